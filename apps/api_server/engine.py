@@ -0,0 +1,18 @@
+"""Run the devices engine, for API workers started with the same
+``DEVICES_ENGINE_SOCKET`` (see the README)."""
+
+import asyncio
+import logging.config
+import os
+
+from logging_config import DEV_LOGGING_CONFIG, PROD_LOGGING_CONFIG
+
+from api.engine import run_engine
+from api.settings import load_settings
+
+if __name__ == "__main__":
+    _env = os.environ.get("GRIDONE_ENV", "development")
+    logging.config.dictConfig(
+        PROD_LOGGING_CONFIG if _env == "production" else DEV_LOGGING_CONFIG
+    )
+    asyncio.run(run_engine(load_settings()))
@@ -3,19 +3,20 @@ import logging
 import logging.config
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from datetime import UTC, datetime
 
-from automations import AutomationsService
-from automations.trigger_providers.schedule import ScheduleTriggerProvider
 from dashboards import DashboardsService
 from fastapi import Depends, FastAPI
 
-from api.action_providers.commands import CommandsActionProvider
-from api.action_providers.notifications import NotificationsActionProvider
 from api.dependencies import get_current_user_id
+from api.engine import (
+    add_device_notifications,
+    build_automations_service,
+    build_commands_service,
+    build_devices_service,
+    build_timeseries_service,
+    timeseries_ingestion,
+)
 from api.exception_handlers import register_exception_handlers
-from api.notification_listeners.device import on_device_discovered
-from api.notification_listeners.fault import on_fault_transition
 from api.routes import (
     assets_router,
     automations_router,
@@ -31,47 +32,23 @@ from api.routes import websocket as websocket_routes
 from api.routes.apps import apps_registration_router, apps_router
 from api.routes.users import auth_router, users_router
 from api.settings import load_settings
-from api.targets import CompositeTargetResolver
-from api.trigger_providers.change_event import ChangeEventTriggerProvider
 from api.websocket.manager import WebSocketManager
 from api.websocket.schemas import DeviceUpdateMessage
 from apps import AppsService
 from assets import AssetsService
-from commands import CommandsService, WriteResult
 from devices_manager import Attribute, CoreDevice, DevicesService
+from devices_manager.remote import RemoteDevicesService
 from models.service import Service
-from models.types import AttributeValueType, DataType
 from notifications import NotificationsService
-from timeseries import DataPoint, SeriesKey, TimeSeriesService
 from users import UsersService
 from users.auth import AuthService
+from users.password import PasswordHasher
 
 
 async def _stop_services(services: list[Service]) -> None:
     await asyncio.gather(*[svc.stop() for svc in services])
 
 
-def _build_automations_service(
-    storage_url: str | None,
-    devices_service: DevicesService,
-    commands_service: CommandsService,
-    notifications_service: NotificationsService,
-    timezone: str = "UTC",
-) -> AutomationsService:
-    """Assemble the automation providers exposed by this API."""
-    return AutomationsService(
-        storage_url=storage_url,
-        trigger_providers=[
-            ScheduleTriggerProvider(timezone),
-            ChangeEventTriggerProvider(devices_service),
-        ],
-        action_providers=[
-            CommandsActionProvider(commands_service),
-            NotificationsActionProvider(notifications_service),
-        ],
-    )
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: PLR0915
     settings = load_settings()
@@ -83,18 +60,32 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: PLR0915
     app.state.auth_service = auth_service
     app.state.cookie_secure = settings.COOKIE_SECURE
 
-    websocket_manager = WebSocketManager()
+    websocket_manager = WebSocketManager(
+        queue_size=settings.WS_SEND_QUEUE_SIZE,
+        overflow=settings.WS_OVERFLOW_POLICY,
+    )
     app.state.websocket_manager = websocket_manager
 
-    dm = DevicesService(settings.storage_url)
-    ts_service = TimeSeriesService(
-        settings.storage_url, default_timezone=settings.GRIDONE_TIMEZONE
+    # With an engine process (api.engine), the devices, their timeseries
+    # ingestion and notifications run there, and this process uses them.
+    engine_socket = settings.DEVICES_ENGINE_SOCKET
+    dm: DevicesService | RemoteDevicesService = (
+        RemoteDevicesService(engine_socket)
+        if engine_socket
+        else build_devices_service(settings)
+    )
+    ts_service = build_timeseries_service(
+        settings, ingestion=not engine_socket, maintenance=not engine_socket
     )
     await ts_service.start()
     app.state.device_manager = dm
     app.state.ts_service = ts_service
 
-    users_service = UsersService(settings.storage_url)
+    password_hasher = PasswordHasher(
+        settings.PASSWORD_HASH_WORKERS,
+        max_per_key=settings.LOGIN_CONCURRENCY_LIMIT,
+    )
+    users_service = UsersService(settings.storage_url, hasher=password_hasher)
     await users_service.start()
     app.state.users_service = users_service
 
@@ -102,53 +93,19 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: PLR0915
     await notifications_svc.start()
     app.state.notifications_service = notifications_svc
 
-    async def _write_device(
-        device_id: str,
-        attribute_name: str,
-        value: AttributeValueType,
-        *,
-        confirm: bool = True,
-    ) -> WriteResult:
-        attr = await dm.write_device_attribute(
-            device_id, attribute_name, value, confirm=confirm
-        )
-        return WriteResult(last_changed=attr.last_changed)
-
-    async def _on_command_success(
-        device_id: str,
-        attribute: str,
-        value: AttributeValueType,
-        data_type: DataType,
-        command_id: int,
-        last_changed: datetime | None,
-    ) -> None:
-        await ts_service.upsert_points(
-            SeriesKey(owner_id=device_id, metric=attribute),
-            [
-                DataPoint(
-                    timestamp=last_changed or datetime.now(UTC),
-                    value=value,
-                    command_id=command_id,
-                )
-            ],
-            create_if_not_found=True,
-        )
-
-    commands_service = CommandsService(
-        settings.storage_url,
-        device_writer=_write_device,
-        result_handler=_on_command_success,
-        target_resolver=CompositeTargetResolver(dm),
-    )
+    commands_service = build_commands_service(settings, dm, ts_service)
     await commands_service.start()
     app.state.commands_service = commands_service
 
-    automations_svc = _build_automations_service(
+    # With an engine, automations fire there: workers only edit them.
+    automations_svc = build_automations_service(
         settings.storage_url,
         dm,
         commands_service,
         notifications_svc,
         settings.GRIDONE_TIMEZONE,
+        run_triggers=not engine_socket,
+        shared=bool(engine_socket),
     )
     await automations_svc.start()
     app.state.automations_service = automations_svc
@@ -165,14 +122,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: PLR0915
     await dashboards_service.start()
     app.state.dashboards_service = dashboards_service
 
-    async def recipients() -> list[str]:
-        users = await users_service.list_users()
-        return [u.id for u in users if not u.is_blocked]
-
-    dm.add_device_discovery_listener(
-        on_device_discovered(notifications_svc, recipients)
-    )
-    dm.add_device_attribute_listener(on_fault_transition(notifications_svc, recipients))
+    if not engine_socket:
+        add_device_notifications(dm, notifications_svc, users_service)
+        dm.add_device_attribute_listener(timeseries_ingestion(ts_service))
 
     async def on_attribute_update(
         device: CoreDevice,
@@ -180,10 +132,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: PLR0915
         _previous: Attribute | None,
         attribute: Attribute,
     ) -> None:
-        """On device attribute update:
-        - broadcast to websocket
-        - store in time series
-        """
+        """Broadcast each device attribute update to websocket clients."""
         message = DeviceUpdateMessage(
             device_id=device.id,
             attribute=attribute_name,
@@ -192,29 +141,21 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: PLR0915
             last_changed=attribute.last_changed,
         )
         await websocket_manager.broadcast(message)
-        await ts_service.upsert_points(
-            SeriesKey(owner_id=device.id, metric=attribute_name),
-            [
-                DataPoint(
-                    timestamp=attribute.last_changed or datetime.now(UTC),
-                    value=attribute.current_value,  # ty: ignore[invalid-argument-type]
-                )
-            ],
-            create_if_not_found=True,
-        )
 
     dm.add_device_attribute_listener(on_attribute_update)
 
     # Start the devices service last so listeners are registered before
-    # storage is restored and polling begins.
+    # storage is restored and polling begins (or engine events arrive).
     await dm.start()
 
     try:
         yield
     finally:
+        # Devices stop first: their last attribute updates must reach the
+        # timeseries ingestion buffer before ts_service drains it.
+        await dm.stop()
         await _stop_services(
             [
-                dm,
                 ts_service,
                 commands_service,
                 automations_svc,
@@ -225,6 +166,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: PLR0915
                 dashboards_service,
             ]
         )
+        password_hasher.close()
         await websocket_manager.close_all()
 
 
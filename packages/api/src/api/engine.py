@@ -0,0 +1,330 @@
+"""The devices engine: devices, their timeseries ingestion and their
+notifications in a process of their own, next to the API workers.
+
+By default the API process runs the devices itself. Started with
+:func:`run_engine` (``apps/api_server/engine.py``), an engine process owns
+them instead and serves them on the ``DEVICES_ENGINE_SOCKET`` Unix socket;
+API workers given the same setting use them through a
+:class:`RemoteDevicesService`. Polling and pushes then no longer share a
+core with HTTP requests, and as many workers as there are cores can serve
+those.
+
+With ``DEVICES_ENGINE_SHARDS``, that engine coordinates shard engines
+(``DEVICES_ENGINE_SHARD``), each running a share of the transports with
+their devices, ingestion and notifications; the coordinator only routes the
+workers' calls and runs the timeseries maintenance jobs.
+
+Automations fire in the process running the devices, or in the coordinator:
+workers only edit them, and the engine reloads their changes from the shared
+storage.
+
+The builders below are shared by every layout, so a device is set up,
+recorded and notified the same way whichever process runs it.
+"""
+
+import asyncio
+import logging
+import signal
+from datetime import UTC, datetime
+
+from automations import AutomationsService
+from automations.service import AUTOMATIONS_SYNC_INTERVAL_SECONDS
+from automations.trigger_providers.schedule import ScheduleTriggerProvider
+
+from api.action_providers.commands import CommandsActionProvider
+from api.action_providers.notifications import NotificationsActionProvider
+from api.notification_listeners.device import on_device_discovered
+from api.notification_listeners.fault import on_fault_transition
+from api.settings import Settings
+from api.targets import CompositeTargetResolver
+from api.trigger_providers.change_event import ChangeEventTriggerProvider
+from commands import CommandsService, WriteResult
+from devices_manager import Attribute, CoreDevice, DevicesService
+from devices_manager.core.device import AttributeListener
+from devices_manager.interface import DevicesServiceInterface
+from devices_manager.remote import EngineServer, ShardedDevicesService
+from models.types import AttributeValueType, DataType
+from notifications import NotificationsService
+from timeseries import DataPoint, SeriesKey, TimeSeriesService
+from timeseries.domain import (
+    parse_compression_policy,
+    parse_duration,
+    parse_retention_policy,
+)
+from timeseries.service.aggregate_cache import AGGREGATE_CACHE_MAX_BUCKETS
+from users import UsersService
+
+logger = logging.getLogger(__name__)
+
+
+def build_devices_service(settings: Settings) -> DevicesService:
+    return DevicesService(
+        settings.storage_url,
+        startup_concurrency=settings.DEVICES_STARTUP_CONCURRENCY,
+        startup_ramp_seconds=settings.DEVICES_STARTUP_RAMP_SECONDS,
+        # A shard runs the transports its coordinator assigns it.
+        owned_transports=() if settings.DEVICES_ENGINE_SHARD else None,
+    )
+
+
+def build_timeseries_service(
+    settings: Settings, *, ingestion: bool = True, maintenance: bool = True
+) -> TimeSeriesService:
+    """The timeseries service of a process, which also spools the points the
+    database does not take when it ingests device updates (*ingestion*), and
+    runs the retention and compression jobs when it is the one process of the
+    deployment doing so (*maintenance*).
+
+    Only a process ingesting the points sees the writes that invalidate
+    cached aggregates, so the others do without the cache.
+    """
+    return TimeSeriesService(
+        settings.storage_url,
+        default_timezone=settings.GRIDONE_TIMEZONE,
+        aggregate_cache_size=AGGREGATE_CACHE_MAX_BUCKETS if ingestion else 0,
+        spool_path=settings.TIMESERIES_SPOOL_PATH if ingestion else None,
+        retention=(
+            parse_retention_policy(settings.TIMESERIES_RETENTION)
+            if maintenance and settings.TIMESERIES_RETENTION
+            else None
+        ),
+        compress_after=(
+            parse_duration(settings.TIMESERIES_COMPRESS_AFTER)
+            if maintenance and settings.TIMESERIES_COMPRESS_AFTER
+            else None
+        ),
+        compression=(
+            parse_compression_policy(settings.TIMESERIES_COMPRESSION)
+            if settings.TIMESERIES_COMPRESSION
+            else None
+        ),
+    )
+
+
+def timeseries_ingestion(ts_service: TimeSeriesService) -> AttributeListener:
+    """Listener: record each attribute update as a timeseries point."""
+
+    def listener(
+        device: CoreDevice,
+        attribute_name: str,
+        _previous: Attribute | None,
+        attribute: Attribute,
+    ) -> None:
+        # Buffered: the service batches points of every series into one
+        # write per flush instead of a transaction per attribute change.
+        ts_service.enqueue_points(
+            SeriesKey(owner_id=device.id, metric=attribute_name),
+            [
+                DataPoint(
+                    timestamp=attribute.last_changed or datetime.now(UTC),
+                    value=attribute.current_value,  # ty: ignore[invalid-argument-type]
+                )
+            ],
+        )
+
+    return listener
+
+
+def add_device_notifications(
+    dm: DevicesServiceInterface,
+    notifications_svc: NotificationsService,
+    users_service: UsersService,
+) -> None:
+    """Notify every active user of discovered devices and fault transitions."""
+
+    async def recipients() -> list[str]:
+        users = await users_service.list_users()
+        return [u.id for u in users if not u.is_blocked]
+
+    dm.add_device_discovery_listener(
+        on_device_discovered(notifications_svc, recipients)
+    )
+    dm.add_device_attribute_listener(on_fault_transition(notifications_svc, recipients))
+
+
+def build_commands_service(
+    settings: Settings,
+    dm: DevicesServiceInterface,
+    ts_service: TimeSeriesService,
+) -> CommandsService:
+    """Commands written through *dm*, each success recorded as a point."""
+
+    async def write_device(
+        device_id: str,
+        attribute_name: str,
+        value: AttributeValueType,
+        *,
+        confirm: bool = True,
+    ) -> WriteResult:
+        attr = await dm.write_device_attribute(
+            device_id, attribute_name, value, confirm=confirm
+        )
+        return WriteResult(last_changed=attr.last_changed)
+
+    async def on_command_success(
+        device_id: str,
+        attribute: str,
+        value: AttributeValueType,
+        data_type: DataType,
+        command_id: int,
+        last_changed: datetime | None,
+    ) -> None:
+        await ts_service.upsert_points(
+            SeriesKey(owner_id=device_id, metric=attribute),
+            [
+                DataPoint(
+                    timestamp=last_changed or datetime.now(UTC),
+                    value=value,
+                    command_id=command_id,
+                )
+            ],
+            create_if_not_found=True,
+        )
+
+    return CommandsService(
+        settings.storage_url,
+        device_writer=write_device,
+        result_handler=on_command_success,
+        target_resolver=CompositeTargetResolver(dm),
+    )
+
+
+def build_automations_service(
+    storage_url: str | None,
+    devices_service: DevicesServiceInterface,
+    commands_service: CommandsService,
+    notifications_service: NotificationsService,
+    timezone: str = "UTC",
+    *,
+    run_triggers: bool = True,
+    shared: bool = False,
+) -> AutomationsService:
+    """Assemble the automation providers exposed by this API; the automations
+    fire only where *run_triggers*, and a process *shared* with others
+    reloads the automations they change."""
+    return AutomationsService(
+        storage_url=storage_url,
+        trigger_providers=[
+            ScheduleTriggerProvider(timezone),
+            ChangeEventTriggerProvider(devices_service),
+        ],
+        action_providers=[
+            CommandsActionProvider(commands_service),
+            NotificationsActionProvider(notifications_service),
+        ],
+        run_triggers=run_triggers,
+        sync_interval=AUTOMATIONS_SYNC_INTERVAL_SECONDS if shared else None,
+    )
+
+
+async def run_engine(settings: Settings) -> None:
+    """Run the devices engine until SIGINT or SIGTERM."""
+    if not settings.DEVICES_ENGINE_SOCKET:
+        msg = "DEVICES_ENGINE_SOCKET must be set to run the devices engine"
+        raise ValueError(msg)
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    if settings.engine_shards:
+        await _run_coordinator(settings, settings.DEVICES_ENGINE_SOCKET, stopping)
+        return
+
+    dm = build_devices_service(settings)
+    # Shards ingest their devices' points; their coordinator runs the jobs.
+    ts_service = build_timeseries_service(
+        settings, maintenance=not settings.DEVICES_ENGINE_SHARD
+    )
+    users_service = UsersService(settings.storage_url)
+    notifications_svc = NotificationsService(settings.storage_url)
+    await ts_service.start()
+    await users_service.start()
+    await notifications_svc.start()
+    automations = await _start_automations(settings, dm, ts_service, notifications_svc)
+
+    add_device_notifications(dm, notifications_svc, users_service)
+    dm.add_device_attribute_listener(timeseries_ingestion(ts_service))
+    server = EngineServer(dm, settings.DEVICES_ENGINE_SOCKET)
+    # Workers wait for the socket, so they only see restored devices.
+    await dm.start()
+    await server.start()
+    try:
+        await stopping.wait()
+    finally:
+        logger.info("Stopping the devices engine")
+        await server.stop()
+        await _stop_automations(automations)
+        # Devices stop first: their last attribute updates must reach the
+        # timeseries ingestion buffer before ts_service drains it.
+        await dm.stop()
+        await asyncio.gather(
+            ts_service.stop(), notifications_svc.stop(), users_service.stop()
+        )
+
+
+async def _start_automations(
+    settings: Settings,
+    dm: DevicesServiceInterface,
+    ts_service: TimeSeriesService,
+    notifications_svc: NotificationsService,
+) -> tuple[AutomationsService, CommandsService] | None:
+    """Fire the automations here, unless this is a shard: its coordinator,
+    which sees every shard's devices, fires them."""
+    if settings.DEVICES_ENGINE_SHARD:
+        return None
+    commands_service = build_commands_service(settings, dm, ts_service)
+    automations_svc = build_automations_service(
+        settings.storage_url,
+        dm,
+        commands_service,
+        notifications_svc,
+        settings.GRIDONE_TIMEZONE,
+        shared=True,
+    )
+    await commands_service.start()
+    await automations_svc.start()
+    return automations_svc, commands_service
+
+
+async def _stop_automations(
+    automations: tuple[AutomationsService, CommandsService] | None,
+) -> None:
+    if automations is not None:
+        automations_svc, commands_service = automations
+        await automations_svc.stop()
+        await commands_service.stop()
+
+
+async def _run_coordinator(
+    settings: Settings, socket: str, stopping: asyncio.Event
+) -> None:
+    dm = ShardedDevicesService(settings.engine_shards, settings.storage_url)
+    ts_service = build_timeseries_service(settings, ingestion=False)
+    notifications_svc = NotificationsService(settings.storage_url)
+    await ts_service.start()
+    await notifications_svc.start()
+    automations = await _start_automations(settings, dm, ts_service, notifications_svc)
+    # Workers wait for the socket, so they only see placed transports.
+    await dm.start()
+    server = EngineServer(dm, socket)
+    await server.start()
+    try:
+        await stopping.wait()
+    finally:
+        logger.info("Stopping the devices engine coordinator")
+        await server.stop()
+        await _stop_automations(automations)
+        await dm.stop()
+        await asyncio.gather(ts_service.stop(), notifications_svc.stop())
+
+
+__all__ = [
+    "add_device_notifications",
+    "build_automations_service",
+    "build_commands_service",
+    "build_devices_service",
+    "build_timeseries_service",
+    "run_engine",
+    "timeseries_ingestion",
+]
@@ -10,13 +10,14 @@ from models.errors import (
     ConflictError,
     InvalidError,
     NotFoundError,
+    TooManyRequestsError,
     UnauthorizedError,
 )
 
 logger = logging.getLogger(__name__)
 
 
-def register_exception_handlers(app: FastAPI) -> None:
+def register_exception_handlers(app: FastAPI) -> None:  # noqa: C901
     @app.exception_handler(NotFoundError)
     async def not_found_handler(request: Request, exc: NotFoundError) -> JSONResponse:
         return JSONResponse(status_code=404, content={"detail": str(exc)})
@@ -57,6 +58,14 @@ def register_exception_handlers(app: FastAPI) -> None:
             },
         )
 
+    @app.exception_handler(TooManyRequestsError)
+    async def too_many_requests_handler(
+        request: Request, exc: TooManyRequestsError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+        )
+
     @app.exception_handler(UnauthorizedError)
     async def unauthorized_handler(
         request: Request, exc: UnauthorizedError
@@ -0,0 +1,25 @@
+"""JSON response for hot endpoints returning data the API shaped itself.
+
+FastAPI validates whatever a route returns against its response model before
+serializing it. For data a route has just shaped from trusted results that is
+wasted work, and for a large device list or a 100k-point series it is most of
+the request. A route returning a :class:`TrustedJSONResponse` skips it: the
+content, models or plain dicts laid out as the response model, goes straight
+to pydantic's Rust serializer, with the same output as FastAPI's own. Such a
+route declares ``response_model`` so that its OpenAPI schema stays the same.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+
+
+class TrustedJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:  # noqa: ANN401
+        return to_json(content, inf_nan_mode="null")
+
+
+__all__ = ["TrustedJSONResponse"]
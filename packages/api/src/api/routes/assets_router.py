@@ -1,3 +1,4 @@
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -85,7 +86,7 @@ async def get_tree_with_devices(
     dm: Annotated[DevicesServiceInterface, Depends(get_device_manager)],
 ) -> list[dict]:
     tree = await assets_svc.get_tree()
-    all_devices = dm.list_devices()
+    all_devices = await asyncio.to_thread(dm.list_devices)
     name_map = {d.id: d.name for d in all_devices}
     links: dict[str, list[str]] = {}
     for device in all_devices:
@@ -161,7 +162,9 @@ async def delete_asset(
     assets_svc: Annotated[AssetsService, Depends(get_assets_service)],
     dm: Annotated[DevicesServiceInterface, Depends(get_device_manager)],
 ) -> None:
-    linked_devices = dm.list_devices(tags={"asset_id": [asset_id]})
+    linked_devices = await asyncio.to_thread(
+        dm.list_devices, tags={"asset_id": [asset_id]}
+    )
     for device in linked_devices:
         await dm.delete_device_tag(device.id, "asset_id")
     await assets_svc.delete_asset(asset_id)
@@ -190,7 +193,10 @@ async def list_asset_devices(
     dm: Annotated[DevicesServiceInterface, Depends(get_device_manager)],
 ) -> list[str]:
     await assets_svc.get_by_id(asset_id)
-    return [d.id for d in dm.list_devices(tags={"asset_id": [asset_id]})]
+    linked_devices = await asyncio.to_thread(
+        dm.list_devices, tags={"asset_id": [asset_id]}
+    )
+    return [d.id for d in linked_devices]
 
 
 @router.post(
@@ -8,6 +8,7 @@ the reusable (target, write) templates automations reference.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -193,7 +194,7 @@ async def dispatch_single_command(
     commands_svc: CommandsServiceInterface = Depends(get_commands_service),
     user_id: str = Depends(get_current_user_id),
 ) -> UnitCommand:
-    dm.get_device(device_id)  # raises NotFoundError → 404 if unknown
+    await asyncio.to_thread(dm.get_device, device_id)  # NotFoundError → 404
     resolved = await resolver.resolve(
         AttributeTarget(
             devices=DevicesFilter(ids=[device_id]), attribute=body.attribute
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Annotated, Any
+from typing import TYPE_CHECKING, Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from api.dependencies import (
     get_device_manager,
@@ -12,6 +13,7 @@ from api.dependencies import (
 )
 from api.devices_filter import parse_tags_params, to_list_devices_kwargs
 from api.permissions import Permission
+from api.responses import TrustedJSONResponse
 from api.routes.command_router import router as command_router
 from api.routes.devices_timeseries_router import router as devices_ts_router
 from api.routes.faults_router import router as faults_router
@@ -43,6 +45,9 @@ from timeseries.domain import (
 )
 from timeseries.service import TimeSeriesService
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,17 +92,64 @@ def get_devices_query(
     )
 
 
-@router.get("/", dependencies=[Depends(require_permission(Permission.DEVICES_READ))])
+def devices_etag(*, structural: bool = False) -> Callable:
+    """Dependency answering ``If-None-Match`` for a device-list endpoint.
+
+    The ETag is the device manager's revision, so a client polling an
+    unchanged list gets a bodiless 304 and the list is not rebuilt. Set
+    *structural* for endpoints that ignore attribute values, unless the
+    request filters on ``is_faulty``.
+    """
+
+    def _check(
+        request: Request,
+        response: Response,
+        dm: Annotated[DevicesServiceInterface, Depends(get_device_manager)],
+        query: Annotated[dict[str, Any], Depends(get_devices_query)],
+    ) -> None:
+        revision = dm.devices_revision(
+            structural=structural and query.get("is_faulty") is None
+        )
+        etag = f'"{revision}"'
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        response.headers["ETag"] = etag
+
+    return _check
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+@router.get(
+    "/",
+    dependencies=[
+        Depends(require_permission(Permission.DEVICES_READ)),
+        Depends(devices_etag()),
+    ],
+    response_model=list[Device],
+)
 def list_devices(
+    response: Response,
     dm: Annotated[DevicesServiceInterface, Depends(get_device_manager)],
     query: Annotated[dict[str, Any], Depends(get_devices_query)],
-) -> list[Device]:
-    return dm.list_devices(**query)
+) -> Response:
+    # The device manager's own DTOs: no need to validate them again.
+    return TrustedJSONResponse(dm.list_devices(**query), headers=response.headers)
 
 
 @router.get(
     "/attributes",
-    dependencies=[Depends(require_permission(Permission.DEVICES_READ))],
+    dependencies=[
+        Depends(require_permission(Permission.DEVICES_READ)),
+        Depends(devices_etag(structural=True)),
+    ],
 )
 def list_device_attributes(
     dm: Annotated[DevicesServiceInterface, Depends(get_device_manager)],
@@ -118,7 +170,10 @@ def list_device_attributes(
 
 @router.get(
     "/tag-groups",
-    dependencies=[Depends(require_permission(Permission.DEVICES_READ))],
+    dependencies=[
+        Depends(require_permission(Permission.DEVICES_READ)),
+        Depends(devices_etag(structural=True)),
+    ],
 )
 def list_device_tag_groups(
     dm: Annotated[DevicesServiceInterface, Depends(get_device_manager)],
@@ -313,7 +368,7 @@ async def push_device_timeseries(
     dm: DevicesServiceInterface = Depends(get_device_manager),
     ts: TimeSeriesService = Depends(get_ts_service),
 ) -> None:
-    device_dto = dm.get_device(device_id)
+    device_dto = await asyncio.to_thread(dm.get_device, device_id)
     for p in body.data:
         if p.attribute not in device_dto.attributes:
             raise HTTPException(
@@ -346,7 +401,7 @@ async def push_device_attribute_timeseries(
     dm: DevicesServiceInterface = Depends(get_device_manager),
     ts: TimeSeriesService = Depends(get_ts_service),
 ) -> None:
-    device_dto = dm.get_device(device_id)
+    device_dto = await asyncio.to_thread(dm.get_device, device_id)
     if attr_name not in device_dto.attributes:
         raise HTTPException(
             status_code=404,
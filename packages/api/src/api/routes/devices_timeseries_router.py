@@ -1,8 +1,9 @@
-from datetime import datetime
+import asyncio
+from datetime import UTC, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, ValidationError
 
 from api.dependencies import (
@@ -13,14 +14,17 @@ from api.dependencies import (
 )
 from api.devices_filter import parse_tags_params
 from api.permissions import Permission
+from api.responses import TrustedJSONResponse
 from api.schemas.timeseries import (
-    AggregatedPointResponse,
     AggregateOptionsResponse,
+    AggregationColumnsResponse,
     AggregationResultResponse,
-    DataPointResponse,
+    FetchPointsColumnsResponse,
     FetchPointsResultResponse,
+    IngestionStatsResponse,
     IntervalOption,
     LiveSpaceAggregateResponse,
+    PointsLayout,
     TimeSeriesResponse,
 )
 from api.targets import CompositeTargetResolver, group_device_ids_by_tag
@@ -30,6 +34,7 @@ from models.targets import AttributeTarget, DevicesFilter
 from timeseries.domain import (
     AggregationOperator,
     AggregationQuery,
+    DownsampleMethod,
     GroupedSpaceAggregationResult,
     SeriesKey,
     SpaceAggregationResult,
@@ -39,6 +44,26 @@ from timeseries.service import TimeSeriesService
 
 router = APIRouter()
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def _epoch_ms(timestamp: datetime) -> int:
+    return (timestamp - _EPOCH) // _MILLISECOND
+
+
+def get_points_layout(
+    layout: PointsLayout = Query(
+        PointsLayout.ROWS,
+        description=(
+            "'rows' returns one object per point; 'columns' returns one array "
+            "per field, with timestamps as Unix epoch milliseconds — much "
+            "lighter for long series."
+        ),
+    ),
+) -> PointsLayout:
+    return layout
+
 
 class ExportQueryParams(BaseModel):
     series_ids: list[str]
@@ -75,21 +100,43 @@ def get_export_query_params(
 async def export_timeseries_csv(
     params: ExportQueryParams = Depends(get_export_query_params),
     ts: TimeSeriesService = Depends(get_ts_service),
-) -> Response:
-    csv_content = await ts.export_csv(
+) -> StreamingResponse:
+    chunks = await ts.stream_csv(
         params.series_ids,
         start=params.start,
         end=params.end,
         last=params.last,
         carry_forward=params.carry_forward,
     )
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        chunks,
         media_type="text/csv",
         headers={"Content-Disposition": 'attachment; filename="export.csv"'},
     )
 
 
+@router.get(
+    "/timeseries/export/parquet",
+    dependencies=[Depends(require_permission(Permission.TIMESERIES_READ))],
+)
+async def export_timeseries_parquet(
+    params: ExportQueryParams = Depends(get_export_query_params),
+    ts: TimeSeriesService = Depends(get_ts_service),
+) -> Response:
+    parquet_content = await ts.export_parquet(
+        params.series_ids,
+        start=params.start,
+        end=params.end,
+        last=params.last,
+        carry_forward=params.carry_forward,
+    )
+    return Response(
+        content=parquet_content,
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": 'attachment; filename="export.parquet"'},
+    )
+
+
 @router.get(
     "/timeseries/export/png",
     dependencies=[Depends(require_permission(Permission.TIMESERIES_READ))],
@@ -116,7 +163,7 @@ async def list_device_timeseries(
     dm: DevicesServiceInterface = Depends(get_device_manager),
     ts: TimeSeriesService = Depends(get_ts_service),
 ) -> list[TimeSeriesResponse]:
-    dm.get_device(device_id)
+    await asyncio.to_thread(dm.get_device, device_id)
     results = await ts.list_series(owner_id=device_id, metric=metric)
     return [TimeSeriesResponse(**s.__dict__) for s in results]
 
@@ -124,6 +171,7 @@ async def list_device_timeseries(
 @router.get(
     "/{device_id}/timeseries/{attr}",
     dependencies=[Depends(require_permission(Permission.TIMESERIES_READ))],
+    response_model=FetchPointsResultResponse | FetchPointsColumnsResponse,
 )
 async def get_device_timeseries_points(
     device_id: str,
@@ -135,10 +183,26 @@ async def get_device_timeseries_points(
     carry_forward: bool = Query(default=False),
     timezone: str | None = Query(None),
     limit: int | None = Query(None),
+    max_points: int | None = Query(
+        None,
+        description=(
+            "Downsample the range to at most this many points for charting, "
+            "instead of paginating with `limit` (mutually exclusive)."
+        ),
+    ),
+    downsample: DownsampleMethod = Query(
+        DownsampleMethod.LTTB,
+        description=(
+            "How `max_points` picks points: 'lttb' follows the curve's shape; "
+            "'minmax' keeps the first, last, min and max point of each time "
+            "slice, so no spike is lost."
+        ),
+    ),
+    layout: PointsLayout = Depends(get_points_layout),
     dm: DevicesServiceInterface = Depends(get_device_manager),
     ts: TimeSeriesService = Depends(get_ts_service),
-) -> FetchPointsResultResponse:
-    dm.get_device(device_id)
+) -> Response:
+    await asyncio.to_thread(dm.get_device, device_id)
     series = await ts.get_series_by_key(SeriesKey(owner_id=device_id, metric=attr))
     if series is None:
         msg = f"No timeseries found for device '{device_id}', attribute '{attr}'"
@@ -151,21 +215,40 @@ async def get_device_timeseries_points(
         carry_forward=carry_forward,
         timezone=timezone,
         limit=limit,
+        max_points=max_points,
+        downsample=downsample,
     )
     tz = ZoneInfo(timezone or ts.default_timezone)
-    return FetchPointsResultResponse(
-        points=[
-            DataPointResponse(
-                timestamp=p.timestamp.astimezone(tz),
-                value=p.value,
-                command_id=p.command_id,
-            )
-            for p in result.points
-        ],
-        truncated=result.truncated,
-        next_start=(
-            result.next_start.astimezone(tz) if result.next_start is not None else None
-        ),
+    points = result.points
+    next_start = (
+        result.next_start.astimezone(tz) if result.next_start is not None else None
+    )
+    # Shaped as the response models from the service's own results: plain
+    # dicts serialize the same, without building and validating a model per
+    # point.
+    if layout == PointsLayout.COLUMNS:
+        return TrustedJSONResponse(
+            {
+                "timestamps": [_epoch_ms(p.timestamp) for p in points],
+                "values": [p.value for p in points],
+                "command_ids": [p.command_id for p in points],
+                "truncated": result.truncated,
+                "next_start": next_start,
+            }
+        )
+    return TrustedJSONResponse(
+        {
+            "points": [
+                {
+                    "timestamp": p.timestamp.astimezone(tz),
+                    "value": p.value,
+                    "command_id": p.command_id,
+                }
+                for p in points
+            ],
+            "truncated": result.truncated,
+            "next_start": next_start,
+        }
     )
 
 
@@ -209,6 +292,17 @@ def get_aggregation_query(
     end: datetime | None = Query(None),
     last: str | None = Query(None),
     timezone: str | None = Query(None),
+    max_points: int | None = Query(
+        None,
+        description=(
+            "With `interval=raw` only: downsample the points to at most this "
+            "many for charting."
+        ),
+    ),
+    downsample: DownsampleMethod = Query(
+        DownsampleMethod.LTTB,
+        description="How `max_points` picks points: 'lttb' or 'minmax'.",
+    ),
 ) -> AggregationQuery:
     try:
         return AggregationQuery.model_validate(
@@ -219,6 +313,8 @@ def get_aggregation_query(
                 "end": end,
                 "last": last,
                 "timezone": timezone,
+                "max_points": max_points,
+                "downsample": downsample,
             }
         )
     except ValidationError as e:
@@ -226,6 +322,22 @@ def get_aggregation_query(
         raise InvalidError("; ".join(msgs)) from e
 
 
+@router.get(
+    "/timeseries/ingestion",
+    dependencies=[Depends(require_permission(Permission.TIMESERIES_READ))],
+)
+def get_ingestion_stats(
+    ts: TimeSeriesService = Depends(get_ts_service),
+) -> IngestionStatsResponse:
+    stats = ts.ingestion_stats()
+    return IngestionStatsResponse(
+        pending_points=stats.pending_points,
+        spooled_points=stats.spooled_points,
+        spool_age_seconds=stats.spool_age_seconds,
+        dropped_points=stats.dropped_points,
+    )
+
+
 @router.get(
     "/timeseries/aggregate/options",
     dependencies=[Depends(require_permission(Permission.TIMESERIES_READ))],
@@ -264,6 +376,7 @@ def get_target_query(
 @router.get(
     "/timeseries/aggregate",
     dependencies=[Depends(require_permission(Permission.TIMESERIES_READ))],
+    response_model=SpaceAggregationResult | GroupedSpaceAggregationResult,
 )
 async def get_devices_timeseries_aggregate(
     target: AttributeTarget = Depends(get_target_query),
@@ -292,13 +405,13 @@ async def get_devices_timeseries_aggregate(
     ),
     resolver: CompositeTargetResolver = Depends(get_target_resolver),
     ts: TimeSeriesService = Depends(get_ts_service),
-) -> SpaceAggregationResult | GroupedSpaceAggregationResult:
+) -> Response:
     """Aggregate one attribute over a device set into a single series.
 
     The target resolves at read time; devices whose history starts
     mid-window simply contribute to fewer buckets. The service's result is
     already wire-shaped — timestamps rendered in the timezone the buckets
-    were cut in — so it serves as the response untouched.
+    were cut in — so it is serialized untouched, without validating it again.
     """
     if group_by is None:
         resolved = await resolver.resolve(target)
@@ -306,7 +419,7 @@ async def get_devices_timeseries_aggregate(
             SeriesKey(owner_id=device_id, metric=target.attribute)
             for device_id in resolved.device_ids
         ]
-        return await ts.get_aggregate_many(keys, query, space_agg)
+        return TrustedJSONResponse(await ts.get_aggregate_many(keys, query, space_agg))
     _, devices = await resolver.resolve_with_devices(target)
     keys_by_group = {
         label: [
@@ -315,7 +428,9 @@ async def get_devices_timeseries_aggregate(
         ]
         for label, device_ids in group_device_ids_by_tag(devices, group_by).items()
     }
-    return await ts.get_aggregate_many_grouped(keys_by_group, query, space_agg)
+    return TrustedJSONResponse(
+        await ts.get_aggregate_many_grouped(keys_by_group, query, space_agg)
+    )
 
 
 @router.get(
@@ -359,30 +474,48 @@ async def get_devices_live_aggregate(
 @router.get(
     "/{device_id}/timeseries/{attr}/aggregate",
     dependencies=[Depends(require_permission(Permission.TIMESERIES_READ))],
+    response_model=AggregationResultResponse | AggregationColumnsResponse,
 )
 async def get_device_timeseries_aggregate(
     device_id: str,
     attr: str,
     query: AggregationQuery = Depends(get_aggregation_query),
+    layout: PointsLayout = Depends(get_points_layout),
     dm: DevicesServiceInterface = Depends(get_device_manager),
     ts: TimeSeriesService = Depends(get_ts_service),
-) -> AggregationResultResponse:
-    dm.get_device(device_id)
+) -> Response:
+    await asyncio.to_thread(dm.get_device, device_id)
     result = await ts.get_aggregate(SeriesKey(owner_id=device_id, metric=attr), query)
+    points = result.points
+    header = {
+        "interval": str(result.interval),
+        "agg": result.agg,
+        "data_type": result.data_type,
+        "aggregation_data_type": result.aggregation_data_type,
+        "timezone": result.timezone,
+        "truncated": result.truncated,
+    }
+    # As in get_device_timeseries_points.
+    if layout == PointsLayout.COLUMNS:
+        return TrustedJSONResponse(
+            {
+                **header,
+                "interval_starts": [_epoch_ms(p.interval_start) for p in points],
+                "values": [p.value for p in points],
+                "counts": [p.count for p in points],
+            }
+        )
     tz = ZoneInfo(result.timezone)
-    return AggregationResultResponse(
-        interval=str(result.interval),
-        agg=result.agg,
-        data_type=result.data_type,
-        aggregation_data_type=result.aggregation_data_type,
-        timezone=result.timezone,
-        truncated=result.truncated,
-        points=[
-            AggregatedPointResponse(
-                interval_start=p.interval_start.astimezone(tz),
-                value=p.value,
-                count=p.count,
-            )
-            for p in result.points
-        ],
+    return TrustedJSONResponse(
+        {
+            **header,
+            "points": [
+                {
+                    "interval_start": p.interval_start.astimezone(tz),
+                    "value": p.value,
+                    "count": p.count,
+                }
+                for p in points
+            ],
+        }
     )
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Path, status
@@ -51,11 +52,14 @@ async def create_discovery(
     payload: DiscoveryHandlerCreateDTO,
     transport_id: Annotated[str, Depends(get_transport_id)],
 ) -> DiscoveryHandlerDTO:
-    if payload.driver_id not in dm.driver_ids:
+    driver_ids, transport_ids = await asyncio.to_thread(
+        lambda: (dm.driver_ids, dm.transport_ids)
+    )
+    if payload.driver_id not in driver_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found"
         )
-    if transport_id not in dm.transport_ids:
+    if transport_id not in transport_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found"
         )
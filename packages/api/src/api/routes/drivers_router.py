@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Annotated
 
@@ -139,7 +140,8 @@ async def rename_driver_attribute(
     ts: Annotated[TimeSeriesService, Depends(get_ts_service)],
 ) -> AttributeDriverSpec:
     result = await dm.rename_driver_attribute(driver_id, attribute_id, payload.new_name)
-    device_ids = [d.id for d in dm.list_devices(driver_id=driver_id)]
+    devices = await asyncio.to_thread(dm.list_devices, driver_id=driver_id)
+    device_ids = [d.id for d in devices]
     try:
         await ts.rename_metric_for_owners(device_ids, attribute_id, payload.new_name)
     except Exception:
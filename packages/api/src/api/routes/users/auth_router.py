@@ -91,9 +91,13 @@ def _apply_token_cookies(
 
 
 async def _tokens_for_credentials(
-    username: str, password: str, um: UsersService, auth_service: AuthService
+    username: str,
+    password: str,
+    um: UsersService,
+    auth_service: AuthService,
+    client: str | None,
 ) -> tuple[str, str]:
-    user = await um.authenticate(username, password)
+    user = await um.authenticate(username, password, client=client)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -144,7 +148,11 @@ async def oauth2_token(
                 detail="username and password are required",
             )
         access, new_refresh = await _tokens_for_credentials(
-            username, password, um, auth_service
+            username,
+            password,
+            um,
+            auth_service,
+            request.client.host if request.client else None,
         )
     elif grant_type == "refresh_token":
         token = refresh_token or request.cookies.get("refresh_token")
@@ -1,10 +1,32 @@
+import asyncio
 import json
 import logging
 
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from pydantic import ValidationError
 
+from api.dependencies import require_permission
+from api.devices_filter import to_list_devices_kwargs
+from api.permissions import Permission
 from api.websocket.manager import WebSocketManager
-from api.websocket.schemas import PongMessage
+from api.websocket.schemas import (
+    ErrorMessage,
+    PongMessage,
+    SubscribedMessage,
+    SubscribeMessage,
+    UnsubscribedMessage,
+    UnsubscribeMessage,
+    WebSocketConnectionStats,
+    WebSocketStatsResponse,
+)
+from devices_manager import DevicesServiceInterface
 
 logger = logging.getLogger(__name__)
 
@@ -16,13 +38,51 @@ def get_websocket_manager(websocket: WebSocket) -> WebSocketManager:
     return websocket.app.state.websocket_manager
 
 
+def get_websocket_device_manager(websocket: WebSocket) -> DevicesServiceInterface:
+    return websocket.app.state.device_manager
+
+
+def get_websocket_manager_http(request: Request) -> WebSocketManager:
+    return request.app.state.websocket_manager
+
+
+@router.get(
+    "/ws/stats",
+    dependencies=[Depends(require_permission(Permission.DEVICES_READ))],
+)
+def get_websocket_stats(
+    manager: WebSocketManager = Depends(get_websocket_manager_http),
+) -> WebSocketStatsResponse:
+    stats = manager.stats()
+    return WebSocketStatsResponse(
+        connections=[
+            WebSocketConnectionStats(
+                connection_id=c.connection_id,
+                queued=c.queued,
+                max_queued=c.max_queued,
+                sent=c.sent,
+                dropped=c.dropped,
+            )
+            for c in stats.connections
+        ],
+        overflow_disconnects=stats.overflow_disconnects,
+    )
+
+
 @router.websocket("/ws")
 @router.websocket("/ws/devices")
 async def websocket_endpoint(
     websocket: WebSocket,
     manager: WebSocketManager = Depends(get_websocket_manager),
+    dm: DevicesServiceInterface = Depends(get_websocket_device_manager),
+    batch_ms: int | None = Query(None, ge=10, le=10_000),
 ) -> None:
-    connection_id = await manager.connect(websocket)
+    """Push device updates, one frame each, or with ``?batch_ms=`` in batches
+    sent at most that often (``device_updates`` frames)."""
+    connection_id = await manager.connect(
+        websocket,
+        batch_interval=batch_ms / 1000 if batch_ms is not None else None,
+    )
 
     try:
         while True:
@@ -36,11 +96,72 @@ async def websocket_endpoint(
             except json.JSONDecodeError:
                 continue
 
-            if isinstance(payload, dict) and payload.get("type") == "ping":
-                await websocket.send_text(PongMessage().model_dump_json())
+            if not isinstance(payload, dict):
+                continue
+            message_type = payload.get("type")
+            if message_type == "ping":
+                await manager.send(connection_id, PongMessage())
+            elif message_type == "subscribe":
+                reply = await _subscribe(manager, dm, connection_id, payload)
+                await manager.send(connection_id, reply)
+            elif message_type == "unsubscribe":
+                reply = _unsubscribe(manager, connection_id, payload)
+                await manager.send(connection_id, reply)
     except WebSocketDisconnect:
         pass
     except Exception:  # noqa: BLE001
         logger.debug("WebSocket connection closed with error", exc_info=True)
     finally:
         await manager.disconnect(connection_id)
+
+
+def _invalid(e: ValidationError) -> ErrorMessage:
+    return ErrorMessage(
+        message="; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+        )
+    )
+
+
+async def _subscribe(
+    manager: WebSocketManager,
+    dm: DevicesServiceInterface,
+    connection_id: str,
+    payload: dict,
+) -> SubscribedMessage | ErrorMessage:
+    try:
+        request = SubscribeMessage.model_validate(payload)
+    except ValidationError as e:
+        return _invalid(e)
+
+    device_ids = request.ids
+    # ids alone are taken as they are, so a device that does not exist yet
+    # is covered once it does; other filters select from the devices now.
+    filters = to_list_devices_kwargs(
+        {"types": request.types, "tags": request.tags, "asset_id": request.asset_id}
+    )
+    if any(value is not None for value in filters.values()):
+        devices = await asyncio.to_thread(dm.list_devices, ids=request.ids, **filters)
+        device_ids = [d.id for d in devices]
+
+    manager.subscribe(
+        connection_id,
+        request.id,
+        device_ids=device_ids,
+        attributes=request.attributes,
+    )
+    return SubscribedMessage(
+        id=request.id,
+        device_count=len(device_ids) if device_ids is not None else None,
+    )
+
+
+def _unsubscribe(
+    manager: WebSocketManager, connection_id: str, payload: dict
+) -> UnsubscribedMessage | ErrorMessage:
+    try:
+        request = UnsubscribeMessage.model_validate(payload)
+    except ValidationError as e:
+        return _invalid(e)
+    manager.unsubscribe(connection_id, request.id)
+    return UnsubscribedMessage(id=request.id)
@@ -1,9 +1,19 @@
 from datetime import datetime
+from enum import StrEnum
 
 from pydantic import BaseModel
 
 from models.types import AttributeValueType, DataType
-from timeseries.domain import AggregationOperator
+from timeseries.domain import AggregationOperator, Compression
+
+
+class PointsLayout(StrEnum):
+    ROWS = "rows"
+    """One object per point."""
+    COLUMNS = "columns"
+    """One array per field, timestamps as Unix epoch milliseconds: far
+    smaller and faster to build for long series, and what chart libraries
+    take."""
 
 
 class TimeSeriesResponse(BaseModel):
@@ -13,6 +23,7 @@ class TimeSeriesResponse(BaseModel):
     metric: str
     created_at: datetime
     updated_at: datetime
+    compression: Compression | None = None
 
 
 class DataPointResponse(BaseModel):
@@ -27,6 +38,17 @@ class FetchPointsResultResponse(BaseModel):
     next_start: datetime | None = None
 
 
+class FetchPointsColumnsResponse(BaseModel):
+    """Points of :class:`FetchPointsResultResponse`, one array per field."""
+
+    timestamps: list[int]
+    """Unix epoch milliseconds."""
+    values: list[AttributeValueType]
+    command_ids: list[int | None]
+    truncated: bool
+    next_start: datetime | None = None
+
+
 class AggregatedPointResponse(BaseModel):
     interval_start: datetime
     value: bool | int | float | str | None
@@ -43,6 +65,21 @@ class AggregationResultResponse(BaseModel):
     points: list[AggregatedPointResponse]
 
 
+class AggregationColumnsResponse(BaseModel):
+    """Points of :class:`AggregationResultResponse`, one array per field."""
+
+    interval: str
+    agg: AggregationOperator
+    data_type: DataType
+    aggregation_data_type: DataType
+    timezone: str
+    truncated: bool
+    interval_starts: list[int]
+    """Unix epoch milliseconds."""
+    values: list[bool | int | float | str | None]
+    counts: list[int]
+
+
 class IntervalOption(BaseModel):
     interval: str
     bucket_count: int | None
@@ -65,6 +102,17 @@ class AggregateOptionsResponse(BaseModel):
     can fold a device set (the space aggregation vocabulary)."""
 
 
+class IngestionStatsResponse(BaseModel):
+    """Backlog of points waiting to reach timeseries storage."""
+
+    pending_points: int
+    spooled_points: int
+    spool_age_seconds: float | None
+    """Age of the oldest spooled point; ``None`` when the spool is empty."""
+    dropped_points: int
+    """Points dropped since startup for lack of room in memory or spool."""
+
+
 class LiveSpaceAggregateResponse(BaseModel):
     """One attribute's current values across a device set, folded to one."""
 
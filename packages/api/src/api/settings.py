@@ -1,10 +1,20 @@
 import secrets
 from collections.abc import Mapping
+from typing import Self
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from api.env import load_environ
+from api.websocket import OverflowPolicy
+from api.websocket.connection import DEFAULT_SEND_QUEUE_SIZE
+from models.errors import InvalidError
+from timeseries.domain import (
+    parse_compression_policy,
+    parse_duration,
+    parse_retention_policy,
+)
+from users.password import HASH_WORKERS, MAX_VERIFICATIONS_PER_KEY
 
 
 class Settings(BaseModel):
@@ -14,7 +24,38 @@ class Settings(BaseModel):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     COOKIE_SECURE: bool = True  # False only when served over plain HTTP
+    # Threads hashing and checking passwords (bcrypt), and the logins one
+    # account or one client address may have checked at once; more get 429.
+    PASSWORD_HASH_WORKERS: int = Field(default=HASH_WORKERS, ge=1)
+    LOGIN_CONCURRENCY_LIMIT: int = Field(default=MAX_VERIFICATIONS_PER_KEY, ge=1)
     GRIDONE_TIMEZONE: str = "UTC"
+    # Devices started at once at boot, and the window their first polls are
+    # spread over (0 = all poll immediately).
+    DEVICES_STARTUP_CONCURRENCY: int = 32
+    DEVICES_STARTUP_RAMP_SECONDS: float = 0.0
+    # Unix socket of the devices engine process (api.engine) serving the
+    # devices to this one. Unset: this process runs the devices itself.
+    DEVICES_ENGINE_SOCKET: str | None = None
+    # Devices engines split by transport (devices_manager.remote.sharding):
+    # comma-separated sockets of the shard engines this engine coordinates,
+    # and, on each shard engine, DEVICES_ENGINE_SHARD=true.
+    DEVICES_ENGINE_SHARDS: str | None = None
+    DEVICES_ENGINE_SHARD: bool = False
+    # SQLite file holding timeseries points the database could not take
+    # (outage, stall) until they are replayed. Unset: held in memory only.
+    TIMESERIES_SPOOL_PATH: str | None = None
+    # JSON list of retention rules, e.g. '[{"metric": "*", "raw": "90d"}]'
+    # (see timeseries.domain.retention). Unset: history is kept forever.
+    TIMESERIES_RETENTION: str | None = None
+    # TimescaleDB compresses point chunks older than this duration (e.g. "7d").
+    TIMESERIES_COMPRESS_AFTER: str | None = None
+    # JSON list of ingestion compression rules for new float series (see
+    # timeseries.domain.compression). Unset: points are stored as sent.
+    TIMESERIES_COMPRESSION: str | None = None
+    # Messages queued per WebSocket client, and what gives when a client on
+    # a slow link falls that far behind.
+    WS_SEND_QUEUE_SIZE: int = Field(default=DEFAULT_SEND_QUEUE_SIZE, ge=1)
+    WS_OVERFLOW_POLICY: OverflowPolicy = OverflowPolicy.COALESCE
 
     model_config = {"extra": "ignore"}
 
@@ -28,6 +69,56 @@ class Settings(BaseModel):
             raise ValueError(msg) from e
         return v
 
+    @field_validator("TIMESERIES_RETENTION")
+    @classmethod
+    def validate_retention(cls, v: str | None) -> str | None:
+        if v is not None:
+            try:
+                parse_retention_policy(v)
+            except InvalidError as e:
+                raise ValueError(str(e)) from e
+        return v
+
+    @field_validator("TIMESERIES_COMPRESSION")
+    @classmethod
+    def validate_compression(cls, v: str | None) -> str | None:
+        if v is not None:
+            try:
+                parse_compression_policy(v)
+            except InvalidError as e:
+                raise ValueError(str(e)) from e
+        return v
+
+    @field_validator("TIMESERIES_COMPRESS_AFTER")
+    @classmethod
+    def validate_compress_after(cls, v: str | None) -> str | None:
+        if v is not None:
+            try:
+                parse_duration(v)
+            except InvalidError as e:
+                raise ValueError(str(e)) from e
+        return v
+
+    @model_validator(mode="after")
+    def validate_engine_role(self) -> Self:
+        if self.DEVICES_ENGINE_SHARDS is not None and not self.engine_shards:
+            msg = "DEVICES_ENGINE_SHARDS must list at least one shard socket"
+            raise ValueError(msg)
+        if self.engine_shards and self.DEVICES_ENGINE_SHARD:
+            msg = "An engine is either a shard or their coordinator, not both"
+            raise ValueError(msg)
+        return self
+
+    @property
+    def engine_shards(self) -> list[str]:
+        if not self.DEVICES_ENGINE_SHARDS:
+            return []
+        return [
+            path.strip()
+            for path in self.DEVICES_ENGINE_SHARDS.split(",")
+            if path.strip()
+        ]
+
     @property
     def storage_url(self) -> str:
         # Fall through to a placeholder so services that require a real
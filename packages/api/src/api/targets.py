@@ -9,6 +9,7 @@ set rather than persisted inside it.
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
 from models.errors import InvalidError
@@ -111,7 +112,9 @@ class CompositeTargetResolver:
         devices — for a caller that needs device data beyond the id (e.g.
         current attribute values), sparing it a second ``list_devices`` scan.
         """
-        devices = self._dm.list_devices(**target.devices.model_dump(exclude_none=True))
+        devices = await asyncio.to_thread(
+            self._dm.list_devices, **target.devices.model_dump(exclude_none=True)
+        )
         exposing = [
             d for d in devices if _exposes(d, target.attribute, writable=writable)
         ]
@@ -134,7 +137,9 @@ class CompositeTargetResolver:
     async def list_attribute_coverage(
         self, devices: DevicesFilter
     ) -> list[AttributeCoverage]:
-        matched = self._dm.list_devices(**devices.model_dump(exclude_none=True))
+        matched = await asyncio.to_thread(
+            self._dm.list_devices, **devices.model_dump(exclude_none=True)
+        )
         return compute_attribute_coverage(matched)
 
 
@@ -1,5 +1,6 @@
 # WebSocket infrastructure for the Gridone API.
 
-from .manager import WebSocketManager
+from .connection import ConnectionStats, OverflowPolicy
+from .manager import WebSocketManager, WebSocketStats
 
-__all__ = ["WebSocketManager"]
+__all__ = ["ConnectionStats", "OverflowPolicy", "WebSocketManager", "WebSocketStats"]
@@ -0,0 +1,187 @@
+"""One WebSocket client with its own bounded send queue and writer task.
+
+Broadcasting only enqueues, so a client on a slow link falls behind on its
+own instead of delaying every other client. When its queue is full, the
+connection's :class:`OverflowPolicy` decides what gives.
+
+A client may instead take device updates in batches: they are held, the
+newest per device attribute, and sent as one compact frame at most every
+``batch_interval`` seconds, once the queue is empty. A slow client then
+gets fewer, larger frames rather than a growing backlog.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from enum import StrEnum
+from itertools import count
+
+from fastapi import WebSocket, status
+
+logger = logging.getLogger(__name__)
+
+# Messages waiting for a client before its overflow policy applies.
+DEFAULT_SEND_QUEUE_SIZE = 256
+
+
+class OverflowPolicy(StrEnum):
+    DROP_OLDEST = "drop_oldest"
+    """Drop the oldest queued message to make room."""
+    COALESCE = "coalesce"
+    """A newer value of a device attribute replaces the queued one; other
+    messages drop the oldest when the queue is still full."""
+    DISCONNECT = "disconnect"
+    """Close the connection; the client reconnects and refetches."""
+
+
+@dataclass(frozen=True)
+class ConnectionStats:
+    connection_id: str
+    queued: int
+    max_queued: int
+    """Deepest the queue has been since the client connected."""
+    sent: int
+    dropped: int
+    """Messages dropped or replaced by a newer value, never sent."""
+
+
+class Connection:
+    """Queue messages for one client and send them from a writer task."""
+
+    def __init__(
+        self,
+        connection_id: str,
+        websocket: WebSocket,
+        *,
+        queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.COALESCE,
+        batch_interval: float | None = None,
+        on_error: Callable[[str], None],
+    ) -> None:
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.batch_interval = batch_interval
+        self._on_error = on_error
+        # Batched device updates, (device_id, attribute) -> compact row.
+        self._batch: dict[Hashable, list] = {}
+        self._next_batch = 0.0
+        # Coalescing key (or a unique number) -> serialized message, oldest first.
+        self._pending: OrderedDict[Hashable, str] = OrderedDict()
+        self._seq = count()
+        self._wakeup = asyncio.Event()
+        self._writer: asyncio.Task | None = None
+        self._max_queued = 0
+        self._sent = 0
+        self._dropped = 0
+
+    @property
+    def batches(self) -> bool:
+        """Whether device updates go through :meth:`enqueue_update`."""
+        return self.batch_interval is not None
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write())
+
+    def enqueue(self, payload: str, key: Hashable | None = None) -> bool:
+        """Queue *payload* for sending; ``False`` when the connection must be
+        closed for falling behind (:attr:`OverflowPolicy.DISCONNECT`).
+
+        Under :attr:`OverflowPolicy.COALESCE`, a queued message with the same
+        *key* is replaced in place by *payload*.
+        """
+        pending = self._pending
+        if (
+            self.overflow == OverflowPolicy.COALESCE
+            and key is not None
+            and key in pending
+        ):
+            pending[key] = payload
+            self._dropped += 1
+            return True
+        if len(pending) >= self.queue_size:
+            if self.overflow == OverflowPolicy.DISCONNECT:
+                self._dropped += len(pending) + 1
+                pending.clear()
+                return False
+            pending.popitem(last=False)
+            self._dropped += 1
+        coalescing = self.overflow == OverflowPolicy.COALESCE and key is not None
+        pending[key if coalescing else next(self._seq)] = payload
+        self._max_queued = max(self._max_queued, len(pending))
+        self._wakeup.set()
+        return True
+
+    def enqueue_update(self, key: Hashable, row: list) -> None:
+        """Hold a device update *row* for the next batch, replacing the one
+        of the same device attribute."""
+        if key in self._batch:
+            self._dropped += 1
+        self._batch[key] = row
+        self._wakeup.set()
+
+    def stats(self) -> ConnectionStats:
+        return ConnectionStats(
+            connection_id=self.connection_id,
+            queued=len(self._pending),
+            max_queued=self._max_queued,
+            sent=self._sent,
+            dropped=self._dropped,
+        )
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        """Stop the writer, dropping what is still queued, and close the socket."""
+        if self._writer is not None:
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+        self._pending.clear()
+        self._batch.clear()
+        with contextlib.suppress(Exception):
+            await self.websocket.close(code=code)
+
+    async def _write(self) -> None:
+        while True:
+            if not self._pending and not self._batch:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if self._pending:
+                _, payload = self._pending.popitem(last=False)
+            else:
+                payload = await self._next_batch_frame()
+            try:
+                await self.websocket.send_text(payload)
+            except Exception:  # noqa: BLE001
+                logger.debug(
+                    "WebSocket send failed, dropping %s",
+                    self.connection_id,
+                    exc_info=True,
+                )
+                self._on_error(self.connection_id)
+                return
+            self._sent += 1
+
+    async def _next_batch_frame(self) -> str:
+        loop = asyncio.get_running_loop()
+        delay = self._next_batch - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._next_batch = loop.time() + (self.batch_interval or 0.0)
+        rows, self._batch = list(self._batch.values()), {}
+        return json.dumps(
+            {"type": "device_updates", "updates": rows}, separators=(",", ":")
+        )
+
+
+__all__ = [
+    "DEFAULT_SEND_QUEUE_SIZE",
+    "Connection",
+    "ConnectionStats",
+    "OverflowPolicy",
+]
@@ -1,62 +1,203 @@
 import asyncio
-import contextlib
 import json
-from collections.abc import Iterable
+import logging
+from collections.abc import Collection, Hashable, Iterable
+from dataclasses import dataclass
 from typing import Any
 from uuid import uuid4
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
+
+from .connection import (
+    DEFAULT_SEND_QUEUE_SIZE,
+    Connection,
+    ConnectionStats,
+    OverflowPolicy,
+)
+from .schemas import DEVICE_UPDATE_FIELDS, DeviceUpdateMessage
+from .subscriptions import Subscription, SubscriptionIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WebSocketStats:
+    connections: list[ConnectionStats]
+    overflow_disconnects: int
+    """Connections closed since startup for falling behind."""
 
 
 class WebSocketManager:
-    """Track active WebSocket connections and broadcast messages."""
+    """Track active WebSocket connections and broadcast messages.
+
+    Each connection sends from its own bounded queue (see
+    :class:`~api.websocket.connection.Connection`), so broadcasting never
+    waits on a client. Device updates only go to the clients subscribed to
+    them (see :mod:`api.websocket.subscriptions`).
+    """
 
-    def __init__(self) -> None:
-        self.active_connections: dict[str, WebSocket] = {}
-        self._lock = asyncio.Lock()
+    def __init__(
+        self,
+        *,
+        queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.COALESCE,
+    ) -> None:
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self._connections: dict[str, Connection] = {}
+        self._subscriptions = SubscriptionIndex()
+        self._closing: set[asyncio.Task] = set()
+        self._overflow_disconnects = 0
 
-    async def connect(self, websocket: WebSocket) -> str:
-        """Accept a connection and register it."""
+    @property
+    def active_connections(self) -> dict[str, WebSocket]:
+        return {cid: c.websocket for cid, c in self._connections.items()}
+
+    async def connect(
+        self, websocket: WebSocket, *, batch_interval: float | None = None
+    ) -> str:
+        """Accept a connection and register it.
+
+        With *batch_interval* (seconds), the client gets device updates in
+        batches (see :class:`~api.websocket.schemas.DeviceUpdatesMessage`).
+        """
         connection_id = str(uuid4())
         await websocket.accept()
 
-        async with self._lock:
-            self.active_connections[connection_id] = websocket
+        connection = Connection(
+            connection_id,
+            websocket,
+            queue_size=self.queue_size,
+            overflow=self.overflow,
+            batch_interval=batch_interval,
+            on_error=self._drop,
+        )
+        connection.start()
+        self._connections[connection_id] = connection
 
         return connection_id
 
     async def disconnect(self, connection_id: str) -> None:
         """Remove a connection if it exists."""
-        async with self._lock:
-            websocket = self.active_connections.pop(connection_id, None)
+        self._subscriptions.remove(connection_id)
+        connection = self._connections.pop(connection_id, None)
+        if connection:
+            await connection.close()
+
+    def subscribe(
+        self,
+        connection_id: str,
+        subscription_id: str,
+        *,
+        device_ids: Collection[str] | None = None,
+        attributes: Collection[str] | None = None,
+    ) -> None:
+        """Send the connection updates of *attributes* of *device_ids* (``None``
+        for any), on top of its other subscriptions; replaces the subscription
+        with the same id.
+
+        From its first subscription on, a connection no longer receives the
+        device updates it did not subscribe to.
+        """
+        if connection_id in self._connections:
+            self._subscriptions.subscribe(
+                connection_id,
+                subscription_id,
+                Subscription.of(device_ids, attributes),
+            )
 
-        if websocket:
-            with contextlib.suppress(Exception):
-                await websocket.close()
+    def unsubscribe(self, connection_id: str, subscription_id: str | None) -> None:
+        """Drop one subscription of the connection, or all when ``None``."""
+        if connection_id in self._connections:
+            self._subscriptions.unsubscribe(connection_id, subscription_id)
+
+    async def send(self, connection_id: str, message: Any) -> None:  # noqa: ANN401
+        """Queue a message for one client."""
+        connection = self._connections.get(connection_id)
+        if connection is not None:
+            self._enqueue(connection, self._serialize(message), None)
 
     async def broadcast(self, message: Any) -> None:  # noqa: ANN401
-        """Send a message to all connected clients."""
-        if not self.active_connections:
+        """Queue a message for every interested client, without waiting on sends."""
+        if isinstance(message, DeviceUpdateMessage):
+            interested = self._subscriptions.interested(
+                message.device_id, message.attribute
+            )
+            connections = [
+                c
+                for cid, c in self._connections.items()
+                if cid in interested or not self._subscriptions.is_filtered(cid)
+            ]
+        else:
+            connections = list(self._connections.values())
+        if not connections:
             return
 
-        payload = self._serialize(message)
+        key = self._coalesce_key(message)
+        if key is not None:
+            batched = [c for c in connections if c.batches]
+            if batched:
+                row = self._update_row(message)
+                for connection in batched:
+                    connection.enqueue_update(key, row)
+                connections = [c for c in connections if not c.batches]
+
+        if connections:
+            payload = self._serialize(message)
+            for connection in connections:
+                self._enqueue(connection, payload, key)
 
-        stale_connections: list[str] = []
-        async with self._lock:
-            for connection_id, connection in self.active_connections.items():
-                try:
-                    await connection.send_text(payload)
-                except Exception:  # noqa: BLE001
-                    stale_connections.append(connection_id)
+    def _enqueue(
+        self, connection: Connection, payload: str, key: Hashable | None
+    ) -> None:
+        if not connection.enqueue(payload, key):
+            self._overflow_disconnects += 1
+            logger.warning(
+                "Closing WebSocket %s: send queue full (%d messages)",
+                connection.connection_id,
+                self.queue_size,
+            )
+            self._drop(connection.connection_id, status.WS_1013_TRY_AGAIN_LATER)
 
-            for connection_id in stale_connections:
-                self.active_connections.pop(connection_id, None)
+    def stats(self) -> WebSocketStats:
+        return WebSocketStats(
+            connections=[c.stats() for c in self._connections.values()],
+            overflow_disconnects=self._overflow_disconnects,
+        )
 
     async def close_all(self) -> None:
         """Close every active connection (used during shutdown)."""
-        connection_ids = list(self.active_connections.keys())
+        connection_ids = list(self._connections.keys())
         for connection_id in connection_ids:
             await self.disconnect(connection_id)
+        if self._closing:
+            await asyncio.gather(*self._closing)
+
+    def _drop(
+        self, connection_id: str, code: int = status.WS_1011_INTERNAL_ERROR
+    ) -> None:
+        """Unregister a connection now and close it in the background."""
+        self._subscriptions.remove(connection_id)
+        connection = self._connections.pop(connection_id, None)
+        if connection is None:
+            return
+        task = asyncio.create_task(connection.close(code))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    def _coalesce_key(message: Any) -> Hashable | None:  # noqa: ANN401
+        """Messages with the same key carry the same attribute: only the
+        newest still queued needs sending."""
+        if isinstance(message, DeviceUpdateMessage):
+            return (message.device_id, message.attribute)
+        return None
+
+    @staticmethod
+    def _update_row(message: DeviceUpdateMessage) -> list:
+        """The compact form of a device update in a batch."""
+        data = message.model_dump(mode="json")
+        return [data[field] for field in DEVICE_UPDATE_FIELDS]
 
     @staticmethod
     def _serialize(message: Any) -> str:  # noqa: ANN401
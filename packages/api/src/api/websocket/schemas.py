@@ -22,6 +22,43 @@ class PongMessage(WebSocketMessage):
     type: Literal["pong"] = "pong"
 
 
+class SubscribeMessage(BaseModel):
+    """Client request for the device updates matching a device filter.
+
+    Devices are selected as by ``GET /devices`` (``ids``, ``types``, ``tags``,
+    ``asset_id``), when the request arrives: devices added later are not
+    included until the client subscribes again. ``attributes`` narrows the
+    updates to those attributes. Omitted filters match everything.
+    """
+
+    type: Literal["subscribe"]
+    id: str = "default"
+    """Client-chosen subscription id; subscribing again with it replaces it."""
+    ids: list[str] | None = None
+    types: list[str] | None = None
+    tags: dict[str, list[str]] | None = None
+    asset_id: str | None = None
+    attributes: list[str] | None = None
+
+
+class UnsubscribeMessage(BaseModel):
+    type: Literal["unsubscribe"]
+    id: str | None = None
+    """Subscription to drop; every subscription when omitted."""
+
+
+class SubscribedMessage(WebSocketMessage):
+    type: Literal["subscribed"] = "subscribed"
+    id: str
+    device_count: int | None
+    """Devices matched, ``None`` when the subscription covers any device."""
+
+
+class UnsubscribedMessage(WebSocketMessage):
+    type: Literal["unsubscribed"] = "unsubscribed"
+    id: str | None
+
+
 class DeviceUpdateMessage(WebSocketMessage):
     type: Literal["device_update"] = "device_update"
     device_id: str
@@ -33,6 +70,30 @@ class DeviceUpdateMessage(WebSocketMessage):
     last_changed: datetime | None = None
 
 
+# Order of the fields of each update in a DeviceUpdatesMessage.
+DEVICE_UPDATE_FIELDS = (
+    "device_id",
+    "attribute",
+    "value",
+    "last_updated",
+    "last_changed",
+)
+
+
+class DeviceUpdatesMessage(BaseModel):
+    """Device updates batched for a client that connected with ``batch_ms``.
+
+    Each update is a row of :data:`DEVICE_UPDATE_FIELDS`, in that order, and
+    only the newest of each device attribute since the previous batch is
+    sent.
+    """
+
+    type: Literal["device_updates"] = "device_updates"
+    updates: list[
+        tuple[str, str, AttributeValueType | None, datetime | None, datetime | None]
+    ]
+
+
 class DeviceFullUpdateMessage(WebSocketMessage):
     type: Literal["device_full_update"] = "device_full_update"
     device: Device
@@ -48,11 +109,31 @@ class ErrorMessage(WebSocketMessage):
     message: str
 
 
+class WebSocketConnectionStats(BaseModel):
+    connection_id: str
+    queued: int
+    max_queued: int
+    """Deepest the send queue has been since the client connected."""
+    sent: int
+    dropped: int
+
+
+class WebSocketStatsResponse(BaseModel):
+    """Send queues of the connected WebSocket clients."""
+
+    connections: list[WebSocketConnectionStats]
+    overflow_disconnects: int
+    """Clients disconnected since startup for falling behind."""
+
+
 WebSocketEvent = (
     DeviceUpdateMessage
+    | DeviceUpdatesMessage
     | DeviceFullUpdateMessage
     | DeviceListUpdateMessage
     | PingMessage
     | PongMessage
+    | SubscribedMessage
+    | UnsubscribedMessage
     | ErrorMessage
 )
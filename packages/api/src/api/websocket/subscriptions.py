@@ -0,0 +1,114 @@
+"""Which device updates each WebSocket client asked for.
+
+A client that never subscribes receives every update. Once it subscribes it
+only receives the updates matching one of its subscriptions, each naming a
+set of devices and of attributes (``None`` for any). The index maps every
+``(device_id, attribute)`` pair, with ``None`` standing for any, to the
+clients interested in it, so routing an update costs four lookups however
+many devices and clients there are.
+"""
+
+from collections.abc import Collection, Iterator
+from dataclasses import dataclass
+
+# (device_id, attribute); None matches any device or attribute.
+type _Key = tuple[str | None, str | None]
+
+
+@dataclass(frozen=True)
+class Subscription:
+    device_ids: frozenset[str] | None = None
+    attributes: frozenset[str] | None = None
+
+    @classmethod
+    def of(
+        cls,
+        device_ids: Collection[str] | None = None,
+        attributes: Collection[str] | None = None,
+    ) -> "Subscription":
+        return cls(
+            device_ids=frozenset(device_ids) if device_ids is not None else None,
+            attributes=frozenset(attributes) if attributes is not None else None,
+        )
+
+    def index_keys(self) -> Iterator[_Key]:
+        devices = self.device_ids if self.device_ids is not None else (None,)
+        attributes = self.attributes if self.attributes is not None else (None,)
+        for device_id in devices:
+            for attribute in attributes:
+                yield device_id, attribute
+
+
+class SubscriptionIndex:
+    """Subscriptions of every connection, indexed by device and attribute."""
+
+    def __init__(self) -> None:
+        # Connection id -> subscription id -> subscription. A connection that
+        # unsubscribed from everything keeps its (empty) entry: it stays
+        # filtered rather than falling back to every update.
+        self._subscriptions: dict[str, dict[str, Subscription]] = {}
+        self._index: dict[_Key, set[str]] = {}
+
+    def is_filtered(self, connection_id: str) -> bool:
+        return connection_id in self._subscriptions
+
+    def subscribe(
+        self, connection_id: str, subscription_id: str, subscription: Subscription
+    ) -> None:
+        """Add a subscription, replacing any with the same id."""
+        self.unsubscribe(connection_id, subscription_id)
+        self._subscriptions[connection_id][subscription_id] = subscription
+        for key in subscription.index_keys():
+            self._index.setdefault(key, set()).add(connection_id)
+
+    def unsubscribe(self, connection_id: str, subscription_id: str | None) -> None:
+        """Drop one subscription, or all of them when *subscription_id* is None."""
+        subscriptions = self._subscriptions.setdefault(connection_id, {})
+        if subscription_id is None:
+            dropped = list(subscriptions.values())
+            subscriptions.clear()
+        else:
+            old = subscriptions.pop(subscription_id, None)
+            dropped = [old] if old is not None else []
+        if dropped:
+            kept = {key for s in subscriptions.values() for key in s.index_keys()}
+            self._unindex(
+                connection_id, {key for s in dropped for key in s.index_keys()} - kept
+            )
+
+    def remove(self, connection_id: str) -> None:
+        """Forget a closed connection."""
+        subscriptions = self._subscriptions.pop(connection_id, {})
+        self._unindex(
+            connection_id,
+            {key for s in subscriptions.values() for key in s.index_keys()},
+        )
+
+    def interested(self, device_id: str, attribute: str) -> set[str]:
+        """Filtered connections subscribed to *attribute* of *device_id*."""
+        index = self._index
+        if not index:
+            return set()
+        return set().union(
+            *(
+                index.get(key, ())
+                for key in (
+                    (device_id, attribute),
+                    (device_id, None),
+                    (None, attribute),
+                    (None, None),
+                )
+            )
+        )
+
+    def _unindex(self, connection_id: str, keys: set[_Key]) -> None:
+        for key in keys:
+            connections = self._index.get(key)
+            if connections is None:
+                continue
+            connections.discard(connection_id)
+            if not connections:
+                del self._index[key]
+
+
+__all__ = ["Subscription", "SubscriptionIndex"]
@@ -5,7 +5,7 @@ from fastapi.testclient import TestClient
 from api.dependencies import get_users_service
 from api.exception_handlers import register_exception_handlers
 from api.routes.users.auth_router import router
-from models.errors import BlockedUserError
+from models.errors import BlockedUserError, TooManyRequestsError
 from users import Role, User
 from users.auth import AuthService
 from users.validation import (
@@ -19,6 +19,8 @@ from users.validation import (
 class MockUsersService:
     def __init__(self) -> None:
         self._credentials = {"admin": "admin", "blocked": "blocked"}
+        self.clients: list[str | None] = []
+        self.busy_clients: set[str] = set()
         self._users = {
             "admin": User(
                 id="admin-id",
@@ -33,7 +35,13 @@ class MockUsersService:
             ),
         }
 
-    async def authenticate(self, username: str, password: str) -> User | None:
+    async def authenticate(
+        self, username: str, password: str, *, client: str | None = None
+    ) -> User | None:
+        self.clients.append(client)
+        if client in self.busy_clients:
+            msg = "Too many concurrent login attempts"
+            raise TooManyRequestsError(msg)
         if self._credentials.get(username) != password:
             return None
         user = self._users[username]
@@ -63,6 +71,7 @@ def app() -> FastAPI:
     app.state.auth_service = AuthService(secret_key="test-secret")
     app.state.cookie_secure = False
     manager = MockUsersService()
+    app.state.users_manager = manager
     app.dependency_overrides[get_users_service] = lambda: manager
     register_exception_handlers(app)
     return app
@@ -206,6 +215,23 @@ def test_token_blocked_user_password_grant_returns_403(client: TestClient) -> No
     assert "blocked" in response.json()["detail"].lower()
 
 
+def test_token_password_grant_passes_the_client_address(
+    app: FastAPI, client: TestClient
+) -> None:
+    _login(client)
+    assert app.state.users_manager.clients == ["testclient"]
+
+
+def test_token_busy_client_returns_429(app: FastAPI, client: TestClient) -> None:
+    app.state.users_manager.busy_clients.add("testclient")
+    response = client.post(
+        "/token",
+        data={"grant_type": "password", "username": "admin", "password": "admin"},
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
 def test_token_blocked_user_refresh_grant_returns_403(app: FastAPI) -> None:
     auth_service: AuthService = app.state.auth_service
     refresh_token = auth_service.create_refresh_token("blocked-id", "operator")
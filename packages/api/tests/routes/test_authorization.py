@@ -39,6 +39,8 @@ from api.routes.transports_router import ingress_router as transports_ingress_ro
 from api.routes.transports_router import router as transports_router
 from api.routes.users.auth_router import router as auth_router
 from api.routes.users.users_router import router as users_router
+from api.routes.websocket import router as websocket_router
+from api.websocket import WebSocketStats
 from apps import (
     App,
     AppsService,
@@ -58,6 +60,7 @@ from notifications import (
     NotificationsServiceInterface,
 )
 from timeseries.domain import FetchPointsResult
+from timeseries.service.ingestion import IngestionStats
 from users import Role, User
 from users.auth import AuthService
 
@@ -89,7 +92,13 @@ class MockUsersService:
             ),
         }
 
-    async def authenticate(self, username: str, password: str) -> User | None:
+    async def authenticate(
+        self,
+        username: str,
+        password: str,
+        *,
+        client: str | None = None,  # noqa: ARG002
+    ) -> User | None:
         if self._credentials.get(username) != password:
             return None
         return self._users.get(username)
@@ -428,7 +437,12 @@ def _build_devices_app() -> FastAPI:
     app = FastAPI()
     app.state.auth_service = AuthService(secret_key="test-secret")
     app.state.cookie_secure = False
-    app.state.websocket_manager = MagicMock(broadcast=AsyncMock())
+    app.state.websocket_manager = MagicMock(
+        broadcast=AsyncMock(),
+        stats=MagicMock(
+            return_value=WebSocketStats(connections=[], overflow_disconnects=0)
+        ),
+    )
     manager = MockUsersService()
     dm = MagicMock()
     dm.list_devices.return_value = []
@@ -445,10 +459,19 @@ def _build_devices_app() -> FastAPI:
     ts_mock.fetch_points.return_value = FetchPointsResult(
         points=[], truncated=False, next_start=None
     )
+    ts_mock.ingestion_stats = MagicMock(
+        return_value=IngestionStats(
+            pending_points=0,
+            spooled_points=0,
+            spool_age_seconds=None,
+            dropped_points=0,
+        )
+    )
     app.dependency_overrides[get_ts_service] = lambda: ts_mock
     app.include_router(auth_router, prefix="/auth")
     jwt_dep = [Depends(get_current_user_id)]
     app.include_router(devices_router, prefix="/devices", dependencies=jwt_dep)
+    app.include_router(websocket_router)
     return app
 
 
@@ -531,6 +554,20 @@ DEVICES_ACCESS_CONTROL_SCENARIOS = [
         401,
         id="export-csv-no-auth",
     ),
+    pytest.param(
+        "GET",
+        "/devices/timeseries/export/parquet",
+        "viewer",
+        422,
+        id="export-parquet-viewer",
+    ),
+    pytest.param(
+        "GET",
+        "/devices/timeseries/export/parquet",
+        None,
+        401,
+        id="export-parquet-no-auth",
+    ),
     # Aggregate: missing required params → 422 past auth, 401 without auth
     pytest.param(
         "GET",
@@ -546,6 +583,22 @@ DEVICES_ACCESS_CONTROL_SCENARIOS = [
         401,
         id="aggregate-no-auth",
     ),
+    pytest.param(
+        "GET",
+        "/devices/timeseries/ingestion",
+        "viewer",
+        200,
+        id="ingestion-stats-viewer",
+    ),
+    pytest.param(
+        "GET",
+        "/devices/timeseries/ingestion",
+        None,
+        401,
+        id="ingestion-stats-no-auth",
+    ),
+    pytest.param("GET", "/ws/stats", "viewer", 200, id="ws-stats-viewer"),
+    pytest.param("GET", "/ws/stats", None, 401, id="ws-stats-no-auth"),
     # Space aggregate: missing required params → 422 past auth, 401 without auth
     pytest.param(
         "GET",
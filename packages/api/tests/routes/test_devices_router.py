@@ -145,6 +145,7 @@ def _make_dm(
         )
     )
     mock.list_standard_schemas.return_value = []
+    mock.devices_revision.return_value = "e-1"
 
     updated = _DEVICE.model_copy(update={"tags": {"asset_id": "a1"}})
     mock.set_device_tag = AsyncMock(return_value=updated)
@@ -388,6 +389,39 @@ class TestListDevices:
         )
 
 
+class TestDeviceListETag:
+    @pytest.mark.parametrize("path", ["/", "/attributes", "/tag-groups?tag_key=floor"])
+    def test_etag_is_devices_revision(self, client: TestClient, path: str):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"e-1"'
+
+    def test_unchanged_list_is_304(self, client: TestClient, dm: MagicMock):
+        response = client.get("/", headers={"If-None-Match": 'W/"e-0", "e-1"'})
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"e-1"'
+        assert response.content == b""
+        dm.list_devices.assert_not_called()
+
+    def test_changed_list_is_sent(self, client: TestClient, dm: MagicMock):
+        dm.devices_revision.return_value = "e-2"
+        response = client.get("/", headers={"If-None-Match": '"e-1"'})
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"e-2"'
+
+    def test_full_list_tracks_values(self, client: TestClient, dm: MagicMock):
+        client.get("/")
+        dm.devices_revision.assert_called_once_with(structural=False)
+
+    def test_attributes_track_structure(self, client: TestClient, dm: MagicMock):
+        client.get("/attributes")
+        dm.devices_revision.assert_called_once_with(structural=True)
+
+    def test_is_faulty_filter_tracks_values(self, client: TestClient, dm: MagicMock):
+        client.get("/attributes", params={"is_faulty": "true"})
+        dm.devices_revision.assert_called_once_with(structural=False)
+
+
 # ---------------------------------------------------------------------------
 # List device attributes (coverage)
 # ---------------------------------------------------------------------------
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import io
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock
 
+import polars as pl
 import pytest
 import pytest_asyncio
 from fastapi import FastAPI
@@ -397,6 +399,46 @@ class TestGetDeviceTimeseriesPointsTruncation:
         assert response.status_code == 422
 
 
+class TestGetDeviceTimeseriesPointsDownsampled:
+    @pytest.mark.parametrize("method", ["lttb", "minmax"])
+    async def test_max_points_caps_points(
+        self, async_client: AsyncClient, ts_service: TimeSeriesService, method: str
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id=DEVICE_ID, metric=ATTR
+        )
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await ts_service.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(minutes=i), value=float(i % 7))
+                for i in range(500)
+            ],
+        )
+        async with async_client as ac:
+            response = await ac.get(
+                f"/{DEVICE_ID}/timeseries/{ATTR}",
+                params={"max_points": 20, "downsample": method},
+            )
+        assert response.status_code == 200
+        body = response.json()
+        assert 0 < len(body["points"]) <= 20
+        assert body["truncated"] is False
+
+    async def test_max_points_with_limit_returns_422(
+        self, async_client: AsyncClient, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id=DEVICE_ID, metric=ATTR
+        )
+        async with async_client as ac:
+            response = await ac.get(
+                f"/{DEVICE_ID}/timeseries/{ATTR}",
+                params={"max_points": 20, "limit": 10},
+            )
+        assert response.status_code == 422
+
+
 # TestExportCsv
 
 
@@ -502,6 +544,39 @@ class TestExportCsv:
         assert "30.0" in lines[2]
 
 
+# TestExportParquet
+
+
+class TestExportParquet:
+    async def test_returns_typed_columns(
+        self, async_client: AsyncClient, ts_service: TimeSeriesService
+    ):
+        series = await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temperature"
+        )
+        t1 = datetime(2024, 1, 1, tzinfo=UTC)
+        await ts_service.upsert_points(
+            series.key, [DataPoint(timestamp=t1, value=20.5)]
+        )
+        async with async_client as ac:
+            response = await ac.get(
+                "/timeseries/export/parquet", params={"series_ids": series.id}
+            )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.parquet"
+        assert "export.parquet" in response.headers["content-disposition"]
+        frame = pl.read_parquet(io.BytesIO(response.content))
+        assert frame.columns == ["timestamp", "d1/temperature"]
+        assert frame["d1/temperature"].to_list() == [20.5]
+
+    async def test_unknown_series_id_returns_404(self, async_client: AsyncClient):
+        async with async_client as ac:
+            response = await ac.get(
+                "/timeseries/export/parquet", params={"series_ids": "nonexistent"}
+            )
+        assert response.status_code == 404
+
+
 # TestExportPng
 
 DUMMY_PNG = b"\x89PNG\r\n\x1a\n"
@@ -624,6 +699,22 @@ class TestOldPathsGone:
         assert response.status_code == 404
 
 
+# TestIngestionStats
+
+
+class TestIngestionStats:
+    async def test_reports_backlog(self, async_client: AsyncClient):
+        async with async_client as ac:
+            response = await ac.get("/timeseries/ingestion")
+        assert response.status_code == 200
+        assert response.json() == {
+            "pending_points": 0,
+            "spooled_points": 0,
+            "spool_age_seconds": None,
+            "dropped_points": 0,
+        }
+
+
 # TestGetDeviceTimeseriesAggregate
 
 AGG_PARAMS = {"interval": "1h", "agg": "avg"}
@@ -854,6 +945,55 @@ class TestGetDeviceTimeseriesAggregate:
         assert [p["value"] for p in body["points"]] == [10.0, 20.0]
         assert all(p["count"] == 1 for p in body["points"])
 
+    async def test_raw_interval_downsampled_with_max_points(
+        self, async_client: AsyncClient, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id=DEVICE_ID, metric=ATTR
+        )
+        await ts_service.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=AGG_START + timedelta(minutes=i), value=float(i))
+                for i in range(300)
+            ],
+        )
+        async with async_client as ac:
+            response = await ac.get(
+                f"/{DEVICE_ID}/timeseries/{ATTR}/aggregate",
+                params={
+                    "interval": "raw",
+                    "agg": "avg",
+                    "max_points": 25,
+                    "downsample": "minmax",
+                    "start": AGG_START.isoformat(),
+                    "end": AGG_END.isoformat(),
+                },
+            )
+        assert response.status_code == 200
+        points = response.json()["points"]
+        assert 0 < len(points) <= 25
+        assert points[0]["value"] == 0.0
+        assert points[-1]["value"] == 299.0
+
+    async def test_max_points_with_bucketed_interval_returns_422(
+        self, async_client: AsyncClient, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id=DEVICE_ID, metric=ATTR
+        )
+        async with async_client as ac:
+            response = await ac.get(
+                f"/{DEVICE_ID}/timeseries/{ATTR}/aggregate",
+                params={
+                    **AGG_PARAMS,
+                    "max_points": 25,
+                    "start": AGG_START.isoformat(),
+                    "end": AGG_END.isoformat(),
+                },
+            )
+        assert response.status_code == 422
+
     async def test_empty_result_when_no_points_in_range(
         self, async_client: AsyncClient, ts_service: TimeSeriesService
     ):
@@ -1536,3 +1676,76 @@ class TestLiveAggregate:
                 "/timeseries/live-aggregate", params=self._params(space_agg="delta")
             )
         assert response.status_code == 422
+
+
+class TestColumnsLayout:
+    async def test_points_as_columns(
+        self, async_client: AsyncClient, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id=DEVICE_ID, metric=ATTR
+        )
+        t0 = datetime(2026, 1, 1, 10, tzinfo=UTC)
+        await ts_service.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=t0, value=1.5),
+                DataPoint(timestamp=t0 + timedelta(seconds=1), value=2.5, command_id=7),
+            ],
+        )
+        async with async_client as ac:
+            response = await ac.get(
+                f"/{DEVICE_ID}/timeseries/{ATTR}", params={"layout": "columns"}
+            )
+        assert response.status_code == 200
+        ms = int(t0.timestamp()) * 1000
+        assert response.json() == {
+            "timestamps": [ms, ms + 1000],
+            "values": [1.5, 2.5],
+            "command_ids": [None, 7],
+            "truncated": False,
+            "next_start": None,
+        }
+
+    async def test_aggregate_as_columns(
+        self, async_client: AsyncClient, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id=DEVICE_ID, metric=ATTR
+        )
+        await ts_service.upsert_points(
+            KEY,
+            [DataPoint(timestamp=datetime(2026, 1, 1, 10, tzinfo=UTC), value=10.0)],
+        )
+        params = {
+            **AGG_PARAMS,
+            "start": AGG_START.isoformat(),
+            "end": AGG_END.isoformat(),
+        }
+        async with async_client as ac:
+            rows = (
+                await ac.get(f"/{DEVICE_ID}/timeseries/{ATTR}/aggregate", params=params)
+            ).json()
+            columns = (
+                await ac.get(
+                    f"/{DEVICE_ID}/timeseries/{ATTR}/aggregate",
+                    params={**params, "layout": "columns"},
+                )
+            ).json()
+        points = rows.pop("points")
+        assert columns == {
+            **rows,
+            "interval_starts": [
+                int(datetime.fromisoformat(p["interval_start"]).timestamp()) * 1000
+                for p in points
+            ],
+            "values": [p["value"] for p in points],
+            "counts": [p["count"] for p in points],
+        }
+
+    async def test_unknown_layout_returns_422(self, async_client: AsyncClient):
+        async with async_client as ac:
+            response = await ac.get(
+                f"/{DEVICE_ID}/timeseries/{ATTR}", params={"layout": "csv"}
+            )
+        assert response.status_code == 422
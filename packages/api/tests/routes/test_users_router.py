@@ -22,7 +22,12 @@ BOB = User(id="bob-id", username="bob", role=Role.OPERATOR, name="Bob User")
 def users_manager() -> AsyncMock:
     um = AsyncMock()
 
-    async def _authenticate(username: str, password: str) -> User | None:
+    async def _authenticate(
+        username: str,
+        password: str,
+        *,
+        client: str | None = None,  # noqa: ARG001
+    ) -> User | None:
         creds = {"admin": "admin", "bob": "bob"}
         users = {"admin": ADMIN, "bob": BOB}
         if creds.get(username) != password:
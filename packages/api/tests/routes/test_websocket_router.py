@@ -1,13 +1,15 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
 
-from api.routes.websocket import websocket_endpoint
+from api.routes.websocket import router, websocket_endpoint
 from api.websocket.manager import WebSocketManager
-
-pytestmark = pytest.mark.asyncio
+from api.websocket.schemas import DeviceUpdateMessage
 
 
+@pytest.mark.asyncio
 async def test_unexpected_exception_triggers_disconnect():
     """Outer except Exception handler fires on non-WebSocketDisconnect errors."""
     ws = AsyncMock()
@@ -15,6 +17,115 @@ async def test_unexpected_exception_triggers_disconnect():
     manager.connect.return_value = "conn-id"
     ws.receive_text.side_effect = RuntimeError("unexpected transport error")
 
-    await websocket_endpoint(websocket=ws, manager=manager)
+    await websocket_endpoint(
+        websocket=ws, manager=manager, dm=MagicMock(), batch_ms=None
+    )
 
     manager.disconnect.assert_awaited_once_with("conn-id")
+
+
+def _app(dm: MagicMock) -> FastAPI:
+    app = FastAPI()
+    app.state.websocket_manager = WebSocketManager()
+    app.state.device_manager = dm
+    app.include_router(router)
+    return app
+
+
+def _device(device_id: str) -> MagicMock:
+    device = MagicMock()
+    device.id = device_id
+    return device
+
+
+def _update(device_id: str) -> DeviceUpdateMessage:
+    return DeviceUpdateMessage(device_id=device_id, attribute="temp", value=1)
+
+
+class TestSubscribe:
+    def test_filters_resolved_to_devices(self):
+        dm = MagicMock()
+        dm.list_devices.return_value = [_device("d1")]
+        app = _app(dm)
+
+        with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "subscribe", "id": "floor", "asset_id": "a1"})
+            reply = ws.receive_json()
+            assert (reply["type"], reply["id"], reply["device_count"]) == (
+                "subscribed",
+                "floor",
+                1,
+            )
+            manager = app.state.websocket_manager
+            portal = client.portal
+            assert portal is not None
+            portal.call(manager.broadcast, _update("d2"))
+            portal.call(manager.broadcast, _update("d1"))
+
+            assert ws.receive_json()["device_id"] == "d1"
+
+        dm.list_devices.assert_called_once_with(
+            ids=None, types=None, tags={"asset_id": ["a1"]}
+        )
+
+    def test_ids_only_taken_as_they_are(self):
+        dm = MagicMock()
+        with TestClient(_app(dm)) as client, client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "subscribe", "ids": ["d9"]})
+
+            assert ws.receive_json()["device_count"] == 1
+        dm.list_devices.assert_not_called()
+
+    def test_invalid_subscription_reported(self):
+        with (
+            TestClient(_app(MagicMock())) as client,
+            client.websocket_connect("/ws") as ws,
+        ):
+            ws.send_json({"type": "subscribe", "ids": "d1"})
+
+            reply = ws.receive_json()
+            assert reply["type"] == "error"
+            assert reply["message"].startswith("ids:")
+
+    def test_unsubscribe(self):
+        with (
+            TestClient(_app(MagicMock())) as client,
+            client.websocket_connect("/ws") as ws,
+        ):
+            ws.send_json({"type": "unsubscribe", "id": "floor"})
+
+            reply = ws.receive_json()
+            assert (reply["type"], reply["id"]) == ("unsubscribed", "floor")
+
+    def test_ping(self):
+        with (
+            TestClient(_app(MagicMock())) as client,
+            client.websocket_connect("/ws") as ws,
+        ):
+            ws.send_json({"type": "ping"})
+
+            assert ws.receive_json()["type"] == "pong"
+
+
+class TestBatches:
+    def test_updates_batched(self):
+        app = _app(MagicMock())
+        with (
+            TestClient(app) as client,
+            client.websocket_connect("/ws/devices?batch_ms=20") as ws,
+        ):
+            ws.send_json({"type": "ping"})
+            assert ws.receive_json()["type"] == "pong"
+            portal = client.portal
+            assert portal is not None
+            portal.call(app.state.websocket_manager.broadcast, _update("d1"))
+
+            assert ws.receive_json()["updates"] == [["d1", "temp", 1, None, None]]
+
+    def test_interval_bounded(self):
+        with (
+            TestClient(_app(MagicMock())) as client,
+            pytest.raises(WebSocketDisconnect),
+            client.websocket_connect("/ws/devices?batch_ms=1"),
+        ):
+            pass
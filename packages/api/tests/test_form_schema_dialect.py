@@ -6,7 +6,7 @@ from unittest.mock import MagicMock
 import pytest
 from pydantic import BaseModel
 
-from api.app import _build_automations_service
+from api.engine import build_automations_service
 from assets import AssetCreate, BuildingProfile
 from devices_manager.dto import TRANSPORT_CONFIG_CLASS_BY_PROTOCOL
 from devices_manager.types import TransportProtocols
@@ -353,7 +353,7 @@ def _assert_form_schema_dialect(name: str, schema: JsonSchema) -> None:
 
 
 def _first_party_form_schemas() -> dict[str, JsonSchema]:
-    automations_service = _build_automations_service(
+    automations_service = build_automations_service(
         None,
         MagicMock(),
         MagicMock(),
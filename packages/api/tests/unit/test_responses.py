@@ -0,0 +1,31 @@
+import math
+from datetime import UTC, datetime
+
+from pydantic import BaseModel, TypeAdapter
+
+from api.responses import TrustedJSONResponse
+
+
+class _Point(BaseModel):
+    timestamp: datetime
+    value: bool | int | float | str | None
+
+
+POINTS = [
+    _Point.model_construct(timestamp=datetime(2026, 1, 1, tzinfo=UTC), value=v)
+    for v in (True, 1, 1.5, "on", None, math.nan)
+]
+
+
+class TestTrustedJSONResponse:
+    def test_same_bytes_as_validated_response(self):
+        expected = TypeAdapter(list[_Point]).dump_json(POINTS)
+        assert TrustedJSONResponse(POINTS).body == expected
+
+    def test_non_finite_floats_become_null(self):
+        assert TrustedJSONResponse([math.inf]).body == b"[null]"
+
+    def test_json_media_type(self):
+        response = TrustedJSONResponse({}, headers={"ETag": '"1"'})
+        assert response.media_type == "application/json"
+        assert response.headers["etag"] == '"1"'
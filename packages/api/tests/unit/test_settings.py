@@ -2,6 +2,9 @@ import pytest
 from pydantic import ValidationError
 
 from api.settings import Settings, load_settings
+from api.websocket import OverflowPolicy
+from api.websocket.connection import DEFAULT_SEND_QUEUE_SIZE
+from users.password import HASH_WORKERS, MAX_VERIFICATIONS_PER_KEY
 
 
 class TestExtraEnvIgnored:
@@ -25,6 +28,109 @@ class TestTimezoneValidation:
         assert "not a valid IANA timezone name" in str(exc_info.value)
 
 
+class TestTimeseriesRetention:
+    def test_unset_by_default(self):
+        settings = Settings()
+        assert settings.TIMESERIES_RETENTION is None
+        assert settings.TIMESERIES_COMPRESS_AFTER is None
+
+    def test_valid_policy_accepted(self):
+        spec = '[{"metric": "power_*", "raw": "30d", "rollups": "24mo"}]'
+        settings = load_settings({"TIMESERIES_RETENTION": spec})
+        assert spec == settings.TIMESERIES_RETENTION
+
+    def test_invalid_policy_raises(self):
+        with pytest.raises(ValidationError, match="TIMESERIES_RETENTION"):
+            Settings(TIMESERIES_RETENTION='[{"raw": "soon"}]')
+
+    def test_invalid_compress_after_raises(self):
+        with pytest.raises(ValidationError, match="TIMESERIES_COMPRESS_AFTER"):
+            Settings(TIMESERIES_COMPRESS_AFTER="7x")
+
+
+class TestTimeseriesCompression:
+    def test_unset_by_default(self):
+        assert Settings().TIMESERIES_COMPRESSION is None
+
+    def test_valid_policy_accepted(self):
+        spec = '[{"metric": "temp*", "method": "deadband", "deviation": 0.1}]'
+        settings = load_settings({"TIMESERIES_COMPRESSION": spec})
+        assert spec == settings.TIMESERIES_COMPRESSION
+
+    def test_invalid_policy_raises(self):
+        with pytest.raises(ValidationError, match="TIMESERIES_COMPRESSION"):
+            Settings(TIMESERIES_COMPRESSION='[{"method": "deadband"}]')
+
+
+class TestWebSocketSendQueue:
+    def test_defaults(self):
+        settings = Settings()
+        assert settings.WS_SEND_QUEUE_SIZE == DEFAULT_SEND_QUEUE_SIZE
+        assert settings.WS_OVERFLOW_POLICY == OverflowPolicy.COALESCE
+
+    def test_policy_read_from_env(self):
+        settings = load_settings({"WS_OVERFLOW_POLICY": "disconnect"})
+        assert settings.WS_OVERFLOW_POLICY == OverflowPolicy.DISCONNECT
+
+    @pytest.mark.parametrize(
+        "env", [{"WS_OVERFLOW_POLICY": "block"}, {"WS_SEND_QUEUE_SIZE": "0"}]
+    )
+    def test_invalid_values_raise(self, env: dict[str, str]):
+        with pytest.raises(ValidationError):
+            load_settings(env)
+
+
+class TestDevicesEngineSocket:
+    def test_devices_run_in_process_by_default(self):
+        assert Settings().DEVICES_ENGINE_SOCKET is None
+
+    def test_read_from_env(self):
+        settings = load_settings({"DEVICES_ENGINE_SOCKET": "/run/gridone/engine.sock"})
+        assert settings.DEVICES_ENGINE_SOCKET == "/run/gridone/engine.sock"
+
+
+class TestDevicesEngineShards:
+    def test_unsharded_by_default(self):
+        settings = Settings()
+        assert settings.engine_shards == []
+        assert settings.DEVICES_ENGINE_SHARD is False
+
+    def test_shards_read_from_env(self):
+        shards = "/run/gridone/shard-0.sock, /run/gridone/shard-1.sock"
+        settings = load_settings({"DEVICES_ENGINE_SHARDS": shards})
+        assert settings.engine_shards == [
+            "/run/gridone/shard-0.sock",
+            "/run/gridone/shard-1.sock",
+        ]
+
+    def test_empty_shard_list_raises(self):
+        with pytest.raises(ValidationError, match="at least one shard"):
+            load_settings({"DEVICES_ENGINE_SHARDS": " , "})
+
+    def test_shard_cannot_coordinate(self):
+        with pytest.raises(ValidationError, match="not both"):
+            load_settings(
+                {
+                    "DEVICES_ENGINE_SHARDS": "/run/gridone/shard-0.sock",
+                    "DEVICES_ENGINE_SHARD": "true",
+                }
+            )
+
+
+class TestPasswordHashing:
+    def test_defaults(self):
+        settings = Settings()
+        assert settings.PASSWORD_HASH_WORKERS == HASH_WORKERS
+        assert settings.LOGIN_CONCURRENCY_LIMIT == MAX_VERIFICATIONS_PER_KEY
+
+    @pytest.mark.parametrize(
+        "env", [{"PASSWORD_HASH_WORKERS": "0"}, {"LOGIN_CONCURRENCY_LIMIT": "0"}]
+    )
+    def test_invalid_values_raise(self, env: dict[str, str]):
+        with pytest.raises(ValidationError):
+            load_settings(env)
+
+
 class TestCookieSecure:
     def test_secure_by_default(self):
         assert Settings().COOKIE_SECURE is True
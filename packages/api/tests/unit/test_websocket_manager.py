@@ -1,12 +1,41 @@
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
 
+from api.websocket import OverflowPolicy
 from api.websocket.manager import WebSocketManager
+from api.websocket.schemas import DeviceUpdateMessage, DeviceUpdatesMessage
 
 pytestmark = pytest.mark.asyncio
 
 
+async def _settle() -> None:
+    """Let the writer tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _stalled() -> tuple[AsyncMock, asyncio.Event]:
+    """A client whose sends hang until the returned event is set."""
+    released = asyncio.Event()
+    ws = AsyncMock()
+
+    async def send_text(_payload: str) -> None:
+        await released.wait()
+
+    ws.send_text.side_effect = send_text
+    return ws, released
+
+
+def _update(attribute: str, value: float) -> DeviceUpdateMessage:
+    return DeviceUpdateMessage(device_id="d1", attribute=attribute, value=value)
+
+
+def _sent(ws: AsyncMock) -> list[str]:
+    return [call.args[0] for call in ws.send_text.await_args_list]
+
+
 class TestConnect:
     async def test_accept_called_and_connection_registered(self):
         manager = WebSocketManager()
@@ -45,6 +74,17 @@ class TestDisconnect:
 
         await manager.disconnect("does-not-exist")
 
+    async def test_disconnect_while_send_pending(self):
+        manager = WebSocketManager()
+        ws, _ = _stalled()
+        connection_id = await manager.connect(ws)
+        await manager.broadcast("ping")
+        await _settle()
+
+        await manager.disconnect(connection_id)
+
+        ws.close.assert_awaited_once()
+
 
 class TestBroadcast:
     async def test_sends_to_all_connections(self):
@@ -54,6 +94,7 @@ class TestBroadcast:
         await manager.connect(ws2)
 
         await manager.broadcast({"event": "update"})
+        await _settle()
 
         assert ws1.send_text.await_count == 1
         assert ws2.send_text.await_count == 1
@@ -66,6 +107,305 @@ class TestBroadcast:
         await manager.connect(ws2)
 
         await manager.broadcast("ping")
+        await _settle()
 
         assert id1 not in manager.active_connections
+        ws1.close.assert_awaited_once()
         assert ws2.send_text.await_count == 1
+
+    async def test_slow_client_does_not_hold_back_others(self):
+        manager = WebSocketManager()
+        slow, _ = _stalled()
+        fast = AsyncMock()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        for i in range(3):
+            await manager.broadcast(f"m{i}")
+        await _settle()
+
+        assert _sent(fast) == ["m0", "m1", "m2"]
+        assert _sent(slow) == ["m0"]
+
+    async def test_sends_in_order(self):
+        manager = WebSocketManager()
+        ws, released = _stalled()
+        await manager.connect(ws)
+
+        for i in range(4):
+            await manager.broadcast(f"m{i}")
+        released.set()
+        await _settle()
+
+        assert _sent(ws) == ["m0", "m1", "m2", "m3"]
+
+
+class TestOverflow:
+    async def _behind(
+        self, overflow: OverflowPolicy, messages: list
+    ) -> tuple[WebSocketManager, AsyncMock, asyncio.Event]:
+        """Queue *messages* to a client stuck sending "first", 2 slots free."""
+        manager = WebSocketManager(queue_size=2, overflow=overflow)
+        ws, released = _stalled()
+        await manager.connect(ws)
+        await manager.broadcast("first")
+        await _settle()
+        for message in messages:
+            await manager.broadcast(message)
+        return manager, ws, released
+
+    async def test_drop_oldest(self):
+        manager, ws, released = await self._behind(
+            OverflowPolicy.DROP_OLDEST, ["m1", "m2", "m3"]
+        )
+        released.set()
+        await _settle()
+
+        assert _sent(ws) == ["first", "m2", "m3"]
+        [stats] = manager.stats().connections
+        assert (stats.sent, stats.dropped, stats.max_queued) == (3, 1, 2)
+
+    async def test_coalesce_keeps_newest_value_per_attribute(self):
+        messages = [_update("temp", 1), _update("hum", 50), _update("temp", 2)]
+        manager, ws, released = await self._behind(OverflowPolicy.COALESCE, messages)
+        [stats] = manager.stats().connections
+        assert stats.queued == 2
+
+        released.set()
+        await _settle()
+
+        values = [
+            (m.attribute, m.value)
+            for m in map(DeviceUpdateMessage.model_validate_json, _sent(ws)[1:])
+        ]
+        assert values == [("temp", 2), ("hum", 50)]
+
+    async def test_coalesce_drops_oldest_of_other_messages(self):
+        manager, ws, released = await self._behind(
+            OverflowPolicy.COALESCE, [_update("temp", 1), "m1", "m2"]
+        )
+        released.set()
+        await _settle()
+
+        assert _sent(ws) == ["first", "m1", "m2"]
+        assert manager.stats().connections[0].dropped == 1
+
+    async def test_disconnect(self):
+        manager, ws, _ = await self._behind(
+            OverflowPolicy.DISCONNECT, ["m1", "m2", "m3"]
+        )
+        await _settle()
+
+        assert manager.active_connections == {}
+        ws.close.assert_awaited_once_with(code=1013)
+        assert manager.stats().overflow_disconnects == 1
+
+    async def test_within_queue_size_nothing_dropped(self):
+        manager, ws, released = await self._behind(
+            OverflowPolicy.DISCONNECT, ["m1", "m2"]
+        )
+        released.set()
+        await _settle()
+
+        assert _sent(ws) == ["first", "m1", "m2"]
+        assert manager.stats().connections[0].dropped == 0
+
+
+class TestCloseAll:
+    async def test_closes_every_connection(self):
+        manager = WebSocketManager()
+        sockets = [AsyncMock(), AsyncMock()]
+        for ws in sockets:
+            await manager.connect(ws)
+
+        await manager.close_all()
+
+        assert manager.active_connections == {}
+        for ws in sockets:
+            ws.close.assert_awaited_once()
+
+
+class TestSubscriptions:
+    async def _client(self, manager: WebSocketManager) -> tuple[str, AsyncMock]:
+        ws = AsyncMock()
+        return await manager.connect(ws), ws
+
+    async def _received(
+        self, manager: WebSocketManager, ws: AsyncMock, *updates: DeviceUpdateMessage
+    ) -> list[tuple[str, str]]:
+        ws.send_text.reset_mock()
+        for update in updates:
+            await manager.broadcast(update)
+        await _settle()
+        return [
+            (m.device_id, m.attribute)
+            for m in map(DeviceUpdateMessage.model_validate_json, _sent(ws))
+        ]
+
+    async def test_only_subscribed_updates_sent(self):
+        manager = WebSocketManager()
+        cid, ws = await self._client(manager)
+        manager.subscribe(cid, "s", device_ids=["d1"], attributes=["temp"])
+
+        received = await self._received(
+            manager,
+            ws,
+            _update("temp", 1),
+            _update("hum", 1),
+            DeviceUpdateMessage(device_id="d2", attribute="temp", value=1),
+        )
+
+        assert received == [("d1", "temp")]
+
+    async def test_clients_without_subscriptions_get_everything(self):
+        manager = WebSocketManager()
+        cid, _ = await self._client(manager)
+        manager.subscribe(cid, "s", device_ids=[])
+        _, ws = await self._client(manager)
+
+        received = await self._received(manager, ws, _update("temp", 1))
+
+        assert received == [("d1", "temp")]
+
+    async def test_subscriptions_add_up(self):
+        manager = WebSocketManager()
+        cid, ws = await self._client(manager)
+        manager.subscribe(cid, "devices", device_ids=["d2"])
+        manager.subscribe(cid, "temps", attributes=["temp"])
+
+        received = await self._received(
+            manager,
+            ws,
+            _update("temp", 1),
+            _update("hum", 1),
+            DeviceUpdateMessage(device_id="d2", attribute="hum", value=1),
+        )
+
+        assert received == [("d1", "temp"), ("d2", "hum")]
+
+    async def test_resubscribing_replaces(self):
+        manager = WebSocketManager()
+        cid, ws = await self._client(manager)
+        manager.subscribe(cid, "s", attributes=["temp"])
+        manager.subscribe(cid, "s", attributes=["hum"])
+
+        received = await self._received(
+            manager, ws, _update("temp", 1), _update("hum", 1)
+        )
+
+        assert received == [("d1", "hum")]
+
+    async def test_unsubscribe_keeps_overlapping_subscription(self):
+        manager = WebSocketManager()
+        cid, ws = await self._client(manager)
+        manager.subscribe(cid, "a", device_ids=["d1"], attributes=["temp"])
+        manager.subscribe(cid, "b", device_ids=["d1"], attributes=["temp", "hum"])
+        manager.unsubscribe(cid, "b")
+
+        received = await self._received(
+            manager, ws, _update("temp", 1), _update("hum", 1)
+        )
+
+        assert received == [("d1", "temp")]
+
+    async def test_unsubscribed_from_everything_gets_nothing(self):
+        manager = WebSocketManager()
+        cid, ws = await self._client(manager)
+        manager.subscribe(cid, "a", device_ids=["d1"])
+        manager.subscribe(cid, "b", attributes=["hum"])
+        manager.unsubscribe(cid, None)
+
+        assert await self._received(manager, ws, _update("temp", 1)) == []
+
+    async def test_other_messages_sent_to_all(self):
+        manager = WebSocketManager()
+        cid, ws = await self._client(manager)
+        manager.subscribe(cid, "s", device_ids=[])
+
+        await manager.broadcast({"type": "device_list_update"})
+        await _settle()
+
+        assert ws.send_text.await_count == 1
+
+    async def test_send_reaches_one_client(self):
+        manager = WebSocketManager()
+        cid, ws = await self._client(manager)
+        _, other = await self._client(manager)
+
+        await manager.send(cid, "hello")
+        await _settle()
+
+        assert _sent(ws) == ["hello"]
+        other.send_text.assert_not_awaited()
+
+    async def test_disconnect_forgets_subscriptions(self):
+        manager = WebSocketManager()
+        cid, _ = await self._client(manager)
+        manager.subscribe(cid, "s", device_ids=["d1"])
+
+        await manager.disconnect(cid)
+
+        assert manager._subscriptions.interested("d1", "temp") == set()  # noqa: SLF001
+
+
+class TestBatches:
+    def _batches(self, ws: AsyncMock) -> list[list[tuple]]:
+        return [
+            [(u[1], u[2]) for u in DeviceUpdatesMessage.model_validate_json(f).updates]
+            for f in _sent(ws)
+        ]
+
+    async def test_newest_value_per_attribute_in_one_frame(self):
+        manager = WebSocketManager()
+        ws = AsyncMock()
+        await manager.connect(ws, batch_interval=0.01)
+
+        for update in (_update("temp", 1), _update("hum", 50), _update("temp", 2)):
+            await manager.broadcast(update)
+        await _settle()
+
+        assert self._batches(ws) == [[("temp", 2), ("hum", 50)]]
+        assert manager.stats().connections[0].dropped == 1
+
+    async def test_frames_sent_at_most_every_interval(self):
+        manager = WebSocketManager()
+        ws = AsyncMock()
+        await manager.connect(ws, batch_interval=0.05)
+        await manager.broadcast(_update("temp", 1))
+        await _settle()
+
+        await manager.broadcast(_update("temp", 2))
+        await manager.broadcast(_update("temp", 3))
+        await _settle()
+        assert self._batches(ws) == [[("temp", 1)]]
+
+        await asyncio.sleep(0.1)
+        assert self._batches(ws) == [[("temp", 1)], [("temp", 3)]]
+
+    async def test_compact_rows(self):
+        manager = WebSocketManager()
+        ws = AsyncMock()
+        await manager.connect(ws, batch_interval=0.01)
+
+        await manager.broadcast(_update("temp", 1.5))
+        await _settle()
+
+        [frame] = _sent(ws)
+        assert frame == (
+            '{"type":"device_updates","updates":[["d1","temp",1.5,null,null]]}'
+        )
+
+    async def test_other_messages_not_batched(self):
+        manager = WebSocketManager()
+        batched, plain = AsyncMock(), AsyncMock()
+        cid = await manager.connect(batched, batch_interval=0.01)
+        await manager.connect(plain)
+
+        await manager.send(cid, "pong")
+        await manager.broadcast(_update("temp", 1))
+        await _settle()
+
+        assert _sent(batched)[0] == "pong"
+        assert len(_sent(batched)) == 2
+        [frame] = _sent(plain)
+        assert DeviceUpdateMessage.model_validate_json(frame).value == 1
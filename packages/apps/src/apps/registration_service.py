@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 from datetime import UTC, datetime
@@ -69,7 +70,10 @@ class RegistrationService:
         request = RegistrationRequest(
             id=existing.id if existing else str(uuid.uuid4()),
             username=create_data.username,
-            hashed_password=hash_password(create_data.password),
+            # Off the event loop: a bcrypt round takes a few hundred ms.
+            hashed_password=await asyncio.to_thread(
+                hash_password, create_data.password
+            ),
             status=RegistrationRequestStatus.PENDING,
             created_at=existing.created_at if existing else datetime.now(UTC),
             config=create_data.config,
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
@@ -19,6 +21,10 @@ from models.service import Service
 
 logger = logging.getLogger(__name__)
 
+# Seconds between reloads for a process sharing the automations storage
+# with others (see AutomationsService).
+AUTOMATIONS_SYNC_INTERVAL_SECONDS = 5.0
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -27,6 +33,14 @@ if TYPE_CHECKING:
 
 
 class AutomationsService(Service):
+    """Automations, their triggers and their execution log.
+
+    Several processes may share one storage, but only one of them should run
+    the triggers (*run_triggers*), or each would fire every automation once.
+    Given a *sync_interval* in seconds, a process periodically reloads the
+    automations the others created, changed or deleted.
+    """
+
     _cache: dict[str, Automation]
     _handles: dict[str, tuple[str, str]]  # automation_id → (provider_id, handle_id)
     _storage: AutomationsStorageBackend
@@ -36,8 +50,16 @@ class AutomationsService(Service):
         storage_url: str | None,
         trigger_providers: Sequence[TriggerProvider],
         action_providers: Sequence[ActionProvider],
+        *,
+        run_triggers: bool = True,
+        sync_interval: float | None = None,
     ) -> None:
         self._storage_url = storage_url
+        self._run_triggers = run_triggers
+        self._sync_interval = sync_interval
+        self._sync_task: asyncio.Task[None] | None = None
+        # Serializes the cache updates of CRUD calls and of sync().
+        self._lock = asyncio.Lock()
         self._providers: dict[str, TriggerProvider] = {
             p.id: p for p in trigger_providers
         }
@@ -57,6 +79,38 @@ class AutomationsService(Service):
         await self._storage.start()
         for automation in await self._storage.list():
             await self._register_automation(automation)
+        if self._sync_interval is not None:
+            self._sync_task = asyncio.create_task(self._sync_loop(self._sync_interval))
+
+    async def sync(self) -> None:
+        """Reload the automations from storage, restarting the triggers of
+        those whose trigger or enabled state changed elsewhere."""
+        async with self._lock:
+            stored = {a.id: a for a in await self._storage.list()}
+            for automation_id in self._cache.keys() - stored.keys():
+                await self._stop_trigger(automation_id)
+                del self._cache[automation_id]
+            for automation in stored.values():
+                cached = self._cache.get(automation.id)
+                if cached == automation:
+                    continue
+                if (
+                    cached is None
+                    or cached.trigger != automation.trigger
+                    or cached.enabled != automation.enabled
+                ):
+                    await self._stop_trigger(automation.id)
+                    await self._register_automation(automation)
+                else:
+                    self._cache[automation.id] = automation
+
+    async def _sync_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Automations sync failed")
 
     # CRUD
 
@@ -73,8 +127,9 @@ class AutomationsService(Service):
             updated_at=now,
             created_by=created_by,
         )
-        await self._storage.create(automation)
-        await self._register_automation(automation)
+        async with self._lock:
+            await self._storage.create(automation)
+            await self._register_automation(automation)
         return automation
 
     async def get(self, automation_id: str) -> Automation:
@@ -91,6 +146,10 @@ class AutomationsService(Service):
         return [a for a in automations if a.enabled == enabled]
 
     async def update(self, automation_id: str, params: AutomationUpdate) -> Automation:
+        async with self._lock:
+            return await self._update(automation_id, params)
+
+    async def _update(self, automation_id: str, params: AutomationUpdate) -> Automation:
         existing = await self.get(automation_id)
         trigger_changed = (
             params.trigger is not None and params.trigger != existing.trigger
@@ -111,10 +170,11 @@ class AutomationsService(Service):
         return updated
 
     async def delete(self, automation_id: str) -> None:
-        await self.get(automation_id)
-        await self._stop_trigger(automation_id)
-        await self._storage.delete(automation_id)
-        self._cache.pop(automation_id)
+        async with self._lock:
+            await self.get(automation_id)
+            await self._stop_trigger(automation_id)
+            await self._storage.delete(automation_id)
+            self._cache.pop(automation_id)
 
     # Enable / disable
 
@@ -147,6 +207,11 @@ class AutomationsService(Service):
         return {p.id: p.params_schema for p in self._action_providers.values()}
 
     async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sync_task
+            self._sync_task = None
         for automation_id in list(self._handles):
             await self._stop_trigger(automation_id)
         if hasattr(self, "_storage"):
@@ -161,6 +226,8 @@ class AutomationsService(Service):
             await self._start_trigger(automation)
 
     async def _start_trigger(self, automation: Automation) -> None:
+        if not self._run_triggers:
+            return
         if automation.id in self._handles:
             msg = f"Trigger for automation {automation.id!r} is already registered"
             raise RuntimeError(msg)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -64,6 +65,9 @@ def _make_service(
     storage: AsyncMock | None = None,
     providers: list[MagicMock] | None = None,
     action_providers: list[MagicMock] | None = None,
+    *,
+    run_triggers: bool = True,
+    sync_interval: float | None = None,
 ) -> AutomationsService:
     """Create a service with storage injected directly — no need to call start()."""
     if providers is None:
@@ -77,6 +81,8 @@ def _make_service(
         storage_url="postgresql://test",
         trigger_providers=providers,
         action_providers=action_providers,
+        run_triggers=run_triggers,
+        sync_interval=sync_interval,
     )
     svc._storage = storage or _make_storage()  # noqa: SLF001
     return svc
@@ -565,3 +571,66 @@ class TestStop:
             action_providers=[],
         )
         await svc.stop()  # _storage not set — must not raise
+
+
+class TestSharedStorage:
+    async def test_triggers_not_registered_without_run_triggers(self):
+        provider = _make_provider("schedule")
+        svc = _make_service(providers=[provider], run_triggers=False)
+        created = await svc.create(_create_params(enabled=True), created_by="u1")
+        provider.register.assert_not_called()
+        assert await svc.get(created.id) == created
+
+    async def test_sync_registers_automation_created_elsewhere(self):
+        storage = _make_storage()
+        provider = _make_provider("schedule")
+        svc = _make_service(storage=storage, providers=[provider])
+        auto = Automation(id="a1", name="a1", trigger=_SCHEDULE, action=_ACTION)
+        storage.list.return_value = [auto]
+        await svc.sync()
+        provider.register.assert_called_once()
+        assert await svc.get("a1") == auto
+
+    async def test_sync_restarts_trigger_changed_elsewhere(self):
+        storage = _make_storage()
+        provider = _make_provider("schedule")
+        svc = _make_service(storage=storage, providers=[provider])
+        created = await svc.create(_create_params(enabled=True), created_by="u1")
+        changed = _SCHEDULE.model_copy(update={"params": {"cron": "0 12 * * *"}})
+        storage.list.return_value = [created.model_copy(update={"trigger": changed})]
+        await svc.sync()
+        provider.unregister.assert_called_once()
+        assert provider.register.call_count == 2
+
+    async def test_sync_keeps_trigger_on_other_changes(self):
+        storage = _make_storage()
+        provider = _make_provider("schedule")
+        svc = _make_service(storage=storage, providers=[provider])
+        created = await svc.create(_create_params(enabled=True), created_by="u1")
+        storage.list.return_value = [created.model_copy(update={"name": "renamed"})]
+        await svc.sync()
+        provider.unregister.assert_not_called()
+        assert (await svc.get(created.id)).name == "renamed"
+
+    async def test_sync_drops_automation_deleted_elsewhere(self):
+        storage = _make_storage()
+        provider = _make_provider("schedule")
+        svc = _make_service(storage=storage, providers=[provider])
+        created = await svc.create(_create_params(enabled=True), created_by="u1")
+        storage.list.return_value = []
+        await svc.sync()
+        provider.unregister.assert_called_once()
+        with pytest.raises(NotFoundError):
+            await svc.get(created.id)
+
+    async def test_synced_periodically_until_stopped(self):
+        storage = _make_storage()
+        svc = _make_service(sync_interval=0.001)
+        with patch("automations.service.build_storage", return_value=storage):
+            await svc.start()
+        await asyncio.sleep(0.05)
+        await svc.stop()
+        synced = storage.list.call_count
+        assert synced > 1
+        await asyncio.sleep(0.01)
+        assert storage.list.call_count == synced
@@ -22,6 +22,7 @@ from .connection_status import (
     compute_connection_status,
 )
 from .event_log import EventType, build_entry, log_event, wrap_listen
+from .revision import revisions
 from .watchdog import SilenceWatchdog
 
 if TYPE_CHECKING:
@@ -32,6 +33,7 @@ if TYPE_CHECKING:
         TransportAddress,
         TransportClient,
     )
+    from devices_manager.core.transports.listener_registry import ListenerCallback
     from devices_manager.types import (
         AttributeValueType,
         ConnectionStatus,
@@ -131,6 +133,8 @@ class CoreDevice:
         init=False, default_factory=dict, repr=False
     )
     _watchdog: SilenceWatchdog | None = field(init=False, default=None, repr=False)
+    revision: int = field(init=False, default=0, repr=False)
+    """Advanced on every change to the device (see :mod:`.revision`)."""
 
     def __post_init__(self) -> None:
         if self.driver.transport != self.transport.protocol:
@@ -140,6 +144,11 @@ class CoreDevice:
             )
             raise TypeError(msg)
         self.type = self.driver.type
+        self.mark_changed()
+
+    def mark_changed(self, *, structural: bool = True) -> None:
+        """Record a change; *structural* unless only attribute values changed."""
+        self.revision = revisions.next(structural=structural)
 
     @property
     def syncing(self) -> bool:
@@ -185,16 +194,19 @@ class CoreDevice:
         self.attributes[attribute_driver.name] = _build_attribute(
             attribute_driver, None, restored=existing
         )
+        self.mark_changed()
 
     def delete_attribute(self, attribute_name: str) -> None:
         """Delete a runtime attribute that no longer exists on the driver."""
         self.attributes.pop(attribute_name, None)
+        self.mark_changed()
 
     def rename_attribute(self, old_name: str, new_name: str) -> None:
         """Rename a runtime attribute in place, preserving all of its state."""
         existing = self.attributes.pop(old_name, None)
         if existing is not None:
             self.attributes[new_name] = existing.model_copy(update={"name": new_name})
+            self.mark_changed()
 
     @classmethod
     def from_base(  # noqa: PLR0913
@@ -253,14 +265,16 @@ class CoreDevice:
         finally:
             self._waiters.remove(waiter)
 
-    async def init_listeners(self) -> None:
-        """Upon init, attach attribute updaters to the transport."""
+    def listener_bindings(self) -> list[tuple[str, ListenerCallback]]:
+        """``(topic, callback)`` pairs that attach attribute updaters to a push
+        transport; empty for pull-only transports."""
         if not isinstance(self.transport, PushTransportClient):
-            return
+            return []
         context = {
             **self.driver.env,
             **self.config,
         }
+        bindings: list[tuple[str, ListenerCallback]] = []
         for attribute in self.attributes.values():
             if attribute.kind == AttributeKind.INTERNAL:
                 continue
@@ -271,9 +285,16 @@ class CoreDevice:
             address = self.transport.build_address(
                 render_struct(attribute_driver.read, context), context
             )
-            await self.transport.register_listener(
-                address.topic, self._make_on_message(codec, attribute)
-            )
+            bindings.append((address.topic, self._make_on_message(codec, attribute)))
+        return bindings
+
+    async def init_listeners(self) -> None:
+        """Upon init, attach attribute updaters to the transport."""
+        if not isinstance(self.transport, PushTransportClient):
+            return
+        bindings = self.listener_bindings()
+        if bindings:
+            await self.transport.register_listeners(bindings)
 
     def _make_on_message(
         self, codec: FnCodec, attribute: Attribute
@@ -298,15 +319,24 @@ class CoreDevice:
             on_data=self._on_data_received,
         )
 
-    async def start_sync(self) -> None:
-        """Start listeners, polling, and silence watchdog for this device."""
-        await self.init_listeners()
+    async def start_sync(
+        self, *, register_listeners: bool = True, poll_delay: float = 0.0
+    ) -> None:
+        """Start listeners, polling, and silence watchdog for this device.
+
+        ``register_listeners=False`` skips :meth:`init_listeners` for callers
+        that already registered :meth:`listener_bindings` in bulk.
+        ``poll_delay`` postpones the first sweep of each polling group, so a
+        fleet started together does not hit its gateways all at once.
+        """
+        if register_listeners:
+            await self.init_listeners()
         if self.polling_enabled:
             for group_name, (interval, names) in self._polling_groups().items():
                 task = self._poll_tasks.get(group_name)
                 if task is None or task.done():
                     self._poll_tasks[group_name] = asyncio.create_task(
-                        self._poll_loop(interval, names)
+                        self._poll_loop(interval, names, poll_delay)
                     )
         interval = self.expected_interval
         if interval is not None:
@@ -359,8 +389,12 @@ class CoreDevice:
                 result[group_name] = (default_interval, names)
         return result
 
-    async def _poll_loop(self, interval: float, attribute_names: list[str]) -> None:
+    async def _poll_loop(
+        self, interval: float, attribute_names: list[str], initial_delay: float = 0.0
+    ) -> None:
         try:
+            if initial_delay > 0:
+                await asyncio.sleep(initial_delay)
             while True:
                 await self._read_group(attribute_names)
                 await asyncio.sleep(interval)
@@ -508,6 +542,7 @@ class CoreDevice:
         previous_value = attribute.current_value
         previous = attribute.model_copy() if previous_value is not None else None
         attribute.update_value(new_value)  # ty:ignore[invalid-argument-type]
+        self.mark_changed(structural=False)
         if new_value is not None:
             for wname, pred, event in self._waiters:
                 if wname == attribute.name and pred(new_value):
@@ -0,0 +1,35 @@
+"""Revisions of device state, for caching what is derived from it.
+
+Every change to a device takes the next revision of a process-wide counter.
+A device's :attr:`~CoreDevice.revision` tells whether a DTO built from it
+is still current, and :attr:`Revisions.latest` whether anything derived
+from any set of devices may have changed since it was derived. Changes
+other than attribute value updates (names, tags, config, the attribute
+set, devices added or removed) also advance :attr:`Revisions.structure`,
+which stays put while devices are merely polled.
+"""
+
+from __future__ import annotations
+
+from secrets import token_hex
+
+# Revisions restart with the process: this tells a revision from one with
+# the same number before a restart.
+EPOCH = token_hex(4)
+
+
+class Revisions:
+    def __init__(self) -> None:
+        self.latest = 0
+        self.structure = 0
+
+    def next(self, *, structural: bool = True) -> int:
+        self.latest += 1
+        if structural:
+            self.structure = self.latest
+        return self.latest
+
+
+revisions = Revisions()
+
+__all__ = ["EPOCH", "Revisions", "revisions"]
@@ -0,0 +1,129 @@
+"""Inverted indexes over the registered devices, for :class:`DeviceFilters`.
+
+Each device is filed under one key per indexed property: its type, driver,
+transport, every tag ``key=value``, every attribute and every writable
+attribute; its name goes to a :class:`FuzzyIndex` for ``search``. Resolving
+a filter then intersects the sets of the filtered keys, smallest first, so
+it costs about the size of the result rather than of the fleet. Only
+``is_faulty``, which changes with attribute values, is left to
+:meth:`DeviceFilters.matches`, run on the candidates only.
+
+The owner calls :meth:`DeviceIndex.add` again whenever it changes one of
+the indexed properties of a device.
+"""
+
+from __future__ import annotations
+
+from itertools import count
+from typing import TYPE_CHECKING
+
+from .fuzzy_search import FuzzyIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .device import CoreDevice
+    from .device_filters import DeviceFilters
+
+# ("type" | "driver" | "transport" | "attribute" | "writable", value) or
+# ("tag", key, value).
+type _Key = tuple[str | None, ...]
+
+
+def _index_keys(device: CoreDevice) -> frozenset[_Key]:
+    return frozenset(
+        (
+            ("type", device.type),
+            ("driver", device.driver_id),
+            ("transport", device.transport_id),
+            *(("tag", key, value) for key, value in device.tags.items()),
+            *(("attribute", name) for name in device.attributes),
+            *(
+                ("writable", name)
+                for name, attribute in device.attributes.items()
+                if "write" in attribute.read_write_modes
+            ),
+        )
+    )
+
+
+class DeviceIndex:
+    """Device ids by type, driver, transport, tag, attribute, writable
+    attribute and name, in registration order."""
+
+    def __init__(self) -> None:
+        self._index: dict[_Key, set[str]] = {}
+        # Device id -> keys it is filed under.
+        self._keys: dict[str, frozenset[_Key]] = {}
+        # Device id -> registration rank, to list candidates in that order.
+        self._rank: dict[str, int] = {}
+        self._seq = count()
+        self._names = FuzzyIndex()
+
+    def add(self, device: CoreDevice) -> None:
+        """File *device*, or refile it after one of its properties changed."""
+        self._names.add(device.id, device.name)
+        keys = _index_keys(device)
+        old = self._keys.get(device.id, frozenset())
+        if keys == old:
+            return
+        self._unfile(device.id, old - keys)
+        for key in keys - old:
+            self._index.setdefault(key, set()).add(device.id)
+        self._keys[device.id] = keys
+        self._rank.setdefault(device.id, next(self._seq))
+
+    def remove(self, device_id: str) -> None:
+        self._unfile(device_id, self._keys.pop(device_id, frozenset()))
+        self._rank.pop(device_id, None)
+        self._names.remove(device_id)
+
+    def lookup(self, key: _Key) -> set[str]:
+        return self._index.get(key, set())
+
+    def candidates(self, filters: DeviceFilters) -> list[str] | None:
+        """Ids of the devices passing the indexed *filters*, in registration
+        order; ``None`` when none of them is set."""
+        sets = list(self._filter_sets(filters))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            if not result:
+                break
+            result.intersection_update(ids)
+        rank = self._rank
+        return sorted((i for i in result if i in rank), key=rank.__getitem__)
+
+    def _filter_sets(self, filters: DeviceFilters) -> Iterable[set[str]]:
+        if filters.ids is not None:
+            yield set(filters.ids)
+        if filters.types is not None:
+            yield self._any_of(("type", t) for t in filters.types)
+        if filters.driver_id is not None:
+            yield self.lookup(("driver", filters.driver_id))
+        if filters.transport_id is not None:
+            yield self.lookup(("transport", filters.transport_id))
+        if filters.attribute is not None:
+            yield self.lookup(("attribute", filters.attribute))
+        if filters.writable_attribute is not None:
+            yield self.lookup(("writable", filters.writable_attribute))
+        for key, values in (filters.tags or {}).items():
+            yield self._any_of(("tag", key, value) for value in values)
+        if filters.search is not None:
+            ids = self._names.search(filters.search)
+            if ids is not None:
+                yield ids
+
+    def _any_of(self, keys: Iterable[_Key]) -> set[str]:
+        return set().union(*(self._index.get(key, ()) for key in keys))
+
+    def _unfile(self, device_id: str, keys: Iterable[_Key]) -> None:
+        for key in keys:
+            ids = self._index.get(key)
+            if ids is None:
+                continue
+            ids.discard(device_id)
+            if not ids:
+                del self._index[key]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Callable, Collection
+from dataclasses import replace
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
@@ -16,7 +17,9 @@ from .device import (
     CoreDevice,
     DeviceBase,
 )
+from .device.revision import EPOCH, revisions
 from .device_filters import DeviceFilters
+from .device_index import DeviceIndex
 
 if TYPE_CHECKING:
     from devices_manager.core.device.event_log import AttributeLogs
@@ -61,8 +64,12 @@ class DeviceRegistry:
         self._resolve_transport = resolve_transport
         self._on_attribute_update = on_attribute_update
         self._storage = storage if storage is not None else MemoryDeviceStorage()
+        # Device id -> (device, its revision, DTO built from it at that revision).
+        self._dtos: dict[str, tuple[CoreDevice, int, Device]] = {}
+        self._index = DeviceIndex()
         for device in self._devices.values():
             device.on_update = self._on_attribute_update
+            self._index.add(device)
 
     @property
     def all(self) -> dict[str, CoreDevice]:
@@ -83,8 +90,27 @@ class DeviceRegistry:
         return self._get_or_raise(device_id)
 
     def get_dto(self, device_id: str) -> Device:
-        device = self._get_or_raise(device_id)
-        return device_to_public(device)
+        return self._dto(self._get_or_raise(device_id))
+
+    def _dto(self, device: CoreDevice) -> Device:
+        """The DTO of *device*, rebuilt only when the device changed since.
+
+        Shared between callers: treat it as read-only.
+        """
+        cached = self._dtos.get(device.id)
+        if cached is not None and cached[0] is device and cached[1] == device.revision:
+            return cached[2]
+        dto = device_to_public(device)
+        self._dtos[device.id] = (device, device.revision, dto)
+        return dto
+
+    def revision(self, *, structural: bool = False) -> str:
+        """Opaque token that changes whenever :meth:`list_all` may return
+        something else; with *structural*, only when something other than
+        attribute values may differ.
+        """
+        latest = revisions.structure if structural else revisions.latest
+        return f"{EPOCH}-{latest}"
 
     def list_all(  # noqa: PLR0913
         self,
@@ -112,23 +138,58 @@ class DeviceRegistry:
             driver_id=driver_id,
             transport_id=transport_id,
         )
-        return [
-            device_to_public(d) for d in self._devices.values() if filters.matches(d)
-        ]
+        return [self._dto(d) for d in self._select(filters)]
+
+    def find(
+        self, *, driver_id: str | None = None, transport_id: str | None = None
+    ) -> list[CoreDevice]:
+        """Devices using *driver_id* and/or *transport_id*."""
+        return self._select(
+            DeviceFilters(driver_id=driver_id, transport_id=transport_id)
+        )
 
-    @staticmethod
-    def _touch(device: CoreDevice) -> None:
+    def _select(self, filters: DeviceFilters) -> list[CoreDevice]:
+        """Devices matching *filters*: the indexed ones narrow the candidates
+        down before the others are checked device by device."""
+        candidate_ids = self._index.candidates(filters)
+        if candidate_ids is None:
+            candidates = list(self._devices.values())
+        else:
+            candidates = [self._devices[i] for i in candidate_ids]
+        # The index resolves search exactly; skip matching names again.
+        filters = replace(filters, search=None)
+        return [d for d in candidates if filters.matches(d)]
+
+    def _touch(self, device: CoreDevice) -> None:
         device.updated_at = datetime.now(UTC)
+        device.mark_changed()
+        self._index.add(device)
 
     async def _persist(self, device: CoreDevice) -> None:
         await self._storage.write(device.id, device_to_public(device))
 
-    async def register(self, device: CoreDevice) -> None:
-        """Register device in memory and persist."""
+    def attach(self, device: CoreDevice) -> None:
+        """Register a stored device in memory only, without persisting it."""
         if device.id in self._devices:
             msg = f"Device with id {device.id} already exists"
             raise ValueError(msg)
         self._devices[device.id] = device
+        device.on_update = self._on_attribute_update
+        device.mark_changed()
+        self._index.add(device)
+
+    def detach(self, device_id: str) -> CoreDevice:
+        """Remove a device from memory only, leaving it in storage."""
+        device = self._get_or_raise(device_id)
+        del self._devices[device_id]
+        self._dtos.pop(device_id, None)
+        self._index.remove(device_id)
+        revisions.next()
+        return device
+
+    async def register(self, device: CoreDevice) -> None:
+        """Register device in memory and persist."""
+        self.attach(device)
         await self._persist(device)
         logger.info("Successfully registered device '%s'", device.id)
 
@@ -284,13 +345,13 @@ class DeviceRegistry:
             self._touch(device)
 
         self._devices[device_id] = device
+        self._index.add(device)
         await self._persist(device)
         return device
 
     async def remove(self, device_id: str) -> None:
         """Remove a device from memory and storage."""
-        self._get_or_raise(device_id)
-        del self._devices[device_id]
+        self.detach(device_id)
         await self._storage.delete(device_id)
 
     async def set_tag(self, device_id: str, key: str, value: str) -> CoreDevice:
@@ -327,28 +388,25 @@ class DeviceRegistry:
         transport_id: str | None = None,
     ) -> None:
         """Stop then start all devices matching the given filters."""
-        filters = DeviceFilters(driver_id=driver_id, transport_id=transport_id)
-        for device in list(self._devices.values()):
-            if filters.matches(device):
-                await device.stop_sync()
-                await device.start_sync()
-
-    def _devices_for_driver(self, driver_id: str) -> list[CoreDevice]:
-        return [d for d in self._devices.values() if d.driver_id == driver_id]
+        for device in self.find(driver_id=driver_id, transport_id=transport_id):
+            await device.stop_sync()
+            await device.start_sync()
 
     def rebuild_attribute_in_devices(
         self, attribute_driver: AttributeDriver, *, driver_id: str
     ) -> None:
         """Rebuild the runtime attribute for all devices using driver_id."""
-        for device in self._devices_for_driver(driver_id):
+        for device in self.find(driver_id=driver_id):
             device.rebuild_attribute(attribute_driver)
+            self._index.add(device)
 
     def delete_attribute_in_devices(
         self, attribute_name: str, *, driver_id: str
     ) -> None:
         """Delete the runtime attribute for all devices using driver_id."""
-        for device in self._devices_for_driver(driver_id):
+        for device in self.find(driver_id=driver_id):
             device.delete_attribute(attribute_name)
+            self._index.add(device)
 
     def rename_attribute_in_devices(
         self,
@@ -358,14 +416,16 @@ class DeviceRegistry:
         driver_id: str,
     ) -> None:
         """Rename the runtime attribute for all devices using driver_id."""
-        for device in self._devices_for_driver(driver_id):
+        for device in self.find(driver_id=driver_id):
             device.rename_attribute(old_name, new_name)
+            self._index.add(device)
 
     def update_type_in_devices(self, new_type: str | None, *, driver_id: str) -> None:
         """Update the runtime type for all devices using driver_id."""
-        for device in list(self._devices.values()):
-            if device.driver_id == driver_id:
-                device.type = new_type
+        for device in self.find(driver_id=driver_id):
+            device.type = new_type
+            device.mark_changed()
+            self._index.add(device)
 
     def get_attribute_logs(self, device_id: str, attribute_name: str) -> AttributeLogs:
         device = self._get_or_raise(device_id)
@@ -280,6 +280,16 @@ class DriverRegistry:
         await self._persist(driver)
         return renamed
 
+    def attach(self, driver: Driver) -> None:
+        """Register a stored driver in memory only, replacing any previous
+        version of it."""
+        self._drivers[driver.id] = driver
+
+    def detach(self, driver_id: str) -> Driver:
+        """Remove a driver from memory only, leaving it in storage."""
+        self._get_or_raise(driver_id)
+        return self._drivers.pop(driver_id)
+
     async def remove(self, driver_id: str) -> None:
         self._get_or_raise(driver_id)
         del self._drivers[driver_id]
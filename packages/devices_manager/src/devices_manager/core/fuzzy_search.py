@@ -17,6 +17,11 @@ def _tokenize(text: str) -> list[str]:
     return _TOKEN_RE.findall(text.lower())
 
 
+def _ratio(matches: int, length: int) -> float:
+    # As SequenceMatcher computes it.
+    return 2.0 * matches / length if length else 1.0
+
+
 def _string_token_matches(token: str, words: list[str]) -> bool:
     return any(
         token in word or SequenceMatcher(None, token, word).ratio() >= _FUZZY_THRESHOLD
@@ -44,3 +49,132 @@ def fuzzy_match(query: str, name: str) -> bool:
         elif not _string_token_matches(token, name_words):
             return False
     return True
+
+
+def _trigrams(word: str) -> set[str]:
+    return {word[i : i + 3] for i in range(len(word) - 2)}
+
+
+class FuzzyIndex:
+    """Search names the way :func:`fuzzy_match` does, without scanning them.
+
+    Names are tokenized once, and each distinct token (the vocabulary) maps
+    to the ids of the names containing it, so a numeric query token is one
+    lookup. A string query token is compared against the vocabulary rather
+    than against every name: its substring hits are shortlisted by trigram,
+    and only the words whose length allows a fuzzy ratio over the threshold
+    go through :class:`~difflib.SequenceMatcher`. The words matching each
+    query token are cached until the vocabulary changes, as type-ahead
+    repeats the same tokens keystroke after keystroke.
+    """
+
+    _CACHE_SIZE = 1024
+
+    def __init__(self) -> None:
+        # Id -> (name, its distinct tokens).
+        self._names: dict[str, tuple[str, frozenset[str]]] = {}
+        # Token -> ids of the names containing it.
+        self._ids: dict[str, set[str]] = {}
+        # Trigram -> tokens containing it; length -> tokens that long.
+        self._trigrams: dict[str, set[str]] = {}
+        self._by_length: dict[int, set[str]] = {}
+        self._cache: dict[str, frozenset[str]] = {}
+
+    def add(self, item_id: str, name: str) -> None:
+        """Index *name* under *item_id*, replacing its previous name."""
+        current = self._names.get(item_id)
+        if current is not None and current[0] == name:
+            return
+        self.remove(item_id)
+        tokens = frozenset(_tokenize(name))
+        self._names[item_id] = (name, tokens)
+        for token in tokens:
+            ids = self._ids.get(token)
+            if ids is None:
+                self._ids[token] = ids = set()
+                self._add_word(token)
+            ids.add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        entry = self._names.pop(item_id, None)
+        if entry is None:
+            return
+        for token in entry[1]:
+            ids = self._ids[token]
+            ids.discard(item_id)
+            if not ids:
+                del self._ids[token]
+                self._remove_word(token)
+
+    def search(self, query: str) -> set[str] | None:
+        """Ids of the names matching every token of *query*; ``None`` for a
+        blank query, which matches everything."""
+        tokens = _tokenize(query)
+        if not tokens:
+            return None
+        result: set[str] | None = None
+        # Longest first: they match the fewest words.
+        for token in sorted(set(tokens), key=str.__len__, reverse=True):
+            ids = set().union(*(self._ids[w] for w in self._matching_words(token)))
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+    def _matching_words(self, token: str) -> frozenset[str]:
+        cached = self._cache.get(token)
+        if cached is not None:
+            return cached
+        if token.isdigit():
+            words = frozenset((token,)) if token in self._ids else frozenset()
+        else:
+            words = self._substring_words(token) | self._fuzzy_words(token)
+        if len(self._cache) >= self._CACHE_SIZE:
+            self._cache.clear()
+        self._cache[token] = words
+        return words
+
+    def _substring_words(self, token: str) -> frozenset[str]:
+        if len(token) < 3:  # noqa: PLR2004
+            candidates = self._ids.keys()
+        else:
+            postings = [self._trigrams.get(t, set()) for t in _trigrams(token)]
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        return frozenset(w for w in candidates if token in w)
+
+    def _fuzzy_words(self, token: str) -> frozenset[str]:
+        matcher = SequenceMatcher(None, token)
+        words = set()
+        n = len(token)
+        for length, bucket in self._by_length.items():
+            # Upper bound of the ratio for any word of this length.
+            if _ratio(min(n, length), n + length) < _FUZZY_THRESHOLD:
+                continue
+            for word in bucket:
+                matcher.set_seq2(word)
+                if (
+                    matcher.quick_ratio() >= _FUZZY_THRESHOLD
+                    and matcher.ratio() >= _FUZZY_THRESHOLD
+                ):
+                    words.add(word)
+        return frozenset(words)
+
+    def _add_word(self, word: str) -> None:
+        self._cache.clear()
+        self._by_length.setdefault(len(word), set()).add(word)
+        for trigram in _trigrams(word):
+            self._trigrams.setdefault(trigram, set()).add(word)
+
+    def _remove_word(self, word: str) -> None:
+        self._cache.clear()
+        _discard(self._by_length, len(word), word)
+        for trigram in _trigrams(word):
+            _discard(self._trigrams, trigram, word)
+
+
+def _discard[K](index: dict[K, set[str]], key: K, word: str) -> None:
+    words = index[key]
+    words.discard(word)
+    if not words:
+        del index[key]
@@ -99,10 +99,19 @@ class TransportRegistry:
         await self._storage.write(dto.id, dto)
         return dto
 
+    def attach(self, client: TransportClient) -> None:
+        """Register the client of a stored transport in memory only."""
+        self._transports[client.id] = client
+
+    def detach(self, transport_id: str) -> TransportClient:
+        """Remove and return the client from memory only, leaving the
+        transport in storage. Caller is responsible for closing it."""
+        self._get_or_raise(transport_id)
+        return self._transports.pop(transport_id)
+
     async def remove(self, transport_id: str) -> TransportClient:
         """Remove and return the client. Caller is responsible for closing it."""
-        self._get_or_raise(transport_id)
-        client = self._transports.pop(transport_id)
+        client = self.detach(transport_id)
         await self._storage.delete(transport_id)
         return client
 
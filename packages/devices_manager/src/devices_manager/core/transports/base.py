@@ -1,7 +1,7 @@
 import logging
 from abc import ABC, abstractmethod
 from asyncio import Event, Lock, Task, create_task, wait_for
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Sequence
 from contextlib import AbstractAsyncContextManager, nullcontext, suppress
 from contextvars import ContextVar
 from typing import ClassVar
@@ -346,6 +346,28 @@ class PushTransportClient[T_PushTransportAddress: PushTransportAddress](
         """Register a listener on an address
         with a handler when receiving data on the address."""
 
+    async def register_listeners(
+        self, listeners: Sequence[tuple[str, ListenerCallback]]
+    ) -> list[str]:
+        """Register several ``(topic, callback)`` listeners, returning their ids
+        in order.
+
+        All-or-nothing: if one registration fails, those already made by this
+        call are unregistered before the error propagates. The default issues
+        one :meth:`register_listener` per pair; transports whose protocol can
+        subscribe many addresses in one request override it.
+        """
+        listener_ids: list[str] = []
+        try:
+            for topic, callback in listeners:
+                listener_ids.append(await self.register_listener(topic, callback))
+        except Exception:
+            for (topic, _), listener_id in zip(listeners, listener_ids, strict=False):
+                with suppress(Exception):
+                    await self.unregister_listener(listener_id, topic)
+            raise
+        return listener_ids
+
     @abstractmethod
     async def unregister_listener(
         self, callback_id: str, topic: str | None = None
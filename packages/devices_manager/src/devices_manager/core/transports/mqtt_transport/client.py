@@ -3,6 +3,7 @@ import json
 import logging
 import ssl
 import tempfile
+from collections.abc import Sequence
 from pathlib import Path
 
 import aiomqtt
@@ -22,6 +23,9 @@ from .topic_handler_registry import TopicHandlerRegistry
 from .transport_config import MqttTransportConfig
 
 TIMEOUT = 10
+# Topic filters per SUBSCRIBE packet when registering listeners in bulk. MQTT
+# sets no limit, but some brokers cap it, so large fleets go out in chunks.
+MAX_TOPICS_PER_SUBSCRIBE = 100
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +133,53 @@ class MqttTransportClient(PushTransportClient[MqttAddress]):
         logger.debug("New listener registered on topic %s", topic)
         return listener_id
 
+    async def register_listeners(
+        self, listeners: Sequence[tuple[str, ListenerCallback]]
+    ) -> list[str]:
+        """Register many listeners with multi-topic SUBSCRIBE packets instead of
+        one round-trip per topic.
+
+        All or nothing: when a packet fails, the topics of the packets already
+        acknowledged are unsubscribed again (but for those other listeners
+        use) before the error propagates.
+        """
+        listener_ids = [
+            self._handlers_registry.register(topic, callback)
+            for topic, callback in listeners
+        ]
+        topics = list(dict.fromkeys(topic for topic, _ in listeners))
+        subscribed: list[str] = []
+        try:
+            for start in range(0, len(topics), MAX_TOPICS_PER_SUBSCRIBE):
+                chunk = topics[start : start + MAX_TOPICS_PER_SUBSCRIBE]
+                await self._subscribe_many(chunk)
+                subscribed.extend(chunk)
+        except Exception:
+            for (topic, _), listener_id in zip(listeners, listener_ids, strict=True):
+                self._handlers_registry.remove(listener_id, topic)
+            await self._rollback_subscriptions(subscribed)
+            raise
+        for (topic, _), listener_id in zip(listeners, listener_ids, strict=True):
+            self._message_handlers.register(topic, listener_id)
+        logger.debug(
+            "%d listeners registered on %d topics", len(listeners), len(topics)
+        )
+        return listener_ids
+
+    async def _rollback_subscriptions(self, topics: list[str]) -> None:
+        unused = [
+            topic for topic in topics if not self._message_handlers.get_by_topic(topic)
+        ]
+        if not unused:
+            return
+        try:
+            await self._unsubscribe_many(unused)
+        except Exception:
+            logger.exception(
+                "Failed to unsubscribe %d topic(s) after a failed subscribe",
+                len(unused),
+            )
+
     async def unregister_listener(
         self, callback_id: str, topic: str | None = None
     ) -> None:
@@ -144,10 +195,18 @@ class MqttTransportClient(PushTransportClient[MqttAddress]):
     async def _subscribe(self, topic: str) -> None:
         await self._client.subscribe(topic)
 
+    @connected
+    async def _subscribe_many(self, topics: list[str]) -> None:
+        await self._client.subscribe([(topic, 0) for topic in topics])
+
     @connected
     async def _unsubscribe(self, topic: str) -> None:
         await self._client.unsubscribe(topic)
 
+    @connected
+    async def _unsubscribe_many(self, topics: list[str]) -> None:
+        await self._client.unsubscribe(topics)
+
     @connected
     async def _handle_incoming_messages(self) -> None:
         async for message in self._client.messages:
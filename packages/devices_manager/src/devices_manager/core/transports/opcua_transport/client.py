@@ -2,7 +2,7 @@ import asyncio
 import contextlib
 import itertools
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Sequence
 from typing import ClassVar
 
 from asyncua import Client, Node, ua
@@ -274,6 +274,36 @@ class OpcuaTransportClient(
                     raise
             return self._handlers_registry.register(topic, callback)
 
+    @connected
+    async def register_listeners(
+        self, listeners: Sequence[tuple[str, ListenerCallback]]
+    ) -> list[str]:
+        """Create the MonitoredItems of every new NodeId in a single
+        CreateMonitoredItems request, then register the callbacks."""
+        async with self._connection_lock:
+            client = self._require_client()
+            topics = [
+                topic
+                for topic in dict.fromkeys(topic for topic, _ in listeners)
+                if topic not in self._monitored_items
+            ]
+            if topics:
+                nodes = [client.get_node(topic) for topic in topics]
+                subscription = await self._ensure_subscription(client)
+                try:
+                    server_handles = await self._create_monitored_items(
+                        subscription, nodes
+                    )
+                except Exception:
+                    if not self._monitored_items:
+                        await self._teardown_subscription()
+                    raise
+                self._monitored_items.update(zip(topics, server_handles, strict=True))
+            return [
+                self._handlers_registry.register(topic, callback)
+                for topic, callback in listeners
+            ]
+
     @connected
     async def unregister_listener(
         self, callback_id: str, topic: str | None = None
@@ -320,6 +350,35 @@ class OpcuaTransportClient(
     async def _create_monitored_item(
         self, subscription: Subscription, node: Node
     ) -> int:
+        [server_handle] = await self._create_monitored_items(subscription, [node])
+        return server_handle
+
+    async def _create_monitored_items(
+        self, subscription: Subscription, nodes: Sequence[Node]
+    ) -> list[int]:
+        """Create one MonitoredItem per node in a single request.
+
+        All-or-nothing: if any item is rejected, the ones the server did
+        create are removed again before the first failure is raised.
+        """
+        results = await subscription.create_monitored_items(
+            [self._monitored_item_request(node) for node in nodes]
+        )
+        server_handles = [result for result in results if isinstance(result, int)]
+        if len(server_handles) == len(results):
+            return server_handles
+        if server_handles:
+            with contextlib.suppress(Exception):
+                await subscription.unsubscribe(server_handles)
+        failure = next(result for result in results if not isinstance(result, int))
+        # Raises a typed ua.UaStatusCodeError, e.g. for an unknown NodeId;
+        # create_monitored_items only stores a StatusCode here for Bad ones,
+        # so the line below is unreachable — guard for type-narrowing only.
+        failure.check()
+        msg = f"Unexpected Good StatusCode in monitored-item failure path: {failure}"
+        raise AssertionError(msg)
+
+    def _monitored_item_request(self, node: Node) -> ua.MonitoredItemCreateRequest:
         read_value_id = ua.ReadValueId()
         read_value_id.NodeId = node.nodeid
         read_value_id.AttributeId = ua.AttributeIds.Value
@@ -333,15 +392,7 @@ class OpcuaTransportClient(
         request.ItemToMonitor = read_value_id
         request.MonitoringMode = ua.MonitoringMode.Reporting
         request.RequestedParameters = monitoring_params
-        [result] = await subscription.create_monitored_items([request])
-        if isinstance(result, int):
-            return result
-        # Raises a typed ua.UaStatusCodeError, e.g. for an unknown NodeId;
-        # create_monitored_items only stores a StatusCode here for Bad ones,
-        # so the line below is unreachable — guard for type-narrowing only.
-        result.check()
-        msg = f"Unexpected Good StatusCode in monitored-item failure path: {result}"
-        raise AssertionError(msg)
+        return request
 
     def _deadband_filter(self) -> ua.DataChangeFilter:
         deadband_filter = ua.DataChangeFilter()
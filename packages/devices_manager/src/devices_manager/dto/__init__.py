@@ -1,4 +1,5 @@
 from .device_dto import (
+    AnyAttribute,
     Device,
     DeviceCreate,
     DeviceUpdate,
@@ -42,6 +43,7 @@ from .transport_dto import secret_field_names as transport_secret_field_names
 
 __all__ = [
     "TRANSPORT_CONFIG_CLASS_BY_PROTOCOL",
+    "AnyAttribute",
     "AttributeDriverSpec",
     "AttributePatch",
     "AttributeRename",
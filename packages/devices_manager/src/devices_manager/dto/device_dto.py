@@ -43,7 +43,8 @@ def _attribute_kind_tag(v: Any) -> str:  # noqa: ANN401
     return getattr(v, "kind", AttributeKind.STANDARD)
 
 
-_AttributeUnion = Annotated[
+# Any attribute of a device, parsed to the class matching its `kind`.
+AnyAttribute = Annotated[
     Annotated[Attribute, Tag(AttributeKind.STANDARD)]
     | Annotated[FaultAttribute, Tag(AttributeKind.FAULT)]
     | Annotated[Attribute, Tag(AttributeKind.INTERNAL)],
@@ -56,7 +57,7 @@ class Device(ResourceMetadata):
     name: str
     type: str | None = None
     tags: dict[str, str] = Field(default_factory=dict)
-    attributes: dict[str, _AttributeUnion] = Field(default_factory=dict)
+    attributes: dict[str, AnyAttribute] = Field(default_factory=dict)
     # Derived from the device's fault attributes (rolled up by `core_to_dto`,
     # recomputed on sync). Defaulted so authored/stored payloads need not carry
     # it — a freshly loaded device reads False until its first sync.
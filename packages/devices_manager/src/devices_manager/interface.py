@@ -48,6 +48,8 @@ class DeviceRegistryInterface(Protocol):
 
     def get_dto(self, device_id: str) -> Device: ...
 
+    def revision(self, *, structural: bool = False) -> str: ...
+
     def list_all(  # noqa: PLR0913
         self,
         *,
@@ -142,6 +144,8 @@ class DevicesServiceInterface(Protocol):
 
     def get_device(self, device_id: str) -> Device: ...
 
+    def devices_revision(self, *, structural: bool = False) -> str: ...
+
     async def add_device(self, device_create: DeviceCreate) -> Device: ...
 
     async def update_device(
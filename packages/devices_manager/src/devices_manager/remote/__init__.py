@@ -0,0 +1,21 @@
+"""Run the devices service in engine processes of their own.
+
+:class:`EngineServer` serves a :class:`DevicesService` on a Unix socket;
+:class:`RemoteDevicesService` implements :class:`DevicesServiceInterface`
+over it for the processes using the devices. :class:`ShardedDevicesService`
+spreads the devices over several such engines, its shards.
+"""
+
+from .client import DeviceRef, RemoteDevicesService
+from .protocol import RemoteError
+from .server import EngineServer
+from .sharding import HashRing, ShardedDevicesService
+
+__all__ = [
+    "DeviceRef",
+    "EngineServer",
+    "HashRing",
+    "RemoteDevicesService",
+    "RemoteError",
+    "ShardedDevicesService",
+]
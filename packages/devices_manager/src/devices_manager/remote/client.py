@@ -0,0 +1,660 @@
+"""The devices service of an engine process, as seen from an API worker.
+
+:class:`RemoteDevicesService` implements :class:`DevicesServiceInterface` by
+forwarding every call to an :class:`~devices_manager.remote.EngineServer`.
+Coroutine methods share one connection, their requests in flight together;
+the same connection brings the engine's events, dispatched to the listeners
+registered here. The interface's plain methods (``list_devices``,
+``get_device``, ...) cannot await, so each thread sends them on a blocking
+socket of its own: the engine answers them from memory, in about the time of
+a local round trip.
+
+Listeners get a :class:`DeviceRef`, the id and name of the device, in place
+of the :class:`CoreDevice` that stays in the engine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import socket
+import threading
+from base64 import b64encode
+from dataclasses import dataclass
+from itertools import count
+from typing import TYPE_CHECKING, Any, cast
+
+from pydantic import TypeAdapter
+
+from devices_manager.dto import AnyAttribute
+from models.errors import StorageConnectionError
+from models.ids import gen_id
+
+from .protocol import METHODS, decode_error, encode_request, read_message, recv_message
+
+if TYPE_CHECKING:
+    import builtins
+    from collections.abc import AsyncIterator, Callable, Collection, Mapping
+
+    from devices_manager.core.device import Attribute, AttributeListener, CoreDevice
+    from devices_manager.core.device.event_log import AttributeLogs
+    from devices_manager.core.discovery_manager import DiscoveryConfig
+    from devices_manager.core.driver.attribute_driver import AttributeDriver
+    from devices_manager.dto import (
+        AttributePatch,
+        Device,
+        DeviceCreate,
+        DeviceUpdate,
+        DriverPatch,
+        DriverSpec,
+        FaultView,
+        StandardAttributeSchema,
+        Transport,
+        TransportCreate,
+        TransportUpdate,
+    )
+    from devices_manager.ingress import IngressRequest, IngressResult
+    from devices_manager.interface import DeviceDiscoveredListener
+    from devices_manager.types import AttributeValueType, DataType
+    from models.types import Severity
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT_SECONDS = 30.0
+# For the plain methods only: coroutines wait as long as the engine's own
+# transport timeouts.
+CALL_TIMEOUT_SECONDS = 10.0
+_RECONNECT_MAX_DELAY = 1.0
+
+_ATTRIBUTE: TypeAdapter[Attribute] = TypeAdapter(AnyAttribute)
+
+
+@dataclass(frozen=True)
+class DeviceRef:
+    """The device of an engine event."""
+
+    id: str
+    name: str
+
+
+class _Channel:
+    """One connection to the engine, multiplexing requests and events."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        on_event: Callable[[dict[str, Any]], None],
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._on_event = on_event
+        self._ids = count(1)
+        self._calls: dict[int, asyncio.Future[Any]] = {}
+        # Request id -> ("item" | "end" | "error", value) of a stream.
+        self._streams: dict[int, asyncio.Queue[tuple[str, Any]]] = {}
+        self.closed = asyncio.Event()
+        self._read_task = asyncio.create_task(self._read())
+
+    async def call(self, name: str, params: Mapping[str, Any]) -> Any:  # noqa: ANN401
+        request_id = self._send(name, params)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._calls[request_id] = future
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self._cancel(request_id)
+            raise
+        finally:
+            self._calls.pop(request_id, None)
+
+    async def stream(self, name: str, params: Mapping[str, Any]) -> AsyncIterator[Any]:
+        request_id = self._send(name, params)
+        queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+        self._streams[request_id] = queue
+        ended = False
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "item":
+                    yield value
+                    continue
+                ended = True
+                if kind == "error":
+                    raise value
+                return
+        finally:
+            self._streams.pop(request_id, None)
+            if not ended:
+                self._cancel(request_id)
+
+    async def close(self) -> None:
+        self._writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self._writer.wait_closed()
+        self._read_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._read_task
+
+    def _send(self, name: str, params: Mapping[str, Any]) -> int:
+        if self.closed.is_set():
+            msg = "Not connected to the devices engine"
+            raise ConnectionError(msg)
+        request_id = next(self._ids)
+        self._writer.write(encode_request(request_id, name, params))
+        return request_id
+
+    def _cancel(self, request_id: int) -> None:
+        if not self.closed.is_set():
+            self._send("cancel", {"id": request_id})
+
+    async def _read(self) -> None:
+        try:
+            while (message := await read_message(self._reader)) is not None:
+                self._dispatch(message)
+        except ConnectionError:
+            logger.warning("Devices engine connection failed", exc_info=True)
+        finally:
+            self.closed.set()
+            lost = ConnectionError("Lost the connection to the devices engine")
+            for future in self._calls.values():
+                if not future.done():
+                    future.set_exception(lost)
+            for queue in self._streams.values():
+                queue.put_nowait(("error", lost))
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        request_id = message.get("id")
+        if request_id is None:
+            self._on_event(message)
+            return
+        queue = self._streams.get(request_id)
+        if queue is not None:
+            if "item" in message:
+                queue.put_nowait(("item", message["item"]))
+            elif "error" in message:
+                queue.put_nowait(("error", decode_error(message["error"])))
+            else:
+                queue.put_nowait(("end", None))
+            return
+        future = self._calls.get(request_id)
+        if future is None or future.done():
+            return
+        if "error" in message:
+            future.set_exception(decode_error(message["error"]))
+        else:
+            future.set_result(message["result"])
+
+
+class _RemoteIngress:
+    def __init__(self, service: RemoteDevicesService, transport_id: str) -> None:
+        self._service = service
+        self._transport_id = transport_id
+
+    async def ingress(self, request: IngressRequest) -> IngressResult:
+        return await self._service.call(
+            "ingress",
+            transport_id=self._transport_id,
+            topic=request.topic,
+            payload=b64encode(request.payload).decode("ascii"),
+            headers=request.headers,
+            query=request.query,
+        )
+
+
+class RemoteDiscoveryManager:
+    def __init__(self, service: RemoteDevicesService) -> None:
+        self._service = service
+
+    def has(self, driver_id: str, transport_id: str) -> bool:
+        return self._service.call_sync(
+            "discovery_manager.has", driver_id=driver_id, transport_id=transport_id
+        )
+
+    async def register(self, driver_id: str, transport_id: str) -> None:
+        await self._service.call(
+            "discovery_manager.register",
+            driver_id=driver_id,
+            transport_id=transport_id,
+        )
+
+    async def unregister(self, driver_id: str, transport_id: str) -> None:
+        await self._service.call(
+            "discovery_manager.unregister",
+            driver_id=driver_id,
+            transport_id=transport_id,
+        )
+
+    def list(
+        self,
+        *,
+        driver_id: str | None = None,
+        transport_id: str | None = None,
+    ) -> builtins.list[DiscoveryConfig]:
+        return self._service.call_sync(
+            "discovery_manager.list", driver_id=driver_id, transport_id=transport_id
+        )
+
+
+class RemoteDevicesService:
+    """:class:`DevicesServiceInterface` served by an engine process."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        connect_timeout: float | None = CONNECT_TIMEOUT_SECONDS,
+        call_timeout: float = CALL_TIMEOUT_SECONDS,
+    ) -> None:
+        self._path = path
+        self._connect_timeout = connect_timeout
+        self._call_timeout = call_timeout
+        self._channel: _Channel | None = None
+        self._supervisor: asyncio.Task[None] | None = None
+        # Blocking sockets of the plain methods, one per thread.
+        self._local = threading.local()
+        self._sockets: set[socket.socket] = set()
+        self._sockets_lock = threading.Lock()
+        self._attribute_listeners: dict[str, AttributeListener] = {}
+        self._discovery_listeners: dict[str, DeviceDiscoveredListener] = {}
+        self._background_tasks: set[asyncio.Task[Any]] = set()
+        self._discovery_manager = RemoteDiscoveryManager(self)
+
+    # -- Lifecycle --
+
+    async def start(self) -> None:
+        """Connect to the engine, waiting up to ``connect_timeout`` for it
+        (``None``: until it is up).
+
+        Raises ``StorageConnectionError`` when it cannot be reached.
+        """
+        self._channel = await self._connect(self._connect_timeout)
+        self._supervisor = asyncio.create_task(self._stay_connected())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._supervisor
+            self._supervisor = None
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+        with self._sockets_lock:
+            for sock in self._sockets:
+                sock.close()
+            self._sockets.clear()
+
+    async def _connect(self, patience: float | None) -> _Channel:
+        loop = asyncio.get_running_loop()
+        deadline = None if patience is None else loop.time() + patience
+        delay = 0.05
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self._path)
+                channel = _Channel(reader, writer, self._on_event)
+                await channel.call("subscribe", {})
+            except OSError as e:
+                if deadline is not None and loop.time() >= deadline:
+                    msg = f"Devices engine unreachable at {self._path}"
+                    raise StorageConnectionError(msg) from e
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _RECONNECT_MAX_DELAY)
+            else:
+                return channel
+
+    async def _stay_connected(self) -> None:
+        while True:
+            channel = self._channel
+            if channel is None:
+                return
+            await channel.closed.wait()
+            # Updates sent in between are lost: connected clients catch up
+            # on the next value of each attribute.
+            logger.warning("Lost the devices engine at %s, reconnecting", self._path)
+            self._channel = await self._connect(None)
+            logger.info("Reconnected to the devices engine at %s", self._path)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the engine is reachable, as of the last message or close."""
+        return self._channel is not None and not self._channel.closed.is_set()
+
+    # -- Calls --
+
+    async def call(self, name: str, **params: Any) -> Any:  # noqa: ANN401
+        """Run *name* on the engine and return its parsed result."""
+        if self._channel is None:
+            msg = "RemoteDevicesService used before start()"
+            raise ConnectionError(msg)
+        return METHODS[name].parse_result(await self._channel.call(name, params))
+
+    def call_sync(self, name: str, **params: Any) -> Any:  # noqa: ANN401
+        """:meth:`call`, blocking, for the interface's plain methods: async
+        code calls those through ``asyncio.to_thread``."""
+        sock = self._socket()
+        try:
+            sock.sendall(encode_request(0, name, params))
+            reply = recv_message(sock)
+        except OSError:
+            # The answer may still come: the socket cannot be reused.
+            self._drop_socket(sock)
+            raise
+        if "error" in reply:
+            raise decode_error(reply["error"])
+        return METHODS[name].parse_result(reply["result"])
+
+    def _socket(self) -> socket.socket:
+        sock: socket.socket | None = getattr(self._local, "socket", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self._call_timeout)
+            try:
+                sock.connect(self._path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.socket = sock
+            with self._sockets_lock:
+                self._sockets.add(sock)
+        return sock
+
+    def _drop_socket(self, sock: socket.socket) -> None:
+        self._local.socket = None
+        with self._sockets_lock:
+            self._sockets.discard(sock)
+        sock.close()
+
+    # -- Events --
+
+    def _on_event(self, event: dict[str, Any]) -> None:
+        # Listeners only use the id and name of the device.
+        device = cast("CoreDevice", DeviceRef(**event["device"]))
+        if event["event"] == "attribute":
+            previous = event["previous"]
+            self._dispatch_attribute_update(
+                device,
+                event["attribute_name"],
+                _ATTRIBUTE.validate_python(previous) if previous is not None else None,
+                _ATTRIBUTE.validate_python(event["attribute"]),
+            )
+        elif event["event"] == "discovered":
+            for listener in list(self._discovery_listeners.values()):
+                try:
+                    self._schedule_if_coroutine(listener(device))
+                except Exception:
+                    logger.exception(
+                        "Discovery listener failed for device %s", device.id
+                    )
+
+    def _dispatch_attribute_update(
+        self,
+        device: CoreDevice,
+        attribute_name: str,
+        previous: Attribute | None,
+        attribute: Attribute,
+    ) -> None:
+        for handler in list(self._attribute_listeners.values()):
+            try:
+                self._schedule_if_coroutine(
+                    handler(device, attribute_name, previous, attribute)
+                )
+            except Exception:
+                logger.exception(
+                    "Attribute update handler failed for %s.%s",
+                    device.id,
+                    attribute_name,
+                )
+
+    def _on_handler_task_done(self, task: asyncio.Task[Any]) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and (exc := task.exception()):
+            logger.error("Async handler failed", exc_info=exc)
+
+    def _schedule_if_coroutine(self, result: object) -> None:
+        if asyncio.iscoroutine(result):
+            task = asyncio.create_task(result)
+            self._background_tasks.add(task)
+            task.add_done_callback(self._on_handler_task_done)
+
+    # -- Properties --
+
+    @property
+    def transport_ids(self) -> set[str]:
+        return self.call_sync("transport_ids")
+
+    @property
+    def driver_ids(self) -> set[str]:
+        return self.call_sync("driver_ids")
+
+    @property
+    def device_ids(self) -> set[str]:
+        return self.call_sync("device_ids")
+
+    @property
+    def discovery_manager(self) -> RemoteDiscoveryManager:
+        return self._discovery_manager
+
+    # -- Devices --
+
+    def list_devices(  # noqa: PLR0913
+        self,
+        *,
+        ids: Collection[str] | None = None,
+        types: list[str] | None = None,
+        attribute: str | None = None,
+        writable_attribute: str | None = None,
+        writable_attribute_type: DataType | None = None,
+        tags: dict[str, list[str]] | None = None,
+        is_faulty: bool | None = None,
+        search: str | None = None,
+        driver_id: str | None = None,
+        transport_id: str | None = None,
+    ) -> list[Device]:
+        return self.call_sync(
+            "list_devices",
+            ids=list(ids) if ids is not None else None,
+            types=types,
+            attribute=attribute,
+            writable_attribute=writable_attribute,
+            writable_attribute_type=writable_attribute_type,
+            tags=tags,
+            is_faulty=is_faulty,
+            search=search,
+            driver_id=driver_id,
+            transport_id=transport_id,
+        )
+
+    def get_device(self, device_id: str) -> Device:
+        return self.call_sync("get_device", device_id=device_id)
+
+    def devices_revision(self, *, structural: bool = False) -> str:
+        return self.call_sync("devices_revision", structural=structural)
+
+    async def add_device(self, device_create: DeviceCreate) -> Device:
+        return await self.call("add_device", device_create=device_create)
+
+    async def update_device(
+        self, device_id: str, device_update: DeviceUpdate
+    ) -> Device:
+        return await self.call(
+            "update_device", device_id=device_id, device_update=device_update
+        )
+
+    async def delete_device(self, device_id: str) -> None:
+        await self.call("delete_device", device_id=device_id)
+
+    async def set_device_tag(self, device_id: str, key: str, value: str) -> Device:
+        return await self.call(
+            "set_device_tag", device_id=device_id, key=key, value=value
+        )
+
+    async def delete_device_tag(self, device_id: str, key: str) -> Device:
+        return await self.call("delete_device_tag", device_id=device_id, key=key)
+
+    async def read_device(self, device_id: str) -> Device:
+        return await self.call("read_device", device_id=device_id)
+
+    async def refresh_device_attribute(
+        self, device_id: str, attribute_name: str
+    ) -> Attribute:
+        return await self.call(
+            "refresh_device_attribute",
+            device_id=device_id,
+            attribute_name=attribute_name,
+        )
+
+    async def stream_device_read(
+        self, device_id: str
+    ) -> AsyncIterator[tuple[str, AttributeValueType | None]]:
+        if self._channel is None:
+            msg = "RemoteDevicesService used before start()"
+            raise ConnectionError(msg)
+        method = METHODS["stream_device_read"]
+        async for item in self._channel.stream(
+            "stream_device_read", {"device_id": device_id}
+        ):
+            yield method.parse_result(item)
+
+    async def start_device_sync(self, device_id: str) -> None:
+        await self.call("start_device_sync", device_id=device_id)
+
+    async def stop_device_sync(self, device_id: str) -> None:
+        await self.call("stop_device_sync", device_id=device_id)
+
+    async def write_device_attribute(
+        self,
+        device_id: str,
+        attribute_name: str,
+        value: AttributeValueType,
+        *,
+        confirm: bool = True,
+    ) -> Attribute:
+        return await self.call(
+            "write_device_attribute",
+            device_id=device_id,
+            attribute_name=attribute_name,
+            value=value,
+            confirm=confirm,
+        )
+
+    def get_attribute_logs(self, device_id: str, attribute_name: str) -> AttributeLogs:
+        return self.call_sync(
+            "get_attribute_logs", device_id=device_id, attribute_name=attribute_name
+        )
+
+    # -- Faults --
+
+    def list_active_faults(
+        self,
+        *,
+        severity: Severity | None = None,
+        device_id: str | None = None,
+    ) -> list[FaultView]:
+        return self.call_sync(
+            "list_active_faults", severity=severity, device_id=device_id
+        )
+
+    # -- Transports --
+
+    def list_transports(self) -> list[Transport]:
+        return self.call_sync("list_transports")
+
+    def get_transport(self, transport_id: str) -> Transport:
+        return self.call_sync("get_transport", transport_id=transport_id)
+
+    def get_transport_ingress(self, transport_id: str) -> _RemoteIngress:
+        return _RemoteIngress(self, transport_id)
+
+    async def add_transport(self, transport: TransportCreate | Transport) -> Transport:
+        return await self.call("add_transport", transport=transport)
+
+    async def update_transport(
+        self, transport_id: str, update: TransportUpdate
+    ) -> Transport:
+        return await self.call(
+            "update_transport", transport_id=transport_id, update=update
+        )
+
+    async def delete_transport(self, transport_id: str) -> None:
+        await self.call("delete_transport", transport_id=transport_id)
+
+    # -- Drivers --
+
+    def list_drivers(self, *, device_type: str | None = None) -> list[DriverSpec]:
+        return self.call_sync("list_drivers", device_type=device_type)
+
+    def get_driver(self, driver_id: str) -> DriverSpec:
+        return self.call_sync("get_driver", driver_id=driver_id)
+
+    async def add_driver(self, driver_dto: DriverSpec) -> DriverSpec:
+        return await self.call("add_driver", driver_dto=driver_dto)
+
+    async def patch_driver(self, driver_id: str, patch: DriverPatch) -> DriverSpec:
+        return await self.call("patch_driver", driver_id=driver_id, patch=patch)
+
+    async def create_driver_attribute(
+        self, driver_id: str, attribute: AttributeDriver
+    ) -> AttributeDriver:
+        return await self.call(
+            "create_driver_attribute", driver_id=driver_id, attribute=attribute
+        )
+
+    async def patch_driver_attribute(
+        self, driver_id: str, attribute_id: str, patch: AttributePatch
+    ) -> AttributeDriver:
+        return await self.call(
+            "patch_driver_attribute",
+            driver_id=driver_id,
+            attribute_id=attribute_id,
+            patch=patch,
+        )
+
+    async def delete_driver_attribute(
+        self, driver_id: str, attribute_id: str
+    ) -> DriverSpec:
+        return await self.call(
+            "delete_driver_attribute", driver_id=driver_id, attribute_id=attribute_id
+        )
+
+    async def rename_driver_attribute(
+        self, driver_id: str, attribute_id: str, new_name: str
+    ) -> AttributeDriver:
+        return await self.call(
+            "rename_driver_attribute",
+            driver_id=driver_id,
+            attribute_id=attribute_id,
+            new_name=new_name,
+        )
+
+    async def delete_driver(self, driver_id: str) -> None:
+        await self.call("delete_driver", driver_id=driver_id)
+
+    # -- Standard schemas --
+
+    def list_standard_schemas(self) -> list[StandardAttributeSchema]:
+        return self.call_sync("list_standard_schemas")
+
+    # -- Listeners --
+
+    def add_device_attribute_listener(self, callback: AttributeListener) -> str:
+        """Register a handler for the engine's attribute updates."""
+        listener_id = gen_id()
+        self._attribute_listeners[listener_id] = callback
+        return listener_id
+
+    def remove_device_attribute_listener(self, listener_id: str) -> None:
+        self._attribute_listeners.pop(listener_id, None)
+
+    def add_device_discovery_listener(self, callback: DeviceDiscoveredListener) -> str:
+        """Register a handler for the devices the engine discovers."""
+        listener_id = gen_id()
+        self._discovery_listeners[listener_id] = callback
+        return listener_id
+
+    def remove_device_discovery_listener(self, listener_id: str) -> None:
+        self._discovery_listeners.pop(listener_id, None)
+
+
+__all__ = ["DeviceRef", "RemoteDevicesService", "RemoteDiscoveryManager"]
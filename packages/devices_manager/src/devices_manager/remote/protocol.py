@@ -0,0 +1,351 @@
+"""Wire protocol between a devices engine and the API workers using it.
+
+Messages are JSON objects over a Unix socket, each prefixed with its length
+as a 4-byte big-endian integer. A worker sends requests::
+
+    {"id": 1, "method": "get_device", "params": {"device_id": "d1"}}
+
+which the engine answers with ``{"id": 1, "result": ...}`` or
+``{"id": 1, "error": {"type": "NotFoundError", "message": ...}}``, after any
+number of ``{"id": 1, "item": ...}`` for a streaming method. Requests on one
+connection are handled concurrently, so answers may come in any order; a
+``cancel`` request (``{"id": ...}``) stops one still running.
+
+After a ``subscribe`` request the connection also receives events, the
+messages without an ``id``::
+
+    {"event": "attribute", "device": {"id": ..., "name": ...},
+     "attribute_name": ..., "previous": ..., "attribute": ...}
+    {"event": "discovered", "device": {"id": ..., "name": ...}}
+
+Method names are the :class:`DevicesService` attributes they call, dotted
+for the discovery manager; ``assign_transports``, ``renew_lease`` and
+``reload_driver`` are only sent to the shards of a
+:class:`ShardedDevicesService`. :data:`METHODS` gives the types of their
+parameters, which the engine validates, and of their result, which the
+worker validates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+from pydantic import Base64Bytes, BaseModel, TypeAdapter, ValidationError, create_model
+from pydantic_core import PydanticCustomError, from_json, to_json
+
+from devices_manager.core.device.event_log import AttributeLogs
+from devices_manager.core.discovery_manager import DiscoveryConfig
+from devices_manager.dto import (
+    AnyAttribute,
+    AttributeDriverSpec,
+    AttributePatch,
+    Device,
+    DeviceCreate,
+    DeviceUpdate,
+    DriverPatch,
+    DriverSpec,
+    FaultView,
+    StandardAttributeSchema,
+    Transport,
+    TransportCreate,
+    TransportUpdate,
+)
+from devices_manager.ingress import IngressResult
+from devices_manager.types import AttributeValueType, DataType
+from models.errors import (
+    ConfirmationError,
+    ConflictError,
+    InvalidError,
+    NotFoundError,
+    StorageNotInitializedError,
+    UnauthorizedError,
+)
+from models.types import Severity
+
+if TYPE_CHECKING:
+    import socket
+    from collections.abc import Mapping
+
+_HEADER = struct.Struct("!I")
+
+# Larger frames are a protocol error, not a message to buffer.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Method:
+    params: Mapping[str, Any] = field(default_factory=dict)
+    result: Any = None
+    stream: bool = False
+    """Answers with one ``item`` per ``result`` value, then a null result."""
+    attribute: bool = False
+    """Reads a property instead of calling a method."""
+
+    @cached_property
+    def _params_model(self) -> type[BaseModel]:
+        fields: dict[str, Any] = {name: (tp, ...) for name, tp in self.params.items()}
+        return create_model("Params", **fields)
+
+    @cached_property
+    def _result_adapter(self) -> TypeAdapter[Any]:
+        return TypeAdapter(self.result)
+
+    def parse_params(self, params: Mapping[str, Any]) -> dict[str, Any]:
+        parsed = self._params_model.model_validate(params)
+        return {name: getattr(parsed, name) for name in self.params}
+
+    def parse_result(self, result: Any) -> Any:  # noqa: ANN401
+        return self._result_adapter.validate_python(result)
+
+
+_DEVICE = {"device_id": str}
+_DRIVER = {"driver_id": str}
+_TRANSPORT = {"transport_id": str}
+_DEVICE_ATTRIBUTE = {"device_id": str, "attribute_name": str}
+_DRIVER_ATTRIBUTE = {"driver_id": str, "attribute_id": str}
+_DISCOVERY = {"driver_id": str, "transport_id": str}
+
+METHODS: dict[str, Method] = {
+    # -- properties --
+    "transport_ids": Method(result=set[str], attribute=True),
+    "driver_ids": Method(result=set[str], attribute=True),
+    "device_ids": Method(result=set[str], attribute=True),
+    # -- devices --
+    "list_devices": Method(
+        {
+            "ids": list[str] | None,
+            "types": list[str] | None,
+            "attribute": str | None,
+            "writable_attribute": str | None,
+            "writable_attribute_type": DataType | None,
+            "tags": dict[str, list[str]] | None,
+            "is_faulty": bool | None,
+            "search": str | None,
+            "driver_id": str | None,
+            "transport_id": str | None,
+        },
+        list[Device],
+    ),
+    "get_device": Method(_DEVICE, Device),
+    "devices_revision": Method({"structural": bool}, str),
+    "add_device": Method({"device_create": DeviceCreate}, Device),
+    "update_device": Method({"device_id": str, "device_update": DeviceUpdate}, Device),
+    "delete_device": Method(_DEVICE),
+    "set_device_tag": Method({"device_id": str, "key": str, "value": str}, Device),
+    "delete_device_tag": Method({"device_id": str, "key": str}, Device),
+    "read_device": Method(_DEVICE, Device),
+    "refresh_device_attribute": Method(_DEVICE_ATTRIBUTE, AnyAttribute),
+    "stream_device_read": Method(
+        _DEVICE, tuple[str, AttributeValueType | None], stream=True
+    ),
+    "start_device_sync": Method(_DEVICE),
+    "stop_device_sync": Method(_DEVICE),
+    "write_device_attribute": Method(
+        {**_DEVICE_ATTRIBUTE, "value": AttributeValueType, "confirm": bool},
+        AnyAttribute,
+    ),
+    "get_attribute_logs": Method(_DEVICE_ATTRIBUTE, AttributeLogs),
+    # -- faults --
+    "list_active_faults": Method(
+        {"severity": Severity | None, "device_id": str | None}, list[FaultView]
+    ),
+    # -- transports --
+    "list_transports": Method(result=list[Transport]),
+    "get_transport": Method(_TRANSPORT, Transport),
+    "add_transport": Method({"transport": TransportCreate | Transport}, Transport),
+    "update_transport": Method(
+        {"transport_id": str, "update": TransportUpdate}, Transport
+    ),
+    "delete_transport": Method(_TRANSPORT),
+    # The IngressRequest of the transport's MessageIngress, payload in base64.
+    "ingress": Method(
+        {
+            "transport_id": str,
+            "topic": str,
+            "payload": Base64Bytes,
+            "headers": dict[str, str],
+            "query": dict[str, str],
+        },
+        IngressResult,
+    ),
+    # -- drivers --
+    "list_drivers": Method({"device_type": str | None}, list[DriverSpec]),
+    "get_driver": Method(_DRIVER, DriverSpec),
+    "add_driver": Method({"driver_dto": DriverSpec}, DriverSpec),
+    "patch_driver": Method({"driver_id": str, "patch": DriverPatch}, DriverSpec),
+    "create_driver_attribute": Method(
+        {"driver_id": str, "attribute": AttributeDriverSpec}, AttributeDriverSpec
+    ),
+    "patch_driver_attribute": Method(
+        {**_DRIVER_ATTRIBUTE, "patch": AttributePatch}, AttributeDriverSpec
+    ),
+    "delete_driver_attribute": Method(_DRIVER_ATTRIBUTE, DriverSpec),
+    "rename_driver_attribute": Method(
+        {**_DRIVER_ATTRIBUTE, "new_name": str}, AttributeDriverSpec
+    ),
+    "delete_driver": Method(_DRIVER),
+    # -- standard schemas --
+    "list_standard_schemas": Method(result=list[StandardAttributeSchema]),
+    # -- discovery --
+    "discovery_manager.has": Method(_DISCOVERY, bool),
+    "discovery_manager.register": Method(_DISCOVERY),
+    "discovery_manager.unregister": Method(_DISCOVERY),
+    "discovery_manager.list": Method(
+        {"driver_id": str | None, "transport_id": str | None}, list[DiscoveryConfig]
+    ),
+    # -- shards (see sharding) --
+    "assign_transports": Method({"transport_ids": list[str], "lease": float | None}),
+    "renew_lease": Method({"lease": float}, bool),
+    "reload_driver": Method(_DRIVER),
+}
+
+# -- Errors --
+
+
+class RemoteError(Exception):
+    """An engine failure of a type not raised again as itself."""
+
+
+# Raised on the worker as themselves, so the API maps them as it would
+# locally; a subclass travels as the first of these it derives from.
+_ERRORS: dict[str, type[Exception]] = {
+    cls.__name__: cls
+    for cls in (
+        NotFoundError,
+        InvalidError,
+        ConflictError,
+        ConfirmationError,
+        UnauthorizedError,
+        StorageNotInitializedError,
+        ValueError,
+        TypeError,
+        KeyError,
+        TimeoutError,
+    )
+}
+
+
+def is_expected(exc: Exception) -> bool:
+    """Whether *exc* is a domain error rather than an engine failure."""
+    return isinstance(exc, (ValidationError, *_ERRORS.values()))
+
+
+def encode_error(exc: Exception) -> dict[str, Any]:
+    if isinstance(exc, ValidationError):
+        return {
+            "type": "ValidationError",
+            "title": exc.title,
+            "errors": exc.errors(
+                include_url=False, include_context=False, include_input=False
+            ),
+        }
+    name = next(
+        (cls.__name__ for cls in type(exc).__mro__ if _ERRORS.get(cls.__name__) is cls),
+        type(exc).__name__,
+    )
+    # args[0] rather than str(): str(KeyError("x")) is "'x'".
+    args = exc.args
+    message = args[0] if len(args) == 1 and isinstance(args[0], str) else str(exc)
+    return {"type": name, "message": message}
+
+
+def decode_error(error: Mapping[str, Any]) -> Exception:
+    if error["type"] == "ValidationError":
+        return ValidationError.from_exception_data(
+            error["title"],
+            [
+                {
+                    "type": PydanticCustomError(e["type"], e["msg"]),
+                    "loc": tuple(e["loc"]),
+                    "input": None,
+                }
+                for e in error["errors"]
+            ],
+        )
+    cls = _ERRORS.get(error["type"])
+    if cls is None:
+        return RemoteError(f"{error['type']}: {error['message']}")
+    return cls(error["message"])
+
+
+# -- Framing --
+
+
+def encode(message: Mapping[str, Any]) -> bytes:
+    body = to_json(message)
+    return _HEADER.pack(len(body)) + body
+
+
+def encode_request(request_id: int, name: str, params: Mapping[str, Any]) -> bytes:
+    """Frame of a call, with models sent without their unset fields so that a
+    patch still tells the fields it leaves alone from those it clears."""
+    params = {
+        key: value.model_dump(mode="json", exclude_unset=True)
+        if isinstance(value, BaseModel)
+        else value
+        for key, value in params.items()
+    }
+    return encode({"id": request_id, "method": name, "params": params})
+
+
+def _body_size(header: bytes) -> int:
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        msg = f"Frame of {size} bytes exceeds the {MAX_FRAME_SIZE} bytes limit"
+        raise ConnectionError(msg)
+    return size
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    """Next message, or ``None`` when the peer closed the connection."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            msg = "Connection closed in the middle of a frame"
+            raise ConnectionError(msg) from e
+        return None
+    try:
+        body = await reader.readexactly(_body_size(header))
+    except asyncio.IncompleteReadError as e:
+        msg = "Connection closed in the middle of a frame"
+        raise ConnectionError(msg) from e
+    return from_json(body)
+
+
+def recv_message(sock: socket.socket) -> dict[str, Any]:
+    """Next message on a blocking socket."""
+    header = _recv_exactly(sock, _HEADER.size)
+    return from_json(_recv_exactly(sock, _body_size(header)))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            msg = "Devices engine closed the connection"
+            raise ConnectionError(msg)
+        received += n
+    return bytes(buffer)
+
+
+__all__ = [
+    "MAX_FRAME_SIZE",
+    "METHODS",
+    "Method",
+    "RemoteError",
+    "decode_error",
+    "encode",
+    "encode_error",
+    "encode_request",
+    "is_expected",
+    "read_message",
+    "recv_message",
+]
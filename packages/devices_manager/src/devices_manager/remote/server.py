@@ -0,0 +1,192 @@
+"""Serve a :class:`DevicesService` to API workers over a Unix socket.
+
+The engine process owns the devices: it polls them, receives their pushes
+and writes to them, while any number of API worker processes reach it through
+a :class:`~devices_manager.remote.RemoteDevicesService`. Each request runs in
+its own task, so a slow device read never holds up the reads behind it.
+Attribute updates and discovered devices are encoded once and written to
+every subscribed worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
+import logging
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from devices_manager.ingress import IngressRequest
+
+from .protocol import METHODS, encode, encode_error, is_expected, read_message
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from devices_manager.core.device import Attribute, CoreDevice
+    from devices_manager.interface import DevicesServiceInterface
+
+    from .protocol import Method
+
+logger = logging.getLogger(__name__)
+
+# Event bytes a worker may leave unread before it is disconnected; it then
+# reconnects, rather than the engine buffering without bound.
+MAX_EVENT_BACKLOG = 16 * 1024 * 1024
+
+
+def _device_ref(device: CoreDevice) -> dict[str, str]:
+    return {"id": device.id, "name": device.name}
+
+
+class EngineServer:
+    """Answer the requests of API workers with a :class:`DevicesService`, or
+    the :class:`ShardedDevicesService` of a coordinator."""
+
+    def __init__(self, service: DevicesServiceInterface, path: str) -> None:
+        self._service = service
+        self._path = Path(path)
+        self._server: asyncio.Server | None = None
+        self._subscribers: set[asyncio.StreamWriter] = set()
+        self._listener_ids: tuple[str, str] | None = None
+
+    async def start(self) -> None:
+        # A socket file left by an engine that did not stop cleanly.
+        self._path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._serve, self._path)
+        self._path.chmod(0o600)
+        self._listener_ids = (
+            self._service.add_device_attribute_listener(self._on_attribute_update),
+            self._service.add_device_discovery_listener(self._on_device_discovered),
+        )
+        logger.info("Devices engine listening on %s", self._path)
+
+    async def stop(self) -> None:
+        if self._listener_ids is not None:
+            attribute_listener, discovery_listener = self._listener_ids
+            self._service.remove_device_attribute_listener(attribute_listener)
+            self._service.remove_device_discovery_listener(discovery_listener)
+            self._listener_ids = None
+        if self._server is not None:
+            self._server.close()
+            self._server.close_clients()
+            await self._server.wait_closed()
+            self._server = None
+        self._subscribers.clear()
+        self._path.unlink(missing_ok=True)
+
+    # -- Requests --
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        tasks: dict[int, asyncio.Task[None]] = {}
+        try:
+            while (message := await read_message(reader)) is not None:
+                request_id = message["id"]
+                name = message["method"]
+                if name == "subscribe":
+                    self._subscribers.add(writer)
+                    writer.write(encode({"id": request_id, "result": None}))
+                elif name == "cancel":
+                    task = tasks.get(message["params"]["id"])
+                    if task is not None:
+                        task.cancel()
+                else:
+                    task = asyncio.create_task(
+                        self._handle(writer, request_id, name, message["params"])
+                    )
+                    tasks[request_id] = task
+                    task.add_done_callback(lambda _, i=request_id: tasks.pop(i, None))
+        except ConnectionError:
+            logger.warning("Dropping a worker connection", exc_info=True)
+        finally:
+            self._subscribers.discard(writer)
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _handle(
+        self,
+        writer: asyncio.StreamWriter,
+        request_id: int,
+        name: str,
+        params: Mapping[str, Any],
+    ) -> None:
+        try:
+            method = METHODS.get(name)
+            if method is None:
+                msg = f"Unknown devices engine method {name!r}"
+                raise ValueError(msg)  # noqa: TRY301
+            kwargs = method.parse_params(params)
+            if method.stream:
+                async for item in attrgetter(name)(self._service)(**kwargs):
+                    writer.write(encode({"id": request_id, "item": item}))
+                    await writer.drain()
+                result = None
+            else:
+                result = await self._call(name, method, kwargs)
+            frame = encode({"id": request_id, "result": result})
+        except Exception as e:
+            if not is_expected(e):
+                logger.exception("Devices engine call %s failed", name)
+            frame = encode({"id": request_id, "error": encode_error(e)})
+        with contextlib.suppress(ConnectionError):
+            writer.write(frame)
+            await writer.drain()
+
+    async def _call(self, name: str, method: Method, kwargs: dict[str, Any]) -> Any:  # noqa: ANN401
+        if name == "ingress":
+            ingress = self._service.get_transport_ingress(kwargs.pop("transport_id"))
+            return await ingress.ingress(IngressRequest(**kwargs))
+        target = attrgetter(name)(self._service)
+        if method.attribute:
+            return target
+        result = target(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    # -- Events --
+
+    def _on_attribute_update(
+        self,
+        device: CoreDevice,
+        attribute_name: str,
+        previous: Attribute | None,
+        attribute: Attribute,
+    ) -> None:
+        if self._subscribers:
+            self._publish(
+                {
+                    "event": "attribute",
+                    "device": _device_ref(device),
+                    "attribute_name": attribute_name,
+                    "previous": previous,
+                    "attribute": attribute,
+                }
+            )
+
+    def _on_device_discovered(self, device: CoreDevice) -> None:
+        if self._subscribers:
+            self._publish({"event": "discovered", "device": _device_ref(device)})
+
+    def _publish(self, event: Mapping[str, Any]) -> None:
+        frame = encode(event)
+        for writer in list(self._subscribers):
+            transport = writer.transport
+            if transport.is_closing():
+                self._subscribers.discard(writer)
+            elif transport.get_write_buffer_size() > MAX_EVENT_BACKLOG:
+                logger.warning("Disconnecting a worker not reading its events")
+                self._subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(frame)
+
+
+__all__ = ["MAX_EVENT_BACKLOG", "EngineServer"]
@@ -0,0 +1,736 @@
+"""Devices spread over several engine processes, one per core.
+
+Each shard is an engine process running a :class:`DevicesService` created
+with ``owned_transports=()``: it runs no transport until a coordinator
+assigns it some. The coordinator, a :class:`ShardedDevicesService`, places
+every stored transport on one of the shards it is connected to with a
+:class:`HashRing`, so a transport and all its devices always run together
+and polling scales with the shards. It sends each call to the shard owning
+the transport or device concerned, and merges the answers of all shards for
+the calls covering every device.
+
+When a shard starts or stops, the transports are placed again over the
+shards then connected: only those of the shard gone, or a share of the
+others for a new one, move. Shards release theirs before any adopts, so a
+transport never runs twice. A shard the coordinator can no longer reach may
+still be running: it holds its transports on a lease the coordinator renews
+at each check, and releases them all once it runs out. Its transports are
+only handed to the others after that. Discoveries running on a moved
+transport are registered again on its new shard.
+
+Drivers are shared by all devices, so every shard loads them all: a change
+runs on the first shard, which stores it, then the others reload that driver
+from the storage, which the shards and the coordinator must share.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from bisect import bisect
+from itertools import chain
+from typing import TYPE_CHECKING, Any
+
+from devices_manager.core.transport_registry import build_transport_client
+from devices_manager.dto import transport_to_public
+from devices_manager.storage.factory import build_storage
+from models.errors import ConflictError, InvalidError, NotFoundError
+from models.ids import gen_id
+
+from .client import CALL_TIMEOUT_SECONDS, CONNECT_TIMEOUT_SECONDS, RemoteDevicesService
+from .protocol import METHODS
+
+if TYPE_CHECKING:
+    import builtins
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Collection,
+        Iterable,
+    )
+
+    from devices_manager.core.device import Attribute, AttributeListener, CoreDevice
+    from devices_manager.core.device.event_log import AttributeLogs
+    from devices_manager.core.discovery_manager import DiscoveryConfig
+    from devices_manager.core.driver.attribute_driver import AttributeDriver
+    from devices_manager.dto import (
+        AttributePatch,
+        Device,
+        DeviceCreate,
+        DeviceUpdate,
+        DriverPatch,
+        DriverSpec,
+        FaultView,
+        StandardAttributeSchema,
+        Transport,
+        TransportCreate,
+        TransportUpdate,
+    )
+    from devices_manager.ingress import MessageIngress
+    from devices_manager.interface import DeviceDiscoveredListener
+    from devices_manager.storage import DevicesManagerStorage
+    from devices_manager.types import AttributeValueType, DataType
+    from models.types import Severity
+
+logger = logging.getLogger(__name__)
+
+# How often the coordinator checks which shards are connected.
+SHARD_CHECK_INTERVAL_SECONDS = 1.0
+# How long a shard keeps its transports without hearing from the coordinator.
+SHARD_LEASE_SECONDS = 5.0
+# Points of each shard on the ring: more spread the transports more evenly.
+RING_REPLICAS = 64
+
+_NO_FILTERS = dict.fromkeys(METHODS["list_devices"].params)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest())
+
+
+class HashRing:
+    """Consistent hashing of keys onto nodes.
+
+    Each node holds ``replicas`` points on a ring of hashes, and a key
+    belongs to the node of the first point after its own hash. Adding or
+    removing a node only moves the keys it gains or held, about one in
+    ``len(nodes)``.
+    """
+
+    def __init__(self, nodes: Iterable[str], *, replicas: int = RING_REPLICAS) -> None:
+        points = sorted(
+            (_hash(f"{node}#{index}"), node)
+            for node in set(nodes)
+            for index in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def __bool__(self) -> bool:
+        return bool(self._nodes)
+
+    def owner(self, key: str) -> str:
+        if not self._nodes:
+            msg = "No node to place keys on"
+            raise LookupError(msg)
+        return self._nodes[bisect(self._hashes, _hash(key)) % len(self._nodes)]
+
+
+class ShardedDiscoveryManager:
+    def __init__(self, service: ShardedDevicesService) -> None:
+        self._service = service
+
+    def has(self, driver_id: str, transport_id: str) -> bool:
+        shard = self._service.transport_shard(transport_id)
+        return shard.discovery_manager.has(driver_id, transport_id)
+
+    async def register(self, driver_id: str, transport_id: str) -> None:
+        await self._service.wait_balanced()
+        shard = self._service.transport_shard(transport_id)
+        await shard.discovery_manager.register(driver_id, transport_id)
+
+    async def unregister(self, driver_id: str, transport_id: str) -> None:
+        await self._service.wait_balanced()
+        shard = self._service.transport_shard(transport_id)
+        await shard.discovery_manager.unregister(driver_id, transport_id)
+
+    def list(
+        self,
+        *,
+        driver_id: str | None = None,
+        transport_id: str | None = None,
+    ) -> builtins.list[DiscoveryConfig]:
+        shards = (
+            [self._service.transport_shard(transport_id)]
+            if transport_id is not None
+            else self._service.live_shards
+        )
+        return [
+            config
+            for shard in shards
+            for config in shard.discovery_manager.list(
+                driver_id=driver_id, transport_id=transport_id
+            )
+        ]
+
+
+class ShardedDevicesService:
+    """:class:`DevicesServiceInterface` over engine shards, coordinating them.
+
+    *shards* are the socket paths of the shard engines, which also name them
+    on the ring: a shard restarted on the same path gets its transports back.
+    Run a single coordinator for a set of shards.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        shards: Collection[str],
+        storage_url: str | None = None,
+        *,
+        connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+        call_timeout: float = CALL_TIMEOUT_SECONDS,
+        check_interval: float = SHARD_CHECK_INTERVAL_SECONDS,
+        lease: float = SHARD_LEASE_SECONDS,
+    ) -> None:
+        if not shards:
+            msg = "At least one shard is required"
+            raise ValueError(msg)
+        if lease <= check_interval:
+            msg = "The lease must outlast the check interval"
+            raise ValueError(msg)
+        self._storage_url = storage_url
+        self._connect_timeout = connect_timeout
+        self._check_interval = check_interval
+        self._lease = lease
+        # Shard path -> loop time after which it last got its lease renewed.
+        self._leased_at: dict[str, float] = {}
+        self._shards = {
+            path: RemoteDevicesService(
+                path, connect_timeout=None, call_timeout=call_timeout
+            )
+            for path in shards
+        }
+        self._storage: DevicesManagerStorage | None = None
+        self._ring = HashRing(())
+        self._live: list[str] = []
+        # Shards the current placement was completed for; None until then.
+        self._balanced_for: list[str] | None = None
+        self._balanced = asyncio.Event()
+        self._rebalancing = asyncio.Lock()
+        self._generation = 0
+        # Device id -> path of its shard, filled as devices are looked up.
+        self._device_shards: dict[str, str] = {}
+        self._tasks: set[asyncio.Task[Any]] = set()
+        self._listeners: dict[str, list[tuple[RemoteDevicesService, str]]] = {}
+        self._discovery_manager = ShardedDiscoveryManager(self)
+        for path, shard in self._shards.items():
+            shard.add_device_attribute_listener(self._track_device(path))
+            shard.add_device_discovery_listener(self._track_device(path))
+
+    # -- Lifecycle --
+
+    async def start(self) -> None:
+        """Connect to the shards and place the transports on them.
+
+        Waits up to ``connect_timeout`` for every shard, so that those
+        starting together share the first placement; the others join as
+        they come up.
+        """
+        self._storage = await build_storage(self._storage_url)
+        # A previous coordinator may have renewed their leases just now.
+        now = asyncio.get_running_loop().time()
+        self._leased_at = dict.fromkeys(self._shards, now)
+        connecting = [self._spawn(shard.start()) for shard in self._shards.values()]
+        await asyncio.wait(connecting, timeout=self._connect_timeout)
+        await self._rebalance()
+        self._spawn(self._watch_shards())
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await asyncio.gather(*(shard.stop() for shard in self._shards.values()))
+        if self._storage is not None:
+            await self._storage.close()
+            self._storage = None
+
+    def _spawn(self, coro: Awaitable[Any]) -> asyncio.Task[Any]:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    # -- Placement --
+
+    @property
+    def live_shards(self) -> list[RemoteDevicesService]:
+        """The shards of the current placement, in the order given."""
+        return [self._shards[path] for path in self._live]
+
+    def _connected(self) -> list[str]:
+        return [path for path, shard in self._shards.items() if shard.connected]
+
+    async def _watch_shards(self) -> None:
+        while True:
+            await asyncio.sleep(self._check_interval)
+            await self._renew_leases()
+            if self._connected() != self._balanced_for:
+                try:
+                    await self._rebalance()
+                except Exception:
+                    # Tried again on the next check.
+                    logger.exception("Failed to place transports on the shards")
+
+    async def _renew_leases(self) -> None:
+        live = [path for path in self._live if self._shards[path].connected]
+        renewed = await asyncio.gather(
+            *(
+                self._shards[path].call("renew_lease", lease=self._lease)
+                for path in live
+            ),
+            return_exceptions=True,
+        )
+        now = asyncio.get_running_loop().time()
+        for path, held in zip(live, renewed, strict=True):
+            # Counted from now: the shard may have taken it even on a failure.
+            self._leased_at[path] = now
+            if held is False:
+                logger.warning("Shard %s lost its transports lease", path)
+                self._balanced_for = None
+            elif isinstance(held, Exception):
+                logger.warning("Failed to renew the lease of shard %s: %s", path, held)
+
+    async def _wait_leases(self, gone: Iterable[str]) -> None:
+        """Wait for the shards *gone* to have released their transports."""
+        loop = asyncio.get_running_loop()
+        expiry = max((self._leased_at[path] + self._lease for path in gone), default=0)
+        if expiry > loop.time():
+            logger.info(
+                "Waiting %.1f s for unreachable shards to release their transports",
+                expiry - loop.time(),
+            )
+        # The shards still connected keep theirs meanwhile.
+        while (delay := expiry - loop.time()) > 0:
+            await asyncio.sleep(min(delay, self._check_interval))
+            await self._renew_leases()
+
+    async def _rebalance(self) -> None:
+        """Place every stored transport on one of the connected shards."""
+        if self._storage is None:
+            msg = "ShardedDevicesService used before start()"
+            raise ConnectionError(msg)
+        async with self._rebalancing:
+            self._balanced.clear()
+            try:
+                await self._place(self._storage)
+            finally:
+                self._balanced.set()
+
+    async def _place(self, storage: DevicesManagerStorage) -> None:
+        live = self._connected()
+        ring = HashRing(live)
+        placement: dict[str, set[str]] = {path: set() for path in live}
+        for transport_id in await storage.transports.list_all():
+            placement[ring.owner(transport_id)].add(transport_id)
+        shards = [self._shards[path] for path in live]
+        owned, discoveries = await asyncio.gather(
+            asyncio.gather(*(shard.call("transport_ids") for shard in shards)),
+            asyncio.gather(
+                *(
+                    shard.call(
+                        "discovery_manager.list", driver_id=None, transport_id=None
+                    )
+                    for shard in shards
+                )
+            ),
+        )
+        # Release first: a transport must never run on two shards at once.
+        await asyncio.gather(
+            *(
+                shard.call(
+                    "assign_transports",
+                    transport_ids=sorted(placement[path] & current),
+                    lease=self._lease,
+                )
+                for path, shard, current in zip(live, shards, owned, strict=True)
+            )
+        )
+        # Shards no longer reachable may still run theirs until their lease
+        # runs out; before the first placement, any shard may hold some.
+        held = self._live if self._balanced_for is not None else self._shards
+        await self._wait_leases(path for path in held if path not in live)
+        self._ring, self._live = ring, live
+        self._generation += 1
+        self._device_shards.clear()
+        await asyncio.gather(
+            *(
+                shard.call(
+                    "assign_transports",
+                    transport_ids=sorted(placement[path]),
+                    lease=self._lease,
+                )
+                for path, shard in zip(live, shards, strict=True)
+            )
+        )
+        now = asyncio.get_running_loop().time()
+        self._leased_at.update(dict.fromkeys(live, now))
+        for config in chain.from_iterable(discoveries):
+            shard = self._shards[ring.owner(config["transport_id"])]
+            if not await shard.call("discovery_manager.has", **config):
+                await shard.call("discovery_manager.register", **config)
+        self._balanced_for = live
+        logger.info(
+            "Placed %d transports on %d shards",
+            sum(len(ids) for ids in placement.values()),
+            len(live),
+        )
+
+    async def wait_balanced(self) -> None:
+        """Wait for a placement in progress to complete."""
+        await self._balanced.wait()
+
+    def _transport_path(self, transport_id: str) -> str:
+        if not self._ring:
+            msg = "No devices engine shard is connected"
+            raise ConnectionError(msg)
+        return self._ring.owner(transport_id)
+
+    def transport_shard(self, transport_id: str) -> RemoteDevicesService:
+        """The shard running *transport_id*, or that would run a new one."""
+        return self._shards[self._transport_path(transport_id)]
+
+    def _note_devices(self, device_ids: Iterable[set[str]]) -> None:
+        for path, ids in zip(self._live, device_ids, strict=True):
+            self._device_shards.update(dict.fromkeys(ids, path))
+
+    def _known_device_shard(self, device_id: str) -> RemoteDevicesService:
+        path = self._device_shards.get(device_id)
+        if path is None:
+            msg = f"Device {device_id} not found"
+            raise NotFoundError(msg)
+        return self._shards[path]
+
+    def _device_shard(self, device_id: str) -> RemoteDevicesService:
+        if device_id not in self._device_shards:
+            self._note_devices(shard.device_ids for shard in self.live_shards)
+        return self._known_device_shard(device_id)
+
+    async def _locate_device(self, device_id: str) -> RemoteDevicesService:
+        """:meth:`_device_shard`, once placed, without blocking the loop."""
+        await self.wait_balanced()
+        if device_id not in self._device_shards:
+            self._note_devices(
+                await asyncio.gather(
+                    *(shard.call("device_ids") for shard in self.live_shards)
+                )
+            )
+        return self._known_device_shard(device_id)
+
+    def _track_device(self, path: str) -> Callable[..., None]:
+        """Listener noting the shard of the devices it hears of."""
+
+        def track(device: CoreDevice, *_: object) -> None:
+            self._device_shards[device.id] = path
+
+        return track
+
+    def _primary(self) -> RemoteDevicesService:
+        """The shard answering for the drivers, which all shards hold."""
+        if not self._live:
+            msg = "No devices engine shard is connected"
+            raise ConnectionError(msg)
+        return self._shards[self._live[0]]
+
+    async def _reload_driver[T](self, driver_id: str, change: Awaitable[T]) -> T:
+        """Await *change*, made on the primary shard, then have the other
+        shards reload the driver it stored."""
+        result = await change
+        await asyncio.gather(
+            *(
+                shard.call("reload_driver", driver_id=driver_id)
+                for shard in self.live_shards[1:]
+            )
+        )
+        return result
+
+    # -- Properties --
+
+    @property
+    def transport_ids(self) -> set[str]:
+        return set().union(*(shard.transport_ids for shard in self.live_shards))
+
+    @property
+    def driver_ids(self) -> set[str]:
+        return self._primary().driver_ids
+
+    @property
+    def device_ids(self) -> set[str]:
+        return set().union(*(shard.device_ids for shard in self.live_shards))
+
+    @property
+    def discovery_manager(self) -> ShardedDiscoveryManager:
+        return self._discovery_manager
+
+    # -- Devices --
+
+    def list_devices(  # noqa: PLR0913
+        self,
+        *,
+        ids: Collection[str] | None = None,
+        types: list[str] | None = None,
+        attribute: str | None = None,
+        writable_attribute: str | None = None,
+        writable_attribute_type: DataType | None = None,
+        tags: dict[str, list[str]] | None = None,
+        is_faulty: bool | None = None,
+        search: str | None = None,
+        driver_id: str | None = None,
+        transport_id: str | None = None,
+    ) -> list[Device]:
+        shards = (
+            [self.transport_shard(transport_id)]
+            if transport_id is not None
+            else self.live_shards
+        )
+        return [
+            device
+            for shard in shards
+            for device in shard.list_devices(
+                ids=ids,
+                types=types,
+                attribute=attribute,
+                writable_attribute=writable_attribute,
+                writable_attribute_type=writable_attribute_type,
+                tags=tags,
+                is_faulty=is_faulty,
+                search=search,
+                driver_id=driver_id,
+                transport_id=transport_id,
+            )
+        ]
+
+    def get_device(self, device_id: str) -> Device:
+        return self._device_shard(device_id).get_device(device_id)
+
+    def devices_revision(self, *, structural: bool = False) -> str:
+        revisions = (
+            shard.devices_revision(structural=structural) for shard in self.live_shards
+        )
+        return f"{self._generation}:{'/'.join(revisions)}"
+
+    async def add_device(self, device_create: DeviceCreate) -> Device:
+        await self.wait_balanced()
+        path = self._transport_path(device_create.transport_id)
+        device = await self._shards[path].add_device(device_create)
+        self._device_shards[device.id] = path
+        return device
+
+    async def update_device(
+        self, device_id: str, device_update: DeviceUpdate
+    ) -> Device:
+        shard = await self._locate_device(device_id)
+        transport_id = device_update.transport_id
+        if transport_id is not None and self.transport_shard(transport_id) is not shard:
+            msg = (
+                f"Transport {transport_id} runs on another engine shard than "
+                f"device {device_id}: delete the device and add it again"
+            )
+            raise InvalidError(msg)
+        return await shard.update_device(device_id, device_update)
+
+    async def delete_device(self, device_id: str) -> None:
+        shard = await self._locate_device(device_id)
+        await shard.delete_device(device_id)
+        self._device_shards.pop(device_id, None)
+
+    async def set_device_tag(self, device_id: str, key: str, value: str) -> Device:
+        shard = await self._locate_device(device_id)
+        return await shard.set_device_tag(device_id, key, value)
+
+    async def delete_device_tag(self, device_id: str, key: str) -> Device:
+        shard = await self._locate_device(device_id)
+        return await shard.delete_device_tag(device_id, key)
+
+    async def read_device(self, device_id: str) -> Device:
+        shard = await self._locate_device(device_id)
+        return await shard.read_device(device_id)
+
+    async def refresh_device_attribute(
+        self, device_id: str, attribute_name: str
+    ) -> Attribute:
+        shard = await self._locate_device(device_id)
+        return await shard.refresh_device_attribute(device_id, attribute_name)
+
+    async def stream_device_read(
+        self, device_id: str
+    ) -> AsyncIterator[tuple[str, AttributeValueType | None]]:
+        shard = await self._locate_device(device_id)
+        async for item in shard.stream_device_read(device_id):
+            yield item
+
+    async def start_device_sync(self, device_id: str) -> None:
+        shard = await self._locate_device(device_id)
+        await shard.start_device_sync(device_id)
+
+    async def stop_device_sync(self, device_id: str) -> None:
+        shard = await self._locate_device(device_id)
+        await shard.stop_device_sync(device_id)
+
+    async def write_device_attribute(
+        self,
+        device_id: str,
+        attribute_name: str,
+        value: AttributeValueType,
+        *,
+        confirm: bool = True,
+    ) -> Attribute:
+        shard = await self._locate_device(device_id)
+        return await shard.write_device_attribute(
+            device_id, attribute_name, value, confirm=confirm
+        )
+
+    def get_attribute_logs(self, device_id: str, attribute_name: str) -> AttributeLogs:
+        shard = self._device_shard(device_id)
+        return shard.get_attribute_logs(device_id, attribute_name)
+
+    # -- Faults --
+
+    def list_active_faults(
+        self,
+        *,
+        severity: Severity | None = None,
+        device_id: str | None = None,
+    ) -> list[FaultView]:
+        shards = (
+            [self._device_shard(device_id)]
+            if device_id is not None
+            else self.live_shards
+        )
+        faults = [
+            fault
+            for shard in shards
+            for fault in shard.list_active_faults(
+                severity=severity, device_id=device_id
+            )
+        ]
+        faults.sort(key=lambda f: f.last_updated, reverse=True)
+        return faults
+
+    # -- Transports --
+
+    def list_transports(self) -> list[Transport]:
+        return [
+            transport
+            for shard in self.live_shards
+            for transport in shard.list_transports()
+        ]
+
+    def get_transport(self, transport_id: str) -> Transport:
+        return self.transport_shard(transport_id).get_transport(transport_id)
+
+    def get_transport_ingress(self, transport_id: str) -> MessageIngress:
+        return self.transport_shard(transport_id).get_transport_ingress(transport_id)
+
+    async def add_transport(self, transport: TransportCreate | Transport) -> Transport:
+        # Its id places it, so it is given one before going to its shard.
+        stored = transport_to_public(build_transport_client(transport))
+        async with self._rebalancing:
+            return await self.transport_shard(stored.id).add_transport(stored)
+
+    async def update_transport(
+        self, transport_id: str, update: TransportUpdate
+    ) -> Transport:
+        await self.wait_balanced()
+        shard = self.transport_shard(transport_id)
+        return await shard.update_transport(transport_id, update)
+
+    async def delete_transport(self, transport_id: str) -> None:
+        async with self._rebalancing:
+            await self.transport_shard(transport_id).delete_transport(transport_id)
+
+    # -- Drivers --
+
+    def list_drivers(self, *, device_type: str | None = None) -> list[DriverSpec]:
+        return self._primary().list_drivers(device_type=device_type)
+
+    def get_driver(self, driver_id: str) -> DriverSpec:
+        return self._primary().get_driver(driver_id)
+
+    async def add_driver(self, driver_dto: DriverSpec) -> DriverSpec:
+        return await self._reload_driver(
+            driver_dto.id, self._primary().add_driver(driver_dto)
+        )
+
+    async def patch_driver(self, driver_id: str, patch: DriverPatch) -> DriverSpec:
+        return await self._reload_driver(
+            driver_id, self._primary().patch_driver(driver_id, patch)
+        )
+
+    async def create_driver_attribute(
+        self, driver_id: str, attribute: AttributeDriver
+    ) -> AttributeDriver:
+        return await self._reload_driver(
+            driver_id, self._primary().create_driver_attribute(driver_id, attribute)
+        )
+
+    async def patch_driver_attribute(
+        self, driver_id: str, attribute_id: str, patch: AttributePatch
+    ) -> AttributeDriver:
+        return await self._reload_driver(
+            driver_id,
+            self._primary().patch_driver_attribute(driver_id, attribute_id, patch),
+        )
+
+    async def delete_driver_attribute(
+        self, driver_id: str, attribute_id: str
+    ) -> DriverSpec:
+        return await self._reload_driver(
+            driver_id, self._primary().delete_driver_attribute(driver_id, attribute_id)
+        )
+
+    async def rename_driver_attribute(
+        self, driver_id: str, attribute_id: str, new_name: str
+    ) -> AttributeDriver:
+        return await self._reload_driver(
+            driver_id,
+            self._primary().rename_driver_attribute(driver_id, attribute_id, new_name),
+        )
+
+    async def delete_driver(self, driver_id: str) -> None:
+        # The primary shard only knows of its own devices.
+        used = await asyncio.gather(
+            *(
+                shard.call("list_devices", **{**_NO_FILTERS, "driver_id": driver_id})
+                for shard in self.live_shards
+            )
+        )
+        devices = list(chain.from_iterable(used))
+        if devices:
+            msg = f"Driver {driver_id} is used by device {devices[0].id}"
+            raise ConflictError(msg)
+        await self._reload_driver(driver_id, self._primary().delete_driver(driver_id))
+
+    # -- Standard schemas --
+
+    def list_standard_schemas(self) -> list[StandardAttributeSchema]:
+        return self._primary().list_standard_schemas()
+
+    # -- Listeners --
+
+    def add_device_attribute_listener(self, callback: AttributeListener) -> str:
+        """Register a handler for the attribute updates of every shard."""
+        listener_id = gen_id()
+        self._listeners[listener_id] = [
+            (shard, shard.add_device_attribute_listener(callback))
+            for shard in self._shards.values()
+        ]
+        return listener_id
+
+    def remove_device_attribute_listener(self, listener_id: str) -> None:
+        for shard, shard_listener_id in self._listeners.pop(listener_id, []):
+            shard.remove_device_attribute_listener(shard_listener_id)
+
+    def add_device_discovery_listener(self, callback: DeviceDiscoveredListener) -> str:
+        """Register a handler for the devices every shard discovers."""
+        listener_id = gen_id()
+        self._listeners[listener_id] = [
+            (shard, shard.add_device_discovery_listener(callback))
+            for shard in self._shards.values()
+        ]
+        return listener_id
+
+    def remove_device_discovery_listener(self, listener_id: str) -> None:
+        for shard, shard_listener_id in self._listeners.pop(listener_id, []):
+            shard.remove_device_discovery_listener(shard_listener_id)
+
+
+__all__ = [
+    "RING_REPLICAS",
+    "SHARD_CHECK_INTERVAL_SECONDS",
+    "SHARD_LEASE_SECONDS",
+    "HashRing",
+    "ShardedDevicesService",
+    "ShardedDiscoveryManager",
+]
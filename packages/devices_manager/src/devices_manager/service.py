@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
@@ -24,7 +25,7 @@ from .core.discovery_manager import (
 from .core.driver_registry import DriverRegistry
 from .core.standard_schemas.registry import default_registry
 from .core.transport_registry import TransportRegistry, build_transport_client
-from .core.transports import TransportClient
+from .core.transports import PushTransportClient, TransportClient
 from .dto import (
     AttributePatch,
     Device,
@@ -47,10 +48,15 @@ from .dto import (
     transport_to_public,
 )
 from .ingress import MessageIngress
+from .storage.attribute_buffer import (
+    ATTRIBUTE_FLUSH_INTERVAL_SECONDS,
+    ATTRIBUTE_FLUSH_MAX_BATCH_SIZE,
+    AttributeWriteBuffer,
+)
 from .storage.factory import build_storage
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator, Collection
+    from collections.abc import AsyncIterator, Callable, Collection
 
     from models.types import Severity
 
@@ -70,6 +76,11 @@ logger = logging.getLogger(__name__)
 # cap rather than an open-ended wait.
 TRANSPORT_CLOSE_TIMEOUT_SECONDS = 10
 
+# How many devices start (or transports subscribe) at the same time during
+# start(). Bounds the burst of connections and subscriptions a large fleet
+# would otherwise open against its gateways and brokers.
+DEVICE_STARTUP_CONCURRENCY = 32
+
 
 async def _close_transport(transport: TransportClient) -> None:
     try:
@@ -112,14 +123,25 @@ class _LoadedState:
 class DevicesService(Service):
     _discovery_manager: DevicesDiscoveryManager
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         storage_url: str | None = None,
         *,
         drivers: dict[str, Driver] | None = None,
         transports: dict[str, TransportClient] | None = None,
         devices: dict[str, CoreDevice] | None = None,
+        attribute_flush_interval: float = ATTRIBUTE_FLUSH_INTERVAL_SECONDS,
+        attribute_flush_max_batch_size: int = ATTRIBUTE_FLUSH_MAX_BATCH_SIZE,
+        startup_concurrency: int = DEVICE_STARTUP_CONCURRENCY,
+        startup_ramp_seconds: float = 0.0,
+        owned_transports: Collection[str] | None = None,
     ) -> None:
+        if startup_concurrency < 1:
+            msg = "startup_concurrency must be at least 1"
+            raise ValueError(msg)
+        if startup_ramp_seconds < 0:
+            msg = "startup_ramp_seconds must not be negative"
+            raise ValueError(msg)
         self._storage_url = storage_url
         self._seed_drivers = drivers if drivers is not None else {}
         self._seed_transports = transports if transports is not None else {}
@@ -130,6 +152,19 @@ class DevicesService(Service):
         self._attribute_update_handlers: dict[str, AttributeListener] = {}
         self._discovery_listeners: dict[str, DeviceDiscoveredListener] = {}
         self._background_tasks: set[asyncio.Task[Any]] = set()
+        self._attribute_flush_interval = attribute_flush_interval
+        self._attribute_flush_max_batch_size = attribute_flush_max_batch_size
+        self._attribute_buffer: AttributeWriteBuffer | None = None
+        self._startup_concurrency = startup_concurrency
+        self._startup_ramp_seconds = startup_ramp_seconds
+        # Transports this service runs, with their devices, as one shard of
+        # several sharing a storage (see assign_transports). None: all.
+        self._owned_transports = (
+            set(owned_transports) if owned_transports is not None else None
+        )
+        # Releases every transport unless renewed (see assign_transports).
+        self._lease_task: asyncio.Task[None] | None = None
+        self._assigning = asyncio.Lock()
 
     @property
     def _state(self) -> _LoadedState:
@@ -159,13 +194,73 @@ class DevicesService(Service):
     async def start(self) -> None:
         """Load from storage, then start syncing devices."""
         await self.load()
-        self._register_attribute_persistence_listener()
+        await self._register_attribute_persistence_listener()
         self._running = True
-        for device in self._device_registry.all.values():
-            try:
-                await device.start_sync()
-            except Exception:
-                logger.exception("Failed to start sync for device %s", device.id)
+        await self._start_devices(list(self._device_registry.all.values()))
+
+    async def _start_devices(self, devices: list[CoreDevice]) -> None:
+        """Start devices concurrently, at most ``startup_concurrency`` at once.
+
+        Push listeners are subscribed first with one batched call per
+        transport, and each device's first poll is offset along
+        ``startup_ramp_seconds`` so polling does not start in lockstep.
+        """
+        semaphore = asyncio.Semaphore(self._startup_concurrency)
+        subscribed = await self._register_listeners_by_transport(devices, semaphore)
+
+        async def _start(index: int, device: CoreDevice) -> None:
+            async with semaphore:
+                try:
+                    await device.start_sync(
+                        register_listeners=device.id not in subscribed,
+                        poll_delay=self._startup_ramp_seconds * index / len(devices),
+                    )
+                except Exception:
+                    logger.exception("Failed to start sync for device %s", device.id)
+
+        await asyncio.gather(
+            *(_start(index, device) for index, device in enumerate(devices))
+        )
+
+    async def _register_listeners_by_transport(
+        self, devices: list[CoreDevice], semaphore: asyncio.Semaphore
+    ) -> set[str]:
+        """Register the listeners of all devices sharing a push transport in
+        one ``register_listeners`` call; returns the ids of devices covered.
+
+        A failed batch is rolled back by the transport and its devices are
+        left out, so they register individually in ``start_sync`` and one bad
+        address only fails its own device.
+        """
+        by_transport: dict[str, list[CoreDevice]] = defaultdict(list)
+        for device in devices:
+            if isinstance(device.transport, PushTransportClient):
+                by_transport[device.transport_id].append(device)
+        subscribed: set[str] = set()
+
+        async def _register(transport_devices: list[CoreDevice]) -> None:
+            transport = transport_devices[0].transport
+            assert isinstance(transport, PushTransportClient)  # noqa: S101
+            async with semaphore:
+                try:
+                    bindings = [
+                        binding
+                        for device in transport_devices
+                        for binding in device.listener_bindings()
+                    ]
+                    await transport.register_listeners(bindings)
+                except Exception:  # noqa: BLE001 - retried per device below
+                    logger.warning(
+                        "Batched listener registration failed on transport %s, "
+                        "falling back to per-device registration",
+                        transport.id,
+                        exc_info=True,
+                    )
+                    return
+            subscribed.update(device.id for device in transport_devices)
+
+        await asyncio.gather(*(_register(group) for group in by_transport.values()))
+        return subscribed
 
     async def load(self) -> None:
         """Build storage and registries once, and hydrate them read-only.
@@ -204,10 +299,16 @@ class DevicesService(Service):
     async def stop(self) -> None:
         """Stop syncing, close transports, and release storage. Idempotent."""
         self._running = False
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            self._lease_task = None
         if self._loaded is None:
             return
         for device in self._device_registry.all.values():
             await device.stop_sync()
+        if self._attribute_buffer is not None:
+            await self._attribute_buffer.stop()
+            self._attribute_buffer = None
         await asyncio.gather(
             *(_close_transport(t) for t in self._transport_registry.all.values())
         )
@@ -218,27 +319,176 @@ class DevicesService(Service):
         """Entities skipped during the last :meth:`load`. Empty on a clean boot."""
         return list(self._load_errors)
 
+    # -- Sharding --
+
+    def _owns(self, transport_id: str) -> bool:
+        return self._owned_transports is None or transport_id in self._owned_transports
+
+    async def assign_transports(
+        self, transport_ids: Collection[str], *, lease: float | None = None
+    ) -> None:
+        """Run exactly *transport_ids* and their devices, as one shard of
+        several sharing a storage.
+
+        Transports no longer assigned are released first: their discoveries
+        and devices stop, and they leave memory but not storage. Those newly
+        assigned are then read back from storage with their devices, which
+        start syncing.
+
+        Given a *lease* in seconds, every transport is released once it runs
+        out without :meth:`renew_lease`: a shard cut off from its
+        coordinator stops them before the coordinator hands them to another.
+        The lease is counted again once they run: the coordinator cannot
+        renew it while waiting for this.
+        """
+        if lease is not None:
+            self._arm_lease(lease)
+        async with self._assigning:
+            await self._assign_transports(transport_ids)
+        if lease is not None:
+            self._arm_lease(lease)
+
+    def renew_lease(self, lease: float) -> bool:
+        """Extend the lease of the assigned transports to *lease* seconds
+        from now; False when it ran out already, releasing them."""
+        if self._lease_task is None:
+            return False
+        self._arm_lease(lease)
+        return True
+
+    def _arm_lease(self, lease: float) -> None:
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+        self._lease_task = asyncio.create_task(self._expire_lease(lease))
+
+    async def _expire_lease(self, lease: float) -> None:
+        await asyncio.sleep(lease)
+        try:
+            async with self._assigning:
+                # Past this point a new lease must not cancel the release;
+                # until then, one armed by an assignment in progress does.
+                self._lease_task = None
+                logger.warning("Transports lease ran out, releasing every transport")
+                await self._assign_transports(())
+        except Exception:
+            logger.exception("Failed to release the transports")
+
+    async def _assign_transports(self, transport_ids: Collection[str]) -> None:
+        assigned = set(transport_ids)
+        for transport_id in self._transport_registry.ids - assigned:
+            await self._release_transport(transport_id)
+        adopted = assigned - self._transport_registry.ids
+        self._owned_transports = assigned
+        if not adopted:
+            return
+        stored, failures = await self._storage.transports.read_all_lenient()
+        for transport_id, exc in failures.items():
+            if transport_id in adopted:
+                self._record_load_error(
+                    "transport", transport_id, "unreadable entry", exc
+                )
+        for dto in stored:
+            if dto.id not in adopted:
+                continue
+            try:
+                self._transport_registry.attach(build_transport_client(dto))
+            except Exception:  # noqa: BLE001 -- fault-tolerant load
+                self._record_load_error("transport", dto.id, "failed to initialize")
+        devices = await self._attach_stored_devices(
+            lambda dto: dto.transport_id in adopted
+        )
+        if self._running and devices:
+            await self._start_devices(devices)
+
+    async def _release_transport(self, transport_id: str) -> None:
+        for config in self.discovery_manager.list(transport_id=transport_id):
+            await self.discovery_manager.unregister(
+                config["driver_id"], config["transport_id"]
+            )
+        for device in self._device_registry.find(transport_id=transport_id):
+            await device.stop_sync()
+            self._device_registry.detach(device.id)
+        await _close_transport(self._transport_registry.detach(transport_id))
+
+    async def reload_driver(self, driver_id: str) -> None:
+        """Take the stored version of a driver another shard added, changed
+        or deleted, and rebuild the devices using it from storage."""
+        try:
+            dto = await self._storage.drivers.read(driver_id)
+        except FileNotFoundError:
+            dto = None
+        reloaded: set[str] = set()
+        for device in self._device_registry.find(driver_id=driver_id):
+            await device.stop_sync()
+            self._device_registry.detach(device.id)
+            reloaded.add(device.id)
+        if dto is not None:
+            self._driver_registry.attach(driver_from_public(dto))
+        elif driver_id in self._driver_registry.ids:
+            self._driver_registry.detach(driver_id)
+        devices = await self._attach_stored_devices(lambda dto: dto.id in reloaded)
+        if self._running and devices:
+            await self._start_devices(devices)
+
+    async def _attach_stored_devices(
+        self, selected: Callable[[Device], bool]
+    ) -> list[CoreDevice]:
+        """Build the *selected* stored devices not in memory yet and register
+        them, without persisting them back."""
+        stored, _ = await self._storage.devices.read_all_lenient()
+        devices: list[CoreDevice] = []
+        for dto in stored:
+            if not selected(dto) or dto.id in self._device_registry.all:
+                continue
+            try:
+                device = device_from_public(
+                    dto,
+                    self._driver_registry.all,
+                    self._transport_registry.all,
+                    on_update=self._on_attribute_update,
+                )
+            except KeyError:
+                self._record_load_error("device", dto.id, "missing driver or transport")
+                continue
+            except Exception:  # noqa: BLE001 -- fault-tolerant load
+                self._record_load_error("device", dto.id, "failed to initialize")
+                continue
+            self._device_registry.attach(device)
+            devices.append(device)
+        return devices
+
     # -- Read-only hydration (seeded entities win over stored duplicates) --
 
     def _record_load_error(
-        self, kind: LoadEntityKind, entity_id: str, reason: str
+        self,
+        kind: LoadEntityKind,
+        entity_id: str,
+        reason: str,
+        exc: BaseException | None = None,
     ) -> None:
-        """Record a skipped entity. Must be called from an ``except`` block."""
+        """Record a skipped entity.
+
+        Logs ``exc`` if given, otherwise the exception being handled (the
+        call must then come from an ``except`` block).
+        """
         self._load_errors.append(
             LoadError(kind=kind, entity_id=entity_id, reason=reason)
         )
-        logger.exception("Skipped %s '%s' during load: %s", kind, entity_id, reason)
+        logger.exception(
+            "Skipped %s '%s' during load: %s",
+            kind,
+            entity_id,
+            reason,
+            exc_info=exc if exc is not None else True,
+        )
 
     async def _read_entities[M: BaseModel](
         self, backend: StorageBackend[M], kind: LoadEntityKind
     ) -> list[M]:
-        """Read stored entities one by one, skipping unreadable entries."""
-        entities: list[M] = []
-        for item_id in await backend.list_all():
-            try:
-                entities.append(await backend.read(item_id))
-            except Exception:  # noqa: BLE001 -- fault-tolerant load
-                self._record_load_error(kind, item_id, "unreadable entry")
+        """Read stored entities in bulk, skipping unreadable entries."""
+        entities, failures = await backend.read_all_lenient()
+        for item_id, exc in failures.items():
+            self._record_load_error(kind, item_id, "unreadable entry", exc)
         return entities
 
     async def _load_transports(
@@ -246,7 +496,7 @@ class DevicesService(Service):
     ) -> dict[str, TransportClient]:
         transports = dict(self._seed_transports)
         for dto in await self._read_entities(storage.transports, "transport"):
-            if dto.id in transports:
+            if dto.id in transports or not self._owns(dto.id):
                 continue
             try:
                 transports[dto.id] = build_transport_client(dto)
@@ -273,7 +523,7 @@ class DevicesService(Service):
     ) -> dict[str, CoreDevice]:
         devices = dict(self._seed_devices)
         for dto in await self._read_entities(storage.devices, "device"):
-            if dto.id in devices:
+            if dto.id in devices or not self._owns(dto.transport_id):
                 continue
             try:
                 devices[dto.id] = device_from_public(
@@ -285,21 +535,29 @@ class DevicesService(Service):
                 self._record_load_error("device", dto.id, "failed to initialize")
         return devices
 
-    def _register_attribute_persistence_listener(self) -> None:
-        """Persist attribute values on change.
+    async def _register_attribute_persistence_listener(self) -> None:
+        """Persist attribute values on change, write-behind.
 
-        The listener is async and fire-and-forget: it does not block the
-        polling or write hot path.
+        The listener only records the latest value per (device, attribute)
+        in an :class:`AttributeWriteBuffer`, which flushes them in batches
+        on an interval and drains on :meth:`stop`. Stored values only serve
+        warm restarts, so a few seconds of staleness is acceptable.
         """
-        storage = self._storage
+        buffer = AttributeWriteBuffer(
+            self._storage,
+            flush_interval=self._attribute_flush_interval,
+            max_batch_size=self._attribute_flush_max_batch_size,
+        )
+        await buffer.start()
+        self._attribute_buffer = buffer
 
-        async def _persist_attribute(
+        def _persist_attribute(
             device: CoreDevice,
             _attribute_name: str,
             _previous: Attribute | None,
             attribute: Attribute,
         ) -> None:
-            await storage.save_attribute(device.id, attribute)
+            buffer.add(device.id, attribute)
 
         self.add_device_attribute_listener(_persist_attribute)
 
@@ -339,6 +597,13 @@ class DevicesService(Service):
     def get_device(self, device_id: str) -> Device:
         return self._device_registry.get_dto(device_id)
 
+    def devices_revision(self, *, structural: bool = False) -> str:
+        """Opaque token that changes whenever :meth:`list_devices` may return
+        something else; with *structural*, only when something other than
+        attribute values may differ (names, tags, config, attribute sets).
+        """
+        return self._device_registry.revision(structural=structural)
+
     async def add_device(self, device_create: DeviceCreate) -> Device:
         device = await self._device_registry.add(device_create)
         if self._running:
@@ -364,6 +629,8 @@ class DevicesService(Service):
         device = self._device_registry.get(device_id)
         await device.stop_sync()
         await self._device_registry.remove(device_id)
+        if self._attribute_buffer is not None:
+            self._attribute_buffer.discard_device(device_id)
 
     async def set_device_tag(self, device_id: str, key: str, value: str) -> Device:
         device = await self._device_registry.set_tag(device_id, key, value)
@@ -562,25 +829,23 @@ class DevicesService(Service):
         return client
 
     async def add_transport(self, transport: TransportCreate | Transport) -> Transport:
-        return mask_transport_secrets(await self._transport_registry.add(transport))
+        dto = await self._transport_registry.add(transport)
+        if self._owned_transports is not None:
+            self._owned_transports.add(dto.id)
+        return mask_transport_secrets(dto)
 
     def _assert_transport_not_used(self, transport_id: str) -> None:
-        device = next(
-            (
-                d
-                for d in self._device_registry.all.values()
-                if d.transport_id == transport_id
-            ),
-            None,
-        )
-        if device is not None:
-            msg = f"Transport {transport_id} is used by device {device.id}"
+        devices = self._device_registry.find(transport_id=transport_id)
+        if devices:
+            msg = f"Transport {transport_id} is used by device {devices[0].id}"
             raise ConflictError(msg)
 
     async def delete_transport(self, transport_id: str) -> None:
         self._transport_registry.get(transport_id)
         self._assert_transport_not_used(transport_id)
         transport = await self._transport_registry.remove(transport_id)
+        if self._owned_transports is not None:
+            self._owned_transports.discard(transport_id)
         await _close_transport(transport)
 
     async def update_transport(
@@ -687,12 +952,9 @@ class DevicesService(Service):
         return result
 
     def _assert_driver_not_used(self, driver_id: str) -> None:
-        device = next(
-            (d for d in self._device_registry.all.values() if d.driver_id == driver_id),
-            None,
-        )
-        if device is not None:
-            msg = f"Driver {driver_id} is used by device {device.id}"
+        devices = self._device_registry.find(driver_id=driver_id)
+        if devices:
+            msg = f"Driver {driver_id} is used by device {devices[0].id}"
             raise ConflictError(msg)
 
     async def delete_driver(self, driver_id: str) -> None:
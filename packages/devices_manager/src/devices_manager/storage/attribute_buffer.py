@@ -0,0 +1,135 @@
+"""Write-behind buffer for last-value attribute persistence.
+
+Stored attribute values only exist to warm-restart devices, so they do not
+need to hit storage on every change. The buffer keeps the latest attribute
+per ``(device_id, attribute_name)`` and hands them to
+``DevicesManagerStorage.save_attributes`` in one batch, either every
+``flush_interval`` seconds or as soon as ``max_batch_size`` distinct keys are
+pending, whichever comes first.
+
+After a failed flush the buffer backs off: the batch size no longer triggers
+a flush, and the interval doubles with each failure (up to
+``ATTRIBUTE_FLUSH_MAX_BACKOFF_SECONDS``) until a flush succeeds, so a down
+database is not retried on every attribute update.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from devices_manager.core.device import Attribute
+
+    from .storage_backend import DevicesManagerStorage
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_FLUSH_INTERVAL_SECONDS = 2.0
+ATTRIBUTE_FLUSH_MAX_BATCH_SIZE = 500
+ATTRIBUTE_FLUSH_MAX_BACKOFF_SECONDS = 60.0
+
+_PendingKey = tuple[str, str]
+
+
+class AttributeWriteBuffer:
+    def __init__(
+        self,
+        storage: DevicesManagerStorage,
+        *,
+        flush_interval: float = ATTRIBUTE_FLUSH_INTERVAL_SECONDS,
+        max_batch_size: int = ATTRIBUTE_FLUSH_MAX_BATCH_SIZE,
+    ) -> None:
+        if flush_interval <= 0:
+            msg = "flush_interval must be positive"
+            raise ValueError(msg)
+        if max_batch_size < 1:
+            msg = "max_batch_size must be at least 1"
+            raise ValueError(msg)
+        self._storage = storage
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        self._pending: dict[_PendingKey, Attribute] = {}
+        # Flushes failed in a row.
+        self._failures = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def add(self, device_id: str, attribute: Attribute) -> None:
+        """Queue ``attribute`` for persistence, replacing any pending value."""
+        self._pending[device_id, attribute.name] = attribute
+        if not self._failures and len(self._pending) >= self._max_batch_size:
+            self._wakeup.set()
+
+    def discard_device(self, device_id: str) -> None:
+        """Drop pending values of a device that no longer exists."""
+        for key in [key for key in self._pending if key[0] == device_id]:
+            del self._pending[key]
+
+    async def flush(self) -> None:
+        """Persist every pending value in one storage call.
+
+        On failure, or when cancelled mid-write (e.g. by :meth:`stop`), the
+        batch is re-queued (unless a newer value for the same key arrived in
+        the meantime) and retried on the next flush.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await self._storage.save_attributes(
+                    [(device_id, attr) for (device_id, _), attr in batch.items()]
+                )
+            except Exception:
+                logger.exception("Failed to persist %d attribute(s)", len(batch))
+                self._pending = {**batch, **self._pending}
+                self._failures += 1
+            except BaseException:
+                self._pending = {**batch, **self._pending}
+                raise
+            else:
+                self._failures = 0
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and drain whatever is still pending."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+        await self.flush()
+
+    async def _loop(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._delay())
+            self._wakeup.clear()
+            await self.flush()
+
+    def _delay(self) -> float:
+        if not self._failures:
+            return self._flush_interval
+        backoff = self._flush_interval * 2 ** min(self._failures, 16)
+        return min(
+            backoff, max(ATTRIBUTE_FLUSH_MAX_BACKOFF_SECONDS, self._flush_interval)
+        )
+
+
+__all__ = [
+    "ATTRIBUTE_FLUSH_INTERVAL_SECONDS",
+    "ATTRIBUTE_FLUSH_MAX_BACKOFF_SECONDS",
+    "ATTRIBUTE_FLUSH_MAX_BATCH_SIZE",
+    "AttributeWriteBuffer",
+]
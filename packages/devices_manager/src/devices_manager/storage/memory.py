@@ -16,6 +16,7 @@ from pydantic import BaseModel
 from devices_manager.dto import Device, DriverSpec, Transport
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from datetime import datetime
 
     from devices_manager.core.device import Attribute
@@ -42,6 +43,9 @@ class MemoryStorageBackend[M: BaseModel]:
     async def read_all(self) -> list[M]:
         return [deepcopy(item) for item in self._items.values()]
 
+    async def read_all_lenient(self) -> tuple[list[M], dict[str, Exception]]:
+        return await self.read_all(), {}
+
     async def list_all(self) -> list[str]:
         return list(self._items)
 
@@ -98,5 +102,11 @@ class MemoryDevicesStorage:
         device.attributes[attribute.name] = attribute
         await self.devices.write(device_id, device)
 
+    async def save_attributes(
+        self, attributes: Sequence[tuple[str, Attribute]]
+    ) -> None:
+        for device_id, attribute in attributes:
+            await self.save_attribute(device_id, attribute)
+
     async def close(self) -> None:
         pass
@@ -5,14 +5,56 @@ from typing import TYPE_CHECKING, cast
 
 from devices_manager.core.device import Attribute
 from devices_manager.dto import Device
-from devices_manager.storage.storage_backend import StorageBackend
+from devices_manager.storage.storage_backend import StorageBackend, build_lenient
 from devices_manager.types import AttributeValueType, DataType
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from datetime import datetime
 
     import asyncpg
 
+_UPSERT_ATTRIBUTE = (
+    "INSERT INTO dm_device_attributes "
+    "(device_id, name, data_type, read_write_modes, "
+    "current_value, last_updated, last_changed) "
+    "VALUES ($1, $2, $3, $4, $5, $6, $7) "
+    "ON CONFLICT (device_id, name) DO UPDATE SET "
+    "data_type = EXCLUDED.data_type, "
+    "read_write_modes = EXCLUDED.read_write_modes, "
+    "current_value = EXCLUDED.current_value, "
+    "last_updated = EXCLUDED.last_updated, "
+    "last_changed = EXCLUDED.last_changed"
+)
+# Same upsert, but a no-op for devices deleted since their values were queued
+# (instead of a foreign-key violation aborting the whole batch).
+_UPSERT_ATTRIBUTE_IF_DEVICE_EXISTS = (
+    "INSERT INTO dm_device_attributes "
+    "(device_id, name, data_type, read_write_modes, "
+    "current_value, last_updated, last_changed) "
+    "SELECT $1::text, $2::text, $3::text, $4::jsonb, $5::jsonb, "
+    "$6::timestamptz, $7::timestamptz "
+    "WHERE EXISTS (SELECT 1 FROM dm_devices WHERE id = $1) "
+    "ON CONFLICT (device_id, name) DO UPDATE SET "
+    "data_type = EXCLUDED.data_type, "
+    "read_write_modes = EXCLUDED.read_write_modes, "
+    "current_value = EXCLUDED.current_value, "
+    "last_updated = EXCLUDED.last_updated, "
+    "last_changed = EXCLUDED.last_changed"
+)
+
+
+def _attribute_args(device_id: str, attribute: Attribute) -> tuple[object, ...]:
+    return (
+        device_id,
+        attribute.name,
+        attribute.data_type.value,
+        list(attribute.read_write_modes),
+        attribute.model_dump(mode="json")["current_value"],
+        attribute.last_updated,
+        attribute.last_changed,
+    )
+
 
 class PostgresDeviceStorage(StorageBackend[Device]):
     def __init__(self, pool: asyncpg.Pool) -> None:
@@ -126,56 +168,69 @@ class PostgresDeviceStorage(StorageBackend[Device]):
 
         # Upsert current attributes
         for attr in attributes.values():
-            await conn.execute(
-                "INSERT INTO dm_device_attributes "
-                "(device_id, name, data_type, read_write_modes, "
-                "current_value, last_updated, last_changed) "
-                "VALUES ($1, $2, $3, $4, $5, $6, $7) "
-                "ON CONFLICT (device_id, name) DO UPDATE SET "
-                "data_type = EXCLUDED.data_type, "
-                "read_write_modes = EXCLUDED.read_write_modes, "
-                "current_value = EXCLUDED.current_value, "
-                "last_updated = EXCLUDED.last_updated, "
-                "last_changed = EXCLUDED.last_changed",
-                device_id,
-                attr.name,
-                attr.data_type.value,
-                list(attr.read_write_modes),
-                attr.model_dump(mode="json")["current_value"],
-                attr.last_updated,
-                attr.last_changed,
-            )
+            await conn.execute(_UPSERT_ATTRIBUTE, *_attribute_args(device_id, attr))
 
     async def save_attribute(self, device_id: str, attribute: Attribute) -> None:
         """Persist a single attribute value (upsert)."""
         await self._pool.execute(
-            "INSERT INTO dm_device_attributes "
-            "(device_id, name, data_type, read_write_modes, "
-            "current_value, last_updated, last_changed) "
-            "VALUES ($1, $2, $3, $4, $5, $6, $7) "
-            "ON CONFLICT (device_id, name) DO UPDATE SET "
-            "data_type = EXCLUDED.data_type, "
-            "read_write_modes = EXCLUDED.read_write_modes, "
-            "current_value = EXCLUDED.current_value, "
-            "last_updated = EXCLUDED.last_updated, "
-            "last_changed = EXCLUDED.last_changed",
-            device_id,
-            attribute.name,
-            attribute.data_type.value,
-            list(attribute.read_write_modes),
-            attribute.model_dump(mode="json")["current_value"],
-            attribute.last_updated,
-            attribute.last_changed,
+            _UPSERT_ATTRIBUTE, *_attribute_args(device_id, attribute)
         )
 
+    async def save_attributes(
+        self, attributes: Sequence[tuple[str, Attribute]]
+    ) -> None:
+        """Persist many attribute values in one transaction.
+
+        Values of devices deleted since they were queued are skipped.
+        """
+        if not attributes:
+            return
+        async with self._pool.acquire() as conn, conn.transaction():
+            await conn.executemany(
+                _UPSERT_ATTRIBUTE_IF_DEVICE_EXISTS,
+                [
+                    _attribute_args(device_id, attribute)
+                    for device_id, attribute in attributes
+                ],
+            )
+
     async def read_all(self) -> list[Device]:
+        device_rows, attrs_by_device, tags_by_device = await self._fetch_all_rows()
+        return [
+            self._build_dto(
+                row,
+                attrs_by_device.get(row["id"], []),
+                tags_by_device.get(row["id"], []),
+            )
+            for row in device_rows
+        ]
+
+    async def read_all_lenient(self) -> tuple[list[Device], dict[str, Exception]]:
+        """Read all devices with three queries total, isolating bad rows."""
+        device_rows, attrs_by_device, tags_by_device = await self._fetch_all_rows()
+        return build_lenient(
+            ((row["id"], row) for row in device_rows),
+            lambda row: self._build_dto(
+                row,
+                attrs_by_device.get(row["id"], []),
+                tags_by_device.get(row["id"], []),
+            ),
+        )
+
+    async def _fetch_all_rows(
+        self,
+    ) -> tuple[
+        list[asyncpg.Record],
+        dict[str, list[asyncpg.Record]],
+        dict[str, list[asyncpg.Record]],
+    ]:
         device_rows = await self._pool.fetch(
             "SELECT id, name, type, config, driver_id, transport_id, "
             "created_at, updated_at "
             "FROM dm_devices ORDER BY id",
         )
         if not device_rows:
-            return []
+            return [], {}, {}
 
         device_ids = [row["id"] for row in device_rows]
         attr_rows, tag_rows = await _fetch_attrs_and_tags(self._pool, device_ids)
@@ -188,14 +243,7 @@ class PostgresDeviceStorage(StorageBackend[Device]):
         for tag_row in tag_rows:
             tags_by_device[tag_row["device_id"]].append(tag_row)
 
-        return [
-            self._build_dto(
-                row,
-                attrs_by_device.get(row["id"], []),
-                tags_by_device.get(row["id"], []),
-            )
-            for row in device_rows
-        ]
+        return list(device_rows), attrs_by_device, tags_by_device
 
     async def list_all(self) -> list[str]:
         rows = await self._pool.fetch("SELECT id FROM dm_devices ORDER BY id")
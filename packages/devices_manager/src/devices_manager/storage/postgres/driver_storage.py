@@ -3,7 +3,7 @@ from datetime import datetime
 import asyncpg
 
 from devices_manager.dto import DriverSpec
-from devices_manager.storage.storage_backend import StorageBackend
+from devices_manager.storage.storage_backend import StorageBackend, build_lenient
 
 # Fields that stay in the JSONB data column
 _JSONB_FIELDS = {
@@ -86,6 +86,13 @@ class PostgresDriverStorage(StorageBackend[DriverSpec]):
         )
         return [self._row_to_dto(row) for row in rows]
 
+    async def read_all_lenient(self) -> tuple[list[DriverSpec], dict[str, Exception]]:
+        rows = await self._pool.fetch(
+            "SELECT id, vendor, model, type, transport, created_at, updated_at, data "
+            "FROM dm_drivers ORDER BY id",
+        )
+        return build_lenient(((row["id"], row) for row in rows), self._row_to_dto)
+
     async def list_all(self) -> list[str]:
         rows = await self._pool.fetch("SELECT id FROM dm_drivers ORDER BY id")
         return [row["id"] for row in rows]
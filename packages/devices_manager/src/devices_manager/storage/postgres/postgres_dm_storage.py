@@ -15,6 +15,8 @@ from .driver_storage import PostgresDriverStorage
 from .transport_storage import PostgresTransportStorage
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from devices_manager.core.device import Attribute
     from devices_manager.dto import DriverSpec, Transport
 
@@ -37,6 +39,12 @@ class PostgresDevicesManagerStorage(DevicesManagerStorage):
         """Persist a single attribute to the dm_device_attributes table."""
         await self._device_storage.save_attribute(device_id, attribute)
 
+    async def save_attributes(
+        self, attributes: Sequence[tuple[str, Attribute]]
+    ) -> None:
+        """Persist a batch of attributes in a single transaction."""
+        await self._device_storage.save_attributes(attributes)
+
     @classmethod
     async def from_url(cls, url: str) -> PostgresDevicesManagerStorage:
         pool = await asyncpg.create_pool(dsn=url)
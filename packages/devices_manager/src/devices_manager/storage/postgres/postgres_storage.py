@@ -5,7 +5,7 @@ from collections.abc import Callable
 import asyncpg
 from pydantic import BaseModel
 
-from devices_manager.storage.storage_backend import StorageBackend
+from devices_manager.storage.storage_backend import StorageBackend, build_lenient
 
 TABLE_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
@@ -68,6 +68,14 @@ class PostgresStorageBackend[M: BaseModel](StorageBackend[M]):
             self._deserializer(self._decode_json_value(row["data"])) for row in rows
         ]
 
+    async def read_all_lenient(self) -> tuple[list[M], dict[str, Exception]]:
+        query = f"SELECT id, data FROM {self._table_name} ORDER BY id"  # noqa: S608
+        rows = await self._pool.fetch(query)
+        return build_lenient(
+            ((row["id"], row["data"]) for row in rows),
+            lambda data: self._deserializer(self._decode_json_value(data)),
+        )
+
     async def list_all(self) -> list[str]:
         query = f"SELECT id FROM {self._table_name} ORDER BY id"  # noqa: S608
         rows = await self._pool.fetch(query)
@@ -7,7 +7,7 @@ from devices_manager.dto.transport_dto import (
     Transport,
     build_dto,
 )
-from devices_manager.storage.storage_backend import StorageBackend
+from devices_manager.storage.storage_backend import StorageBackend, build_lenient
 
 if TYPE_CHECKING:
     import asyncpg
@@ -71,6 +71,14 @@ class PostgresTransportStorage(StorageBackend[Transport]):
         )
         return [self._row_to_dto(row) for row in rows]
 
+    async def read_all_lenient(self) -> tuple[list[Transport], dict[str, Exception]]:
+        rows = await self._pool.fetch(
+            "SELECT id, name, protocol, config, connection_state, "
+            "created_at, updated_at "
+            "FROM dm_transports ORDER BY id",
+        )
+        return build_lenient(((row["id"], row) for row in rows), self._row_to_dto)
+
     async def list_all(self) -> list[str]:
         rows = await self._pool.fetch("SELECT id FROM dm_transports ORDER BY id")
         return [row["id"] for row in rows]
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from devices_manager.dto import Device
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
     from datetime import datetime
 
     from devices_manager.core.device import Attribute
@@ -20,6 +21,14 @@ class StorageBackend[M: BaseModel](Protocol):
 
     async def read_all(self) -> list[M]: ...
 
+    async def read_all_lenient(self) -> tuple[list[M], dict[str, Exception]]:
+        """Read every entry in bulk, isolating per-entry failures.
+
+        Returns the readable entities and, keyed by id, the error raised by
+        each entry that could not be read or deserialized.
+        """
+        ...
+
     async def list_all(self) -> list[str]: ...
 
     async def delete(self, item_id: str) -> None: ...
@@ -44,11 +53,30 @@ class DevicesManagerStorage(Protocol):
 
     async def save_attribute(self, device_id: str, attribute: Attribute) -> None: ...
 
+    async def save_attributes(
+        self, attributes: Sequence[tuple[str, Attribute]]
+    ) -> None: ...
+
     async def close(self) -> None: ...
 
 
+def build_lenient[R, M](
+    items: Iterable[tuple[str, R]], build: Callable[[R], M]
+) -> tuple[list[M], dict[str, Exception]]:
+    """Build one entity per ``(id, raw)`` item, collecting failures by id."""
+    entities: list[M] = []
+    failures: dict[str, Exception] = {}
+    for item_id, raw in items:
+        try:
+            entities.append(build(raw))
+        except Exception as exc:  # noqa: BLE001 -- reported to the caller
+            failures[item_id] = exc
+    return entities, failures
+
+
 __all__ = [
     "DeviceStorageBackend",
     "DevicesManagerStorage",
     "StorageBackend",
+    "build_lenient",
 ]
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from devices_manager.core.transports import TransportConnectionState
 from devices_manager.dto import DriverSpec, Transport, build_transport
-from devices_manager.dto.device_dto import Device
 from models.metadata import timestamp_kwargs
 
-from .yaml_dm_storage import YamlDeviceStorage, YamlFileStorage
+from .yaml_dm_storage import (
+    DEVICE_FLUSH_INTERVAL_SECONDS,
+    YamlDeviceStorage,
+    YamlFileStorage,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from devices_manager.core.device import Attribute
     from devices_manager.storage.storage_backend import (
         DeviceStorageBackend,
@@ -22,16 +28,30 @@ logger = logging.getLogger(__name__)
 
 
 class CoreFileStorage:
-    """A basic yaml file storage system satisfying ``DevicesManagerStorage``."""
+    """A basic yaml file storage system satisfying ``DevicesManagerStorage``.
+
+    Attribute values are applied to in-memory devices and flushed to disk
+    at most once per ``flush_interval`` per device (see
+    :class:`YamlDeviceStorage`).
+    """
 
     _root_dir: Path
+    _device_storage: YamlDeviceStorage
     devices: DeviceStorageBackend
     drivers: StorageBackend[DriverSpec]
     transports: StorageBackend[Transport]
 
-    def __init__(self, root_dir: str | Path) -> None:
+    def __init__(
+        self,
+        root_dir: str | Path,
+        *,
+        flush_interval: float = DEVICE_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
         self._root_dir = Path(root_dir)
-        self.devices = YamlDeviceStorage(self._root_dir / "devices", model_cls=Device)
+        self._device_storage = YamlDeviceStorage(
+            self._root_dir / "devices", flush_interval=flush_interval
+        )
+        self.devices = self._device_storage
         self.drivers = YamlFileStorage[DriverSpec](
             self._root_dir / "drivers", model_cls=DriverSpec
         )
@@ -54,17 +74,30 @@ class CoreFileStorage:
         )
 
     async def save_attribute(self, device_id: str, attribute: Attribute) -> None:
-        """Persist attribute by rewriting the device file."""
-        try:
-            dto = await self.devices.read(device_id)
-        except FileNotFoundError:
-            logger.warning(
-                "Cannot persist attribute for unknown device %s",
-                device_id,
-            )
-            return
-        dto.attributes[attribute.name] = attribute
-        await self.devices.write(device_id, dto)
+        """Apply attribute to the cached device; written on the next flush."""
+        await self.save_attributes([(device_id, attribute)])
+
+    async def save_attributes(
+        self, attributes: Sequence[tuple[str, Attribute]]
+    ) -> None:
+        """Apply attributes to the cached devices; written on the next flush."""
+        by_device: dict[str, list[Attribute]] = defaultdict(list)
+        for device_id, attribute in attributes:
+            by_device[device_id].append(attribute)
+        for device_id, device_attributes in by_device.items():
+            try:
+                await self._device_storage.update_attributes(
+                    device_id, device_attributes
+                )
+            except FileNotFoundError:
+                logger.warning(
+                    "Cannot persist attribute for unknown device %s",
+                    device_id,
+                )
+
+    async def flush(self) -> None:
+        """Write pending attribute values to disk now."""
+        await self._device_storage.flush()
 
     async def close(self) -> None:
-        pass
+        await self._device_storage.close()
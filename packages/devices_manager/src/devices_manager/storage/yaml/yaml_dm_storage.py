@@ -1,17 +1,38 @@
 import asyncio
-from collections.abc import Callable
+import contextlib
+import logging
+import os
+import stat
+import tempfile
+from collections.abc import Callable, Iterable
 from datetime import datetime
 from pathlib import Path
 
 import yaml
 from pydantic import BaseModel
 
+from devices_manager.core.device import Attribute
 from devices_manager.dto.device_dto import Device
 from devices_manager.storage.storage_backend import StorageBackend
 
+logger = logging.getLogger(__name__)
+
+# libyaml bindings are an order of magnitude faster than the pure-Python
+# implementation; PyYAML only ships them when built against libyaml.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+DEVICE_FLUSH_INTERVAL_SECONDS = 5.0
+_NEW_FILE_MODE = 0o644
+
 
 class YamlFileStorage[M: BaseModel](StorageBackend[M]):
-    """A basic generic file storage system for yaml data."""
+    """A basic generic file storage system for yaml data.
+
+    Files are replaced atomically (write to a temporary file, then rename),
+    so a crash or power loss mid-write never leaves a truncated entry. A
+    replaced file keeps its permissions; new ones are created 0644.
+    """
 
     _root_path: Path
     _builder: Callable[[dict], M]
@@ -40,14 +61,18 @@ class YamlFileStorage[M: BaseModel](StorageBackend[M]):
         return self._root_path / (item_id + self._file_extension)
 
     def _list_all_sync(self) -> list[str]:
-        return [file.stem for file in self._root_path.iterdir() if file.is_file()]
+        return [
+            file.stem
+            for file in self._root_path.iterdir()
+            if file.is_file() and file.suffix == self._file_extension
+        ]
 
     async def list_all(self) -> list[str]:
         return await asyncio.to_thread(self._list_all_sync)
 
     def _read_sync(self, item_id: str) -> M:
         with self._get_file_path(item_id).open("r", encoding="utf-8") as file:
-            data = yaml.safe_load(file)
+            data = yaml.load(file, Loader=_Loader)  # noqa: S506 -- safe loader
             return self._builder(data)
 
     async def read(self, item_id: str) -> M:
@@ -59,9 +84,57 @@ class YamlFileStorage[M: BaseModel](StorageBackend[M]):
     async def read_all(self) -> list[M]:
         return await asyncio.to_thread(self._read_all_sync)
 
+    async def read_all_lenient(self) -> tuple[list[M], dict[str, Exception]]:
+        """Parse every file concurrently on the default thread pool."""
+        item_ids = await self.list_all()
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._read_sync, item_id) for item_id in item_ids),
+            return_exceptions=True,
+        )
+        entities: list[M] = []
+        failures: dict[str, Exception] = {}
+        for item_id, result in zip(item_ids, results, strict=True):
+            if isinstance(result, Exception):
+                failures[item_id] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                entities.append(result)
+        return entities, failures
+
+    def _dump_sync(self, item_id: str, payload: dict) -> None:
+        path = self._get_file_path(item_id)
+        try:
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            mode = _NEW_FILE_MODE
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self._root_path, prefix=f".{item_id}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                yaml.dump(payload, file, Dumper=_Dumper)
+                file.flush()
+                # mkstemp creates the file 0600.
+                os.fchmod(file.fileno(), mode)
+                os.fsync(file.fileno())
+            Path(tmp_name).replace(path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                Path(tmp_name).unlink()
+            raise
+        self._fsync_root()
+
+    def _fsync_root(self) -> None:
+        """Persist the rename itself, held in the directory entry."""
+        fd = os.open(self._root_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
     def _write_sync(self, item_id: str, data: M) -> None:
-        with self._get_file_path(item_id).open("w", encoding="utf-8") as file:
-            yaml.dump(data.model_dump(mode="json"), file)
+        self._dump_sync(item_id, data.model_dump(mode="json"))
 
     async def write(self, item_id: str, data: M) -> None:
         await asyncio.to_thread(self._write_sync, item_id, data)
@@ -74,7 +147,70 @@ class YamlFileStorage[M: BaseModel](StorageBackend[M]):
 
 
 class YamlDeviceStorage(YamlFileStorage[Device]):
-    """YamlFileStorage[Device] extended with targeted tag-mutation methods."""
+    """YamlFileStorage[Device] with an in-memory cache and coalesced writes.
+
+    Devices are kept in memory once read. CRUD writes go straight to disk,
+    while attribute updates only mutate the cached device and mark it dirty:
+    a background task rewrites each dirty device file at most once per
+    ``flush_interval``. :meth:`close` flushes whatever is still dirty.
+
+    A CRUD write carries the attribute updates still pending for its device
+    (unless it holds a newer value of the attribute), so a device read before
+    them and written back does not undo them.
+    """
+
+    def __init__(
+        self,
+        root_path: Path | str,
+        *,
+        flush_interval: float = DEVICE_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        super().__init__(root_path, model_cls=Device)
+        self._flush_interval = flush_interval
+        self._cache: dict[str, Device] = {}
+        # Attribute updates not on disk yet, by device id.
+        self._dirty: dict[str, dict[str, Attribute]] = {}
+        # Serializes file writes so a flush can never land an older snapshot
+        # over a newer write-through of the same device.
+        self._io_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def dirty_ids(self) -> set[str]:
+        return set(self._dirty)
+
+    async def _get_cached(self, item_id: str) -> Device:
+        if item_id not in self._cache:
+            self._cache[item_id] = await super().read(item_id)
+        return self._cache[item_id]
+
+    async def read(self, item_id: str) -> Device:
+        return (await self._get_cached(item_id)).model_copy(deep=True)
+
+    async def read_all_lenient(self) -> tuple[list[Device], dict[str, Exception]]:
+        entities, failures = await super().read_all_lenient()
+        for dto in entities:
+            if dto.id not in self._cache:
+                self._cache[dto.id] = dto.model_copy(deep=True)
+        return [self._cache[dto.id].model_copy(deep=True) for dto in entities], failures
+
+    async def write(self, item_id: str, data: Device) -> None:
+        async with self._io_lock:
+            pending = self._dirty.pop(item_id, {})
+            data = _with_attributes(data, pending)
+            try:
+                await super().write(item_id, data)
+            except BaseException:
+                self._dirty[item_id] = {**pending, **self._dirty.get(item_id, {})}
+                raise
+        # Updates applied while the file was written stay pending.
+        self._cache[item_id] = _with_attributes(data, self._dirty.get(item_id, {}))
+
+    async def delete(self, item_id: str) -> None:
+        async with self._io_lock:
+            await super().delete(item_id)
+        self._cache.pop(item_id, None)
+        self._dirty.pop(item_id, None)
 
     async def set_tag(
         self, device_id: str, key: str, value: str, updated_at: datetime
@@ -89,3 +225,75 @@ class YamlDeviceStorage(YamlFileStorage[Device]):
         dto.tags.pop(key, None)
         dto.updated_at = updated_at
         await self.write(device_id, dto)
+
+    async def update_attributes(
+        self, device_id: str, attributes: Iterable[Attribute]
+    ) -> None:
+        """Apply attributes to the cached device and schedule its flush.
+
+        Raises ``FileNotFoundError`` if the device is not stored.
+        """
+        dto = await self._get_cached(device_id)
+        pending = self._dirty.setdefault(device_id, {})
+        for attribute in attributes:
+            dto.attributes[attribute.name] = attribute
+            pending[attribute.name] = attribute
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def flush(self) -> None:
+        """Write every dirty device to disk."""
+        async with self._io_lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, {}
+            payloads = {
+                device_id: self._cache[device_id].model_dump(mode="json")
+                for device_id in dirty
+                if device_id in self._cache
+            }
+            try:
+                await asyncio.to_thread(self._dump_all_sync, payloads)
+            except Exception:
+                logger.exception("Failed to flush %d device file(s)", len(payloads))
+                for device_id, pending in dirty.items():
+                    self._dirty[device_id] = {
+                        **pending,
+                        **self._dirty.get(device_id, {}),
+                    }
+
+    def _dump_all_sync(self, payloads: dict[str, dict]) -> None:
+        for device_id, payload in payloads.items():
+            self._dump_sync(device_id, payload)
+
+    async def _flush_loop(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self._flush_interval)
+            # Shielded so close() cancelling the loop never abandons a batch
+            # that was already taken off the dirty set.
+            await asyncio.shield(self.flush())
+
+    async def close(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+        self._flush_task = None
+        await self.flush()
+
+
+def _with_attributes(device: Device, attributes: dict[str, Attribute]) -> Device:
+    """Copy of *device* with those of *attributes* it has and holds an older
+    value of."""
+    device = device.model_copy(deep=True)
+    for name, attribute in attributes.items():
+        current = device.attributes.get(name)
+        if current is not None and not _older(attribute, current):
+            device.attributes[name] = attribute.model_copy(deep=True)
+    return device
+
+
+def _older(attribute: Attribute, than: Attribute) -> bool:
+    if attribute.last_updated is None or than.last_updated is None:
+        return False
+    return attribute.last_updated < than.last_updated
@@ -386,6 +386,28 @@ class TestDeviceStorage:
         assert dev1.attributes["temp"].current_value == 21.0
         assert len(dev2.attributes) == 0
 
+    async def test_read_all_lenient_isolates_bad_rows(
+        self,
+        pool: asyncpg.Pool,
+        transport_storage: PostgresTransportStorage,
+        driver_storage: PostgresDriverStorage,
+        device_storage: PostgresDeviceStorage,
+    ):
+        await transport_storage.write("t1", _make_transport("t1"))
+        await driver_storage.write("d1", _make_driver("d1"))
+        attrs = {"temp": Attribute.create("temp", DataType.FLOAT, {"read"}, 21.0)}
+        await device_storage.write("dev1", _make_device("dev1", attributes=attrs))
+        await device_storage.write("dev2", _make_device("dev2"))
+        await pool.execute(
+            "UPDATE dm_device_attributes SET data_type = 'bogus' WHERE device_id = $1",
+            "dev1",
+        )
+
+        devices, failures = await device_storage.read_all_lenient()
+
+        assert [d.id for d in devices] == ["dev2"]
+        assert list(failures) == ["dev1"]
+
     async def test_list_all(
         self,
         transport_storage: PostgresTransportStorage,
@@ -571,6 +593,46 @@ class TestAttributePersistence:
         result = await composed_storage.devices.read("dev1")
         assert result.attributes["humidity"].current_value == 60.0
 
+    async def test_save_attributes_batch_upserts(
+        self,
+        composed_storage: PostgresDevicesManagerStorage,
+    ):
+        await composed_storage.transports.write("t1", _make_transport("t1"))
+        await composed_storage.drivers.write("d1", _make_driver("d1"))
+        attrs = {"temp": Attribute.create("temp", DataType.FLOAT, {"read"}, 20.0)}
+        await composed_storage.devices.write(
+            "dev1", _make_device("dev1", attributes=attrs)
+        )
+
+        await composed_storage.save_attributes(
+            [
+                ("dev1", Attribute.create("temp", DataType.FLOAT, {"read"}, 25.0)),
+                ("dev1", Attribute.create("hum", DataType.FLOAT, {"read"}, 60.0)),
+            ]
+        )
+
+        result = await composed_storage.devices.read("dev1")
+        assert result.attributes["temp"].current_value == 25.0
+        assert result.attributes["hum"].current_value == 60.0
+
+    async def test_save_attributes_skips_deleted_device(
+        self,
+        composed_storage: PostgresDevicesManagerStorage,
+    ):
+        await composed_storage.transports.write("t1", _make_transport("t1"))
+        await composed_storage.drivers.write("d1", _make_driver("d1"))
+        await composed_storage.devices.write("dev1", _make_device("dev1"))
+
+        await composed_storage.save_attributes(
+            [
+                ("ghost", Attribute.create("temp", DataType.FLOAT, {"read"}, 1.0)),
+                ("dev1", Attribute.create("temp", DataType.FLOAT, {"read"}, 2.0)),
+            ]
+        )
+
+        result = await composed_storage.devices.read("dev1")
+        assert result.attributes["temp"].current_value == 2.0
+
     async def test_tags_write_and_read_roundtrip(
         self,
         transport_storage: PostgresTransportStorage,
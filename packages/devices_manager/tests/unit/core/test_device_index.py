@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import pytest
+
+from devices_manager.core.device import Attribute, CoreDevice
+from devices_manager.core.device_filters import DeviceFilters
+from devices_manager.core.device_index import DeviceIndex
+from devices_manager.types import DataType
+
+DeviceFactory = Callable[..., CoreDevice]
+
+
+@pytest.fixture
+def make_device(driver, mock_transport_client) -> DeviceFactory:
+    def _make(
+        device_id: str,
+        *,
+        device_type: str | None = None,
+        tags: dict[str, str] | None = None,
+        writable: tuple[str, ...] = (),
+    ) -> CoreDevice:
+        attributes = {
+            "x": Attribute.create("x", DataType.FLOAT, {"read"}),
+            **{
+                name: Attribute.create(name, DataType.FLOAT, {"read", "write"})
+                for name in writable
+            },
+        }
+        device = CoreDevice(
+            id=device_id,
+            name=device_id,
+            attributes=attributes,
+            driver=driver,
+            transport=mock_transport_client,
+            config={},
+        )
+        device.type = device_type
+        device.tags = dict(tags or {})
+        return device
+
+    return _make
+
+
+@pytest.fixture
+def fleet(make_device) -> list[CoreDevice]:
+    return [
+        make_device("d1", device_type="thermostat", tags={"floor": "1"}),
+        make_device(
+            "d2", device_type="thermostat", tags={"floor": "2"}, writable=("sp",)
+        ),
+        make_device("d3", device_type="meter", tags={"floor": "1", "zone": "a"}),
+        make_device("d4", writable=("sp",)),
+    ]
+
+
+@pytest.fixture
+def index(fleet) -> DeviceIndex:
+    index = DeviceIndex()
+    for device in fleet:
+        index.add(device)
+    return index
+
+
+class TestDeviceIndexCandidates:
+    def test_no_indexed_filter(self, index):
+        assert index.candidates(DeviceFilters()) is None
+        assert index.candidates(DeviceFilters(is_faulty=True, search=" ")) is None
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            pytest.param(DeviceFilters(types=["thermostat"]), id="types"),
+            pytest.param(DeviceFilters(types=["thermostat", "meter"]), id="types_any"),
+            pytest.param(DeviceFilters(tags={"floor": ["1"]}), id="tag"),
+            pytest.param(DeviceFilters(tags={"floor": ["1", "2"]}), id="tag_any"),
+            pytest.param(
+                DeviceFilters(tags={"floor": ["1"], "zone": ["a"]}), id="tags_all"
+            ),
+            pytest.param(DeviceFilters(writable_attribute="sp"), id="writable"),
+            pytest.param(DeviceFilters(attribute="sp"), id="attribute"),
+            pytest.param(DeviceFilters(attribute="x"), id="attribute_everywhere"),
+            pytest.param(DeviceFilters(driver_id="test_driver"), id="driver"),
+            pytest.param(DeviceFilters(transport_id="my-transport"), id="transport"),
+            pytest.param(DeviceFilters(transport_id="other"), id="no_match"),
+            pytest.param(DeviceFilters(ids=["d4", "d2", "nope"]), id="ids"),
+            pytest.param(DeviceFilters(search="d3"), id="search"),
+            pytest.param(DeviceFilters(search="x"), id="search_no_match"),
+            pytest.param(
+                DeviceFilters(types=["thermostat"], writable_attribute="sp"),
+                id="combined",
+            ),
+        ],
+    )
+    def test_same_as_matching_every_device(self, index, fleet, filters):
+        assert index.candidates(filters) == [d.id for d in fleet if filters.matches(d)]
+
+
+class TestDeviceIndexUpkeep:
+    def test_refile_after_change(self, index, fleet):
+        d1 = fleet[0]
+        d1.tags["floor"] = "3"
+        d1.type = "meter"
+        index.add(d1)
+
+        assert index.candidates(DeviceFilters(tags={"floor": ["1"]})) == ["d3"]
+        assert index.candidates(DeviceFilters(tags={"floor": ["3"]})) == ["d1"]
+        assert index.candidates(DeviceFilters(types=["meter"])) == ["d1", "d3"]
+
+    def test_refile_keeps_registration_order(self, index, fleet):
+        fleet[0].tags["zone"] = "b"
+        index.add(fleet[0])
+        assert index.candidates(DeviceFilters(attribute="x")) == [
+            "d1",
+            "d2",
+            "d3",
+            "d4",
+        ]
+
+    def test_remove(self, index):
+        index.remove("d2")
+        assert index.candidates(DeviceFilters(writable_attribute="sp")) == ["d4"]
+        assert index.lookup(("tag", "floor", "2")) == set()
+        index.remove("d2")
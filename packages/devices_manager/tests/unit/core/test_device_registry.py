@@ -135,6 +135,58 @@ class TestDeviceRegistryGet:
             device_registry.get_dto("unknown")
 
 
+class TestDeviceRegistryDtoCache:
+    def test_dto_reused_while_unchanged(self, device_registry, device):
+        dto = device_registry.get_dto(device.id)
+        assert device_registry.get_dto(device.id) is dto
+        assert device_registry.list_all()[0] is dto
+
+    def test_attribute_update_rebuilds_dto(self, device_registry, device):
+        dto = device_registry.get_dto(device.id)
+        structure = device_registry.revision(structural=True)
+        revision = device_registry.revision()
+
+        device._update_attribute(device.attributes["temperature"], 42.0)  # noqa: SLF001
+
+        updated = device_registry.get_dto(device.id)
+        assert updated is not dto
+        assert updated.attributes["temperature"].current_value == 42.0
+        assert device_registry.revision() != revision
+        assert device_registry.revision(structural=True) == structure
+
+    @pytest.mark.asyncio
+    async def test_tag_change_is_structural(self, device_registry, device):
+        dto = device_registry.get_dto(device.id)
+        structure = device_registry.revision(structural=True)
+
+        await device_registry.set_tag(device.id, "floor", "2")
+
+        updated = device_registry.get_dto(device.id)
+        assert updated is not dto
+        assert updated.tags == {"floor": "2"}
+        assert device_registry.revision(structural=True) != structure
+
+    @pytest.mark.asyncio
+    async def test_remove_changes_revision(self, device_registry, device):
+        structure = device_registry.revision(structural=True)
+
+        await device_registry.remove(device.id)
+
+        assert device_registry.revision(structural=True) != structure
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_device_gets_new_dto(
+        self, device_registry, device, thermostat_driver, mock_transport_client
+    ):
+        dto = device_registry.get_dto(device.id)
+        thermostat_driver.transport = mock_transport_client.protocol
+        device_registry.all[device.id] = device_registry.rebuild_device(
+            device, thermostat_driver, mock_transport_client
+        )
+
+        assert device_registry.get_dto(device.id) is not dto
+
+
 class TestDeviceRegistryList:
     def test_list_all(self, device_registry):
         devices = device_registry.list_all()
@@ -194,6 +246,43 @@ class TestDeviceRegistryList:
         result = registry.list_all(driver_id=driver.metadata.id)
         assert [d.id for d in result] == ["d2"]
 
+    @pytest.mark.asyncio
+    async def test_list_all_follows_tag_changes(self, device_registry, device):
+        await device_registry.set_tag(device.id, "floor", "1")
+        assert [d.id for d in device_registry.list_all(tags={"floor": ["1"]})] == [
+            device.id
+        ]
+
+        await device_registry.delete_tag(device.id, "floor")
+        assert device_registry.list_all(tags={"floor": ["1"]}) == []
+
+    def test_list_all_follows_attribute_renames(self, device_registry, device):
+        device_registry.rename_attribute_in_devices(
+            "temperature", "temp", driver_id=device.driver_id
+        )
+        assert device_registry.list_all(attribute="temperature") == []
+        assert [d.id for d in device_registry.list_all(attribute="temp")] == [device.id]
+
+    def test_list_all_follows_type_changes(self, device_registry, device):
+        device_registry.update_type_in_devices("meter", driver_id=device.driver_id)
+        assert [d.id for d in device_registry.list_all(types=["meter"])] == [device.id]
+
+    @pytest.mark.asyncio
+    async def test_list_all_search_follows_renames(self, device_registry, device):
+        await device_registry.update(device.id, DeviceUpdate(name="Salle 12"))
+        assert device_registry.list_all(search="my device") == []
+        assert [d.id for d in device_registry.list_all(search="sale 12")] == [device.id]
+
+    @pytest.mark.asyncio
+    async def test_removed_device_not_listed(self, device_registry, device):
+        await device_registry.remove(device.id)
+        assert device_registry.list_all(driver_id=device.driver_id) == []
+
+    @pytest.mark.asyncio
+    async def test_find_by_transport(self, device_registry, device):
+        assert device_registry.find(transport_id=device.transport_id) == [device]
+        assert device_registry.find(transport_id="other") == []
+
 
 class TestDeviceRegistryRegister:
     @pytest.mark.asyncio
@@ -57,7 +57,7 @@ from .fixtures.transport_clients import MockPushTransportClient
 
 
 class FailingStartDevice(CoreDevice):
-    async def start_sync(self) -> None:
+    async def start_sync(self, **_kwargs: object) -> None:
         msg = "boom"
         raise RuntimeError(msg)
 
@@ -191,6 +191,148 @@ class TestDevicesServiceSync:
 
         assert mock_transport_client.read.call_count >= 2 * n_readable_attrs
 
+    @pytest.mark.asyncio
+    async def test_start_ramps_first_poll_across_devices(
+        self, mock_transport_client, driver, monkeypatch
+    ):
+        devices = {
+            f"device{i}": CoreDevice.from_base(
+                DeviceBase(id=f"device{i}", name=f"device{i}", config={}),
+                driver=driver,
+                transport=mock_transport_client,
+            )
+            for i in range(4)
+        }
+        starts = {}
+        for device in devices.values():
+            starts[device.id] = AsyncMock()
+            monkeypatch.setattr(device, "start_sync", starts[device.id])
+        manager = DevicesService(
+            devices=devices,
+            drivers={"test_driver": driver},
+            transports={"t1": mock_transport_client},
+            startup_ramp_seconds=2.0,
+        )
+
+        await manager.start()
+
+        delays = sorted(m.await_args.kwargs["poll_delay"] for m in starts.values())
+        assert delays == [0.0, 0.5, 1.0, 1.5]
+
+    @pytest.mark.asyncio
+    async def test_start_bounds_concurrency(
+        self, mock_transport_client, driver, monkeypatch
+    ):
+        in_flight = 0
+        peak = 0
+
+        async def _slow_start(**_kwargs: object) -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        devices = {}
+        for i in range(6):
+            device = CoreDevice.from_base(
+                DeviceBase(id=f"device{i}", name=f"device{i}", config={}),
+                driver=driver,
+                transport=mock_transport_client,
+            )
+            monkeypatch.setattr(device, "start_sync", _slow_start)
+            devices[device.id] = device
+        manager = DevicesService(
+            devices=devices,
+            drivers={"test_driver": driver},
+            transports={"t1": mock_transport_client},
+            startup_concurrency=2,
+        )
+
+        await manager.start()
+
+        assert peak == 2
+
+    def test_invalid_startup_settings_rejected(self):
+        with pytest.raises(ValueError, match="startup_concurrency"):
+            DevicesService(startup_concurrency=0)
+        with pytest.raises(ValueError, match="startup_ramp_seconds"):
+            DevicesService(startup_ramp_seconds=-1)
+
+    @pytest.mark.asyncio
+    async def test_start_registers_push_listeners_once_per_transport(
+        self, driver_w_push_transport, mock_push_transport_client, monkeypatch
+    ):
+        devices = {
+            f"d{i}": CoreDevice.from_base(
+                DeviceBase(
+                    id=f"d{i}",
+                    name=f"d{i}",
+                    config={"vendor_id": f"v{i}", "gateway_id": "gtw"},
+                ),
+                driver=driver_w_push_transport,
+                transport=mock_push_transport_client,
+            )
+            for i in range(3)
+        }
+        single = AsyncMock(wraps=mock_push_transport_client.register_listener)
+        batch = AsyncMock(wraps=mock_push_transport_client.register_listeners)
+        monkeypatch.setattr(mock_push_transport_client, "register_listener", single)
+        monkeypatch.setattr(mock_push_transport_client, "register_listeners", batch)
+        manager = DevicesService(
+            devices=devices,
+            drivers={driver_w_push_transport.id: driver_w_push_transport},
+            transports={mock_push_transport_client.id: mock_push_transport_client},
+        )
+
+        await manager.start()
+
+        [call] = batch.await_args_list
+        [bindings] = call.args
+        expected = sum(len(d.listener_bindings()) for d in devices.values())
+        assert len(bindings) == expected > 0
+        assert all(device.syncing for device in devices.values())
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_listener_batch_falls_back_to_per_device(
+        self, driver_w_push_transport, mock_push_transport_client, monkeypatch
+    ):
+        device = CoreDevice.from_base(
+            DeviceBase(
+                id="d1", name="d1", config={"vendor_id": "v1", "gateway_id": "gtw"}
+            ),
+            driver=driver_w_push_transport,
+            transport=mock_push_transport_client,
+        )
+        calls = 0
+        original = type(mock_push_transport_client).register_listeners
+
+        async def _fail_first(
+            self: MockPushTransportClient, listeners: list
+        ) -> list[str]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                msg = "broker refused"
+                raise RuntimeError(msg)
+            return await original(self, listeners)
+
+        monkeypatch.setattr(
+            type(mock_push_transport_client), "register_listeners", _fail_first
+        )
+        manager = DevicesService(
+            devices={device.id: device},
+            drivers={driver_w_push_transport.id: driver_w_push_transport},
+            transports={mock_push_transport_client.id: mock_push_transport_client},
+        )
+
+        await manager.start()
+
+        assert calls == 2
+        assert device.syncing is True
+        await manager.stop()
+
     @pytest.mark.asyncio
     async def test_stop_sync(self, devices_manager, device):
         await devices_manager.start()
@@ -228,8 +370,8 @@ class TestDevicesServiceSync:
     async def test_devices_are_polled_during_sync(
         self, devices_manager, mock_transport_client
     ):
-        await devices_manager.start()
         mock_transport_client.read = AsyncMock(return_value="25.5")
+        await devices_manager.start()
         await asyncio.sleep(0.1)
         await devices_manager.stop()
         assert mock_transport_client.read.called
@@ -1348,6 +1490,38 @@ class TestDevicesServiceStorage:
         finally:
             await dm2.stop()
 
+    @pytest.mark.asyncio
+    async def test_attribute_persistence_is_write_behind(
+        self, seeded_storage: MemoryDevicesStorage, device, driver, monkeypatch
+    ):
+        """Changes are coalesced in memory and only written on flush/stop."""
+        driver.update_strategy = UpdateStrategy(polling_enabled=False)
+
+        async def _build(_url: str | None) -> MemoryDevicesStorage:
+            return seeded_storage
+
+        monkeypatch.setattr("devices_manager.service.build_storage", _build)
+        save_attributes = AsyncMock(wraps=seeded_storage.save_attributes)
+        monkeypatch.setattr(seeded_storage, "save_attributes", save_attributes)
+
+        dm = DevicesService(storage_url="memory://test", attribute_flush_interval=60)
+        await dm.start()
+        live = dm._device_registry.get(device.id)  # noqa: SLF001
+        for value in (40.0, 41.0, 42.0):
+            live._update_attribute(live.attributes["temperature"], value)  # noqa: SLF001
+        await asyncio.sleep(0.01)
+        save_attributes.assert_not_awaited()
+
+        await dm.stop()
+
+        [batch] = [call.args[0] for call in save_attributes.await_args_list]
+        temperatures = [
+            (d, a.current_value) for d, a in batch if a.name == "temperature"
+        ]
+        assert temperatures == [(device.id, 42.0)]
+        stored = await seeded_storage.devices.read(device.id)
+        assert stored.attributes["temperature"].current_value == 42.0
+
 
 class TestDevicesServiceRestartSync:
     @pytest.mark.asyncio
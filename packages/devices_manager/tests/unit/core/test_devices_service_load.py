@@ -58,6 +58,7 @@ def _seed_backend(backend: AsyncMock, entities: list) -> None:
     by_id = {entity.id: entity for entity in entities}
     backend.list_all.return_value = list(by_id)
     backend.read.side_effect = lambda item_id: by_id[item_id]
+    backend.read_all_lenient.return_value = (list(by_id.values()), {})
 
 
 def _storage_mock(
@@ -301,6 +302,56 @@ class TestFaultTolerantLoad:
         with pytest.raises(StorageConnectionError):
             await svc.load()
 
+    @pytest.mark.asyncio
+    async def test_failed_bulk_entry_is_recorded(
+        self, monkeypatch, driver, mock_transport_client
+    ):
+        storage = _storage_mock(
+            devices=[_device_dto(driver, mock_transport_client.id)],
+            drivers=[driver_to_public(driver)],
+            transports=[transport_to_public(mock_transport_client)],
+        )
+        storage.drivers.read_all_lenient.return_value = (
+            [driver_to_public(driver)],
+            {"broken": ValueError("bad row")},
+        )
+        monkeypatch.setattr(
+            "devices_manager.service.build_storage", AsyncMock(return_value=storage)
+        )
+
+        svc = DevicesService(storage_url="memory://test")
+        await svc.load()
+
+        assert svc.device_ids == {"d1"}
+        [error] = svc.load_errors
+        assert (error.kind, error.entity_id) == ("driver", "broken")
+
+
+class TestBulkHydration:
+    @pytest.mark.asyncio
+    async def test_load_reads_each_backend_in_bulk(
+        self, monkeypatch, driver, mock_transport_client
+    ):
+        storage = _storage_mock(
+            devices=[
+                _device_dto(driver, mock_transport_client.id, device_id=f"d{i}")
+                for i in range(5)
+            ],
+            drivers=[driver_to_public(driver)],
+            transports=[transport_to_public(mock_transport_client)],
+        )
+        monkeypatch.setattr(
+            "devices_manager.service.build_storage", AsyncMock(return_value=storage)
+        )
+
+        svc = DevicesService(storage_url="memory://test")
+        await svc.load()
+
+        assert len(svc.device_ids) == 5
+        for backend in (storage.devices, storage.drivers, storage.transports):
+            backend.read_all_lenient.assert_awaited_once()
+            backend.read.assert_not_awaited()
+
 
 class TestSinglePhaseConstruction:
     def test_set_storage_absent_from_public_surface(self):
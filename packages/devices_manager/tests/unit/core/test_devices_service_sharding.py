@@ -0,0 +1,198 @@
+"""A DevicesService running the transports assigned to it, as one shard of
+several sharing a storage."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+import pytest_asyncio
+
+from devices_manager import DevicesService
+from devices_manager.core.codecs.factory import CodecSpec
+from devices_manager.core.driver import AttributeDriver, UpdateStrategy
+from devices_manager.core.transports.http_transport import HttpTransportConfig
+from devices_manager.dto import DeviceCreate, DriverPatch, driver_to_public
+from devices_manager.dto.transport_dto import HttpTransportCreate
+from devices_manager.types import DataType, TransportProtocols
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+
+@pytest_asyncio.fixture
+async def stored(tmp_path: Path, driver) -> tuple[str, dict[str, str]]:
+    """A yaml storage with two transports of one device each: transport id
+    -> device id."""
+    driver.update_strategy = UpdateStrategy(polling_enabled=False)
+    url = f"yaml:{tmp_path}"
+    svc = DevicesService(url)
+    await svc.load()
+    await svc.add_driver(driver_to_public(driver))
+    devices = {}
+    for index in range(2):
+        transport = await svc.add_transport(
+            HttpTransportCreate(
+                name=f"Transport {index}",
+                protocol=TransportProtocols.HTTP,
+                config=HttpTransportConfig(),
+            )
+        )
+        device = await svc.add_device(
+            DeviceCreate(
+                name=f"Device {index}",
+                driver_id=driver.id,
+                transport_id=transport.id,
+                config={"some_id": str(index)},
+            )
+        )
+        devices[transport.id] = device.id
+    await svc.stop()
+    return url, devices
+
+
+@pytest_asyncio.fixture
+async def shard(stored) -> AsyncIterator[DevicesService]:
+    url, _ = stored
+    svc = DevicesService(url, owned_transports=())
+    await svc.start()
+    yield svc
+    await svc.stop()
+
+
+class TestAssignTransports:
+    @pytest.mark.asyncio
+    async def test_runs_nothing_until_assigned(self, shard, driver):
+        assert shard.transport_ids == set()
+        assert shard.device_ids == set()
+        assert shard.driver_ids == {driver.id}
+
+    @pytest.mark.asyncio
+    async def test_adopts_assigned_transports_with_their_devices(self, shard, stored):
+        _, devices = stored
+        first, second = devices
+
+        await shard.assign_transports([first])
+        assert shard.transport_ids == {first}
+        assert shard.device_ids == {devices[first]}
+
+        await shard.assign_transports([first, second])
+        assert shard.transport_ids == {first, second}
+        assert shard.device_ids == set(devices.values())
+
+    @pytest.mark.asyncio
+    async def test_releases_without_deleting(self, shard, stored):
+        url, devices = stored
+        await shard.assign_transports(devices)
+        await shard.assign_transports([])
+        assert shard.transport_ids == set()
+        assert shard.device_ids == set()
+
+        other = DevicesService(url)
+        await other.load()
+        try:
+            assert other.transport_ids == set(devices)
+            assert other.device_ids == set(devices.values())
+        finally:
+            await other.stop()
+
+    @pytest.mark.asyncio
+    async def test_added_transport_is_owned(self, shard):
+        transport = await shard.add_transport(
+            HttpTransportCreate(
+                name="New",
+                protocol=TransportProtocols.HTTP,
+                config=HttpTransportConfig(),
+            )
+        )
+        assert shard.transport_ids == {transport.id}
+        await shard.assign_transports(set())
+        assert shard.transport_ids == set()
+
+
+class TestLease:
+    @pytest.mark.asyncio
+    async def test_transports_released_when_it_runs_out(self, shard, stored):
+        _, devices = stored
+        await shard.assign_transports(devices, lease=0.05)
+        await asyncio.sleep(0.1)
+        assert shard.transport_ids == set()
+        assert shard.device_ids == set()
+        assert not shard.renew_lease(0.05)
+
+    @pytest.mark.asyncio
+    async def test_renewals_keep_the_transports(self, shard, stored):
+        _, devices = stored
+        await shard.assign_transports(devices, lease=0.05)
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+            assert shard.renew_lease(0.05)
+        assert shard.transport_ids == set(devices)
+
+    @pytest.mark.asyncio
+    async def test_counted_from_the_end_of_a_slow_assignment(
+        self, shard, stored, monkeypatch: pytest.MonkeyPatch
+    ):
+        _, devices = stored
+        transports = shard._storage.transports  # noqa: SLF001
+        read_all = transports.read_all_lenient
+
+        async def _slow_read_all() -> tuple[list, dict[str, Exception]]:
+            await asyncio.sleep(0.1)
+            return await read_all()
+
+        monkeypatch.setattr(transports, "read_all_lenient", _slow_read_all)
+        await shard.assign_transports(devices, lease=0.05)
+        await asyncio.sleep(0.02)
+
+        assert shard.renew_lease(0.05)
+        assert shard.transport_ids == set(devices)
+
+
+class TestReloadDriver:
+    @pytest.mark.asyncio
+    async def test_takes_the_stored_driver_and_rebuilds_its_devices(
+        self, shard, stored, driver
+    ):
+        url, devices = stored
+        await shard.assign_transports(devices)
+
+        other = DevicesService(url, owned_transports=())
+        await other.load()
+        try:
+            await other.patch_driver(driver.id, DriverPatch(vendor="Acme"))
+            await other.create_driver_attribute(
+                driver.id,
+                AttributeDriver(
+                    name="pressure",
+                    data_type=DataType.FLOAT,
+                    read="GET /pressure",
+                    codecs=[CodecSpec(name="identity", argument="")],
+                ),
+            )
+        finally:
+            await other.stop()
+        await shard.reload_driver(driver.id)
+
+        assert shard.get_driver(driver.id).vendor == "Acme"
+        for device_id in devices.values():
+            assert "pressure" in shard.get_device(device_id).attributes
+
+    @pytest.mark.asyncio
+    async def test_adds_and_drops_drivers(self, shard, stored, driver):
+        url, _ = stored
+        added = driver_to_public(driver).model_copy(update={"id": "other_driver"})
+        other = DevicesService(url, owned_transports=())
+        await other.load()
+        try:
+            await other.add_driver(added)
+            await shard.reload_driver(added.id)
+            assert added.id in shard.driver_ids
+
+            await other.delete_driver(added.id)
+            await shard.reload_driver(added.id)
+            assert added.id not in shard.driver_ids
+        finally:
+            await other.stop()
@@ -1,44 +1,92 @@
 import pytest
 
-from devices_manager.core.fuzzy_search import fuzzy_match
+from devices_manager.core.fuzzy_search import FuzzyIndex, fuzzy_match
+
+CASES = [
+    # exact match
+    ("chambre 12", "chambre 12", True),
+    # fuzzy string token matches despite typo
+    ("chmabre 12", "chambre 12", True),
+    # numeric token is whole-word: "13" does not match "chambre 12"
+    ("chambre 13", "chambre 12", False),
+    # numeric token is whole-word: "3" does not match "chambre 13"
+    ("chambre 3", "chambre 13", False),
+    # numeric token is whole-word: "1" does not match "chambre 12"
+    ("1", "chambre 12", False),
+    # AND semantics: all tokens must match — missing token rejects device
+    ("chambre 12", "chambre", False),
+    # empty query returns True
+    ("", "chambre 12", True),
+    # whitespace-only query returns True
+    ("   ", "chambre 12", True),
+    # --- hyphenated / concatenated names (leak detectors) ---
+    # a substring of a concatenated name matches (was: matched nothing)
+    ("fuite", "EM300-Fuite-Colonne6", True),
+    ("colonne", "EM300-Fuite-Colonne6", True),
+    ("colon", "EM300-Fuite-Colonne6", True),  # partial prefix
+    # full hyphenated query targets exactly its number (was: matched all)
+    ("EM300-Fuite-Colonne-6", "EM300-Fuite-Colonne6", True),
+    ("EM300-Fuite-Colonne-6", "EM300-Fuite-Colonne16", False),
+    ("EM300-Fuite-Colonne-6", "EM300-Fuite-Colonne1", False),
+    # numeric token glued to letters is still whole-number
+    ("colonne 6", "EM300-Fuite-Colonne16", False),
+    ("colonne 16", "EM300-Fuite-Colonne16", True),
+    # accented names tokenize without dropping the accent
+    ("étage 5", "AUT_N6 — Chambres étage 5", True),
+    ("étage 5", "AUT_N6 — Chambres étage 7", False),
+]
+
+NAMES = [
+    "chambre 12",
+    "chambre 13",
+    "EM300-Fuite-Colonne6",
+    "EM300-Fuite-Colonne16",
+    "AUT_N6 — Chambres étage 5",
+    "Bureau nord",
+]
 
 
 class TestFuzzyMatch:
-    @pytest.mark.parametrize(
-        ("query", "name", "expected"),
-        [
-            # exact match
-            ("chambre 12", "chambre 12", True),
-            # fuzzy string token matches despite typo
-            ("chmabre 12", "chambre 12", True),
-            # numeric token is whole-word: "13" does not match "chambre 12"
-            ("chambre 13", "chambre 12", False),
-            # numeric token is whole-word: "3" does not match "chambre 13"
-            ("chambre 3", "chambre 13", False),
-            # numeric token is whole-word: "1" does not match "chambre 12"
-            ("1", "chambre 12", False),
-            # AND semantics: all tokens must match — missing token rejects device
-            ("chambre 12", "chambre", False),
-            # empty query returns True
-            ("", "chambre 12", True),
-            # whitespace-only query returns True
-            ("   ", "chambre 12", True),
-            # --- hyphenated / concatenated names (leak detectors) ---
-            # a substring of a concatenated name matches (was: matched nothing)
-            ("fuite", "EM300-Fuite-Colonne6", True),
-            ("colonne", "EM300-Fuite-Colonne6", True),
-            ("colon", "EM300-Fuite-Colonne6", True),  # partial prefix
-            # full hyphenated query targets exactly its number (was: matched all)
-            ("EM300-Fuite-Colonne-6", "EM300-Fuite-Colonne6", True),
-            ("EM300-Fuite-Colonne-6", "EM300-Fuite-Colonne16", False),
-            ("EM300-Fuite-Colonne-6", "EM300-Fuite-Colonne1", False),
-            # numeric token glued to letters is still whole-number
-            ("colonne 6", "EM300-Fuite-Colonne16", False),
-            ("colonne 16", "EM300-Fuite-Colonne16", True),
-            # accented names tokenize without dropping the accent
-            ("étage 5", "AUT_N6 — Chambres étage 5", True),
-            ("étage 5", "AUT_N6 — Chambres étage 7", False),
-        ],
-    )
+    @pytest.mark.parametrize(("query", "name", "expected"), CASES)
     def test_fuzzy_match(self, query: str, name: str, expected: bool) -> None:
         assert fuzzy_match(query, name) is expected
+
+
+@pytest.fixture
+def index() -> FuzzyIndex:
+    index = FuzzyIndex()
+    for i, name in enumerate(NAMES):
+        index.add(str(i), name)
+    return index
+
+
+class TestFuzzyIndex:
+    @pytest.mark.parametrize(("query", "name", "expected"), CASES)
+    def test_same_as_fuzzy_match(self, query: str, name: str, expected: bool) -> None:
+        index = FuzzyIndex()
+        index.add("d1", name)
+        found = index.search(query)
+        assert (found is None or found == {"d1"}) is expected
+
+    @pytest.mark.parametrize(
+        "query", ["chmabre", "colon 6", "fuite 16", "étage", "bureua", "12", "zzz"]
+    )
+    def test_many_names(self, index: FuzzyIndex, query: str) -> None:
+        assert index.search(query) == {
+            str(i) for i, name in enumerate(NAMES) if fuzzy_match(query, name)
+        }
+
+    def test_blank_query_matches_everything(self, index: FuzzyIndex) -> None:
+        assert index.search("  ") is None
+
+    def test_rename(self, index: FuzzyIndex) -> None:
+        assert index.search("bureau") == {"5"}
+        index.add("5", "Salle sud")
+        assert index.search("bureau") == set()
+        assert index.search("salle") == {"5"}
+
+    def test_remove(self, index: FuzzyIndex) -> None:
+        index.remove("0")
+        assert index.search("chambre 12") == set()
+        assert index.search("chambre") == {"1", "4"}
+        index.remove("0")
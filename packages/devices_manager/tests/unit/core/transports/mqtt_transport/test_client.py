@@ -253,6 +253,60 @@ async def test_subscribe(mqtt_client, mock_aiomqtt_client):
     mock_aiomqtt_client.subscribe.assert_awaited_once_with("test/topic")
 
 
+@pytest.mark.asyncio
+async def test_register_listeners_subscribes_in_one_request(
+    mqtt_client, mock_aiomqtt_client
+):
+    await mqtt_client.connect()
+    listener_ids = await mqtt_client.register_listeners(
+        [("a/temp", Mock()), ("b/temp", Mock()), ("a/temp", Mock())]
+    )
+    assert len(set(listener_ids)) == 3
+    mock_aiomqtt_client.subscribe.assert_awaited_once_with(
+        [("a/temp", 0), ("b/temp", 0)]
+    )
+    assert len(mqtt_client._message_handlers.get_by_topic("a/temp")) == 2  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_register_listeners_rolls_back_on_subscribe_failure(
+    mqtt_client, mock_aiomqtt_client
+):
+    await mqtt_client.connect()
+    mock_aiomqtt_client.subscribe.side_effect = RuntimeError("broker refused")
+    with pytest.raises(RuntimeError, match="broker refused"):
+        await mqtt_client.register_listeners([("a/temp", Mock())])
+    assert not mqtt_client._handlers_registry.get_by_address_id("a/temp")  # noqa: SLF001
+    assert not mqtt_client._message_handlers.get_by_topic("a/temp")  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_register_listeners_unsubscribes_acknowledged_chunks_on_failure(
+    mqtt_client, mock_aiomqtt_client
+):
+    await mqtt_client.connect()
+    await mqtt_client.register_listener("a/temp", Mock())
+    mock_aiomqtt_client.subscribe.side_effect = [
+        None,
+        None,
+        RuntimeError("broker refused"),
+    ]
+    with (
+        patch(
+            "devices_manager.core.transports.mqtt_transport.client."
+            "MAX_TOPICS_PER_SUBSCRIBE",
+            1,
+        ),
+        pytest.raises(RuntimeError, match="broker refused"),
+    ):
+        await mqtt_client.register_listeners(
+            [("a/temp", Mock()), ("b/temp", Mock()), ("c/temp", Mock())]
+        )
+    # a/temp stays subscribed for the listener registered before.
+    mock_aiomqtt_client.unsubscribe.assert_awaited_once_with(["b/temp"])
+    assert len(mqtt_client._message_handlers.get_by_topic("a/temp")) == 1  # noqa: SLF001
+
+
 @pytest.mark.asyncio
 async def test_unsubscribe(mqtt_client, mock_aiomqtt_client):
     await mqtt_client.connect()
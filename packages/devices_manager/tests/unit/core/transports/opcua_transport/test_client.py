@@ -0,0 +1,109 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from asyncua import ua
+
+from devices_manager.core.transports.opcua_transport.client import OpcuaTransportClient
+from devices_manager.core.transports.opcua_transport.transport_config import (
+    OpcuaTransportConfig,
+)
+from devices_manager.core.transports.transport_connection_state import (
+    TransportConnectionState,
+)
+from devices_manager.core.transports.transport_metadata import TransportMetadata
+
+pytestmark = pytest.mark.asyncio
+
+TOPICS = ["ns=2;s=A", "ns=2;s=B", "ns=2;s=C"]
+UNKNOWN_NODE = ua.StatusCode(ua.StatusCodes.BadNodeIdUnknown)  # ty: ignore[invalid-argument-type]
+
+
+def _noop(_value: object) -> None:
+    pass
+
+
+@pytest.fixture
+def subscription() -> Mock:
+    subscription = Mock(is_deleted=False)
+    subscription.create_monitored_items = AsyncMock(return_value=[11, 12, 13])
+    subscription.unsubscribe = AsyncMock()
+    subscription.delete = AsyncMock()
+    return subscription
+
+
+@pytest.fixture
+def opcua_client(subscription: Mock) -> OpcuaTransportClient:
+    client = OpcuaTransportClient(
+        TransportMetadata(id="opc1", name="OPC-UA server"),
+        OpcuaTransportConfig(endpoint_url="opc.tcp://127.0.0.1:4840"),
+    )
+    session = Mock()
+    session.get_node = Mock(side_effect=lambda topic: Mock(nodeid=topic))
+    session.create_subscription = AsyncMock(return_value=subscription)
+    client._client = session  # noqa: SLF001
+    client.connection_state = TransportConnectionState.connected()
+    return client
+
+
+class TestRegisterListeners:
+    async def test_new_topics_created_in_one_request(
+        self, opcua_client: OpcuaTransportClient, subscription: Mock
+    ):
+        ids = await opcua_client.register_listeners(
+            [(topic, _noop) for topic in TOPICS]
+        )
+
+        subscription.create_monitored_items.assert_awaited_once()
+        [requests] = subscription.create_monitored_items.await_args.args
+        assert [r.ItemToMonitor.NodeId for r in requests] == TOPICS
+        handles = dict(zip(TOPICS, [11, 12, 13], strict=True))
+        assert opcua_client._monitored_items == handles  # noqa: SLF001
+        assert len(set(ids)) == len(TOPICS)
+        assert opcua_client._handlers_registry.address_ids() == set(TOPICS)  # noqa: SLF001
+
+    async def test_known_and_repeated_topics_not_recreated(
+        self, opcua_client: OpcuaTransportClient, subscription: Mock
+    ):
+        subscription.create_monitored_items.return_value = [11]
+        await opcua_client.register_listeners([(TOPICS[0], _noop)])
+        subscription.create_monitored_items.return_value = [12]
+
+        ids = await opcua_client.register_listeners(
+            [(TOPICS[0], _noop), (TOPICS[1], _noop), (TOPICS[1], _noop)]
+        )
+
+        [requests] = subscription.create_monitored_items.await_args.args
+        assert [r.ItemToMonitor.NodeId for r in requests] == [TOPICS[1]]
+        assert len(ids) == 3
+        assert opcua_client._monitored_items == {TOPICS[0]: 11, TOPICS[1]: 12}  # noqa: SLF001
+
+    async def test_rejected_item_rolls_back_the_batch(
+        self, opcua_client: OpcuaTransportClient, subscription: Mock
+    ):
+        subscription.create_monitored_items.return_value = [11, UNKNOWN_NODE, 13]
+
+        with pytest.raises(ua.uaerrors.BadNodeIdUnknown):
+            await opcua_client.register_listeners([(topic, _noop) for topic in TOPICS])
+
+        subscription.unsubscribe.assert_awaited_once_with([11, 13])
+        assert opcua_client._monitored_items == {}  # noqa: SLF001
+        assert opcua_client._handlers_registry.address_ids() == set()  # noqa: SLF001
+        subscription.delete.assert_awaited_once()
+        assert opcua_client._subscription is None  # noqa: SLF001
+
+    async def test_rejected_batch_keeps_existing_items(
+        self, opcua_client: OpcuaTransportClient, subscription: Mock
+    ):
+        subscription.create_monitored_items.return_value = [11]
+        await opcua_client.register_listeners([(TOPICS[0], _noop)])
+        subscription.create_monitored_items.return_value = [12, UNKNOWN_NODE]
+
+        with pytest.raises(ua.uaerrors.BadNodeIdUnknown):
+            await opcua_client.register_listeners(
+                [(TOPICS[1], _noop), (TOPICS[2], _noop)]
+            )
+
+        subscription.unsubscribe.assert_awaited_once_with([12])
+        subscription.delete.assert_not_awaited()
+        assert opcua_client._monitored_items == {TOPICS[0]: 11}  # noqa: SLF001
+        assert opcua_client._handlers_registry.address_ids() == {TOPICS[0]}  # noqa: SLF001
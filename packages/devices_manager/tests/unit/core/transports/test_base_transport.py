@@ -26,6 +26,7 @@ from ..fixtures.recording_transport import (
     SerializedTransportClient,
 )
 from ..fixtures.transport_clients import (
+    MockPushTransportClient,
     MockTransportAddress,
     make_http_transport_client,
 )
@@ -38,6 +39,47 @@ def _mqtt_client() -> MqttTransportClient:
     )
 
 
+class TestRegisterListeners:
+    @pytest.mark.asyncio
+    async def test_default_registers_each_listener_in_order(self) -> None:
+        client = MockPushTransportClient(
+            TransportMetadata(id="push", name="push"),
+            MqttTransportConfig(host="broker", port=1883),
+        )
+        received: list[object] = []
+        ids = await client.register_listeners(
+            [("a", received.append), ("b", received.append)]
+        )
+        await client.simulate_event("b", 42)
+        assert len(ids) == 2
+        assert received == [42]
+
+    @pytest.mark.asyncio
+    async def test_default_rolls_back_on_failure(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client = MockPushTransportClient(
+            TransportMetadata(id="push", name="push"),
+            MqttTransportConfig(host="broker", port=1883),
+        )
+        original = client.register_listener
+
+        async def _fail_on_b(topic: str, callback: Callable) -> str:
+            if topic == "b":
+                msg = "rejected"
+                raise RuntimeError(msg)
+            return await original(topic, callback)
+
+        monkeypatch.setattr(client, "register_listener", _fail_on_b)
+        received: list[object] = []
+        with pytest.raises(RuntimeError, match="rejected"):
+            await client.register_listeners(
+                [("a", received.append), ("b", received.append)]
+            )
+        await client.simulate_event("a", 42)
+        assert received == []
+
+
 class TestReadLock:
     @pytest.mark.asyncio
     async def test_default_reads_stay_concurrent(self) -> None:
@@ -0,0 +1,3 @@
+from ..core.fixtures.devices import *  # noqa: F403, TID252
+from ..core.fixtures.drivers import *  # noqa: F403, TID252
+from ..core.fixtures.transport_clients import *  # noqa: F403, TID252
@@ -0,0 +1,234 @@
+"""The engine and a worker in one event loop: the worker's blocking calls go
+through ``asyncio.to_thread``, or the loop would never serve their answer."""
+
+import asyncio
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from pydantic import ValidationError
+
+from devices_manager import Attribute, DevicesService
+from devices_manager.dto import Device, DeviceUpdate, DriverPatch
+from devices_manager.ingress import IngressRequest
+from devices_manager.remote import (
+    DeviceRef,
+    EngineServer,
+    RemoteDevicesService,
+    RemoteError,
+)
+from devices_manager.remote.protocol import decode_error, encode_error
+from models.errors import ConflictError, NotFoundError, StorageConnectionError
+
+
+@pytest.fixture
+def socket_path() -> Iterator[str]:
+    # Not tmp_path: Unix socket paths are limited to about 100 characters.
+    with tempfile.TemporaryDirectory() as directory:
+        yield str(Path(directory) / "engine.sock")
+
+
+@pytest_asyncio.fixture
+async def service(device, driver, mock_transport_client) -> DevicesService:
+    service = DevicesService(
+        devices={device.id: device},
+        drivers={driver.id: driver},
+        transports={mock_transport_client.id: mock_transport_client},
+    )
+    await service.load()
+    return service
+
+
+@pytest_asyncio.fixture
+async def engine(service, socket_path) -> AsyncIterator[EngineServer]:
+    server = EngineServer(service, socket_path)
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def remote(
+    engine,  # noqa: ARG001
+    socket_path,
+) -> AsyncIterator[RemoteDevicesService]:
+    remote = RemoteDevicesService(socket_path, connect_timeout=1)
+    await remote.start()
+    yield remote
+    await remote.stop()
+
+
+class TestRemoteCalls:
+    @pytest.mark.asyncio
+    async def test_plain_methods(self, remote, service):
+        assert await asyncio.to_thread(remote.get_device, "d1") == service.get_device(
+            "d1"
+        )
+        assert await asyncio.to_thread(
+            lambda: remote.list_devices(ids={"d1"}, search="my device")
+        ) == service.list_devices(ids=["d1"])
+        assert await asyncio.to_thread(lambda: remote.device_ids) == {"d1"}
+        assert await asyncio.to_thread(remote.list_transports) == (
+            service.list_transports()
+        )
+        assert await asyncio.to_thread(remote.get_driver, "test_driver") == (
+            service.get_driver("test_driver")
+        )
+
+    @pytest.mark.asyncio
+    async def test_coroutines(self, remote, service):
+        updated = await remote.update_device("d1", DeviceUpdate(name="Renamed"))
+        assert updated.name == "Renamed"
+        assert service.get_device("d1").name == "Renamed"
+
+        tagged = await remote.set_device_tag("d1", "floor", "2")
+        assert tagged.tags == {"floor": "2"}
+
+    @pytest.mark.asyncio
+    async def test_patch_leaves_unset_fields_alone(self, remote, service):
+        patched = await remote.patch_driver("test_driver", DriverPatch(vendor="Acme"))
+        assert patched.vendor == "Acme"
+        assert service.get_driver("test_driver").vendor == "Acme"
+
+    @pytest.mark.asyncio
+    async def test_write_returns_the_attribute(self, remote):
+        attribute = await remote.write_device_attribute(
+            "d1", "temperature_setpoint", 21.5, confirm=False
+        )
+        assert isinstance(attribute, Attribute)
+        assert attribute.name == "temperature_setpoint"
+
+    @pytest.mark.asyncio
+    async def test_stream(self, remote, service, monkeypatch):
+        async def stream_device_read(
+            device_id: str,  # noqa: ARG001
+        ) -> AsyncIterator[tuple[str, float | None]]:
+            yield "temperature", 20.5
+            yield "humidity", None
+
+        monkeypatch.setattr(service, "stream_device_read", stream_device_read)
+
+        assert [item async for item in remote.stream_device_read("d1")] == [
+            ("temperature", 20.5),
+            ("humidity", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently(self, remote, service, monkeypatch):
+        release = asyncio.Event()
+
+        async def slow_read(device_id: str) -> Device:
+            await release.wait()
+            return service.get_device(device_id)
+
+        monkeypatch.setattr(service, "read_device", slow_read)
+
+        slow = asyncio.create_task(remote.read_device("d1"))
+        await remote.set_device_tag("d1", "floor", "1")
+        assert not slow.done()
+        release.set()
+        assert (await slow).id == "d1"
+
+
+class TestRemoteErrors:
+    @pytest.mark.asyncio
+    async def test_domain_errors_raised_as_themselves(self, remote):
+        with pytest.raises(NotFoundError):
+            await asyncio.to_thread(remote.get_device, "nope")
+        with pytest.raises(NotFoundError):
+            await remote.delete_device("nope")
+        with pytest.raises(ConflictError):
+            await remote.delete_driver("test_driver")
+
+    @pytest.mark.asyncio
+    async def test_ingress_on_a_pull_transport(self, remote, mock_transport_client):
+        ingress = remote.get_transport_ingress(mock_transport_client.id)
+        with pytest.raises(NotFoundError):
+            await ingress.ingress(IngressRequest(topic="t", payload=b"\xff\x00"))
+
+    @pytest.mark.asyncio
+    async def test_unexpected_errors(self, remote, service, monkeypatch):
+        async def broken(device_id: str) -> Device:  # noqa: ARG001
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        monkeypatch.setattr(service, "read_device", broken)
+
+        with pytest.raises(RemoteError, match="RuntimeError: boom"):
+            await remote.read_device("d1")
+
+    def test_validation_error_round_trip(self):
+        with pytest.raises(ValidationError) as raised:
+            DeviceUpdate.model_validate({"name": 1, "unknown": True})
+
+        error = decode_error(encode_error(raised.value))
+
+        assert isinstance(error, ValidationError)
+        assert error.errors(include_url=False, include_input=False) == (
+            raised.value.errors(include_url=False, include_input=False)
+        )
+
+    def test_key_error_keeps_its_key(self):
+        error = decode_error(encode_error(KeyError("d1")))
+        assert isinstance(error, KeyError)
+        assert error.args == ("d1",)
+
+    @pytest.mark.asyncio
+    async def test_engine_unreachable(self, socket_path):
+        remote = RemoteDevicesService(socket_path, connect_timeout=0.1)
+        with pytest.raises(StorageConnectionError):
+            await remote.start()
+
+
+class TestRemoteEvents:
+    @pytest.mark.asyncio
+    async def test_attribute_updates(self, remote, device):
+        received = asyncio.Queue()
+        remote.add_device_attribute_listener(lambda *args: received.put_nowait(args))
+
+        device._update_attribute(device.attributes["temperature_setpoint"], 22)  # noqa: SLF001
+
+        ref, name, previous, attribute = await asyncio.wait_for(received.get(), 1)
+        assert ref == DeviceRef(id="d1", name="My device")
+        assert name == "temperature_setpoint"
+        assert previous is None
+        assert attribute.current_value == 22
+
+    @pytest.mark.asyncio
+    async def test_removed_listener(self, remote, device):
+        received = asyncio.Queue()
+        listener_id = remote.add_device_attribute_listener(
+            lambda *args: received.put_nowait(args)
+        )
+        remote.remove_device_attribute_listener(listener_id)
+        sentinel = asyncio.Event()
+        remote.add_device_attribute_listener(lambda *_: sentinel.set())
+
+        device._update_attribute(device.attributes["temperature_setpoint"], 22)  # noqa: SLF001
+
+        await asyncio.wait_for(sentinel.wait(), 1)
+        assert received.empty()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_an_engine_restart(
+        self, remote, engine, service, device, socket_path
+    ):
+        received = asyncio.Queue()
+        remote.add_device_attribute_listener(lambda *args: received.put_nowait(args))
+        await engine.stop()
+        server = EngineServer(service, socket_path)
+        await server.start()
+        try:
+            for value in range(100):
+                device._update_attribute(  # noqa: SLF001
+                    device.attributes["temperature_setpoint"], value
+                )
+                if not received.empty():
+                    break
+                await asyncio.sleep(0.05)
+            assert not received.empty()
+            assert (await remote.read_device("d1")).id == "d1"
+        finally:
+            await server.stop()
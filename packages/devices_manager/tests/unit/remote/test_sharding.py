@@ -0,0 +1,297 @@
+"""Shards and their coordinator in one event loop, sharing a yaml storage.
+
+The coordinator's plain methods block on the shards, so tests call them
+through ``asyncio.to_thread`` for the loop to serve the shards meanwhile.
+"""
+
+import asyncio
+import tempfile
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from devices_manager import DevicesService
+from devices_manager.core.driver import UpdateStrategy
+from devices_manager.core.transports.http_transport import HttpTransportConfig
+from devices_manager.dto import (
+    DeviceCreate,
+    DeviceUpdate,
+    DriverPatch,
+    driver_to_public,
+)
+from devices_manager.dto.transport_dto import HttpTransportCreate
+from devices_manager.remote import EngineServer, HashRing, ShardedDevicesService
+from devices_manager.types import TransportProtocols
+from models.errors import ConflictError, InvalidError, NotFoundError
+
+TRANSPORTS = 16
+
+
+def _http_transport(name: str) -> HttpTransportCreate:
+    return HttpTransportCreate(
+        name=name, protocol=TransportProtocols.HTTP, config=HttpTransportConfig()
+    )
+
+
+async def _until(condition: Callable[[], bool]) -> None:
+    async with asyncio.timeout(5):
+        while not condition():  # noqa: ASYNC110 - polls another service's state
+            await asyncio.sleep(0.01)
+
+
+class TestHashRing:
+    def test_owner_is_stable(self):
+        keys = [f"t{i}" for i in range(100)]
+        ring = HashRing(["a", "b", "c"])
+        assert [ring.owner(k) for k in keys] == [
+            HashRing(["c", "b", "a"]).owner(k) for k in keys
+        ]
+
+    def test_new_node_only_takes_keys(self):
+        keys = [f"t{i}" for i in range(1000)]
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b", "c", "d"])
+        moved = [k for k in keys if before.owner(k) != after.owner(k)]
+        assert {after.owner(k) for k in moved} == {"d"}
+        assert 100 < len(moved) < 400
+
+    def test_removed_node_only_gives_its_keys(self):
+        keys = [f"t{i}" for i in range(1000)]
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "c"])
+        moved = [k for k in keys if before.owner(k) != after.owner(k)]
+        assert {before.owner(k) for k in moved} == {"b"}
+
+    def test_empty_ring(self):
+        ring = HashRing([])
+        assert not ring
+        with pytest.raises(LookupError):
+            ring.owner("t1")
+
+
+@pytest.fixture
+def socket_dir() -> Iterator[Path]:
+    # Not tmp_path: Unix socket paths are limited to about 100 characters.
+    with tempfile.TemporaryDirectory() as directory:
+        yield Path(directory)
+
+
+@pytest_asyncio.fixture
+async def stored(tmp_path, driver) -> tuple[str, dict[str, str]]:
+    """A yaml storage with transports of one device each: transport id ->
+    device id."""
+    driver.update_strategy = UpdateStrategy(polling_enabled=False)
+    url = f"yaml:{tmp_path}"
+    svc = DevicesService(url)
+    await svc.load()
+    await svc.add_driver(driver_to_public(driver))
+    devices = {}
+    for index in range(TRANSPORTS):
+        transport = await svc.add_transport(_http_transport(f"Transport {index}"))
+        device = await svc.add_device(
+            DeviceCreate(
+                name=f"Device {index}",
+                driver_id=driver.id,
+                transport_id=transport.id,
+                config={"some_id": str(index)},
+            )
+        )
+        devices[transport.id] = device.id
+    await svc.stop()
+    return url, devices
+
+
+class _Shard:
+    def __init__(self, url: str, path: str) -> None:
+        self.path = path
+        self.service = DevicesService(url, owned_transports=())
+        self.server = EngineServer(self.service, path)
+
+    async def start(self) -> None:
+        await self.service.start()
+        await self.server.start()
+
+    async def stop(self) -> None:
+        await self.server.stop()
+        await self.service.stop()
+
+
+@pytest_asyncio.fixture
+async def shards(stored, socket_dir) -> AsyncIterator[list[_Shard]]:
+    url, _ = stored
+    shards = [_Shard(url, str(socket_dir / f"shard-{i}.sock")) for i in range(2)]
+    for shard in shards:
+        await shard.start()
+    yield shards
+    for shard in shards:
+        await shard.stop()
+
+
+@pytest_asyncio.fixture
+async def coordinator(stored, shards) -> AsyncIterator[ShardedDevicesService]:
+    url, _ = stored
+    coordinator = ShardedDevicesService(
+        [shard.path for shard in shards],
+        url,
+        connect_timeout=1,
+        check_interval=0.02,
+        lease=0.2,
+    )
+    await coordinator.start()
+    yield coordinator
+    await coordinator.stop()
+
+
+def _placed(shards: list[_Shard], transport_ids: list[str]) -> bool:
+    """Whether each transport runs on its ring owner among *shards*."""
+    ring = HashRing(shard.path for shard in shards)
+    return all(
+        shard.service.transport_ids
+        == {t for t in transport_ids if ring.owner(t) == shard.path}
+        for shard in shards
+    )
+
+
+class TestPlacement:
+    @pytest.mark.asyncio
+    async def test_transports_run_on_their_ring_owner(
+        self,
+        coordinator,  # noqa: ARG002
+        shards,
+        stored,
+    ):
+        _, devices = stored
+        assert _placed(shards, list(devices))
+        assert all(shard.service.transport_ids for shard in shards)
+        for shard in shards:
+            assert shard.service.device_ids == {
+                devices[t] for t in shard.service.transport_ids
+            }
+
+    @pytest.mark.asyncio
+    async def test_stopped_shard_transports_move_and_come_back(
+        self, coordinator, shards, stored
+    ):
+        _, devices = stored
+        first, second = shards
+        kept = set(first.service.transport_ids)
+
+        await second.server.stop()
+        await _until(lambda: first.service.device_ids == set(devices.values()))
+        assert await asyncio.to_thread(lambda: coordinator.device_ids) == set(
+            devices.values()
+        )
+
+        await second.server.start()
+        await _until(lambda: _placed(shards, list(devices)))
+        assert first.service.transport_ids == kept
+
+
+class TestLease:
+    @pytest.mark.asyncio
+    async def test_cut_off_shard_releases_before_others_adopt(
+        self, coordinator, shards, stored
+    ):
+        _, devices = stored
+        first, second = shards
+        overlaps: list[set[str]] = []
+
+        async def watch() -> None:
+            while True:
+                overlaps.append(
+                    first.service.transport_ids & second.service.transport_ids
+                )
+                await asyncio.sleep(0.005)
+
+        watcher = asyncio.create_task(watch())
+        try:
+            # The coordinator loses the shard, which keeps running.
+            await second.server.stop()
+            await _until(lambda: first.service.transport_ids == set(devices))
+        finally:
+            watcher.cancel()
+        assert second.service.transport_ids == set()
+        assert not any(overlaps)
+        assert await asyncio.to_thread(lambda: coordinator.transport_ids) == set(
+            devices
+        )
+
+
+class TestRouting:
+    @pytest.mark.asyncio
+    async def test_reads_cover_every_shard(self, coordinator, stored):
+        _, devices = stored
+        listed = await asyncio.to_thread(coordinator.list_devices)
+        assert {d.id for d in listed} == set(devices.values())
+        assert await asyncio.to_thread(lambda: coordinator.transport_ids) == set(
+            devices
+        )
+        for device_id in devices.values():
+            device = await asyncio.to_thread(coordinator.get_device, device_id)
+            assert device.id == device_id
+
+    @pytest.mark.asyncio
+    async def test_device_calls_reach_its_shard(self, coordinator, shards, stored):
+        _, devices = stored
+        for transport_id, device_id in devices.items():
+            tagged = await coordinator.set_device_tag(device_id, "floor", "2")
+            assert tagged.tags == {"floor": "2"}
+            owner = next(s for s in shards if transport_id in s.service.transport_ids)
+            assert owner.service.get_device(device_id).tags == {"floor": "2"}
+
+        with pytest.raises(NotFoundError):
+            await coordinator.read_device("nope")
+
+    @pytest.mark.asyncio
+    async def test_added_transport_and_device_go_to_the_owner(
+        self, coordinator, shards, driver
+    ):
+        transport = await coordinator.add_transport(_http_transport("New"))
+        owner = next(
+            s
+            for s in shards
+            if s.path == HashRing(s.path for s in shards).owner(transport.id)
+        )
+        assert transport.id in owner.service.transport_ids
+
+        device = await coordinator.add_device(
+            DeviceCreate(
+                name="New device",
+                driver_id=driver.id,
+                transport_id=transport.id,
+                config={"some_id": "new"},
+            )
+        )
+        assert device.id in owner.service.device_ids
+        await coordinator.delete_device(device.id)
+        assert device.id not in owner.service.device_ids
+
+    @pytest.mark.asyncio
+    async def test_moving_a_device_to_another_shard_is_rejected(
+        self, coordinator, shards, stored
+    ):
+        _, devices = stored
+        first, second = shards
+        device_id = devices[next(iter(first.service.transport_ids))]
+        with pytest.raises(InvalidError):
+            await coordinator.update_device(
+                device_id,
+                DeviceUpdate(transport_id=next(iter(second.service.transport_ids))),
+            )
+
+
+class TestDrivers:
+    @pytest.mark.asyncio
+    async def test_change_reaches_every_shard(self, coordinator, shards, driver):
+        await coordinator.patch_driver(driver.id, DriverPatch(vendor="Acme"))
+        for shard in shards:
+            assert shard.service.get_driver(driver.id).vendor == "Acme"
+
+    @pytest.mark.asyncio
+    async def test_delete_checks_every_shard(self, coordinator, shards, driver):
+        with pytest.raises(ConflictError):
+            await coordinator.delete_driver(driver.id)
+        for shard in shards:
+            assert driver.id in shard.service.driver_ids
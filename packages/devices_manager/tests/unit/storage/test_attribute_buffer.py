@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from devices_manager.core.device import Attribute
+from devices_manager.storage.attribute_buffer import AttributeWriteBuffer
+from devices_manager.types import DataType
+
+
+def _attr(name: str, value: float) -> Attribute:
+    return Attribute.create(name, DataType.FLOAT, {"read"}, value)
+
+
+def _saved(storage: AsyncMock) -> list[list[tuple[str, Attribute]]]:
+    return [call.args[0] for call in storage.save_attributes.await_args_list]
+
+
+class TestAttributeWriteBuffer:
+    def test_invalid_settings_rejected(self):
+        with pytest.raises(ValueError, match="flush_interval"):
+            AttributeWriteBuffer(AsyncMock(), flush_interval=0)
+        with pytest.raises(ValueError, match="max_batch_size"):
+            AttributeWriteBuffer(AsyncMock(), max_batch_size=0)
+
+    @pytest.mark.asyncio
+    async def test_latest_value_per_key_wins(self):
+        storage = AsyncMock()
+        buffer = AttributeWriteBuffer(storage)
+        buffer.add("d1", _attr("temp", 1.0))
+        buffer.add("d1", _attr("temp", 2.0))
+        buffer.add("d2", _attr("temp", 3.0))
+
+        await buffer.flush()
+
+        [batch] = _saved(storage)
+        assert {(d, a.current_value) for d, a in batch} == {("d1", 2.0), ("d2", 3.0)}
+        assert buffer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_without_pending_is_a_noop(self):
+        storage = AsyncMock()
+        await AttributeWriteBuffer(storage).flush()
+        storage.save_attributes.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_interval(self):
+        storage = AsyncMock()
+        buffer = AttributeWriteBuffer(storage, flush_interval=0.01)
+        await buffer.start()
+        try:
+            buffer.add("d1", _attr("temp", 1.0))
+            await asyncio.sleep(0.05)
+        finally:
+            await buffer.stop()
+
+        assert len(_saved(storage)) == 1
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_size_reached(self):
+        storage = AsyncMock()
+        buffer = AttributeWriteBuffer(storage, flush_interval=60, max_batch_size=2)
+        await buffer.start()
+        try:
+            buffer.add("d1", _attr("a", 1.0))
+            buffer.add("d1", _attr("b", 2.0))
+            await asyncio.sleep(0.01)
+            assert len(_saved(storage)) == 1
+        finally:
+            await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_pending(self):
+        storage = AsyncMock()
+        buffer = AttributeWriteBuffer(storage, flush_interval=60)
+        await buffer.start()
+        buffer.add("d1", _attr("temp", 1.0))
+
+        await buffer.stop()
+
+        [batch] = _saved(storage)
+        assert [d for d, _ in batch] == ["d1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_requeued_without_overwriting_newer(self):
+        storage = AsyncMock()
+        buffer = AttributeWriteBuffer(storage)
+        buffer.add("d1", _attr("temp", 1.0))
+        buffer.add("d1", _attr("hum", 50.0))
+
+        async def _fail(_batch: list) -> None:
+            buffer.add("d1", _attr("temp", 2.0))
+            msg = "db down"
+            raise RuntimeError(msg)
+
+        storage.save_attributes.side_effect = _fail
+        await buffer.flush()
+        assert buffer.pending_count == 2
+
+        storage.save_attributes.side_effect = None
+        await buffer.flush()
+        batch = _saved(storage)[-1]
+        assert {a.name: a.current_value for _, a in batch} == {
+            "temp": 2.0,
+            "hum": 50.0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_failing_storage_retried_once_per_interval(self):
+        storage = AsyncMock()
+        storage.save_attributes.side_effect = RuntimeError("db down")
+        buffer = AttributeWriteBuffer(storage, flush_interval=0.2, max_batch_size=1)
+        await buffer.start()
+        try:
+            for value in range(40):
+                buffer.add("d1", _attr(f"a{value}", float(value)))
+                await asyncio.sleep(0.001)
+
+            # The first update flushes at once and fails; the next ones wait.
+            assert len(_saved(storage)) == 1
+        finally:
+            await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_mid_write_keeps_the_batch(self):
+        storage = AsyncMock()
+        buffer = AttributeWriteBuffer(storage, max_batch_size=1)
+        writing = asyncio.Event()
+
+        async def _hang(_batch: list) -> None:
+            writing.set()
+            await asyncio.Event().wait()
+
+        storage.save_attributes.side_effect = _hang
+        await buffer.start()
+        buffer.add("d1", _attr("temp", 1.0))
+        await writing.wait()
+
+        storage.save_attributes.side_effect = None
+        await buffer.stop()
+
+        cancelled, retried = _saved(storage)
+        assert cancelled == retried
+        assert [(d, a.current_value) for d, a in retried] == [("d1", 1.0)]
+        assert buffer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_discard_device_drops_its_pending_values(self):
+        storage = AsyncMock()
+        buffer = AttributeWriteBuffer(storage)
+        buffer.add("d1", _attr("temp", 1.0))
+        buffer.add("d2", _attr("temp", 2.0))
+
+        buffer.discard_device("d1")
+        await buffer.flush()
+
+        [batch] = _saved(storage)
+        assert [d for d, _ in batch] == ["d2"]
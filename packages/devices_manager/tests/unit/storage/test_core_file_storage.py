@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import stat
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 import pytest
+import yaml
 
 from devices_manager.core.device import Attribute
 from devices_manager.core.transports import TransportConnectionState
@@ -90,6 +93,170 @@ class TestSaveAttribute:
         assert "Cannot persist attribute for unknown device" in caplog.text
 
 
+class TestSaveAttributes:
+    @pytest.mark.asyncio
+    async def test_save_attributes_groups_by_device(self, storage: CoreFileStorage):
+        await storage.devices.write("dev1", _make_device("dev1"))
+        await storage.devices.write("dev2", _make_device("dev2"))
+
+        await storage.save_attributes(
+            [
+                ("dev1", Attribute.create("temp", DataType.FLOAT, {"read"}, 21.0)),
+                ("dev2", Attribute.create("temp", DataType.FLOAT, {"read"}, 22.0)),
+                ("dev1", Attribute.create("hum", DataType.FLOAT, {"read"}, 40.0)),
+            ]
+        )
+
+        dev1 = await storage.devices.read("dev1")
+        dev2 = await storage.devices.read("dev2")
+        assert dev1.attributes["temp"].current_value == 21.0
+        assert dev1.attributes["hum"].current_value == 40.0
+        assert dev2.attributes["temp"].current_value == 22.0
+
+    @pytest.mark.asyncio
+    async def test_save_attributes_skips_unknown_device(
+        self, storage: CoreFileStorage, caplog
+    ):
+        await storage.devices.write("dev1", _make_device("dev1"))
+
+        await storage.save_attributes(
+            [
+                ("ghost", Attribute.create("temp", DataType.FLOAT, {"read"}, 1.0)),
+                ("dev1", Attribute.create("temp", DataType.FLOAT, {"read"}, 2.0)),
+            ]
+        )
+
+        assert "Cannot persist attribute for unknown device" in caplog.text
+        result = await storage.devices.read("dev1")
+        assert result.attributes["temp"].current_value == 2.0
+
+
+class TestCoalescedFlush:
+    @pytest.mark.asyncio
+    async def test_attribute_updates_are_not_written_immediately(
+        self, storage: CoreFileStorage, tmp_path: Path
+    ):
+        await storage.devices.write("dev1", _make_device())
+        path = tmp_path / "devices" / "dev1.yaml"
+        before = path.read_bytes()
+
+        attr = Attribute.create("temp", DataType.FLOAT, {"read"}, 22.5)
+        await storage.save_attribute("dev1", attr)
+
+        assert path.read_bytes() == before
+        await storage.close()
+        on_disk = yaml.safe_load(path.read_text(encoding="utf-8"))
+        assert on_disk["attributes"]["temp"]["current_value"] == 22.5
+
+    @pytest.mark.asyncio
+    async def test_dirty_device_flushed_once_per_interval(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        storage = CoreFileStorage(tmp_path, flush_interval=0.01)
+        await storage.devices.write("dev1", _make_device())
+        writes: list[str] = []
+        original = storage._device_storage._dump_sync  # noqa: SLF001
+
+        def _counting_dump(item_id: str, payload: dict) -> None:
+            writes.append(item_id)
+            original(item_id, payload)
+
+        monkeypatch.setattr(storage._device_storage, "_dump_sync", _counting_dump)  # noqa: SLF001
+        for value in range(10):
+            attr = Attribute.create("temp", DataType.FLOAT, {"read"}, float(value))
+            await storage.save_attribute("dev1", attr)
+        await asyncio.sleep(0.05)
+
+        assert writes == ["dev1"]
+        reloaded = await CoreFileStorage(tmp_path).devices.read("dev1")
+        assert reloaded.attributes["temp"].current_value == 9.0
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_write_through_clears_dirty_flag(self, storage: CoreFileStorage):
+        await storage.devices.write("dev1", _make_device())
+        attr = Attribute.create("temp", DataType.FLOAT, {"read"}, 1.0)
+        await storage.save_attribute("dev1", attr)
+        assert storage._device_storage.dirty_ids == {"dev1"}  # noqa: SLF001
+
+        await storage.devices.write("dev1", await storage.devices.read("dev1"))
+
+        assert storage._device_storage.dirty_ids == set()  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_stale_write_keeps_pending_attributes(
+        self, storage: CoreFileStorage, tmp_path: Path
+    ):
+        attrs = {"temp": Attribute.create("temp", DataType.FLOAT, {"read"}, 20.0)}
+        await storage.devices.write("dev1", _make_device(attributes=attrs))
+        stale = await storage.devices.read("dev1")
+        attr = Attribute.create("temp", DataType.FLOAT, {"read"}, 22.5)
+        await storage.save_attribute("dev1", attr)
+
+        stale.name = "Renamed"
+        await storage.devices.write("dev1", stale)
+
+        path = tmp_path / "devices" / "dev1.yaml"
+        on_disk = yaml.safe_load(path.read_text(encoding="utf-8"))
+        assert on_disk["name"] == "Renamed"
+        assert on_disk["attributes"]["temp"]["current_value"] == 22.5
+        result = await storage.devices.read("dev1")
+        assert result.attributes["temp"].current_value == 22.5
+
+    @pytest.mark.asyncio
+    async def test_writes_leave_no_temporary_files(
+        self, storage: CoreFileStorage, tmp_path: Path
+    ):
+        await storage.devices.write("dev1", _make_device())
+        attr = Attribute.create("temp", DataType.FLOAT, {"read"}, 1.0)
+        await storage.save_attribute("dev1", attr)
+        await storage.flush()
+
+        assert [p.name for p in (tmp_path / "devices").iterdir()] == ["dev1.yaml"]
+        assert await storage.devices.list_all() == ["dev1"]
+
+    @pytest.mark.asyncio
+    async def test_writes_keep_file_permissions(
+        self, storage: CoreFileStorage, tmp_path: Path
+    ):
+        await storage.devices.write("dev1", _make_device())
+        path = tmp_path / "devices" / "dev1.yaml"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+        path.chmod(0o640)
+        await storage.devices.write("dev1", _make_device())
+        attr = Attribute.create("temp", DataType.FLOAT, {"read"}, 1.0)
+        await storage.save_attribute("dev1", attr)
+        await storage.flush()
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+class TestReadAllLenient:
+    @pytest.mark.asyncio
+    async def test_corrupt_file_is_isolated(
+        self, storage: CoreFileStorage, tmp_path: Path
+    ):
+        for device_id in ("dev1", "dev2"):
+            await storage.devices.write(device_id, _make_device(device_id))
+        (tmp_path / "devices" / "corrupt.yaml").write_text("[ unclosed")
+
+        devices, failures = await storage.devices.read_all_lenient()
+
+        assert sorted(d.id for d in devices) == ["dev1", "dev2"]
+        assert list(failures) == ["corrupt"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_read_populates_device_cache(self, tmp_path: Path):
+        await CoreFileStorage(tmp_path).devices.write("dev1", _make_device())
+        storage = CoreFileStorage(tmp_path)
+        await storage.devices.read_all_lenient()
+
+        (tmp_path / "devices" / "dev1.yaml").unlink()
+
+        assert (await storage.devices.read("dev1")).id == "dev1"
+
+
 class TestTransportRoundTrip:
     @pytest.mark.asyncio
     async def test_connection_state_survives_round_trip(self, storage: CoreFileStorage):
@@ -22,6 +22,10 @@ class UnauthorizedError(Exception):
     """Raised when a request fails credential verification."""
 
 
+class TooManyRequestsError(Exception):
+    """Raised when a caller already has its share of a limited resource in use."""
+
+
 class StorageError(Exception):
     """Base class for storage-related failures raised by services."""
 
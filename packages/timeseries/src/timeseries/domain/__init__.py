@@ -15,6 +15,23 @@ from timeseries.domain.aggregation import (
     IntervalUnit,
     resolve_aggregation_data_type,
 )
+from timeseries.domain.buckets import bin_boundaries
+from timeseries.domain.compression import (
+    Compression,
+    CompressionMethod,
+    CompressionPolicy,
+    CompressionRule,
+    SeriesCompressor,
+    interpolated_tw_avgs,
+    parse_compression_policy,
+    validate_compression_data_type,
+)
+from timeseries.domain.downsample import (
+    MIN_DOWNSAMPLE_POINTS,
+    DownsampleMethod,
+    lttb,
+    validate_downsample_data_type,
+)
 from timeseries.domain.models import (
     DataPoint,
     FetchPointsResult,
@@ -22,6 +39,11 @@ from timeseries.domain.models import (
     TimeSeries,
     validate_value_type,
 )
+from timeseries.domain.retention import (
+    RetentionPolicy,
+    RetentionRule,
+    parse_retention_policy,
+)
 from timeseries.domain.space import (
     SPACE_COMPAT,
     GroupedSpaceAggregationResult,
@@ -42,6 +64,7 @@ from timeseries.domain.time_range import (
 __all__ = [
     "AGG_COMPAT",
     "DATA_TYPE_MAP",
+    "MIN_DOWNSAMPLE_POINTS",
     "SPACE_COMPAT",
     "VALUE_TYPE_MAP",
     "AggregatedPoint",
@@ -49,24 +72,39 @@ __all__ = [
     "AggregationQuery",
     "AggregationResult",
     "AttributeValueType",
+    "Compression",
+    "CompressionMethod",
+    "CompressionPolicy",
+    "CompressionRule",
     "DataPoint",
     "DataType",
+    "DownsampleMethod",
     "FetchPointsResult",
     "GroupedSpaceAggregationResult",
     "Interval",
     "IntervalUnit",
+    "RetentionPolicy",
+    "RetentionRule",
+    "SeriesCompressor",
     "SeriesKey",
     "SortOrder",
     "SpaceAggregationGroup",
     "SpaceAggregationResult",
     "TimeSeries",
+    "bin_boundaries",
     "combine_space",
     "fold_space_values",
+    "interpolated_tw_avgs",
+    "lttb",
     "normalize_to_utc",
+    "parse_compression_policy",
     "parse_duration",
+    "parse_retention_policy",
     "resolve_aggregation_data_type",
     "resolve_last",
     "resolve_space_aggregation_data_type",
+    "validate_compression_data_type",
+    "validate_downsample_data_type",
     "validate_space_operator",
     "validate_tz_name",
     "validate_value_type",
@@ -14,6 +14,7 @@ from pydantic import (
 
 from models.errors import InvalidError
 from models.types import DATA_TYPE_MAP, AggregationOperator, DataType
+from timeseries.domain.downsample import DownsampleMethod
 from timeseries.domain.time_range import (
     parse_duration,
     parse_duration_parts,
@@ -162,6 +163,9 @@ class AggregationQuery(BaseModel):
     end: datetime | None = None
     last: str | None = None
     timezone: str | None = None
+    # Downsampling of interval="raw" results; see domain/downsample.py.
+    max_points: int | None = None
+    downsample: DownsampleMethod = DownsampleMethod.LTTB
 
     @model_validator(mode="before")
     @classmethod
@@ -0,0 +1,73 @@
+"""Calendar bucket boundaries of an aggregation interval.
+
+Buckets are floored in the query timezone, so day and month buckets follow
+local midnight across DST changes, and line up with Postgres ``time_bucket``.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta, tzinfo
+from zoneinfo import ZoneInfo
+
+from timeseries.domain.aggregation import Interval, IntervalUnit
+
+# Postgres uses 2000-01-03 as the origin for day-interval time_bucket calls.
+# Multi-day bins must anchor here so memory and Postgres produce identical buckets.
+_PG_DAY_ORIGIN: date = date(2000, 1, 3)
+
+
+def _tz(name: str) -> tzinfo:
+    return UTC if name == "UTC" else ZoneInfo(name)
+
+
+def _floor_bin(dt: datetime, interval: Interval) -> datetime:
+    """Floor dt to the start of its containing bin, preserving timezone."""
+    if interval.unit == IntervalUnit.MO:
+        return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0, fold=0)
+    if interval.unit == IntervalUnit.D:
+        if interval.qty == 1:
+            # Per-day: local-wall replace is DST-correct (avoids 25h day regression).
+            return dt.replace(hour=0, minute=0, second=0, microsecond=0, fold=0)
+        # Multi-day: anchor at Postgres origin (2000-01-03) using calendar dates so
+        # bucket boundaries match time_bucket(..., timezone) exactly.
+        local_date = dt.date()
+        elapsed_days = (local_date - _PG_DAY_ORIGIN).days
+        slot_days = (elapsed_days // interval.qty) * interval.qty
+        floored = _PG_DAY_ORIGIN + timedelta(days=slot_days)
+        return datetime(
+            floored.year, floored.month, floored.day, tzinfo=dt.tzinfo, fold=0
+        )
+    td_s = int(interval.to_timedelta().total_seconds())
+    midnight = dt.replace(hour=0, minute=0, second=0, microsecond=0, fold=0)
+    elapsed_s = int((dt.astimezone(UTC) - midnight.astimezone(UTC)).total_seconds())
+    slot_s = (elapsed_s // td_s) * td_s
+    return midnight + timedelta(seconds=slot_s)
+
+
+def _next_bin(dt: datetime, interval: Interval) -> datetime:
+    """Advance dt by one bin. Sub-day bins advance in UTC to avoid DST phantom bins."""
+    if interval.unit == IntervalUnit.MO:
+        # qty is always 1 — enforced by Interval._validate_mo
+        return dt.replace(year=dt.year + dt.month // 12, month=dt.month % 12 + 1)
+    td = interval.to_timedelta()
+    if interval.unit == IntervalUnit.D:
+        d = dt.date() + td
+        return datetime(d.year, d.month, d.day, tzinfo=dt.tzinfo, fold=0)
+    return (dt.astimezone(UTC) + td).astimezone(dt.tzinfo)
+
+
+def bin_boundaries(
+    start: datetime, end: datetime, interval: Interval, tz_name: str
+) -> list[tuple[datetime, datetime]]:
+    """Return list of (bin_start_utc, bin_end_utc) covering [start, end)."""
+    tz = _tz(tz_name)
+    current = _floor_bin(start.astimezone(tz), interval)
+    bins: list[tuple[datetime, datetime]] = []
+    while current.astimezone(UTC) < end:
+        nxt = _next_bin(current, interval)
+        bins.append((current.astimezone(UTC), nxt.astimezone(UTC)))
+        current = nxt
+    return bins
+
+
+__all__ = ["bin_boundaries"]
@@ -0,0 +1,306 @@
+"""Lossy compression of float series at ingestion, historian style.
+
+A slowly drifting analog value produces a row for every tiny change. A
+:class:`Compression` set on a float series drops the points that add nothing
+within ``deviation`` before they reach storage:
+
+- ``deadband`` keeps a point when it moves more than ``deviation`` away from
+  the last point kept. Held forward until the next kept point (LOCF), the
+  stored points stay within ``deviation`` of every dropped one.
+- ``swinging_door`` keeps the points where the signal turns: a point is
+  dropped while one straight line from the last kept point to the newest
+  one passes within ``deviation`` of every point in between. Joined by
+  straight lines, the stored points stay within ``deviation`` of every
+  dropped one, which takes far fewer points than deadband for ramps.
+  Time-weighted averages of such series interpolate between points (see
+  :attr:`Compression.interpolates`).
+
+Either way a point is kept at least every ``max_interval``. Swinging door
+holds the newest point back until the next one shows whether it is needed.
+A signal that stops changing sends no next point, so the service also
+releases a point held for ``max_interval`` (:meth:`SeriesCompressor.flush_stale`,
+swept at every ingestion flush): storage trails the live value by at most
+``max_interval`` plus one flush interval.
+
+A :class:`CompressionPolicy` picks the compression of new series by metric,
+like :class:`~timeseries.domain.retention.RetentionPolicy`; the compression
+actually applied is stored on each :class:`~timeseries.domain.models.TimeSeries`.
+"""
+
+import math
+from datetime import datetime, timedelta
+from enum import StrEnum
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
+
+from models.errors import InvalidError
+from models.types import DataType
+from timeseries.domain.time_range import parse_duration
+
+if TYPE_CHECKING:
+    from timeseries.domain.models import DataPoint, TimeSeries
+
+# A point is kept at least this often unless configured otherwise.
+DEFAULT_COMPRESSION_MAX_INTERVAL = timedelta(hours=1)
+
+# Decimals of averages, as the storage backends round them.
+_ROUND = 6
+
+
+class CompressionMethod(StrEnum):
+    DEADBAND = "deadband"
+    SWINGING_DOOR = "swinging_door"
+
+
+class Compression(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    method: CompressionMethod
+    deviation: float = Field(gt=0, allow_inf_nan=False)
+    max_interval: timedelta = DEFAULT_COMPRESSION_MAX_INTERVAL
+
+    @field_validator("max_interval", mode="before")
+    @classmethod
+    def _parse_duration(cls, v: object) -> object:
+        if isinstance(v, str):
+            try:
+                return parse_duration(v)
+            except InvalidError as e:
+                raise ValueError(str(e)) from None
+        return v
+
+    @field_validator("max_interval")
+    @classmethod
+    def _positive(cls, v: timedelta) -> timedelta:
+        if v <= timedelta(0):
+            msg = "max_interval must be positive"
+            raise ValueError(msg)
+        return v
+
+    @property
+    def interpolates(self) -> bool:
+        """Whether stored points are joined by lines rather than held (LOCF)."""
+        return self.method == CompressionMethod.SWINGING_DOOR
+
+
+def validate_compression_data_type(data_type: DataType) -> None:
+    if data_type != DataType.FLOAT:
+        msg = "Compression requires a float series"
+        raise InvalidError(msg)
+
+
+class CompressionRule(Compression):
+    metric: str = "*"
+    """``fnmatch`` pattern on the series metric."""
+
+    def matches(self, series: "TimeSeries") -> bool:
+        return series.data_type == DataType.FLOAT and fnmatchcase(
+            series.metric, self.metric
+        )
+
+    @property
+    def compression(self) -> Compression:
+        return Compression(
+            method=self.method,
+            deviation=self.deviation,
+            max_interval=self.max_interval,
+        )
+
+
+class CompressionPolicy(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    rules: tuple[CompressionRule, ...] = ()
+
+    def compression_for(self, series: "TimeSeries") -> Compression | None:
+        """The compression of the first rule matching *series*, if any."""
+        rule = next((rule for rule in self.rules if rule.matches(series)), None)
+        return rule.compression if rule is not None else None
+
+
+_RULES = TypeAdapter(list[CompressionRule])
+
+
+def parse_compression_policy(spec: str) -> CompressionPolicy:
+    """Parse a JSON list of rules, e.g.
+    ``[{"metric": "temp*", "method": "swinging_door", "deviation": 0.1}]``.
+    """
+    try:
+        rules = _RULES.validate_json(spec)
+    except ValidationError as e:
+        msg = f"Invalid compression policy: {e}"
+        raise InvalidError(msg) from None
+    return CompressionPolicy(rules=tuple(rules))
+
+
+class SeriesCompressor:
+    """Streaming :class:`Compression` of one series.
+
+    :meth:`feed` takes points as they arrive and returns those to store.
+    Points no newer than the newest one fed are out of order: they are stored
+    as they are and leave the compressor alone. Points carrying a
+    ``command_id`` are always stored.
+    """
+
+    def __init__(self, compression: Compression) -> None:
+        self.compression = compression
+        self._newest: datetime | None = None
+        self._kept: DataPoint | None = None
+        # Swinging door: the newest point, not stored yet, and the slopes a
+        # line from _kept may take to pass within deviation of the points
+        # dropped since _kept.
+        self._held: DataPoint | None = None
+        self._lo = -math.inf
+        self._hi = math.inf
+
+    def feed(self, points: list["DataPoint"]) -> list["DataPoint"]:
+        kept: list[DataPoint] = []
+        for point in sorted(points, key=lambda p: p.timestamp):
+            if self._newest is not None and point.timestamp <= self._newest:
+                kept.append(point)
+                continue
+            self._newest = point.timestamp
+            if point.command_id is not None:
+                kept.extend(self._release())
+                kept.append(point)
+                self._kept = point
+            elif self.compression.interpolates:
+                kept.extend(self._swinging_door(point))
+            elif self._deadband(point):
+                kept.append(point)
+                self._kept = point
+        return kept
+
+    def flush(self) -> "DataPoint | None":
+        """The point held back, to store now; the compressor restarts from it."""
+        released = self._release()
+        return released[0] if released else None
+
+    def flush_stale(self, now: datetime) -> "DataPoint | None":
+        """Like :meth:`flush`, for a point held since ``max_interval`` before
+        *now* or longer; ``None`` otherwise."""
+        held = self._held
+        if held is None or now - held.timestamp < self.compression.max_interval:
+            return None
+        return self.flush()
+
+    def _deadband(self, point: "DataPoint") -> bool:
+        kept = self._kept
+        return (
+            kept is None
+            or abs(float(point.value) - float(kept.value)) > self.compression.deviation
+            or point.timestamp - kept.timestamp >= self.compression.max_interval
+        )
+
+    def _swinging_door(self, point: "DataPoint") -> list["DataPoint"]:
+        kept, held = self._kept, self._held
+        if kept is None:
+            self._kept = point
+            return [point]
+        released: list[DataPoint] = []
+        if held is not None:
+            if (
+                point.timestamp - kept.timestamp < self.compression.max_interval
+                and self._door_open(kept, held, point)
+            ):
+                self._held = point
+                return []
+            released = self._release()
+        self._held = point
+        return released
+
+    def _door_open(
+        self, kept: "DataPoint", held: "DataPoint", point: "DataPoint"
+    ) -> bool:
+        """Whether the line from *kept* to *point* can replace *held*.
+
+        It can when it passes within deviation of *held* and of every point
+        dropped before it; narrows the allowed slopes to include *held*.
+        """
+        dev = self.compression.deviation
+        base = float(kept.value)
+        dt = (held.timestamp - kept.timestamp).total_seconds()
+        lo = max(self._lo, (float(held.value) - base - dev) / dt)
+        hi = min(self._hi, (float(held.value) - base + dev) / dt)
+        slope = (float(point.value) - base) / (
+            point.timestamp - kept.timestamp
+        ).total_seconds()
+        if not lo <= slope <= hi:
+            return False
+        self._lo, self._hi = lo, hi
+        return True
+
+    def _release(self) -> list["DataPoint"]:
+        held = self._held
+        if held is None:
+            return []
+        self._kept, self._held = held, None
+        self._lo, self._hi = -math.inf, math.inf
+        return [held]
+
+
+def _linear_means(
+    x: np.ndarray, y: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """Mean over each ``[starts[i], ends[i])`` of the line joining ``(x, y)``.
+
+    The line is held flat before ``x[0]`` and after ``x[-1]``.
+    """
+    area = np.concatenate(([0.0], np.cumsum(np.diff(x) * (y[:-1] + y[1:]) / 2)))
+
+    def integral(t: np.ndarray) -> np.ndarray:
+        i = np.clip(np.searchsorted(x, t, side="right") - 1, 0, len(x) - 1)
+        return area[i] + (t - x[i]) * (y[i] + np.interp(t, x, y)) / 2
+
+    return (integral(ends) - integral(starts)) / (ends - starts)
+
+
+def interpolated_tw_avgs(
+    points: list["DataPoint"], windows: list[tuple[datetime, datetime]]
+) -> list[float | None]:
+    """Time-weighted average over each window of *points* joined by lines.
+
+    *points* must be in timestamp order. Before the first point and after the
+    last the value is held flat, as under LOCF, and a window ending at or
+    before the first point, or empty, has no average.
+    """
+    if not points or not windows:
+        return [None] * len(windows)
+    origin = points[0].timestamp
+
+    def seconds(ts: datetime) -> float:
+        return (ts - origin).total_seconds()
+
+    x = np.array([seconds(p.timestamp) for p in points])
+    y = np.array([float(p.value) for p in points])
+    starts = np.array([seconds(lo) for lo, _ in windows])
+    ends = np.array([seconds(hi) for _, hi in windows])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = _linear_means(x, y, starts, ends)
+    return [
+        round(float(mean), _ROUND) if hi > max(lo, 0.0) else None
+        for lo, hi, mean in zip(starts, ends, means, strict=True)
+    ]
+
+
+__all__ = [
+    "DEFAULT_COMPRESSION_MAX_INTERVAL",
+    "Compression",
+    "CompressionMethod",
+    "CompressionPolicy",
+    "CompressionRule",
+    "SeriesCompressor",
+    "interpolated_tw_avgs",
+    "parse_compression_policy",
+    "validate_compression_data_type",
+]
@@ -0,0 +1,104 @@
+"""Downsampling of raw points for display.
+
+A chart a few hundred pixels wide cannot show 100 000 points; sending them
+costs payload and serialization for nothing. Two methods keep the shape:
+
+- ``lttb`` (Largest-Triangle-Three-Buckets) keeps, per bucket of points, the
+  one forming the largest triangle with the previously kept point and the
+  next bucket's mean: a fixed number of points that follows the curve.
+- ``minmax`` splits the time range into equal-width buckets and keeps each
+  bucket's first, last, minimum and maximum point (M4), so no spike is lost
+  whatever the rendering width. Storage backends compute it where the data
+  lives (``fetch_points_minmax``).
+
+Both always keep the first and last point, and only apply to numeric series
+(bool counts as 0/1).
+"""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from models.errors import InvalidError
+from models.types import DataType
+
+if TYPE_CHECKING:
+    from timeseries.domain.models import DataPoint
+
+# Points a minmax bucket can contribute: first, last, min and max.
+MINMAX_POINTS_PER_BUCKET = 4
+MIN_DOWNSAMPLE_POINTS = MINMAX_POINTS_PER_BUCKET
+
+
+class DownsampleMethod(StrEnum):
+    LTTB = "lttb"
+    MINMAX = "minmax"
+
+
+def validate_downsample_data_type(data_type: DataType) -> None:
+    if data_type == DataType.STRING:
+        msg = "Downsampling (max_points) requires a numeric or boolean series"
+        raise InvalidError(msg)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the *threshold* points LTTB keeps out of ``(x, y)``.
+
+    *x* must be increasing. Every point is kept when there are no more than
+    *threshold* of them.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:  # noqa: PLR2004
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64) - x[0]
+    y = np.asarray(y, dtype=np.float64)
+    # threshold - 2 buckets between the pinned first and last points.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, buckets: int) -> np.ndarray:
+    """Sorted indices of each bucket's first, last, min and max point.
+
+    The ``[x[0], x[-1]]`` range is split into *buckets* equal-width buckets;
+    *x* must be increasing. Ties go to the earliest point.
+    """
+    n = len(x)
+    if n <= buckets * MINMAX_POINTS_PER_BUCKET:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    span = x[-1] - x[0] + 1
+    bins = np.floor((x - x[0]) / span * buckets).astype(np.int64)
+    firsts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    lasts = np.r_[firsts[1:], n] - 1
+    # Sorting by (bin, value) lines each bin's group up at the same offsets
+    # as in x, so the group's first entry is its argmin (argmax for -value).
+    mins = np.lexsort((y, bins))[firsts]
+    maxs = np.lexsort((-y, bins))[firsts]
+    return np.unique(np.concatenate([firsts, lasts, mins, maxs]))
+
+
+def lttb(points: list[DataPoint], threshold: int) -> list[DataPoint]:
+    """Keep *threshold* of time-ordered *points* with :func:`lttb_indices`."""
+    if len(points) <= threshold:
+        return points
+    x = np.fromiter((p.timestamp.timestamp() for p in points), np.float64)
+    y = np.fromiter((float(p.value) for p in points), np.float64)
+    return [points[i] for i in lttb_indices(x, y, threshold)]
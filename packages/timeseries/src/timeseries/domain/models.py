@@ -6,6 +6,7 @@ from secrets import token_hex
 
 from models.errors import InvalidError
 from models.types import AttributeValueType, DataType  # noqa: TC001
+from timeseries.domain.compression import Compression  # noqa: TC001
 
 
 @dataclass(frozen=True)
@@ -37,6 +38,7 @@ class TimeSeries:
     created_at: datetime = field(default_factory=lambda: datetime.now(tz=UTC))
     updated_at: datetime = field(default_factory=lambda: datetime.now(tz=UTC))
     data_points: list[DataPoint] = field(default_factory=list)
+    compression: Compression | None = None
 
     @property
     def key(self) -> SeriesKey:
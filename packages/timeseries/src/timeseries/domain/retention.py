@@ -0,0 +1,112 @@
+"""How long series keep their history.
+
+A :class:`RetentionPolicy` is an ordered list of :class:`RetentionRule`; a
+series follows the first rule whose metric pattern and data type match it,
+and keeps everything when none does. A rule keeps raw points for ``raw``
+and, where the backend has them, the pre-aggregated rollups built from those
+points for ``rollups`` (forever when unset), so aged-out history still
+answers the aggregations rollups can serve.
+
+Durations use the compact grammar of ``last`` (``"90d"``, ``"24mo"``).
+"""
+
+from datetime import UTC, datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+    model_validator,
+)
+
+from models.errors import InvalidError
+from models.types import DataType
+from timeseries.domain.time_range import parse_duration
+
+if TYPE_CHECKING:
+    from timeseries.domain.models import TimeSeries
+
+# Shortest raw retention: older points are only deleted in whole hours, the
+# coarsest rollup granule, so a shorter window would delete nothing anyway.
+MIN_RAW_RETENTION = timedelta(hours=1)
+
+
+class RetentionRule(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    metric: str = "*"
+    """``fnmatch`` pattern on the series metric."""
+    data_type: DataType | None = None
+    raw: timedelta
+    rollups: timedelta | None = None
+
+    @field_validator("raw", "rollups", mode="before")
+    @classmethod
+    def _parse_duration(cls, v: object) -> object:
+        if isinstance(v, str):
+            try:
+                return parse_duration(v)
+            except InvalidError as e:
+                raise ValueError(str(e)) from None
+        return v
+
+    @model_validator(mode="after")
+    def _validate_windows(self) -> "RetentionRule":
+        if self.raw < MIN_RAW_RETENTION:
+            msg = "raw retention must be at least 1h"
+            raise ValueError(msg)
+        if self.rollups is not None and self.rollups < self.raw:
+            msg = "rollups retention cannot be shorter than raw retention"
+            raise ValueError(msg)
+        return self
+
+    def matches(self, series: "TimeSeries") -> bool:
+        if self.data_type is not None and series.data_type != self.data_type:
+            return False
+        return fnmatchcase(series.metric, self.metric)
+
+    def raw_cutoff(self, now: datetime) -> datetime:
+        """Raw points before this are deleted: ``now - raw``, to the hour."""
+        return _floor_hour(now - self.raw)
+
+    def rollups_cutoff(self, now: datetime) -> datetime | None:
+        return _floor_hour(now - self.rollups) if self.rollups is not None else None
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+class RetentionPolicy(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    rules: tuple[RetentionRule, ...] = ()
+
+    def rule_for(self, series: "TimeSeries") -> RetentionRule | None:
+        """The first rule matching *series*, or ``None`` to keep everything."""
+        return next((rule for rule in self.rules if rule.matches(series)), None)
+
+
+_RULES = TypeAdapter(list[RetentionRule])
+
+
+def parse_retention_policy(spec: str) -> RetentionPolicy:
+    """Parse a JSON list of rules, e.g. ``[{"metric": "*", "raw": "90d"}]``."""
+    try:
+        rules = _RULES.validate_json(spec)
+    except ValidationError as e:
+        msg = f"Invalid retention policy: {e}"
+        raise InvalidError(msg) from None
+    return RetentionPolicy(rules=tuple(rules))
+
+
+__all__ = [
+    "MIN_RAW_RETENTION",
+    "RetentionPolicy",
+    "RetentionRule",
+    "parse_retention_policy",
+]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from timeseries.domain import DataType
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    from timeseries.exporters.rows import Row
+
+# Rows collected into one polars frame before moving on to the next.
+FRAME_ROWS = 10_000
+
+_DTYPES: dict[DataType, pl.DataType] = {
+    DataType.INT: pl.Int64(),
+    DataType.FLOAT: pl.Float64(),
+    DataType.BOOL: pl.Boolean(),
+    DataType.STRING: pl.String(),
+}
+
+
+async def to_parquet(
+    columns: list[tuple[str, DataType]],
+    rows: AsyncIterator[Row],
+    *,
+    timezone: str = "UTC",
+    metadata: Callable[[], dict[str, str]] | None = None,
+) -> bytes:
+    """Encode merged rows as a Parquet file with one typed column per series.
+
+    Rows are packed into typed frames of :data:`FRAME_ROWS` as they arrive,
+    so the Python row objects never outlive their frame. *metadata* is called
+    once every row is consumed; its pairs go to the file's key-value metadata.
+    """
+    schema = pl.Schema(
+        [("timestamp", pl.Datetime("us", time_zone=timezone))]
+        + [(name, _DTYPES[data_type]) for name, data_type in columns]
+    )
+    frames: list[pl.DataFrame] = []
+    batch: list[Row] = []
+
+    def _flush() -> None:
+        data = [[ts for ts, _ in batch]] + [
+            [values[i] for _, values in batch] for i in range(len(columns))
+        ]
+        frames.append(pl.DataFrame(data, schema=schema, orient="col"))
+        batch.clear()
+
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= FRAME_ROWS:
+            _flush()
+    if batch or not frames:
+        _flush()
+
+    buf = io.BytesIO()
+    pl.concat(frames, rechunk=True).write_parquet(
+        buf, metadata=metadata() if metadata is not None else None
+    )
+    return buf.getvalue()
@@ -0,0 +1,69 @@
+"""Wide, last-observation-carried-forward rows from time-ordered points.
+
+The points of every series arrive as one stream of time-ordered batches, each
+point tagged with the index of its series (see
+``TimeSeriesStorage.iter_points_many``), so only one batch is held in memory
+whatever the exported range.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from timeseries.storage.merge import merge_point_streams
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Sequence
+    from datetime import datetime
+
+    from timeseries.domain import AttributeValueType, DataPoint
+
+type Row = tuple[datetime, list[AttributeValueType | None]]
+
+
+def _trunc(ts: datetime) -> datetime:
+    return ts.replace(microsecond=0)
+
+
+def _localize(ts: datetime, tz: ZoneInfo) -> datetime:
+    return _trunc(ts.astimezone(tz))
+
+
+async def rows_from_points(
+    batches: AsyncIterable[list[tuple[int, DataPoint]]],
+    width: int,
+    *,
+    timezone: str = "UTC",
+) -> AsyncGenerator[Row]:
+    """Fold tagged points into one row of *width* values per distinct second.
+
+    Timestamps are localized to *timezone* and truncated to the second; each
+    row carries the latest value of every series at that second, or ``None``
+    for a series with no point yet.
+    """
+    tz = ZoneInfo(timezone)
+    last_values: list[AttributeValueType | None] = [None] * width
+    current: datetime | None = None
+    async for batch in batches:
+        for i, point in batch:
+            ts = _localize(point.timestamp, tz)
+            if current is not None and ts != current:
+                yield current, list(last_values)
+            current = ts
+            last_values[i] = point.value
+    if current is not None:
+        yield current, last_values
+
+
+async def merge_rows(
+    streams: Sequence[AsyncIterator[list[DataPoint]]],
+    *,
+    timezone: str = "UTC",
+) -> AsyncGenerator[Row]:
+    """Rows merged from one point stream per series, see
+    :func:`rows_from_points`."""
+    async for row in rows_from_points(
+        merge_point_streams(streams), len(streams), timezone=timezone
+    ):
+        yield row
@@ -0,0 +1,221 @@
+"""Cache of closed aggregation buckets.
+
+Dashboards re-issue the same aggregation on every refresh, but only its
+trailing bucket can still change. Every other bucket is *closed*: its value
+depends only on the points inside it and on the last point before it. That
+holds whatever range the query asked for, except for a first bucket that
+``start`` cuts short.
+
+:class:`AggregateCache` keeps closed buckets per
+``(series set, operator, interval, timezone)``. A query covered by an entry
+asks the backend only for the cut-short head bucket, if any, and for the
+buckets from the end of the entry onward. Writes truncate the entries of
+their series from the bucket they land in: under LOCF a late point also
+changes the empty buckets after it.
+
+Only writes made through the owning service invalidate entries.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+    from timeseries.domain import (
+        AggregatedPoint,
+        AggregationOperator,
+        AggregationQuery,
+        AggregationResult,
+        SeriesKey,
+    )
+
+# Cached buckets (summed over every series of every entry) before the least
+# recently used entries are evicted.
+AGGREGATE_CACHE_MAX_BUCKETS = 500_000
+
+type CacheKey = tuple[tuple[SeriesKey, ...], AggregationOperator, str, str]
+
+
+@dataclass
+class _Entry:
+    starts: list[datetime]
+    points: list[list[AggregatedPoint]]  # per series, aligned with starts
+    end: datetime  # where the last cached bucket ends
+
+    @property
+    def size(self) -> int:
+        return len(self.starts) * len(self.points)
+
+
+@dataclass(frozen=True)
+class CacheHit:
+    """Closed buckets serving part of a query.
+
+    *points* covers ``[head_end, tail_start)`` per series. The caller still
+    computes ``[query.start, head_end)`` when it is not empty, and
+    ``[tail_start, query.end)``.
+    """
+
+    points: list[list[AggregatedPoint]]
+    head_end: datetime
+    tail_start: datetime
+
+
+def _cache_key(keys: list[SeriesKey], query: AggregationQuery) -> CacheKey:
+    return (tuple(keys), query.agg, str(query.interval), query.timezone or "")
+
+
+class AggregateCache:
+    def __init__(self, max_buckets: int = AGGREGATE_CACHE_MAX_BUCKETS) -> None:
+        if max_buckets < 1:
+            msg = "max_buckets must be at least 1"
+            raise ValueError(msg)
+        self._max_buckets = max_buckets
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._by_series: dict[SeriesKey, set[CacheKey]] = {}
+        self._size = 0
+        # Write sequence: a result computed before a write to one of its series
+        # may predate that write, so it is not stored (see :meth:`store`).
+        self._seq = 0
+        self._written: dict[SeriesKey, int] = {}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def mark(self) -> int:
+        """Call before computing a result to be passed to :meth:`store`."""
+        return self._seq
+
+    def lookup(self, keys: list[SeriesKey], query: AggregationQuery) -> CacheHit | None:
+        """Closed buckets for *query*, or ``None`` if the cache cannot help.
+
+        The entry has to reach back to the bucket holding ``query.start`` and
+        must end before ``query.end``.
+        """
+        if query.start is None or query.end is None or query.interval == "whole":
+            return None
+        ck = _cache_key(keys, query)
+        entry = self._entries.get(ck)
+        if (
+            entry is None
+            or not entry.starts[0] <= query.start < entry.end
+            or query.end <= entry.end
+        ):
+            return None
+        first = bisect_left(entry.starts, query.start)
+        if first == len(entry.starts):
+            return None
+        self._entries.move_to_end(ck)
+        return CacheHit(
+            points=[series[first:] for series in entry.points],
+            head_end=entry.starts[first],
+            tail_start=entry.end,
+        )
+
+    def store(
+        self,
+        keys: list[SeriesKey],
+        query: AggregationQuery,
+        results: list[AggregationResult],
+        since: int,
+    ) -> None:
+        """Keep the closed buckets of *results*, computed for *query*.
+
+        A result's last bucket may still be open and is never kept, nor is a
+        first bucket that ``query.start`` cuts short. *since* is the
+        :meth:`mark` taken before computing.
+        """
+        if query.start is None or query.interval == "whole" or not results:
+            return
+        if any(self._written.get(key, 0) > since for key in keys):
+            return
+        starts = [p.interval_start for p in results[0].points]
+        if any([p.interval_start for p in r.points] != starts for r in results):
+            return
+        first = 0 if starts and starts[0] == query.start else 1
+        if len(starts) - first < 2:  # noqa: PLR2004
+            return
+        new = _Entry(
+            starts=starts[first:-1],
+            points=[r.points[first:-1] for r in results],
+            end=starts[-1],
+        )
+        ck = _cache_key(keys, query)
+        old = self._entries.get(ck)
+        if old is not None:
+            self._drop(ck)
+            if new.starts[0] <= old.end and old.starts[0] <= new.end:
+                new = _merge(old, new)
+        self._entries[ck] = new
+        self._size += new.size
+        for key in keys:
+            self._by_series.setdefault(key, set()).add(ck)
+        while self._size > self._max_buckets:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, key: SeriesKey, since: datetime) -> None:
+        """Forget *key*'s buckets ending after *since*, where a write landed."""
+        self._seq += 1
+        self._written[key] = self._seq
+        for ck in list(self._by_series.get(key, ())):
+            entry = self._entries[ck]
+            if since >= entry.end:
+                continue
+            keep = bisect_right(entry.starts, since) - 1
+            if keep <= 0:
+                self._drop(ck)
+                continue
+            self._size -= entry.size
+            entry.end = entry.starts[keep]
+            del entry.starts[keep:]
+            for series in entry.points:
+                del series[keep:]
+            self._size += entry.size
+
+    def forget(self, keys: Iterable[SeriesKey]) -> None:
+        """Forget every entry involving *keys* (e.g. a renamed series)."""
+        self._seq += 1
+        for key in keys:
+            self._written[key] = self._seq
+            for ck in list(self._by_series.get(key, ())):
+                self._drop(ck)
+
+    def clear(self) -> None:
+        for ck in list(self._entries):
+            self._drop(ck)
+
+    def _drop(self, ck: CacheKey) -> None:
+        entry = self._entries.pop(ck)
+        self._size -= entry.size
+        for key in ck[0]:
+            cks = self._by_series.get(key)
+            if cks is not None:
+                cks.discard(ck)
+                if not cks:
+                    del self._by_series[key]
+
+
+def _merge(old: _Entry, new: _Entry) -> _Entry:
+    """Union of two overlapping or adjacent entries, *new* winning overlaps."""
+    by_start: dict[datetime, list[AggregatedPoint]] = {
+        start: [series[i] for series in old.points]
+        for i, start in enumerate(old.starts)
+    }
+    for i, start in enumerate(new.starts):
+        by_start[start] = [series[i] for series in new.points]
+    starts = sorted(by_start)
+    return _Entry(
+        starts=starts,
+        points=[[by_start[s][n] for s in starts] for n in range(len(new.points))],
+        end=max(old.end, new.end),
+    )
+
+
+__all__ = ["AGGREGATE_CACHE_MAX_BUCKETS", "AggregateCache", "CacheHit"]
@@ -0,0 +1,267 @@
+"""Buffered ingestion of data points across many series.
+
+Device attribute changes arrive one point at a time; writing each on its own
+costs a transaction per point. :class:`IngestionBuffer` collects them per
+``SeriesKey`` and hands the whole set to a sink (``upsert_points_many``) in
+one call, every ``flush_interval`` seconds or as soon as ``max_batch_size``
+points are pending, whichever comes first.
+
+A batch storage fails to take (or does not take within ``write_timeout``
+seconds) is held for retry: in an :class:`~timeseries.service.spool.IngestionSpool`
+when one is given, replayed in batches once writes succeed again, otherwise
+in memory up to ``max_pending`` points.
+
+A ``sweep`` callback, when given, runs before each periodic flush to
+:meth:`IngestionBuffer.add` points held elsewhere (e.g. by compression).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from models.errors import InvalidError, NotFoundError
+
+if TYPE_CHECKING:
+    from timeseries.domain import DataPoint, SeriesKey
+    from timeseries.service.spool import IngestionSpool
+
+logger = logging.getLogger(__name__)
+
+INGEST_FLUSH_INTERVAL_SECONDS = 1.0
+INGEST_MAX_BATCH_POINTS = 5_000
+# Points kept for retry while storage is failing; a failed batch that would
+# push the backlog past this is dropped rather than grow without bound.
+INGEST_MAX_PENDING_POINTS = 200_000
+# A write still running after this long is cancelled and its batch held for
+# retry, so a stalled database does not stall ingestion.
+INGEST_WRITE_TIMEOUT_SECONDS = 30.0
+# Spooled batches replayed per flush, so a long backlog does not hold up
+# the live points behind it.
+INGEST_REPLAY_BATCHES_PER_FLUSH = 20
+
+IngestionSink = Callable[[dict["SeriesKey", list["DataPoint"]]], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class IngestionStats:
+    pending_points: int
+    spooled_points: int
+    # Seconds since the oldest spooled point was spooled; None when empty.
+    spool_age_seconds: float | None
+    # Points dropped since start because neither memory nor spool had room.
+    dropped_points: int
+
+
+class IngestionBuffer:
+    def __init__(  # noqa: PLR0913
+        self,
+        sink: IngestionSink,
+        *,
+        flush_interval: float = INGEST_FLUSH_INTERVAL_SECONDS,
+        max_batch_size: int = INGEST_MAX_BATCH_POINTS,
+        max_pending: int = INGEST_MAX_PENDING_POINTS,
+        write_timeout: float = INGEST_WRITE_TIMEOUT_SECONDS,
+        spool: IngestionSpool | None = None,
+        sweep: Callable[[], None] | None = None,
+    ) -> None:
+        if flush_interval <= 0:
+            msg = "flush_interval must be positive"
+            raise ValueError(msg)
+        if max_batch_size < 1:
+            msg = "max_batch_size must be at least 1"
+            raise ValueError(msg)
+        if max_pending < max_batch_size:
+            msg = "max_pending must be at least max_batch_size"
+            raise ValueError(msg)
+        if write_timeout <= 0:
+            msg = "write_timeout must be positive"
+            raise ValueError(msg)
+        self._sink = sink
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        self._max_pending = max_pending
+        self._write_timeout = write_timeout
+        self._spool = spool
+        self._sweep = sweep
+        self._dropped = 0
+        self._pending: dict[SeriesKey, list[DataPoint]] = {}
+        self._pending_count = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pending_count(self) -> int:
+        return self._pending_count
+
+    def stats(self) -> IngestionStats:
+        oldest = self._spool.oldest if self._spool is not None else None
+        return IngestionStats(
+            pending_points=self._pending_count,
+            spooled_points=self._spool.points if self._spool is not None else 0,
+            spool_age_seconds=(
+                (datetime.now(UTC) - oldest).total_seconds()
+                if oldest is not None
+                else None
+            ),
+            dropped_points=self._dropped,
+        )
+
+    def add(self, key: SeriesKey, points: list[DataPoint]) -> None:
+        if not points:
+            return
+        self._pending.setdefault(key, []).extend(points)
+        self._pending_count += len(points)
+        if self._pending_count >= self._max_batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write every pending point with one sink call, then replay the spool.
+
+        If the sink rejects the batch as invalid, series are retried one by
+        one so a single bad series (wrong value type, key collision) is
+        dropped without taking the others with it. Any other failure holds
+        the batch for retry (see :meth:`_hold`) and skips the replay. Points
+        of a write cancelled midway (e.g. by :meth:`stop`) go back to the
+        pending ones.
+        """
+        async with self._flush_lock:
+            if self._pending:
+                batch, self._pending = self._pending, {}
+                count, self._pending_count = self._pending_count, 0
+                if not await self._write_batch(batch, count):
+                    return
+            if self._spool is not None:
+                await self._replay(self._spool)
+
+    async def _write_batch(
+        self, batch: dict[SeriesKey, list[DataPoint]], count: int
+    ) -> bool:
+        """Write *batch*; ``False`` if storage failed and it was held back."""
+        try:
+            await self._write(batch)
+        except (InvalidError, NotFoundError):
+            return await self._flush_one_by_one(batch)
+        except Exception:
+            logger.exception("Failed to ingest %d point(s)", count)
+            await self._hold(batch, count)
+            return False
+        except BaseException:
+            # Cancelled mid-write (e.g. by stop()): the next flush retries.
+            self._requeue(batch, count)
+            raise
+        return True
+
+    async def _write(self, batch: dict[SeriesKey, list[DataPoint]]) -> None:
+        await asyncio.wait_for(self._sink(batch), timeout=self._write_timeout)
+
+    async def _flush_one_by_one(self, batch: dict[SeriesKey, list[DataPoint]]) -> bool:
+        ok = True
+        unwritten = dict(batch)
+        try:
+            for key, points in batch.items():
+                try:
+                    await self._write({key: points})
+                except (InvalidError, NotFoundError) as e:
+                    logger.warning(
+                        "Dropping %d point(s) for %s: %s", len(points), key, e
+                    )
+                except Exception:
+                    logger.exception(
+                        "Failed to ingest %d point(s) for %s", len(points), key
+                    )
+                    await self._hold({key: points}, len(points))
+                    ok = False
+                del unwritten[key]
+        except BaseException:
+            # Cancelled: the series not written yet go back to the pending
+            # points (spooled ones are also kept in the spool; upserts are
+            # idempotent).
+            self._requeue(unwritten, sum(len(points) for points in unwritten.values()))
+            raise
+        return ok
+
+    async def _replay(self, spool: IngestionSpool) -> None:
+        for _ in range(INGEST_REPLAY_BATCHES_PER_FLUSH):
+            if not spool.points:
+                return
+            last_id, batch = await spool.peek(self._max_batch_size)
+            count = sum(len(points) for points in batch.values())
+            try:
+                await self._write(batch)
+            except (InvalidError, NotFoundError):
+                # Series failing again for another reason are spooled anew.
+                ok = await self._flush_one_by_one(batch)
+            except Exception as e:  # noqa: BLE001
+                # Left spooled for the next flush.
+                logger.warning("Spool replay failed, %d point(s) kept: %s", count, e)
+                return
+            else:
+                ok = True
+                logger.info("Replayed %d spooled point(s)", count)
+            await spool.delete_through(last_id)
+            if not ok:
+                return
+
+    async def _hold(self, batch: dict[SeriesKey, list[DataPoint]], count: int) -> None:
+        if self._spool is not None:
+            if await self._spool.append(batch):
+                return
+            logger.error("Ingestion spool full, dropping %d point(s)", count)
+            self._dropped += count
+            return
+        self._requeue(batch, count)
+
+    def _requeue(self, batch: dict[SeriesKey, list[DataPoint]], count: int) -> None:
+        if self._pending_count + count > self._max_pending:
+            logger.error("Ingestion backlog full, dropping %d point(s)", count)
+            self._dropped += count
+            return
+        # Failed points go first so each series stays in timestamp order.
+        for key, points in batch.items():
+            self._pending[key] = [*points, *self._pending.get(key, [])]
+        self._pending_count += count
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and drain whatever is still pending."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+        await self.flush()
+
+    async def _loop(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self._flush_interval
+                )
+            self._wakeup.clear()
+            if self._sweep is not None:
+                try:
+                    self._sweep()
+                except Exception:
+                    logger.exception("Ingestion sweep failed")
+            await self.flush()
+
+
+__all__ = [
+    "INGEST_FLUSH_INTERVAL_SECONDS",
+    "INGEST_MAX_BATCH_POINTS",
+    "INGEST_MAX_PENDING_POINTS",
+    "INGEST_REPLAY_BATCHES_PER_FLUSH",
+    "INGEST_WRITE_TIMEOUT_SECONDS",
+    "IngestionBuffer",
+    "IngestionStats",
+]
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import copy
 import logging
+from bisect import bisect_left
 from collections import defaultdict
+from contextlib import aclosing, asynccontextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Literal, cast
@@ -13,41 +16,66 @@ from models.service import Service
 from timeseries.domain import (
     AGG_COMPAT,
     DATA_TYPE_MAP,
+    MIN_DOWNSAMPLE_POINTS,
     SPACE_COMPAT,
     VALUE_TYPE_MAP,
     AggregatedPoint,
     AggregationOperator,
     AggregationQuery,
     AggregationResult,
+    Compression,
     DataPoint,
     DataType,
+    DownsampleMethod,
     FetchPointsResult,
     GroupedSpaceAggregationResult,
     Interval,
+    SeriesCompressor,
     SeriesKey,
     SpaceAggregationGroup,
     SpaceAggregationResult,
     TimeSeries,
+    bin_boundaries,
     combine_space,
     fold_space_values,
+    interpolated_tw_avgs,
+    lttb,
     normalize_to_utc,
     parse_duration,
     resolve_aggregation_data_type,
     resolve_last,
     resolve_space_aggregation_data_type,
+    validate_compression_data_type,
+    validate_downsample_data_type,
     validate_tz_name,
     validate_value_type,
 )
-from timeseries.exporters.csv import to_csv
+from timeseries.exporters.csv import iter_csv
 from timeseries.exporters.png import to_png
+from timeseries.exporters.rows import rows_from_points
+from timeseries.service.aggregate_cache import (
+    AGGREGATE_CACHE_MAX_BUCKETS,
+    AggregateCache,
+)
 from timeseries.service.auto_interval import (
     CANONICAL_INTERVALS,
     resolve_auto_interval,
     valid_intervals_for_period,
 )
+from timeseries.service.ingestion import (
+    INGEST_FLUSH_INTERVAL_SECONDS,
+    INGEST_MAX_BATCH_POINTS,
+    IngestionBuffer,
+    IngestionStats,
+)
+from timeseries.service.spool import SPOOL_MAX_POINTS, IngestionSpool
 from timeseries.storage import build_storage
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator
+
+    from timeseries.domain import CompressionPolicy, RetentionPolicy
+    from timeseries.exporters.rows import Row
     from timeseries.storage import TimeSeriesStorage
     from timeseries.storage.postgres import PostgresStorage
 
@@ -98,18 +126,85 @@ _SPACE_OPERATORS_BY_DATA_TYPE: dict[
 
 DEFAULT_RAW_LIMIT = 10_000
 MAX_RAW_LIMIT = 100_000
+# Exports stream, so their per-series cap only guards against runaway
+# downloads: a year of 1-minute data is ~526k points.
+MAX_EXPORT_POINTS = 5_000_000
+# Raw points a swinging-door tw_avg reads into memory; compression keeps
+# these series sparse, so a range past it is better asked of a rollup.
+MAX_INTERPOLATED_POINTS = MAX_RAW_LIMIT
 
-# How many per-series aggregations one space aggregation runs concurrently.
-# Kept below the postgres pool size (see storage/factory.py) so a wide
-# target occupies at most this many connections and the rest of the
-# platform's timeseries traffic — ingestion included — is never starved.
-AGGREGATE_FANOUT_LIMIT = 4
+# Seconds between two runs of the retention job.
+RETENTION_INTERVAL_SECONDS = 3600.0
 
 
 def _utcnow() -> datetime:
     return datetime.now(UTC)
 
 
+def _reject_naive(points: list[DataPoint]) -> None:
+    naive = [p.timestamp for p in points if p.timestamp.tzinfo is None]
+    if naive:
+        msg = (
+            f"DataPoint timestamps must be timezone-aware; "
+            f"got {len(naive)} naive timestamp(s)"
+        )
+        raise InvalidError(msg)
+
+
+@dataclass
+class _ExportTally:
+    points: int = 0
+    truncated: bool = False
+
+
+async def _export_points(  # noqa: PLR0913
+    storage: TimeSeriesStorage,
+    keys: list[SeriesKey],
+    *,
+    start: datetime | None,
+    end: datetime | None,
+    carry_forward: bool,
+    tally: _ExportTally,
+) -> AsyncGenerator[list[tuple[int, DataPoint]]]:
+    """The export points of *keys*, tagged with their index, each series
+    capped at :data:`MAX_EXPORT_POINTS`."""
+    budgets = [MAX_EXPORT_POINTS] * len(keys)
+    if carry_forward and start is not None:
+        anchors: list[tuple[int, DataPoint]] = []
+        for i, key in enumerate(keys):
+            previous = await storage.fetch_point_before(key, before=start)
+            if previous is not None:
+                budgets[i] -= 1
+                anchors.append((i, DataPoint(timestamp=start, value=previous.value)))
+        if anchors:
+            tally.points += len(anchors)
+            yield anchors
+    # One stream for every series: postgres reads them through one cursor,
+    # holding one pooled connection whatever the number of series.
+    async with aclosing(
+        storage.iter_points_many(keys, start=start, end=end)
+    ) as batches:
+        async for batch in batches:
+            kept: list[tuple[int, DataPoint]] = []
+            for i, point in batch:
+                if budgets[i] > 0:
+                    budgets[i] -= 1
+                    kept.append((i, point))
+                else:
+                    tally.truncated = True
+            tally.points += len(kept)
+            if kept:
+                yield kept
+            if tally.truncated and not any(budgets):
+                return
+
+
+def _validate_max_points(max_points: int) -> None:
+    if not (MIN_DOWNSAMPLE_POINTS <= max_points <= MAX_RAW_LIMIT):
+        msg = f"max_points must be between {MIN_DOWNSAMPLE_POINTS} and {MAX_RAW_LIMIT}"
+        raise InvalidError(msg)
+
+
 def _resolve_interval(
     query: AggregationQuery, period: timedelta
 ) -> Interval | Literal["raw", "whole"]:
@@ -123,22 +218,65 @@ def _resolve_interval(
 class TimeSeriesService(Service):
     _storage: TimeSeriesStorage | None
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         storage_url: str | None = None,
         *,
         default_timezone: str = "UTC",
+        ingest_flush_interval: float = INGEST_FLUSH_INTERVAL_SECONDS,
+        ingest_max_batch_size: int = INGEST_MAX_BATCH_POINTS,
+        aggregate_cache_size: int = AGGREGATE_CACHE_MAX_BUCKETS,
+        spool_path: str | None = None,
+        spool_max_points: int = SPOOL_MAX_POINTS,
+        retention: RetentionPolicy | None = None,
+        retention_interval: float = RETENTION_INTERVAL_SECONDS,
+        compress_after: timedelta | None = None,
+        compression: CompressionPolicy | None = None,
     ) -> None:
         self._storage_url = storage_url
         self._storage = None
         self._default_timezone = default_timezone
+        self._ingest_flush_interval = ingest_flush_interval
+        self._ingest_max_batch_size = ingest_max_batch_size
+        self._ingestion: IngestionBuffer | None = None
+        # Ingestion batches storage could not take go to disk when set.
+        self._spool = (
+            IngestionSpool(spool_path, max_points=spool_max_points)
+            if spool_path
+            else None
+        )
+        # 0 disables the cache.
+        self._aggregate_cache = (
+            AggregateCache(aggregate_cache_size) if aggregate_cache_size else None
+        )
+        self._retention = retention
+        self._retention_interval = retention_interval
+        self._retention_task: asyncio.Task[None] | None = None
+        # TimescaleDB compresses chunks older than this; None leaves them be.
+        self._compress_after = compress_after
+        # Compression of new float series; each series keeps its own.
+        self._compression = compression
+        # Per series written to or aggregated: its compressor, None when the
+        # series is not compressed.
+        self._compressors: dict[SeriesKey, SeriesCompressor | None] = {}
 
     async def start(self) -> None:
         if self._is_postgres:
             await self._start_postgres()
-            return
-
-        self._storage = await build_storage(self._storage_url)
+        else:
+            self._storage = await build_storage(self._storage_url)
+        if self._spool is not None:
+            await self._spool.open()
+        self._ingestion = IngestionBuffer(
+            self._ingest,
+            flush_interval=self._ingest_flush_interval,
+            max_batch_size=self._ingest_max_batch_size,
+            spool=self._spool,
+            sweep=self._release_stale_compressors,
+        )
+        await self._ingestion.start()
+        if self._retention is not None and self._retention.rules:
+            self._retention_task = asyncio.create_task(self._retention_loop())
 
     async def _start_postgres(self) -> None:
         from timeseries.storage.postgres import run_migrations  # noqa: PLC0415
@@ -149,6 +287,12 @@ class TimeSeriesService(Service):
             storage = await build_storage(self._storage_url)
             postgres_storage = cast("PostgresStorage", storage)
             await postgres_storage.try_enable_hypertable()
+            if self._compress_after is not None:
+                await postgres_storage.try_enable_compression(self._compress_after)
+            # Before warming the cache, so no rename slips in between.
+            await postgres_storage.follow_renames(self._series_renamed)
+            warmed = await postgres_storage.warm_series_cache()
+            logger.debug("Series cache warmed with %d series", warmed)
         except StorageConnectionError:
             raise
         except Exception as e:
@@ -160,9 +304,27 @@ class TimeSeriesService(Service):
         self._storage = storage
 
     async def stop(self) -> None:
+        if self._retention_task is not None:
+            self._retention_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._retention_task
+            self._retention_task = None
+        if self._ingestion is not None:
+            await self._ingestion.stop()
+            self._ingestion = None
+        if self._storage is not None:
+            try:
+                await self._release_compressors(list(self._compressors))
+            except Exception:
+                logger.exception("Failed to write points held by compression")
+        self._compressors.clear()
+        if self._spool is not None:
+            await self._spool.close()
         if self._storage is not None:
             await self._storage.close()
             self._storage = None
+        if self._aggregate_cache is not None:
+            self._aggregate_cache.clear()
 
     @property
     def default_timezone(self) -> str:
@@ -187,19 +349,53 @@ class TimeSeriesService(Service):
         data_type: DataType,
         owner_id: str,
         metric: str,
+        compression: Compression | None = None,
     ) -> TimeSeries:
+        """Create a series, compressed as *compression* or else as the policy says."""
         key = SeriesKey(owner_id=owner_id, metric=metric)
         existing = await self._backend.get_series_by_key(key)
         if existing is not None:
             msg = f"Series already exists for {key}"
             raise InvalidError(msg)
-        series = TimeSeries(
-            data_type=data_type,
-            owner_id=owner_id,
-            metric=metric,
+        if compression is not None:
+            validate_compression_data_type(data_type)
+        series = self._with_compression(
+            TimeSeries(data_type=data_type, owner_id=owner_id, metric=metric),
+            compression,
         )
         return await self._backend.create_series(series)
 
+    def _with_compression(
+        self, series: TimeSeries, compression: Compression | None = None
+    ) -> TimeSeries:
+        if compression is None and self._compression is not None:
+            compression = self._compression.compression_for(series)
+        series.compression = compression
+        return series
+
+    async def set_compression(
+        self, key: SeriesKey, compression: Compression | None
+    ) -> TimeSeries:
+        """Compress the points *key* is written from now on; ``None`` stops it.
+
+        Points already stored are left as they are.
+        """
+        series = await self._backend.get_series_by_key(key)
+        if series is None:
+            msg = f"No series found for {key}"
+            raise NotFoundError(msg)
+        if compression is not None:
+            validate_compression_data_type(series.data_type)
+        await self._release_compressors([key])
+        updated = await self._backend.set_series_compression(key, compression)
+        if updated is None:
+            msg = f"No series found for {key}"
+            raise NotFoundError(msg)
+        self._compressors.pop(key, None)
+        if self._aggregate_cache is not None:
+            self._aggregate_cache.forget([key])
+        return updated
+
     async def get_series(self, series_id: str) -> TimeSeries:
         series = await self._backend.get_series(series_id)
         if series is None:
@@ -229,12 +425,213 @@ class TimeSeriesService(Service):
         create_if_not_found: bool = False,
         validate_data_type: DataType | None = None,
     ) -> None:
+        await self._prepare_points(
+            key,
+            points,
+            create_if_not_found=create_if_not_found,
+            validate_data_type=validate_data_type,
+        )
+        async with self._compressed({key: points}) as compressed:
+            [points] = compressed.values()
+            logger.debug("Upserting %d points for %s", len(points), key)
+            await self._backend.upsert_points(key, points)
+        self._invalidate_aggregates({key: points})
+
+    async def upsert_points_many(
+        self,
+        points_by_key: dict[SeriesKey, list[DataPoint]],
+        *,
+        create_if_not_found: bool = False,
+    ) -> None:
+        """Validate, then upsert points of many series in one storage call.
+
+        All-or-nothing validation: any invalid series rejects the whole call
+        before anything is written.
+        """
+        for key, points in points_by_key.items():
+            await self._prepare_points(
+                key, points, create_if_not_found=create_if_not_found
+            )
+        async with self._compressed(points_by_key) as compressed:
+            logger.debug("Upserting points for %d series", len(compressed))
+            await self._backend.upsert_points_many(compressed)
+        self._invalidate_aggregates(compressed)
+
+    async def _load_compressors(self, keys: list[SeriesKey]) -> None:
+        missing = [key for key in keys if key not in self._compressors]
+        if not missing:
+            return
+        for series in await self._backend.get_series_by_keys(missing):
+            self._compressors[series.key] = (
+                SeriesCompressor(series.compression) if series.compression else None
+            )
+
+    @asynccontextmanager
+    async def _compressed(
+        self, points_by_key: dict[SeriesKey, list[DataPoint]]
+    ) -> AsyncIterator[dict[SeriesKey, list[DataPoint]]]:
+        """The points compression keeps, series by series, to store in the
+        block.
+
+        Compressors advance on copies, put back as they were when storing
+        fails: the caller retries the same points, and a held point released
+        into the failed write must be released again.
+        """
+        await self._load_compressors(list(points_by_key))
+        compressed: dict[SeriesKey, list[DataPoint]] = {}
+        fed: dict[SeriesKey, tuple[SeriesCompressor, SeriesCompressor]] = {}
+        for key, points in points_by_key.items():
+            compressor = self._compressors.get(key)
+            if compressor is None:
+                compressed[key] = points
+                continue
+            advanced = copy.copy(compressor)
+            compressed[key] = advanced.feed(points)
+            self._compressors[key] = advanced
+            fed[key] = (compressor, advanced)
+        try:
+            yield compressed
+        except BaseException:
+            for key, (compressor, advanced) in fed.items():
+                # Unless fed again, or dropped, in the meantime.
+                if self._compressors.get(key) is advanced:
+                    self._compressors[key] = compressor
+            raise
+
+    async def _release_compressors(self, keys: list[SeriesKey]) -> None:
+        """Write the points the compressors of *keys* hold back, and drop them;
+        they are kept when the write fails."""
+        held: dict[SeriesKey, list[DataPoint]] = {}
+        released: dict[SeriesKey, SeriesCompressor] = {}
+        for key in keys:
+            compressor = self._compressors.pop(key, None)
+            if compressor is None:
+                continue
+            released[key] = copy.copy(compressor)
+            point = compressor.flush()
+            if point is not None:
+                held[key] = [point]
+        if not held:
+            return
+        try:
+            await self._backend.upsert_points_many(held)
+        except BaseException:
+            for key, compressor in released.items():
+                self._compressors.setdefault(key, compressor)
+            raise
+        self._invalidate_aggregates(held)
+
+    def _series_renamed(self, key: SeriesKey, new_key: SeriesKey) -> None:
+        """Drop what this process keeps under *key* after another process
+        renamed its series (as :meth:`rename_metric_for_owners` does for its
+        own); points compression held go to the renamed series."""
+        for stale in (key, new_key):
+            compressor = self._compressors.pop(stale, None)
+            if compressor is None or self._ingestion is None:
+                continue
+            point = compressor.flush()
+            if point is not None:
+                self._ingestion.add(new_key, [point])
+        if self._aggregate_cache is not None:
+            self._aggregate_cache.forget([key, new_key])
+
+    def _release_stale_compressors(self) -> None:
+        """Queue the points compressors have held back for their
+        ``max_interval``: a signal that stopped changing sends no next point
+        to release them."""
+        if self._ingestion is None:
+            return
+        now = datetime.now(UTC)
+        for key, compressor in self._compressors.items():
+            if compressor is None:
+                continue
+            point = compressor.flush_stale(now)
+            if point is not None:
+                self._ingestion.add(key, [point])
+
+    def _invalidate_aggregates(
+        self, points_by_key: dict[SeriesKey, list[DataPoint]]
+    ) -> None:
+        if self._aggregate_cache is None:
+            return
+        for key, points in points_by_key.items():
+            if points:
+                earliest = min(p.timestamp for p in points)
+                self._aggregate_cache.invalidate(key, earliest)
+
+    def enqueue_points(self, key: SeriesKey, points: list[DataPoint]) -> None:
+        """Queue points for buffered ingestion, creating the series if needed.
+
+        Points are written by a background flush through
+        :meth:`upsert_points_many`; call :meth:`flush_ingestion` to force it.
+        Raises ``InvalidError`` right away for naive timestamps or values of
+        an unsupported type; a value not matching its series' data type is
+        only detected at flush, where that series is dropped and logged.
+        """
+        _reject_naive(points)
+        unsupported = [p.value for p in points if type(p.value) not in VALUE_TYPE_MAP]
+        if unsupported:
+            msg = f"Unsupported value type: {type(unsupported[0]).__name__}"
+            raise InvalidError(msg)
+        if self._ingestion is None:
+            msg = "TimeSeriesService.start() must be called before use"
+            raise RuntimeError(msg)
+        self._ingestion.add(key, points)
+
+    async def flush_ingestion(self) -> None:
+        """Write every point queued by :meth:`enqueue_points`."""
+        if self._ingestion is not None:
+            await self._ingestion.flush()
+
+    def ingestion_stats(self) -> IngestionStats:
+        """Backlog of :meth:`enqueue_points`: in memory, spooled and dropped."""
+        if self._ingestion is None:
+            msg = "TimeSeriesService.start() must be called before use"
+            raise RuntimeError(msg)
+        return self._ingestion.stats()
+
+    async def apply_retention(self, now: datetime | None = None) -> list[SeriesKey]:
+        """Delete the history the retention policy no longer keeps.
+
+        Runs every ``retention_interval`` seconds once started with a policy;
+        returns the series that lost points or rollups.
+        """
+        if self._retention is None:
+            return []
+        trimmed = await self._backend.apply_retention(self._retention, now or _utcnow())
+        if self._aggregate_cache is not None:
+            self._aggregate_cache.forget(trimmed)
+        return trimmed
+
+    async def _retention_loop(self) -> None:
+        while True:
+            try:
+                trimmed = await self.apply_retention()
+            except Exception:
+                logger.exception("Timeseries retention failed")
+            else:
+                if trimmed:
+                    logger.info("Retention trimmed %d series", len(trimmed))
+            await asyncio.sleep(self._retention_interval)
+
+    async def _ingest(self, points_by_key: dict[SeriesKey, list[DataPoint]]) -> None:
+        await self.upsert_points_many(points_by_key, create_if_not_found=True)
+
+    async def _prepare_points(
+        self,
+        key: SeriesKey,
+        points: list[DataPoint],
+        *,
+        create_if_not_found: bool,
+        validate_data_type: DataType | None = None,
+    ) -> None:
+        """Resolve (or create) the series for *key* and validate *points*."""
         storage = self._backend
-        series = await storage.get_series_by_key(key)
-        if series is None and not create_if_not_found:
+        data_type = await storage.get_series_data_type(key)
+        if data_type is None and not create_if_not_found:
             msg = f"No series found for {key}"
             raise NotFoundError(msg)
-        if series is None:
+        if data_type is None:
             if validate_data_type is not None:
                 data_type = validate_data_type
             elif not points:
@@ -243,25 +640,19 @@ class TimeSeriesService(Service):
             else:
                 data_type = VALUE_TYPE_MAP[type(points[0].value)]
             logger.debug("Creating series %s", key)
-            series = await storage.create_series(
-                TimeSeries(
-                    data_type=data_type,
-                    owner_id=key.owner_id,
-                    metric=key.metric,
+            await storage.create_series(
+                self._with_compression(
+                    TimeSeries(
+                        data_type=data_type,
+                        owner_id=key.owner_id,
+                        metric=key.metric,
+                    )
                 ),
             )
-        expected = DATA_TYPE_MAP[series.data_type]
+        expected = DATA_TYPE_MAP[data_type]
         for p in points:
             validate_value_type(p.value, expected)
-        naive = [p.timestamp for p in points if p.timestamp.tzinfo is None]
-        if naive:
-            msg = (
-                f"DataPoint timestamps must be timezone-aware; "
-                f"got {len(naive)} naive timestamp(s)"
-            )
-            raise InvalidError(msg)
-        logger.debug("Upserting %d points for %s", len(points), key)
-        await storage.upsert_points(key, points)
+        _reject_naive(points)
 
     async def rename_metric_for_owners(
         self,
@@ -278,6 +669,7 @@ class TimeSeriesService(Service):
             if new_key != key and await self._backend.get_series_by_key(new_key):
                 msg = f"Series with key {new_key} already exists"
                 raise InvalidError(msg)
+        await self._release_compressors(keys)
         renamed: list[SeriesKey] = []
         try:
             for key in keys:
@@ -289,6 +681,12 @@ class TimeSeriesService(Service):
                 with contextlib.suppress(Exception):
                     await self._backend.rename_series(new_key, old_metric)
             raise
+        finally:
+            touched = [*keys, *(SeriesKey(k.owner_id, new_metric) for k in keys)]
+            for key in touched:
+                self._compressors.pop(key, None)
+            if self._aggregate_cache is not None:
+                self._aggregate_cache.forget(touched)
 
     async def get_aggregate(
         self,
@@ -317,11 +715,126 @@ class TimeSeriesService(Service):
         start: datetime = query.start
         end: datetime = query.end or cutoff  # end always set by model_copy above
         interval = _resolve_interval(query, end - start)
+        if query.max_points is not None and interval != "raw":
+            msg = "max_points only applies to interval=raw"
+            raise InvalidError(msg)
         if interval == "raw":
             return await self._get_aggregate_raw(key, query, series.data_type)
         # The backends require a resolved interval — "auto" must never reach them.
         query = query.model_copy(update={"interval": interval})
-        return await self._backend.aggregate(key, query)
+        [result] = await self._aggregate_cached([key], query)
+        return result
+
+    async def _aggregate_uncached(
+        self, keys: list[SeriesKey], query: AggregationQuery
+    ) -> list[AggregationResult]:
+        if len(keys) == 1:
+            return [await self._backend.aggregate(keys[0], query)]
+        return await self._backend.aggregate_many(keys, query)
+
+    async def _aggregate_cached(
+        self, keys: list[SeriesKey], query: AggregationQuery
+    ) -> list[AggregationResult]:
+        """Aggregate *keys*, reading closed buckets from the aggregate cache.
+
+        On a hit the backend only computes the bucket cut short by
+        ``query.start`` (if any) and the buckets after the cached ones.
+        tw_avg of swinging-door series bypasses both cache and backend.
+        """
+        if query.agg == AggregationOperator.TW_AVG and (
+            linear := await self._interpolated(keys)
+        ):
+            return [
+                await self._interpolated_tw_avg(key, query)
+                if key in linear
+                else await self._backend.aggregate(key, query)
+                for key in keys
+            ]
+        cache = self._aggregate_cache
+        if cache is None:
+            return await self._aggregate_uncached(keys, query)
+        since = cache.mark()
+        hit = cache.lookup(keys, query)
+        if hit is None:
+            results = await self._aggregate_uncached(keys, query)
+            cache.store(keys, query, results, since)
+            return results
+
+        tail_query = query.model_copy(update={"start": hit.tail_start})
+        tail = await self._aggregate_uncached(keys, tail_query)
+        cache.store(keys, tail_query, tail, since)
+        heads: list[list[AggregatedPoint]] = [[] for _ in keys]
+        if cast("datetime", query.start) < hit.head_end:
+            head_query = query.model_copy(update={"end": hit.head_end})
+            heads = [r.points for r in await self._aggregate_uncached(keys, head_query)]
+        return [
+            result.model_copy(update={"points": [*head, *cached, *result.points]})
+            for head, cached, result in zip(heads, hit.points, tail, strict=True)
+        ]
+
+    async def _interpolated(self, keys: list[SeriesKey]) -> set[SeriesKey]:
+        """Those of *keys* compressed into points joined by lines."""
+        await self._load_compressors(keys)
+        return {
+            key
+            for key in keys
+            if (compressor := self._compressors.get(key)) is not None
+            and compressor.compression.interpolates
+        }
+
+    async def _interpolated_tw_avg(
+        self, key: SeriesKey, query: AggregationQuery
+    ) -> AggregationResult:
+        """tw_avg of a swinging-door series, whose points are joined by lines.
+
+        Computed here from the raw points, the bucket's and the ones on either
+        side, rather than by the backend, which holds each value until the
+        next (LOCF). Never cached: a new point also changes the buckets back
+        to the point before it.
+        """
+        start = cast("datetime", query.start)
+        end = cast("datetime", query.end)
+        timezone = cast("str", query.timezone)
+        interval: Interval | Literal["whole"]
+        if query.interval == "whole":
+            interval = "whole"
+            bins = [(start, end)]
+        else:
+            interval = cast("Interval", query.interval)
+            bins = bin_boundaries(start, end, interval, timezone)
+        backend = self._backend
+        anchor = await backend.fetch_point_before(key, before=start)
+        inside: list[DataPoint] = []
+        async with aclosing(backend.iter_points(key, start=start, end=end)) as batches:
+            async for batch in batches:
+                inside.extend(p for p in batch if p.timestamp < end)
+                if len(inside) > MAX_INTERPOLATED_POINTS:
+                    msg = (
+                        f"tw_avg of {key} reads over {MAX_INTERPOLATED_POINTS} "
+                        "points; narrow the time range"
+                    )
+                    raise InvalidError(msg)
+        after = await backend.fetch_points(key, start=end, limit=1)
+        values = interpolated_tw_avgs(
+            [*([anchor] if anchor else []), *inside, *after],
+            [(lo, min(hi, end)) for lo, hi in bins],
+        )
+        stamps = [p.timestamp for p in inside]
+        points = [
+            AggregatedPoint(
+                interval_start=lo,
+                value=value,
+                count=bisect_left(stamps, hi) - bisect_left(stamps, lo),
+            )
+            for (lo, hi), value in zip(bins, values, strict=True)
+        ]
+        return AggregationResult(
+            interval=interval,
+            agg=query.agg,
+            data_type=DataType.FLOAT,
+            timezone=timezone,
+            points=points,
+        )
 
     async def _time_aggregate_series(
         self,
@@ -372,20 +885,15 @@ class TimeSeriesService(Service):
         if interval == "raw":
             msg = "Space aggregation requires bucketed series; 'raw' is not supported"
             raise InvalidError(msg)
+        if query.max_points is not None:
+            msg = "max_points only applies to interval=raw"
+            raise InvalidError(msg)
         query = query.model_copy(update={"interval": interval})
 
-        # Bounded fan-out: the postgres pool is shared by the whole platform,
-        # so one wide target must not queue N acquires at once and starve
-        # ingestion behind a dashboard render. The cap stays below the pool
-        # size so other timeseries work always finds a free connection.
-        semaphore = asyncio.Semaphore(AGGREGATE_FANOUT_LIMIT)
-
-        async def _aggregate(s: TimeSeries) -> AggregationResult:
-            async with semaphore:
-                return await self._backend.aggregate(s.key, query)
-
-        results = await asyncio.gather(*(_aggregate(s) for s in series))
-        return series, list(results), data_type, interval, resolved_tz
+        # One storage call for the whole target: postgres batches it into a
+        # single statement where it can and bounds its own fan-out otherwise.
+        results = await self._aggregate_cached([s.key for s in series], query)
+        return series, results, data_type, interval, resolved_tz
 
     async def get_aggregate_many(
         self,
@@ -547,13 +1055,24 @@ class TimeSeriesService(Service):
         query: AggregationQuery,
         data_type: DataType,
     ) -> AggregationResult:
-        fetch = await self._fetch_points_utc(
-            key,
-            start=query.start,
-            end=query.end,
-            carry_forward=False,
-            limit=MAX_RAW_LIMIT,
-        )
+        if query.max_points is not None:
+            validate_downsample_data_type(data_type)
+            fetch = await self._fetch_downsampled(
+                key,
+                start=query.start,
+                end=query.end,
+                carry_forward=False,
+                max_points=query.max_points,
+                method=query.downsample,
+            )
+        else:
+            fetch = await self._fetch_points_utc(
+                key,
+                start=query.start,
+                end=query.end,
+                carry_forward=False,
+                limit=MAX_RAW_LIMIT,
+            )
         wrapped = [
             AggregatedPoint(interval_start=p.timestamp, value=p.value, count=1)
             for p in fetch.points
@@ -577,18 +1096,41 @@ class TimeSeriesService(Service):
         carry_forward: bool = False,
         timezone: str | None = None,
         limit: int | None = None,
+        max_points: int | None = None,
+        downsample: DownsampleMethod = DownsampleMethod.LTTB,
     ) -> FetchPointsResult:
+        """Raw points of *key*, paginated by *limit*.
+
+        With *max_points* the whole range is downsampled to at most that many
+        points instead (see ``domain/downsample.py``), and *limit* must not
+        be given.
+        """
         if timezone is not None:
             validate_tz_name(timezone)
         resolved_tz = timezone or self._default_timezone
         if limit is not None and not (1 <= limit <= MAX_RAW_LIMIT):
             msg = f"limit must be between 1 and {MAX_RAW_LIMIT}"
             raise InvalidError(msg)
+        if max_points is not None and limit is not None:
+            msg = "limit and max_points are mutually exclusive"
+            raise InvalidError(msg)
         effective_limit = limit if limit is not None else DEFAULT_RAW_LIMIT
         if last is not None and start is None:
             start = resolve_last(last)
         start = normalize_to_utc(start, resolved_tz)
         end = normalize_to_utc(end, resolved_tz)
+        if max_points is not None:
+            data_type = await self._backend.get_series_data_type(key)
+            if data_type is not None:
+                validate_downsample_data_type(data_type)
+            return await self._fetch_downsampled(
+                key,
+                start=start,
+                end=end,
+                carry_forward=carry_forward,
+                max_points=max_points,
+                method=downsample,
+            )
         return await self._fetch_points_utc(
             key,
             start=start,
@@ -629,6 +1171,133 @@ class TimeSeriesService(Service):
             points=points, truncated=truncated, next_start=next_start
         )
 
+    async def _fetch_downsampled(  # noqa: PLR0913
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None,
+        end: datetime | None,
+        carry_forward: bool,
+        max_points: int,
+        method: DownsampleMethod,
+    ) -> FetchPointsResult:
+        """At most *max_points* points of the range, one slot kept for the
+        carried-forward point.
+
+        ``minmax`` runs in storage over the whole range. ``lttb`` needs the
+        points themselves: it reads at most ``MAX_RAW_LIMIT`` of them, and a
+        longer range comes back truncated like a raw read.
+        """
+        _validate_max_points(max_points)
+        budget = max_points - 1
+        if method == DownsampleMethod.MINMAX:
+            buckets = max(1, budget // MIN_DOWNSAMPLE_POINTS)
+            points = await self._backend.fetch_points_minmax(
+                key, start=start, end=end, buckets=buckets
+            )
+            # A single bucket can still bring more points than the budget.
+            if len(points) > budget:
+                points = lttb(points, budget)
+            truncated, next_start = False, None
+        else:
+            fetched = await self._fetch_points_utc(
+                key, start=start, end=end, carry_forward=False, limit=MAX_RAW_LIMIT
+            )
+            points = lttb(fetched.points, budget)
+            truncated, next_start = fetched.truncated, fetched.next_start
+        if carry_forward and start is not None:
+            previous = await self._backend.fetch_point_before(key, before=start)
+            if previous is not None:
+                points = [DataPoint(timestamp=start, value=previous.value), *points]
+        return FetchPointsResult(
+            points=points, truncated=truncated, next_start=next_start
+        )
+
+    async def _resolve_export(
+        self,
+        series_ids: list[str],
+        *,
+        start: datetime | None,
+        end: datetime | None,
+        last: str | None,
+    ) -> tuple[list[TimeSeries], datetime | None, datetime | None]:
+        if last is not None and start is None:
+            start = resolve_last(last)
+        start = normalize_to_utc(start, self._default_timezone)
+        end = normalize_to_utc(end, self._default_timezone)
+        all_series = [await self.get_series(series_id) for series_id in series_ids]
+        return all_series, start, end
+
+    @asynccontextmanager
+    async def _export_rows(
+        self,
+        all_series: list[TimeSeries],
+        *,
+        start: datetime | None,
+        end: datetime | None,
+        carry_forward: bool,
+        tally: _ExportTally,
+    ) -> AsyncIterator[AsyncIterator[Row]]:
+        # Closing the stream on exit returns the postgres cursor's connection
+        # to the pool even when the consumer stops early (client disconnect).
+        points = _export_points(
+            self._backend,
+            [series.key for series in all_series],
+            start=start,
+            end=end,
+            carry_forward=carry_forward,
+            tally=tally,
+        )
+        async with aclosing(points):
+            rows = rows_from_points(
+                points, len(all_series), timezone=self._default_timezone
+            )
+            async with aclosing(rows):
+                yield rows
+
+    async def stream_csv(
+        self,
+        series_ids: list[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        last: str | None = None,
+        carry_forward: bool = False,
+    ) -> AsyncIterator[str]:
+        """Resolve *series_ids* and return the export as an iterator of chunks.
+
+        Unknown series raise here, before the first chunk. Points are read in
+        time order batch by batch and merged, so memory does not grow with
+        the exported range.
+        """
+        all_series, start, end = await self._resolve_export(
+            series_ids, start=start, end=end, last=last
+        )
+        return self._csv_chunks(
+            all_series, start=start, end=end, carry_forward=carry_forward
+        )
+
+    async def _csv_chunks(
+        self,
+        all_series: list[TimeSeries],
+        *,
+        start: datetime | None,
+        end: datetime | None,
+        carry_forward: bool,
+    ) -> AsyncIterator[str]:
+        tally = _ExportTally()
+        async with self._export_rows(
+            all_series,
+            start=start,
+            end=end,
+            carry_forward=carry_forward,
+            tally=tally,
+        ) as rows:
+            async for chunk in iter_csv([s.metric for s in all_series], rows):
+                yield chunk
+        if tally.truncated:
+            yield f"\n# truncated to {tally.points} points"
+
     async def export_csv(
         self,
         series_ids: list[str],
@@ -638,32 +1307,48 @@ class TimeSeriesService(Service):
         last: str | None = None,
         carry_forward: bool = False,
     ) -> str:
-        if last is not None and start is None:
-            start = resolve_last(last)
-        start = normalize_to_utc(start, self._default_timezone)
-        end = normalize_to_utc(end, self._default_timezone)
+        chunks = await self.stream_csv(
+            series_ids, start=start, end=end, last=last, carry_forward=carry_forward
+        )
+        return "".join([chunk async for chunk in chunks])
 
-        all_series = []
-        any_truncated = False
-        for series_id in series_ids:
-            series = await self.get_series(series_id)
-            result = await self._fetch_points_utc(
-                series.key,
-                start=start,
-                end=end,
-                carry_forward=carry_forward,
-                limit=MAX_RAW_LIMIT,
-            )
-            series.data_points = result.points
-            all_series.append(series)
-            if result.truncated:
-                any_truncated = True
+    async def export_parquet(
+        self,
+        series_ids: list[str],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        last: str | None = None,
+        carry_forward: bool = False,
+    ) -> bytes:
+        """Export as Parquet: a ``timestamp`` column, then one typed column
+        per series named ``<owner_id>/<metric>``.
 
-        csv_content = to_csv(all_series, timezone=self._default_timezone)
-        if any_truncated:
-            total = sum(len(s.data_points) for s in all_series)
-            csv_content += f"\n# truncated to {total} points"
-        return csv_content
+        A truncated export records ``truncated_to`` (the number of points
+        kept) in the file's key-value metadata.
+        """
+        # Function-level import: polars is only loaded when actually needed.
+        from timeseries.exporters.parquet import to_parquet  # noqa: PLC0415
+
+        all_series, start, end = await self._resolve_export(
+            series_ids, start=start, end=end, last=last
+        )
+        tally = _ExportTally()
+        async with self._export_rows(
+            all_series,
+            start=start,
+            end=end,
+            carry_forward=carry_forward,
+            tally=tally,
+        ) as rows:
+            return await to_parquet(
+                [(f"{s.owner_id}/{s.metric}", s.data_type) for s in all_series],
+                rows,
+                timezone=self._default_timezone,
+                metadata=lambda: (
+                    {"truncated_to": str(tally.points)} if tally.truncated else {}
+                ),
+            )
 
     async def export_png(  # noqa: PLR0913
         self,
@@ -0,0 +1,168 @@
+"""On-disk spool for ingestion batches storage could not take.
+
+When storage is down or stalls, :class:`~timeseries.service.ingestion.IngestionBuffer`
+appends the failed batch here instead of holding it in memory, and replays the
+spool oldest first, in batches, once writes go through again. The spool is a
+SQLite file (WAL journal), so it survives a restart of the process: whatever is
+left is replayed after the next start.
+
+Replays may write a point that already reached storage (a write cancelled after
+it committed); upserts keyed on timestamp make that harmless.
+
+Calls are not safe to interleave: the buffer makes them under its flush lock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from timeseries.domain import DataPoint, SeriesKey
+from timeseries.storage.memory.columns import from_us, to_us
+
+if TYPE_CHECKING:
+    from timeseries.domain import AttributeValueType
+
+# Points the spool holds before it refuses new batches.
+SPOOL_MAX_POINTS = 2_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    ts_us INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    command_id INTEGER,
+    spooled_at REAL NOT NULL
+)
+"""
+
+type _Row = tuple[str, str, int, str, int | None, float]
+
+
+class IngestionSpool:
+    def __init__(self, path: str | Path, *, max_points: int = SPOOL_MAX_POINTS) -> None:
+        if max_points < 1:
+            msg = "max_points must be at least 1"
+            raise ValueError(msg)
+        self._path = Path(path)
+        self._max_points = max_points
+        self._conn: sqlite3.Connection | None = None
+        self._count = 0
+        self._oldest: datetime | None = None
+
+    @property
+    def points(self) -> int:
+        return self._count
+
+    @property
+    def oldest(self) -> datetime | None:
+        """When the oldest spooled point was spooled."""
+        return self._oldest
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
+
+    def _open(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        self._conn = conn
+        self._count = conn.execute("SELECT count(*) FROM spool").fetchone()[0]
+        self._oldest = self._head_spooled_at()
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    async def append(self, batch: dict[SeriesKey, list[DataPoint]]) -> bool:
+        """Spool *batch*; ``False`` if it does not fit, leaving the spool as is."""
+        count = sum(len(points) for points in batch.values())
+        if self._count + count > self._max_points:
+            return False
+        now = datetime.now(UTC)
+        rows: list[_Row] = [
+            (
+                key.owner_id,
+                key.metric,
+                to_us(p.timestamp),
+                json.dumps(p.value),
+                p.command_id,
+                now.timestamp(),
+            )
+            for key, points in batch.items()
+            for p in points
+        ]
+        await asyncio.to_thread(self._insert, rows)
+        self._count += count
+        if self._oldest is None:
+            self._oldest = now
+        return True
+
+    def _insert(self, rows: list[_Row]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO spool (owner_id, metric, ts_us, value, command_id,"
+                " spooled_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    async def peek(self, limit: int) -> tuple[int, dict[SeriesKey, list[DataPoint]]]:
+        """The *limit* oldest points, and the row id to :meth:`delete_through`."""
+        rows = await asyncio.to_thread(self._select, limit)
+        batch: dict[SeriesKey, list[DataPoint]] = {}
+        last_id = 0
+        for row_id, owner_id, metric, ts_us, value, command_id in rows:
+            decoded: AttributeValueType = json.loads(value)
+            batch.setdefault(SeriesKey(owner_id=owner_id, metric=metric), []).append(
+                DataPoint(
+                    timestamp=from_us(ts_us), value=decoded, command_id=command_id
+                )
+            )
+            last_id = row_id
+        return last_id, batch
+
+    def _select(self, limit: int) -> list[tuple[int, str, str, int, str, int | None]]:
+        return self._connection.execute(
+            "SELECT id, owner_id, metric, ts_us, value, command_id FROM spool"
+            " ORDER BY id LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    async def delete_through(self, row_id: int) -> None:
+        """Drop every point up to *row_id*, once storage has taken them."""
+        deleted = await asyncio.to_thread(self._delete, row_id)
+        self._count -= deleted
+        self._oldest = await asyncio.to_thread(self._head_spooled_at)
+
+    def _delete(self, row_id: int) -> int:
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM spool WHERE id <= ?", (row_id,)
+            )
+        return cursor.rowcount
+
+    def _head_spooled_at(self) -> datetime | None:
+        # Rows are spooled in id order, so the first row is the oldest.
+        row = self._connection.execute(
+            "SELECT spooled_at FROM spool ORDER BY id LIMIT 1"
+        ).fetchone()
+        return datetime.fromtimestamp(row[0], UTC) if row else None
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            msg = "IngestionSpool.open() must be called before use"
+            raise RuntimeError(msg)
+        return self._conn
+
+
+__all__ = ["SPOOL_MAX_POINTS", "IngestionSpool"]
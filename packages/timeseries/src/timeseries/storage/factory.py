@@ -23,8 +23,9 @@ async def build_storage(url: str | None = None) -> TimeSeriesStorage:
 
         try:
             # Timeseries is the platform's most DB-intensive service: reads
-            # fan out per series (bounded by AGGREGATE_FANOUT_LIMIT in the
-            # service) while ingestion writes continuously. 10 connections
+            # that cannot be batched fan out per series (bounded by
+            # AGGREGATE_FANOUT_LIMIT in the postgres storage) while ingestion
+            # writes continuously. 10 connections
             # keep those from queuing behind each other and stay well under
             # postgres' default 100-connection budget shared with the other
             # services' (smaller) pools.
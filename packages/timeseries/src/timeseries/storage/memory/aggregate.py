@@ -1,8 +1,9 @@
+from array import array
 from collections import defaultdict
-from datetime import UTC, date, datetime, timedelta
+from datetime import UTC, datetime
 from typing import Any, Literal
-from zoneinfo import ZoneInfo
 
+import numpy as np
 import polars as pl
 
 from timeseries.domain import (
@@ -13,17 +14,14 @@ from timeseries.domain import (
     DataPoint,
     DataType,
     Interval,
-    IntervalUnit,
     TimeSeries,
+    bin_boundaries,
 )
 from timeseries.storage._preconditions import assert_query_resolved
+from timeseries.storage.memory.columns import TYPECODES, from_us, to_us
 
 _ROUND = 6
 
-# Postgres uses 2000-01-03 as the origin for day-interval time_bucket calls.
-# Multi-day bins must anchor here so memory and Postgres produce identical buckets.
-_PG_DAY_ORIGIN: date = date(2000, 1, 3)
-
 _DTYPE_POLARS: dict[DataType, pl.datatypes.DataTypeClass] = {
     DataType.FLOAT: pl.Float64,
     DataType.INT: pl.Int64,
@@ -31,61 +29,12 @@ _DTYPE_POLARS: dict[DataType, pl.datatypes.DataTypeClass] = {
     DataType.STRING: pl.Utf8,
 }
 
-
-def _tz(name: str) -> Any:
-    return UTC if name == "UTC" else ZoneInfo(name)
-
-
-def _floor_bin(dt: datetime, interval: Interval) -> datetime:
-    """Floor dt to the start of its containing bin, preserving timezone."""
-    if interval.unit == IntervalUnit.MO:
-        return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0, fold=0)
-    if interval.unit == IntervalUnit.D:
-        if interval.qty == 1:
-            # Per-day: local-wall replace is DST-correct (avoids 25h day regression).
-            return dt.replace(hour=0, minute=0, second=0, microsecond=0, fold=0)
-        # Multi-day: anchor at Postgres origin (2000-01-03) using calendar dates so
-        # bucket boundaries match time_bucket(..., timezone) exactly.
-        local_date = dt.date()
-        elapsed_days = (local_date - _PG_DAY_ORIGIN).days
-        slot_days = (elapsed_days // interval.qty) * interval.qty
-        floored = _PG_DAY_ORIGIN + timedelta(days=slot_days)
-        return datetime(
-            floored.year, floored.month, floored.day, tzinfo=dt.tzinfo, fold=0
-        )
-    td_s = int(interval.to_timedelta().total_seconds())
-    midnight = dt.replace(hour=0, minute=0, second=0, microsecond=0, fold=0)
-    elapsed_s = int((dt.astimezone(UTC) - midnight.astimezone(UTC)).total_seconds())
-    slot_s = (elapsed_s // td_s) * td_s
-    return midnight + timedelta(seconds=slot_s)
-
-
-def _next_bin(dt: datetime, interval: Interval) -> datetime:
-    """Advance dt by one bin. Sub-day bins advance in UTC to avoid DST phantom bins."""
-    if interval.unit == IntervalUnit.MO:
-        # qty is always 1 — enforced by Interval._validate_mo
-        if dt.month == 12:
-            return dt.replace(year=dt.year + 1, month=1)
-        return dt.replace(month=dt.month + 1)
-    td = interval.to_timedelta()
-    if interval.unit == IntervalUnit.D:
-        d = dt.date() + td
-        return datetime(d.year, d.month, d.day, tzinfo=dt.tzinfo, fold=0)
-    return (dt.astimezone(UTC) + td).astimezone(dt.tzinfo)
-
-
-def _bin_boundaries(
-    start: datetime, end: datetime, interval: Interval, tz_name: str
-) -> list[tuple[datetime, datetime]]:
-    """Return list of (bin_start_utc, bin_end_utc) covering [start, end)."""
-    tz = _tz(tz_name)
-    current = _floor_bin(start.astimezone(tz), interval)
-    bins: list[tuple[datetime, datetime]] = []
-    while current.astimezone(UTC) < end:
-        nxt = _next_bin(current, interval)
-        bins.append((current.astimezone(UTC), nxt.astimezone(UTC)))
-        current = nxt
-    return bins
+# numpy views over the SeriesColumns arrays, by array typecode.
+_DTYPE_NUMPY: dict[str, type[np.generic]] = {
+    "q": np.int64,
+    "d": np.float64,
+    "b": np.int8,
+}
 
 
 def _mode(values: list[Any]) -> Any:
@@ -140,9 +89,9 @@ def _segs_to_step_df(
     Each row gets a next_ts_us column: the timestamp of the following segment, or
     bin_end for the last segment, enabling duration computation via subtraction.
     """
-    seg_ts_us = [int(ts.astimezone(UTC).timestamp() * 1_000_000) for ts, _ in segs]
+    seg_ts_us = [to_us(ts) for ts, _ in segs]
     seg_vals = [v for _, v in segs]
-    bin_end_us = int(bin_end.astimezone(UTC).timestamp() * 1_000_000)
+    bin_end_us = to_us(bin_end)
     df = pl.DataFrame({"ts_us": seg_ts_us, "val": pl.Series("val", seg_vals)})
     return df.with_columns(
         pl.col("ts_us").shift(-1).fill_null(bin_end_us).alias("next_ts_us")
@@ -278,14 +227,36 @@ def _apply_op(
     )
 
 
+def _frame(
+    timestamps_us: array[int], values: array[Any] | list[Any], data_type: DataType
+) -> pl.DataFrame:
+    """Wrap the storage columns without a per-point Python round trip.
+
+    Fixed-width columns are viewed through numpy (no copy); only string
+    values go through Python objects.
+    """
+    ts = pl.Series("ts_us", np.frombuffer(timestamps_us, dtype=np.int64))
+    pl_dtype = _DTYPE_POLARS[data_type]
+    if isinstance(values, array):
+        view = np.frombuffer(values, dtype=_DTYPE_NUMPY[TYPECODES[data_type]])
+        value = pl.Series("value", view).cast(pl_dtype)
+    else:
+        value = pl.Series("value", values, dtype=pl_dtype)
+    return pl.DataFrame([ts, value])
+
+
 def compute(
-    points: list[DataPoint],
+    timestamps_us: array[int],
+    values: array[Any] | list[Any],
     anchor: DataPoint | None,
     series: TimeSeries,
     query: AggregationQuery,
 ) -> AggregationResult:
     """Aggregate time-series data using polars for bucketing and per-operator logic.
 
+    *timestamps_us* (sorted epoch microseconds) and *values* are the
+    ``SeriesColumns`` of the points from ``query.start`` on.
+
     Uses tz-aware bucket boundaries (DST-correct for calendar intervals), LOCF for
     empty buckets (except count/sum), polars shift-based duration for tw_avg/tw_mode.
 
@@ -308,7 +279,7 @@ def compute(
     else:
         assert isinstance(query.interval, Interval)  # noqa: S101
         result_interval = query.interval
-        bins = _bin_boundaries(query.start, query.end, query.interval, tz_name)
+        bins = bin_boundaries(query.start, query.end, query.interval, tz_name)
 
     if not bins:
         return AggregationResult(
@@ -319,42 +290,38 @@ def compute(
             points=[],
         )
 
-    pl_dtype = _DTYPE_POLARS[series.data_type]
-
-    if points:
-        df = pl.DataFrame(
-            {
-                "ts_us": [
-                    int(p.timestamp.astimezone(UTC).timestamp() * 1_000_000)
-                    for p in points
-                ],
-                "value": pl.Series("value", [p.value for p in points], dtype=pl_dtype),
-            }
-        ).sort("ts_us")
-    else:
-        df = pl.DataFrame(
-            {
-                "ts_us": pl.Series([], dtype=pl.Int64),
-                "value": pl.Series("value", [], dtype=pl_dtype),
-            }
-        )
-
-    all_pts: list[tuple[datetime, Any]] = [
-        (p.timestamp.astimezone(UTC), p.value) for p in points
-    ]
+    df = _frame(timestamps_us, values, series.data_type)
+    # Bucket row ranges by binary search over the sorted timestamps.
+    edges = np.array(
+        [(to_us(bin_start), to_us(bin_end)) for bin_start, bin_end in bins],
+        dtype=np.int64,
+    )
+    ts_view = df["ts_us"].to_numpy()
+    lows = np.searchsorted(ts_view, edges[:, 0], side="left").tolist()
+    highs = np.searchsorted(ts_view, edges[:, 1], side="left").tolist()
+    time_weighted = query.agg in {
+        AggregationOperator.TW_AVG,
+        AggregationOperator.TW_MODE,
+    }
 
     result_points: list[AggregatedPoint] = []
     locf: Any = anchor.value if anchor is not None else None
     query_end_utc = query.end.astimezone(UTC)
 
-    for bin_start, bin_end in bins:
-        start_us = int(bin_start.astimezone(UTC).timestamp() * 1_000_000)
-        end_us = int(bin_end.astimezone(UTC).timestamp() * 1_000_000)
-
-        bucket_df = df.filter(
-            (pl.col("ts_us") >= start_us) & (pl.col("ts_us") < end_us)
+    for (bin_start, bin_end), lo, hi in zip(bins, lows, highs, strict=True):
+        bucket_df = df.slice(lo, hi - lo)
+        bucket_pts = (
+            [
+                (from_us(ts), v)
+                for ts, v in zip(
+                    bucket_df["ts_us"].to_list(),
+                    bucket_df["value"].to_list(),
+                    strict=True,
+                )
+            ]
+            if time_weighted
+            else []
         )
-        bucket_pts = [(ts, v) for ts, v in all_pts if bin_start <= ts < bin_end]
 
         # tw_avg/tw_mode must integrate only over the covered duration, not
         # extrapolate the last known value into a not-yet-elapsed trailing bucket.
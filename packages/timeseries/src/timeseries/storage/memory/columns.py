@@ -0,0 +1,135 @@
+"""Sorted columnar point storage for one in-memory series.
+
+Timestamps are kept as int64 microseconds since the epoch (the resolution
+of ``datetime``) in an ``array``, values in a typed ``array`` alongside —
+strings, which have no fixed-width type, in a list. Range lookups bisect
+the timestamp column; in-order writes append. This module must not import
+polars (see ``MemoryStorage.aggregate``).
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import UTC, datetime, timedelta
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any
+
+from models.errors import InvalidError
+from timeseries.domain import DataPoint, DataType
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from models.types import AttributeValueType
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+# array typecodes per data type; STRING values live in a plain list.
+TYPECODES: dict[DataType, str] = {
+    DataType.INT: "q",
+    DataType.FLOAT: "d",
+    DataType.BOOL: "b",
+}
+
+
+def to_us(ts: datetime) -> int:
+    return (ts - _EPOCH) // _MICROSECOND
+
+
+def from_us(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=us)
+
+
+class SeriesColumns:
+    __slots__ = ("_command_ids", "_data_type", "_timestamps", "_values")
+
+    def __init__(self, data_type: DataType) -> None:
+        self._data_type = data_type
+        self._timestamps: array[int] = array("q")
+        self._values: array[Any] | list[Any] = self._new_values([])
+        self._command_ids: list[int | None] = []
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def _new_values(self, values: list[Any]) -> array[Any] | list[Any]:
+        code = TYPECODES.get(self._data_type)
+        if code is None:
+            return values
+        try:
+            return array(code, values)
+        except (TypeError, OverflowError) as e:
+            msg = f"Value does not fit a {self._data_type.value} series: {e}"
+            raise InvalidError(msg) from e
+
+    def _decode(self, value: AttributeValueType) -> AttributeValueType:
+        return bool(value) if self._data_type == DataType.BOOL else value
+
+    def upsert(self, points: Sequence[DataPoint]) -> None:
+        """Insert or replace points by timestamp.
+
+        A point replacing an existing one keeps its ``command_id`` unless it
+        carries its own. Points newer than everything stored, in order, are
+        appended; others are inserted in place.
+        """
+        if not points:
+            return
+        timestamps = [to_us(p.timestamp) for p in points]
+        # Encoding first rejects the whole batch before anything is written.
+        values = self._new_values([p.value for p in points])
+        stored = self._timestamps
+        in_order = all(a < b for a, b in pairwise(timestamps))
+        if in_order and (not stored or timestamps[0] > stored[-1]):
+            stored.extend(timestamps)
+            self._values.extend(values)
+            self._command_ids.extend(p.command_id for p in points)
+            return
+        for us, value, point in zip(timestamps, values, points, strict=True):
+            idx = bisect_left(stored, us)
+            if idx < len(stored) and stored[idx] == us:
+                self._values[idx] = value
+                if point.command_id is not None:
+                    self._command_ids[idx] = point.command_id
+            else:
+                stored.insert(idx, us)
+                self._values.insert(idx, value)
+                self._command_ids.insert(idx, point.command_id)
+
+    def point(self, idx: int) -> DataPoint:
+        return DataPoint(
+            timestamp=from_us(self._timestamps[idx]),
+            value=self._decode(self._values[idx]),
+            command_id=self._command_ids[idx],
+        )
+
+    def points(self, lo: int, hi: int) -> list[DataPoint]:
+        return [self.point(idx) for idx in range(lo, hi)]
+
+    def index_at_or_after(self, ts: datetime) -> int:
+        return bisect_left(self._timestamps, to_us(ts))
+
+    def index_after(self, ts: datetime) -> int:
+        return bisect_right(self._timestamps, to_us(ts))
+
+    def drop_before(self, ts: datetime) -> int:
+        """Delete every point before *ts*; returns how many."""
+        idx = self.index_at_or_after(ts)
+        del self._timestamps[:idx]
+        del self._values[:idx]
+        del self._command_ids[:idx]
+        return idx
+
+    def columns_from(
+        self, lo: int, hi: int | None = None
+    ) -> tuple[array[int], array[Any] | list[Any]]:
+        """Copies of the timestamp and value columns from index *lo* to *hi*.
+
+        Copies, so a caller wrapping the buffers (numpy, polars) never pins
+        them against a later resize.
+        """
+        return self._timestamps[lo:hi], self._values[lo:hi]
+
+
+__all__ = ["TYPECODES", "SeriesColumns", "from_us", "to_us"]
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from bisect import bisect_left
-from copy import deepcopy
+from dataclasses import replace
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from models.errors import InvalidError, NotFoundError
-from timeseries.domain import DataPoint, SeriesKey
+from timeseries.domain import SeriesKey
+from timeseries.domain.downsample import MINMAX_POINTS_PER_BUCKET, minmax_indices
+from timeseries.storage.memory.columns import SeriesColumns
+from timeseries.storage.merge import merge_point_streams
+from timeseries.storage.protocol import ITER_BATCH_SIZE
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
     from timeseries.domain import (
         AggregationQuery,
         AggregationResult,
+        Compression,
+        DataPoint,
+        DataType,
+        RetentionPolicy,
         TimeSeries,
     )
 
@@ -20,9 +31,22 @@ def _series_key_collision(key: SeriesKey) -> InvalidError:
     return InvalidError(f"Series with key {key} already exists")
 
 
+def _copy(series: TimeSeries) -> TimeSeries:
+    # Points live in SeriesColumns, not on the TimeSeries: the remaining
+    # fields are immutable, so a shallow copy is a full one.
+    return replace(series, data_points=[])
+
+
 class MemoryStorage:
+    """In-process storage, one :class:`SeriesColumns` per series.
+
+    Series metadata is returned without points, as from postgres; points are
+    read through :meth:`fetch_points`.
+    """
+
     def __init__(self) -> None:
         self._series: dict[str, TimeSeries] = {}
+        self._columns: dict[str, SeriesColumns] = {}
         self._key_index: dict[SeriesKey, str] = {}
 
     async def create_series(self, series: TimeSeries) -> TimeSeries:
@@ -31,14 +55,17 @@ class MemoryStorage:
             raise InvalidError(msg)
         if series.key in self._key_index:
             raise _series_key_collision(series.key)
-        stored = deepcopy(series)
+        columns = SeriesColumns(series.data_type)
+        columns.upsert(series.data_points)
+        stored = _copy(series)
         self._series[stored.id] = stored
+        self._columns[stored.id] = columns
         self._key_index[stored.key] = stored.id
-        return deepcopy(stored)
+        return _copy(stored)
 
     async def get_series(self, series_id: str) -> TimeSeries | None:
         series = self._series.get(series_id)
-        return deepcopy(series) if series else None
+        return _copy(series) if series else None
 
     async def get_series_by_key(self, key: SeriesKey) -> TimeSeries | None:
         series_id = self._key_index.get(key)
@@ -46,6 +73,10 @@ class MemoryStorage:
             return None
         return await self.get_series(series_id)
 
+    async def get_series_data_type(self, key: SeriesKey) -> DataType | None:
+        series_id = self._key_index.get(key)
+        return self._series[series_id].data_type if series_id is not None else None
+
     async def get_series_by_keys(self, keys: list[SeriesKey]) -> list[TimeSeries]:
         found = [await self.get_series_by_key(key) for key in keys]
         return [series for series in found if series is not None]
@@ -62,7 +93,7 @@ class MemoryStorage:
             results = [s for s in results if s.owner_id == owner_id]
         if metric is not None:
             results = [s for s in results if s.metric == metric]
-        return [deepcopy(s) for s in results]
+        return [_copy(s) for s in results]
 
     async def fetch_points(
         self,
@@ -75,14 +106,74 @@ class MemoryStorage:
         series_id = self._key_index.get(key)
         if series_id is None:
             return []
-        points = self._series[series_id].data_points
-        if start is not None:
-            points = [p for p in points if p.timestamp >= start]
-        if end is not None:
-            points = [p for p in points if p.timestamp <= end]
+        columns = self._columns[series_id]
+        lo = columns.index_at_or_after(start) if start is not None else 0
+        hi = columns.index_after(end) if end is not None else len(columns)
         if limit is not None:
-            points = points[: limit + 1]
-        return list(points)
+            hi = min(hi, lo + limit + 1)
+        return columns.points(lo, hi)
+
+    async def fetch_points_minmax(
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        buckets: int,
+    ) -> list[DataPoint]:
+        series_id = self._key_index.get(key)
+        if series_id is None:
+            return []
+        columns = self._columns[series_id]
+        lo = columns.index_at_or_after(start) if start is not None else 0
+        hi = columns.index_after(end) if end is not None else len(columns)
+        if hi - lo <= buckets * MINMAX_POINTS_PER_BUCKET:
+            return columns.points(lo, hi)
+        timestamps, values = columns.columns_from(lo, hi)
+        kept = minmax_indices(
+            np.frombuffer(timestamps, dtype=np.int64),
+            np.asarray(values, dtype=np.float64),
+            buckets,
+        )
+        return [columns.point(lo + int(i)) for i in kept]
+
+    async def iter_points(
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> AsyncGenerator[list[DataPoint]]:
+        series_id = self._key_index.get(key)
+        if series_id is None:
+            return
+        columns = self._columns[series_id]
+        lo = columns.index_at_or_after(start) if start is not None else 0
+        while True:
+            hi = columns.index_after(end) if end is not None else len(columns)
+            batch = columns.points(lo, min(hi, lo + batch_size))
+            if not batch:
+                return
+            yield batch
+            # Writes may land while the consumer holds a batch: resume after
+            # the last timestamp handed out rather than at a stale index.
+            lo = columns.index_after(batch[-1].timestamp)
+
+    async def iter_points_many(
+        self,
+        keys: list[SeriesKey],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> AsyncGenerator[list[tuple[int, DataPoint]]]:
+        streams = [
+            self.iter_points(key, start=start, end=end, batch_size=batch_size)
+            for key in keys
+        ]
+        async for batch in merge_point_streams(streams, batch_size=batch_size):
+            yield batch
 
     async def fetch_point_before(
         self,
@@ -93,12 +184,9 @@ class MemoryStorage:
         series_id = self._key_index.get(key)
         if series_id is None:
             return None
-        points = self._series[series_id].data_points
-        timestamps = [p.timestamp for p in points]
-        idx = bisect_left(timestamps, before)
-        if idx > 0:
-            return points[idx - 1]
-        return None
+        columns = self._columns[series_id]
+        idx = columns.index_at_or_after(before)
+        return columns.point(idx - 1) if idx > 0 else None
 
     async def upsert_points(
         self,
@@ -109,20 +197,18 @@ class MemoryStorage:
         if series_id is None:
             msg = f"No series found for key {key}"
             raise NotFoundError(msg)
-        series = self._series[series_id]
-        existing = {p.timestamp: p for p in series.data_points}
-        for p in points:
-            prev = existing.get(p.timestamp)
-            resolved_id = (
-                p.command_id
-                if p.command_id is not None
-                else (prev.command_id if prev is not None else None)
-            )
-            existing[p.timestamp] = DataPoint(
-                timestamp=p.timestamp, value=p.value, command_id=resolved_id
-            )
-        series.data_points = sorted(existing.values(), key=lambda p: p.timestamp)
-        series.updated_at = datetime.now(tz=UTC)
+        self._columns[series_id].upsert(points)
+        self._series[series_id].updated_at = datetime.now(tz=UTC)
+
+    async def upsert_points_many(
+        self, points_by_key: dict[SeriesKey, list[DataPoint]]
+    ) -> None:
+        missing = [key for key in points_by_key if key not in self._key_index]
+        if missing:
+            msg = f"No series found for key {missing[0]}"
+            raise NotFoundError(msg)
+        for key, points in points_by_key.items():
+            await self.upsert_points(key, points)
 
     async def rename_series(self, key: SeriesKey, new_metric: str) -> TimeSeries | None:
         series_id = self._key_index.get(key)
@@ -136,7 +222,18 @@ class MemoryStorage:
         series.updated_at = datetime.now(tz=UTC)
         del self._key_index[key]
         self._key_index[new_key] = series_id
-        return deepcopy(series)
+        return _copy(series)
+
+    async def set_series_compression(
+        self, key: SeriesKey, compression: Compression | None
+    ) -> TimeSeries | None:
+        series_id = self._key_index.get(key)
+        if series_id is None:
+            return None
+        series = self._series[series_id]
+        series.compression = compression
+        series.updated_at = datetime.now(tz=UTC)
+        return _copy(series)
 
     async def aggregate(
         self,
@@ -148,20 +245,45 @@ class MemoryStorage:
         # breaking the polars-isolation contract.
         from timeseries.storage.memory import aggregate as _agg  # noqa: PLC0415
 
-        series = await self.get_series_by_key(key)
-        if series is None:
+        series_id = self._key_index.get(key)
+        if series_id is None:
             msg = f"No series found for key {key}"
             raise NotFoundError(msg)
+        series = self._series[series_id]
+        columns = self._columns[series_id]
 
         anchor = None
-        points: list[DataPoint] = []
+        lo = len(columns)
         if query.start is not None:
-            anchor = await self.fetch_point_before(key, before=query.start)
-            # No end filter: the last UTC bucket can extend past query.end for
-            # cross-timezone queries; aggregate.py filters per-bucket.
-            points = await self.fetch_points(key, start=query.start)
+            lo = columns.index_at_or_after(query.start)
+            anchor = columns.point(lo - 1) if lo > 0 else None
+        # No end filter: the last UTC bucket can extend past query.end for
+        # cross-timezone queries; aggregate.py filters per-bucket.
+        timestamps_us, values = columns.columns_from(lo)
+        return _agg.compute(timestamps_us, values, anchor, series, query)
+
+    async def aggregate_many(
+        self,
+        keys: list[SeriesKey],
+        query: AggregationQuery,
+    ) -> list[AggregationResult]:
+        return [await self.aggregate(key, query) for key in keys]
+
+    async def apply_retention(
+        self, policy: RetentionPolicy, now: datetime
+    ) -> list[SeriesKey]:
+        """Drop raw points past each series' raw retention.
 
-        return _agg.compute(points, anchor, series, query)
+        There are no rollups in memory: aged-out points are simply gone.
+        """
+        trimmed: list[SeriesKey] = []
+        for series_id, series in self._series.items():
+            rule = policy.rule_for(series)
+            if rule is None:
+                continue
+            if self._columns[series_id].drop_before(rule.raw_cutoff(now)):
+                trimmed.append(SeriesKey(series.owner_id, series.metric))
+        return trimmed
 
     async def close(self) -> None:
         pass
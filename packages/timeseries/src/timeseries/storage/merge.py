@@ -0,0 +1,72 @@
+"""Merge per-series point streams into one time-ordered stream.
+
+Each point comes out tagged with the index of its series, the shape of
+``TimeSeriesStorage.iter_points_many``. A k-way merge over the batch heads
+keeps one batch per series in memory, whatever the range.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING
+
+from timeseries.storage.protocol import ITER_BATCH_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+    from datetime import datetime
+
+    from timeseries.domain import DataPoint
+
+
+class _Cursor:
+    __slots__ = ("_batch", "_batches", "_pos")
+
+    def __init__(self, batches: AsyncIterator[list[DataPoint]]) -> None:
+        self._batches = batches
+        self._batch: list[DataPoint] = []
+        self._pos = 0
+
+    async def next(self) -> DataPoint | None:
+        while self._pos >= len(self._batch):
+            batch = await anext(self._batches, None)
+            if batch is None:
+                return None
+            self._batch, self._pos = batch, 0
+        point = self._batch[self._pos]
+        self._pos += 1
+        return point
+
+
+async def merge_point_streams(
+    streams: Sequence[AsyncIterator[list[DataPoint]]],
+    *,
+    batch_size: int = ITER_BATCH_SIZE,
+) -> AsyncGenerator[list[tuple[int, DataPoint]]]:
+    """Points of *streams* in time order, each with the index of its stream;
+    ties go to the lower index."""
+    cursors = [_Cursor(stream) for stream in streams]
+    heap: list[tuple[datetime, int, DataPoint]] = []
+    for i, cursor in enumerate(cursors):
+        point = await cursor.next()
+        if point is not None:
+            heap.append((point.timestamp, i, point))
+    heapq.heapify(heap)
+
+    batch: list[tuple[int, DataPoint]] = []
+    while heap:
+        _, i, point = heap[0]
+        batch.append((i, point))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+        following = await cursors[i].next()
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (following.timestamp, i, following))
+    if batch:
+        yield batch
+
+
+__all__ = ["merge_point_streams"]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 from timeseries.domain import (
     AggregatedPoint,
@@ -12,6 +12,7 @@ from timeseries.domain import (
     IntervalUnit,
 )
 from timeseries.storage._preconditions import assert_query_resolved
+from timeseries.storage.postgres import rollups as _rollups
 
 _PG_UNIT: dict[IntervalUnit, str] = {
     IntervalUnit.MIN: "minutes",
@@ -47,7 +48,7 @@ if TYPE_CHECKING:
 
     import asyncpg
 
-    from timeseries.domain import AggregationQuery, DataPoint, TimeSeries
+    from timeseries.domain import AggregationQuery, DataPoint
 
     _AnchorValue = float | bool | int | str | None
     _Params = list[_AnchorValue | str | datetime]
@@ -90,7 +91,11 @@ def _end_boundary(ctx: _QueryCtx) -> str:
     regardless of DST transitions (a DST spring-forward can push
     bucket_start + 1 day across midnight into the wrong bucket).
     """
-    if ctx.interval_unit in {IntervalUnit.D, IntervalUnit.MO}:
+    return _end_boundary_for(ctx.interval_unit)
+
+
+def _end_boundary_for(unit: IntervalUnit) -> str:
+    if unit in {IntervalUnit.D, IntervalUnit.MO}:
         return (
             "time_bucket($1::text::interval,"
             " time_bucket($1::text::interval,"
@@ -162,6 +167,14 @@ def _locf_parts(
             raise ValueError(msg)
 
 
+def _sum_expr(data_type: DataType, vc: str) -> str:
+    if data_type == DataType.BOOL:
+        return f"COALESCE(SUM({vc}::int), 0)::bigint"
+    if data_type == DataType.INT:
+        return f"COALESCE(SUM({vc}), 0)::bigint"
+    return f"COALESCE(SUM({vc}), 0)::double precision"
+
+
 def _simple_query(
     op: AggregationOperator,
     data_type: DataType,
@@ -184,12 +197,7 @@ def _simple_query(
             params = _base_params(ctx)
 
         case AggregationOperator.SUM:
-            if data_type == DataType.BOOL:
-                val_expr = f"COALESCE(SUM({vc}::int), 0)::bigint"
-            elif data_type == DataType.INT:
-                val_expr = f"COALESCE(SUM({vc}), 0)::bigint"
-            else:
-                val_expr = f"COALESCE(SUM({vc}), 0)::double precision"
+            val_expr = _sum_expr(data_type, vc)
             params = _base_params(ctx)
 
         case _:
@@ -519,12 +527,7 @@ def _whole_simple_query(op: AggregationOperator, ctx: _WholeCtx) -> tuple[str, _
             return sql, _whole_base_params(ctx)
 
         case AggregationOperator.SUM:
-            if ctx.data_type == DataType.BOOL:
-                val_expr = f"COALESCE(SUM({vc}::int), 0)::bigint"
-            elif ctx.data_type == DataType.INT:
-                val_expr = f"COALESCE(SUM({vc}), 0)::bigint"
-            else:
-                val_expr = f"COALESCE(SUM({vc}), 0)::double precision"
+            val_expr = _sum_expr(ctx.data_type, vc)
             sql = (
                 "SELECT\n"
                 "    $1::timestamptz AS bucket,\n"
@@ -703,9 +706,10 @@ def _whole_query(op: AggregationOperator, ctx: _WholeCtx) -> tuple[str, _Params]
             return _whole_simple_query(op, ctx)
 
 
-async def compute(
+async def compute(  # noqa: PLR0913
     pool: asyncpg.Pool,
-    series: TimeSeries,
+    series_id: str,
+    data_type: DataType,
     query: AggregationQuery,
     anchor: DataPoint | None,
     value_col: str,
@@ -716,14 +720,13 @@ async def compute(
     assert query.timezone is not None  # noqa: S101
     tz: str = query.timezone
     op = query.agg
-    data_type = series.data_type
     anchor_value = _coerce_anchor(op, anchor)
 
     if query.interval == "whole":
         wctx = _WholeCtx(
             value_col=value_col,
             anchor_value=anchor_value,
-            series_id=series.id,
+            series_id=series_id,
             start=query.start,
             end=query.end,
             data_type=data_type,
@@ -754,7 +757,7 @@ async def compute(
         tz=tz,
         interval_str=_to_sql_interval(interval),
         interval_unit=interval.unit,
-        series_id=series.id,
+        series_id=series_id,
         start=query.start,
         end=query.end,
         data_type=data_type,
@@ -790,3 +793,276 @@ async def compute(
         timezone=ctx.tz,
         points=points,
     )
+
+
+# Multi-series aggregation: one statement for many series of the same data
+# type. Only operators that are plain GROUP BY aggregates are supported; the
+# window-based ones (mode, tw_avg, tw_mode, delta) order rows per series and
+# stay on the single-series queries above.
+MULTI_SERIES_OPERATORS = frozenset(
+    {
+        AggregationOperator.COUNT,
+        AggregationOperator.SUM,
+        AggregationOperator.AVG,
+        AggregationOperator.MIN,
+        AggregationOperator.MAX,
+        AggregationOperator.FIRST,
+        AggregationOperator.LAST,
+    }
+)
+
+
+def _anchor_subquery(
+    op: AggregationOperator, data_type: DataType, vc: str, outer: str, before: str
+) -> str:
+    """Correlated LOCF anchor: the series' last value before *before*.
+
+    Replaces the per-series anchor round-trip; typed like the ``prev`` of
+    :func:`_locf_parts` (double precision for AVG).
+    """
+    value = f"a.{vc}"
+    if op == AggregationOperator.AVG:
+        value = (
+            f"a.{vc}::int::double precision"
+            if data_type == DataType.BOOL
+            else f"a.{vc}::double precision"
+        )
+    return (
+        f"(SELECT {value} FROM ts_data_points AS a"
+        f" WHERE a.series_id = {outer} AND a.timestamp < {before}"
+        " ORDER BY a.timestamp DESC LIMIT 1)"
+    )
+
+
+def _component_exprs(  # noqa: PLR0911
+    op: AggregationOperator, data_type: DataType
+) -> tuple[str, str]:
+    """(aggregate expr, LOCF carry expr) over :func:`rollups.components_source` rows.
+
+    The rollup counterpart of :func:`_locf_parts` (COUNT and SUM included):
+    every operator recombined from per-granule components.
+    """
+    carry = "last(s_last, last_at)"
+    match op:
+        case AggregationOperator.COUNT:
+            return "COALESCE(SUM(cnt), 0)::bigint", carry
+        case AggregationOperator.SUM:
+            cast = "double precision" if data_type == DataType.FLOAT else "bigint"
+            return f"COALESCE(SUM(s_sum), 0)::{cast}", carry
+        case AggregationOperator.AVG:
+            last_cast = (
+                "s_last::int::double precision"
+                if data_type == DataType.BOOL
+                else "s_last::double precision"
+            )
+            return (
+                "SUM(s_sum)::double precision / NULLIF(SUM(cnt), 0)",
+                f"last({last_cast}, last_at)",
+            )
+        case AggregationOperator.MIN:
+            agg = "bool_and(s_min)" if data_type == DataType.BOOL else "MIN(s_min)"
+            return agg, carry
+        case AggregationOperator.MAX:
+            agg = "bool_or(s_max)" if data_type == DataType.BOOL else "MAX(s_max)"
+            return agg, carry
+        case AggregationOperator.FIRST:
+            return "first(s_first, first_at)", carry
+        case AggregationOperator.LAST:
+            return "last(s_last, last_at)", carry
+        case _:
+            msg = f"_component_exprs does not handle operator {op!r}"
+            raise ValueError(msg)
+
+
+def _many_bucketed_query(
+    op: AggregationOperator,
+    data_type: DataType,
+    vc: str,
+    unit: IntervalUnit,
+    rollup_width: int | None = None,
+) -> str:
+    """Bucketed aggregate of every series in ``$5``, gap-filled per series.
+
+    Params: $1 interval, $2 start, $3 end, $4 timezone, $5 series ids. A
+    series with no row in range yields no bucket at all — gapfill only fills
+    groups it has seen — so callers must complete those separately. With
+    *rollup_width*, rows come from :func:`rollups.components_source` instead
+    of the raw points.
+    """
+    end = _end_boundary_for(unit)
+    if rollup_width is None:
+        ts_col = "timestamp"
+        count_expr = "COALESCE(COUNT(timestamp), 0)::int"
+        source = (
+            "ts_data_points AS d\n"
+            "WHERE series_id = ANY($5::text[])\n"
+            "  AND timestamp >= $2::timestamptz\n"
+            f"  AND timestamp < {end}"
+        )
+        if op == AggregationOperator.COUNT:
+            agg_expr, locf_cast = "COALESCE(COUNT(timestamp), 0)::bigint", ""
+        elif op == AggregationOperator.SUM:
+            agg_expr, locf_cast = _sum_expr(data_type, vc), ""
+        else:
+            agg_expr, locf_cast, _ = _locf_parts(op, data_type, vc)
+    else:
+        ts_col = "ts"
+        count_expr = "COALESCE(SUM(cnt), 0)::int"
+        components = _rollups.components_source(
+            data_type,
+            vc,
+            rollup_width,
+            "series_id = ANY($5::text[])",
+            "$2::timestamptz",
+            end,
+        )
+        source = f"(\n{components}\n) AS d"
+        agg_expr, locf_cast = _component_exprs(op, data_type)
+    gapfill = (
+        f"time_bucket_gapfill($1::text::interval, {ts_col},"
+        " start => $2::timestamptz,"
+        " finish => $3::timestamptz,"
+        " timezone => $4)"
+    )
+    if op in {AggregationOperator.COUNT, AggregationOperator.SUM}:
+        return (
+            "SELECT\n"
+            "    series_id,\n"
+            f"    {gapfill} AS bucket,\n"
+            f"    {agg_expr} AS value,\n"
+            f"    {count_expr} AS count\n"
+            f"FROM {source}\n"
+            "GROUP BY series_id, bucket\n"
+            "ORDER BY series_id, bucket"
+        )
+    anchor = _anchor_subquery(op, data_type, vc, "d.series_id", "$2::timestamptz")
+    return (
+        "SELECT series_id, bucket, COALESCE(agg_val, locf_val) AS value,"
+        " cnt AS count\n"
+        "FROM (\n"
+        "    SELECT\n"
+        "        series_id,\n"
+        f"        {gapfill} AS bucket,\n"
+        f"        {agg_expr} AS agg_val,\n"
+        f"        locf({locf_cast},"
+        f" prev => {anchor},"
+        " treat_null_as_missing => true) AS locf_val,\n"
+        f"        {count_expr} AS cnt\n"
+        f"    FROM {source}\n"
+        "    GROUP BY series_id, bucket\n"
+        ") _\n"
+        "ORDER BY series_id, bucket"
+    )
+
+
+def _many_whole_query(
+    op: AggregationOperator,
+    data_type: DataType,
+    vc: str,
+    rollup_width: int | None = None,
+) -> str:
+    """Single-bucket aggregate of every series in ``$3`` over [$1, $2).
+
+    Driven by the id array, so series without points still get their bucket
+    (count 0, value from the anchor where the operator carries one).
+    """
+    if rollup_width is None:
+        count_expr = "COALESCE(COUNT(timestamp), 0)::int"
+        source = (
+            "ts_data_points AS d\n"
+            "  ON d.series_id = s.series_id\n"
+            " AND d.timestamp >= $1::timestamptz\n"
+            " AND d.timestamp < $2::timestamptz"
+        )
+        match op:
+            case AggregationOperator.COUNT:
+                agg_expr = "COALESCE(COUNT(timestamp), 0)::bigint"
+            case AggregationOperator.SUM:
+                agg_expr = _sum_expr(data_type, vc)
+            case _:
+                agg_expr, _, _ = _locf_parts(op, data_type, vc)
+    else:
+        count_expr = "COALESCE(SUM(cnt), 0)::int"
+        components = _rollups.components_source(
+            data_type,
+            vc,
+            rollup_width,
+            "series_id = ANY($3::text[])",
+            "$1::timestamptz",
+            "$2::timestamptz",
+        )
+        source = f"(\n{components}\n) AS d\n  ON d.series_id = s.series_id"
+        agg_expr, _ = _component_exprs(op, data_type)
+    value_expr = agg_expr
+    if op not in {AggregationOperator.COUNT, AggregationOperator.SUM}:
+        anchor = _anchor_subquery(op, data_type, vc, "s.series_id", "$1::timestamptz")
+        value_expr = f"COALESCE({agg_expr}, {anchor})"
+    return (
+        "SELECT\n"
+        "    s.series_id,\n"
+        "    $1::timestamptz AS bucket,\n"
+        f"    {value_expr} AS value,\n"
+        f"    {count_expr} AS count\n"
+        "FROM unnest($3::text[]) AS s(series_id)\n"
+        f"LEFT JOIN {source}\n"
+        "GROUP BY s.series_id"
+    )
+
+
+async def compute_many(  # noqa: PLR0913
+    pool: asyncpg.Pool,
+    series_ids: list[str],
+    data_type: DataType,
+    query: AggregationQuery,
+    value_col: str,
+    rollup_width: int | None = None,
+) -> dict[str, AggregationResult]:
+    """Aggregate many series of one data type in a single statement.
+
+    Only for :data:`MULTI_SERIES_OPERATORS`. Returns results keyed by series
+    id; for bucketed queries, series without any point in range are absent
+    (see :func:`_many_bucketed_query`). *rollup_width* (from
+    :func:`rollups.rollup_width`) reads whole granules from ``ts_rollups``;
+    the caller must have refreshed them.
+    """
+    assert query.start is not None  # noqa: S101
+    assert query.end is not None  # noqa: S101
+    assert_query_resolved(query)
+    assert query.timezone is not None  # noqa: S101
+    op = query.agg
+    result_interval: Interval | Literal["whole"]
+    if query.interval == "whole":
+        result_interval = "whole"
+        sql = _many_whole_query(op, data_type, value_col, rollup_width)
+        rows = await pool.fetch(sql, query.start, query.end, series_ids)
+    else:
+        assert isinstance(query.interval, Interval)  # noqa: S101
+        result_interval = query.interval
+        sql = _many_bucketed_query(
+            op, data_type, value_col, query.interval.unit, rollup_width
+        )
+        rows = await pool.fetch(
+            sql,
+            _to_sql_interval(query.interval),
+            query.start,
+            query.end,
+            query.timezone,
+            series_ids,
+        )
+    points: dict[str, list[AggregatedPoint]] = {}
+    for row in rows:
+        points.setdefault(row["series_id"], []).append(
+            AggregatedPoint(
+                interval_start=row["bucket"], value=row["value"], count=row["count"]
+            )
+        )
+    return {
+        series_id: AggregationResult(
+            interval=result_interval,
+            agg=op,
+            data_type=data_type,
+            timezone=query.timezone,
+            points=series_points,
+        )
+        for series_id, series_points in points.items()
+    }
@@ -0,0 +1,2 @@
+DROP TABLE IF EXISTS ts_rollup_dirty;
+DROP TABLE IF EXISTS ts_rollups;
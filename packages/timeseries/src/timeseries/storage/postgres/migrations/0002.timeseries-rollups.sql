@@ -0,0 +1,47 @@
+-- depends: 0001.timeseries-initial
+
+-- Pre-aggregated components of ts_data_points per fixed-width UTC granule
+-- (see storage/postgres/rollups.py). Columns are typed like the point value
+-- columns; only the set matching the series' data type is filled.
+CREATE TABLE IF NOT EXISTS ts_rollups (
+    series_id      TEXT             NOT NULL REFERENCES ts_series (id) ON DELETE CASCADE,
+    width_seconds  INTEGER          NOT NULL,
+    bucket         TIMESTAMPTZ      NOT NULL,
+    point_count    BIGINT           NOT NULL,
+    sum_integer    BIGINT,
+    sum_float      DOUBLE PRECISION,
+    min_integer    BIGINT,
+    max_integer    BIGINT,
+    min_float      DOUBLE PRECISION,
+    max_float      DOUBLE PRECISION,
+    min_boolean    BOOLEAN,
+    max_boolean    BOOLEAN,
+    first_at       TIMESTAMPTZ      NOT NULL,
+    first_integer  BIGINT,
+    first_float    DOUBLE PRECISION,
+    first_boolean  BOOLEAN,
+    last_at        TIMESTAMPTZ      NOT NULL,
+    last_integer   BIGINT,
+    last_float     DOUBLE PRECISION,
+    last_boolean   BOOLEAN,
+    PRIMARY KEY (series_id, width_seconds, bucket)
+);
+
+-- Finest-width granules whose points changed since their rollups were last
+-- computed. Writers mark them in the same transaction as the points; readers
+-- claim and recompute them before answering from ts_rollups.
+CREATE TABLE IF NOT EXISTS ts_rollup_dirty (
+    series_id  TEXT         NOT NULL REFERENCES ts_series (id) ON DELETE CASCADE,
+    bucket     TIMESTAMPTZ  NOT NULL,
+    marked_at  TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (series_id, bucket)
+);
+
+-- Existing history has no rollups yet: mark all of it, to be computed lazily
+-- by the first query that reads each series.
+INSERT INTO ts_rollup_dirty (series_id, bucket)
+SELECT DISTINCT
+    series_id,
+    to_timestamp(floor(extract(epoch FROM timestamp) / 900) * 900)
+FROM ts_data_points
+ON CONFLICT (series_id, bucket) DO NOTHING;
@@ -0,0 +1,10 @@
+-- depends: 0002.timeseries-rollups
+
+-- Per series, where raw points start after the retention job deleted older
+-- ones (see PostgresStorage.apply_retention). Rollup granules before it are
+-- final: their raw points are gone, so a refresh must not recompute them.
+CREATE TABLE IF NOT EXISTS ts_retention (
+    series_id  TEXT         NOT NULL REFERENCES ts_series (id) ON DELETE CASCADE,
+    raw_from   TIMESTAMPTZ  NOT NULL,
+    PRIMARY KEY (series_id)
+);
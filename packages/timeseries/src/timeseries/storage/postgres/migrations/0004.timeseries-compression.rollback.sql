@@ -0,0 +1,4 @@
+ALTER TABLE ts_series
+    DROP COLUMN IF EXISTS compression_method,
+    DROP COLUMN IF EXISTS compression_deviation,
+    DROP COLUMN IF EXISTS compression_max_interval;
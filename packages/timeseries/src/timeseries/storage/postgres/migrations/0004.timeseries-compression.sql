@@ -0,0 +1,8 @@
+-- depends: 0003.timeseries-retention
+
+-- Compression applied to a float series' points at ingestion (see
+-- timeseries.domain.compression); NULL method: points are stored as written.
+ALTER TABLE ts_series
+    ADD COLUMN IF NOT EXISTS compression_method        TEXT,
+    ADD COLUMN IF NOT EXISTS compression_deviation     DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS compression_max_interval  INTERVAL;
@@ -1,23 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 import asyncpg
 
 from models.errors import InvalidError, NotFoundError
 from timeseries.domain import (
+    Compression,
     DataPoint,
     DataType,
     SeriesKey,
     TimeSeries,
 )
 from timeseries.storage.postgres import aggregate as _agg
+from timeseries.storage.postgres import retention as _retention
+from timeseries.storage.postgres import rollups as _rollups
+from timeseries.storage.protocol import ITER_BATCH_SIZE
 
 if TYPE_CHECKING:
-    from datetime import datetime
+    from collections.abc import AsyncGenerator, Callable
+    from datetime import datetime, timedelta
 
-    from timeseries.domain import AggregationQuery, AggregationResult
+    from timeseries.domain import (
+        AggregationQuery,
+        AggregationResult,
+        RetentionPolicy,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +37,30 @@ _CREATE_HYPERTABLE = (
     "SELECT create_hypertable('ts_data_points', 'timestamp', if_not_exists => TRUE);"
 )
 
+# Native compression, segmented per series so a compressed chunk still reads
+# one series without decompressing the others.
+_ENABLE_COMPRESSION = (
+    "ALTER TABLE ts_data_points SET ("
+    "timescaledb.compress,"
+    " timescaledb.compress_segmentby = 'series_id',"
+    " timescaledb.compress_orderby = 'timestamp')"
+)
+_ADD_COMPRESSION_POLICY = (
+    "SELECT add_compression_policy('ts_data_points', $1::interval,"
+    " if_not_exists => TRUE)"
+)
+
+# rename_series notifies every process sharing the database on this channel,
+# so each keeps its series cache (and the service its compressors) in step.
+_RENAMED_CHANNEL = "ts_series_renamed"
+# Seconds between attempts to listen again after the connection dropped.
+_RELISTEN_DELAY_SECONDS = 5.0
+
+# How many single-series aggregations aggregate_many runs concurrently for
+# the operators it cannot batch. Kept below the pool size (see
+# storage/factory.py) so a wide target never starves ingestion of connections.
+AGGREGATE_FANOUT_LIMIT = 4
+
 _VALUE_COLUMNS: dict[DataType, str] = {
     DataType.INT: "value_integer",
     DataType.FLOAT: "value_float",
@@ -33,13 +69,176 @@ _VALUE_COLUMNS: dict[DataType, str] = {
 }
 
 
+# Per-connection scratch table for bulk ingestion: COPY is the fastest way
+# into postgres but cannot resolve conflicts, so points land here first and
+# are merged into ts_data_points with a single INSERT ... ON CONFLICT.
+_CREATE_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS ts_points_staging
+    (LIKE ts_data_points INCLUDING DEFAULTS)
+    ON COMMIT DELETE ROWS
+"""
+
+_STAGING_COLUMNS = (
+    "series_id",
+    "timestamp",
+    "value_integer",
+    "value_float",
+    "value_boolean",
+    "value_string",
+    "command_id",
+)
+
+_MERGE_STAGING = """
+INSERT INTO ts_data_points
+    (series_id, timestamp, value_integer, value_float, value_boolean,
+     value_string, command_id)
+SELECT series_id, timestamp, value_integer, value_float, value_boolean,
+       value_string, command_id
+FROM ts_points_staging
+ON CONFLICT (series_id, timestamp) DO UPDATE SET
+    value_integer = EXCLUDED.value_integer,
+    value_float = EXCLUDED.value_float,
+    value_boolean = EXCLUDED.value_boolean,
+    value_string = EXCLUDED.value_string,
+    command_id = COALESCE(EXCLUDED.command_id, ts_data_points.command_id)
+"""
+
+_COPY_VALUE_SLOTS: dict[DataType, tuple[int, type]] = {
+    DataType.INT: (2, int),
+    DataType.FLOAT: (3, float),
+    DataType.BOOL: (4, bool),
+    DataType.STRING: (5, str),
+}
+
+
+def _copy_records(
+    series_id: str, data_type: DataType, points: list[DataPoint]
+) -> list[tuple[object, ...]]:
+    """COPY rows for one series, deduplicated by timestamp.
+
+    A timestamp may only appear once per merge (ON CONFLICT cannot touch a
+    row twice), so duplicates collapse the way sequential upserts would:
+    last value wins, and a missing command_id keeps the earlier one.
+    """
+    slot, cast = _COPY_VALUE_SLOTS[data_type]
+    merged: dict[datetime, DataPoint] = {}
+    for point in points:
+        previous = merged.get(point.timestamp)
+        if point.command_id is None and previous is not None:
+            point = DataPoint(point.timestamp, point.value, previous.command_id)  # noqa: PLW2901
+        merged[point.timestamp] = point
+    records: list[tuple[object, ...]] = []
+    for point in merged.values():
+        row: list[object] = [series_id, point.timestamp, None, None, None, None]
+        row[slot] = cast(point.value)
+        row.append(point.command_id)
+        records.append(tuple(row))
+    return records
+
+
 def _series_key_collision(key: SeriesKey) -> InvalidError:
     return InvalidError(f"Series with key {key} already exists")
 
 
+def _compression_columns(
+    compression: Compression | None,
+) -> tuple[str | None, float | None, timedelta | None]:
+    if compression is None:
+        return None, None, None
+    return compression.method.value, compression.deviation, compression.max_interval
+
+
+def _row_compression(row: asyncpg.Record) -> Compression | None:
+    if row["compression_method"] is None:
+        return None
+    return Compression(
+        method=row["compression_method"],
+        deviation=row["compression_deviation"],
+        max_interval=row["compression_max_interval"],
+    )
+
+
+class _SeriesRef(NamedTuple):
+    id: str
+    data_type: DataType
+
+
 class PostgresStorage:
+    """asyncpg-backed storage.
+
+    Resolving a ``SeriesKey`` to its series id and data type is needed by
+    every point read and write, so resolved keys are cached in-process: a
+    series' id and data type never change, and its key only changes through
+    :meth:`rename_series`, which updates the cache. Misses are not cached, so
+    a series created elsewhere is picked up on first use. A rename made by
+    another process reaches this one's cache through :meth:`follow_renames`.
+    """
+
     def __init__(self, pool: asyncpg.Pool) -> None:
         self._pool = pool
+        self._series_refs: dict[SeriesKey, _SeriesRef] = {}
+        self._on_renamed: Callable[[SeriesKey, SeriesKey], None] | None = None
+        self._listener: asyncpg.Connection | None = None
+        self._relisten_task: asyncio.Task[None] | None = None
+
+    async def follow_renames(
+        self, on_renamed: Callable[[SeriesKey, SeriesKey], None] | None = None
+    ) -> None:
+        """Follow the renames other processes sharing the database make.
+
+        Holds one pool connection listening to the notification
+        :meth:`rename_series` sends; the cache moves each renamed key, and
+        *on_renamed* gets the old and the new key. Should that connection
+        drop, renames may be missed: the cache is cleared, and listening
+        resumes on a new connection.
+        """
+        self._on_renamed = on_renamed
+        await self._listen()
+
+    async def _listen(self) -> None:
+        conn = await self._pool.acquire()
+        try:
+            await conn.add_listener(_RENAMED_CHANNEL, self._renamed)
+        except BaseException:
+            await self._pool.release(conn)
+            raise
+        conn.add_termination_listener(self._listener_lost)
+        self._listener = conn
+
+    def _renamed(
+        self, _conn: asyncpg.Connection, _pid: int, _channel: str, payload: str
+    ) -> None:
+        data = json.loads(payload)
+        key = SeriesKey(data["owner_id"], data["metric"])
+        new_key = SeriesKey(data["owner_id"], data["new_metric"])
+        # Already moved when this process made the rename.
+        ref = self._series_refs.pop(key, None)
+        if ref is not None:
+            self._series_refs[new_key] = ref
+        if self._on_renamed is not None:
+            self._on_renamed(key, new_key)
+
+    def _listener_lost(self, conn: asyncpg.Connection) -> None:
+        logger.warning("Lost the series rename listener; clearing the series cache")
+        self._listener = None
+        self._series_refs.clear()
+        self._relisten_task = asyncio.create_task(self._relisten(conn))
+
+    async def _relisten(self, lost: asyncpg.Connection) -> None:
+        await self._pool.release(lost)
+        while True:
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception(
+                    "Cannot listen for series renames; retrying in %.0fs",
+                    _RELISTEN_DELAY_SECONDS,
+                )
+                await asyncio.sleep(_RELISTEN_DELAY_SECONDS)
+            else:
+                # Renames made while nobody listened.
+                self._series_refs.clear()
+                return
 
     async def try_enable_hypertable(self) -> None:
         """Best-effort TimescaleDB hypertable conversion."""
@@ -51,8 +250,47 @@ class PostgresStorage:
                     "TimescaleDB not available — ts_data_points remains a regular table"
                 )
 
-    @staticmethod
-    def _row_to_series(row: asyncpg.Record) -> TimeSeries:
+    async def try_enable_compression(self, after: timedelta) -> None:
+        """Best-effort TimescaleDB compression of chunks older than *after*.
+
+        Needs ``ts_data_points`` to be a hypertable; on plain PostgreSQL the
+        table stays uncompressed.
+        """
+        async with self._pool.acquire() as conn:
+            try:
+                await conn.execute(_ENABLE_COMPRESSION)
+                await conn.execute(_ADD_COMPRESSION_POLICY, after)
+            except asyncpg.PostgresError as e:
+                logger.warning("TimescaleDB compression not enabled: %s", e)
+
+    async def warm_series_cache(self) -> int:
+        """Resolve every stored series key in one query; returns the count."""
+        rows = await self._pool.fetch(
+            "SELECT id, data_type, owner_id, metric FROM ts_series"
+        )
+        for row in rows:
+            self._remember(row)
+        return len(rows)
+
+    def _remember(self, row: asyncpg.Record) -> _SeriesRef:
+        ref = _SeriesRef(row["id"], DataType(row["data_type"]))
+        self._series_refs[SeriesKey(row["owner_id"], row["metric"])] = ref
+        return ref
+
+    async def _resolve(self, key: SeriesKey) -> _SeriesRef | None:
+        ref = self._series_refs.get(key)
+        if ref is not None:
+            return ref
+        row = await self._pool.fetchrow(
+            "SELECT id, data_type, owner_id, metric FROM ts_series "
+            "WHERE owner_id = $1 AND metric = $2",
+            key.owner_id,
+            key.metric,
+        )
+        return self._remember(row) if row else None
+
+    def _row_to_series(self, row: asyncpg.Record) -> TimeSeries:
+        self._remember(row)
         return TimeSeries(
             id=row["id"],
             data_type=DataType(row["data_type"]),
@@ -61,6 +299,7 @@ class PostgresStorage:
             created_at=row["created_at"],
             updated_at=row["updated_at"],
             data_points=[],
+            compression=_row_compression(row),
         )
 
     async def create_series(self, series: TimeSeries) -> TimeSeries:
@@ -68,8 +307,10 @@ class PostgresStorage:
             row = await self._pool.fetchrow(
                 """
                 INSERT INTO ts_series
-                    (id, data_type, owner_id, metric, created_at, updated_at)
-                VALUES ($1, $2, $3, $4, $5, $6)
+                    (id, data_type, owner_id, metric, created_at, updated_at,
+                     compression_method, compression_deviation,
+                     compression_max_interval)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
                 RETURNING *
                 """,
                 series.id,
@@ -78,6 +319,7 @@ class PostgresStorage:
                 series.metric,
                 series.created_at,
                 series.updated_at,
+                *_compression_columns(series.compression),
             )
         except asyncpg.UniqueViolationError as exc:
             if "ts_series_pkey" in str(exc):
@@ -102,6 +344,10 @@ class PostgresStorage:
         )
         return self._row_to_series(row) if row else None
 
+    async def get_series_data_type(self, key: SeriesKey) -> DataType | None:
+        ref = await self._resolve(key)
+        return ref.data_type if ref else None
+
     async def get_series_by_keys(self, keys: list[SeriesKey]) -> list[TimeSeries]:
         """Fetch every series matching *keys* in a single round-trip.
 
@@ -147,18 +393,12 @@ class PostgresStorage:
         rows = await self._pool.fetch(query, *params)
         return [self._row_to_series(r) for r in rows]
 
-    async def fetch_points(
-        self,
-        key: SeriesKey,
-        *,
-        start: datetime | None = None,
-        end: datetime | None = None,
-        limit: int | None = None,
-    ) -> list[DataPoint]:
-        series = await self.get_series_by_key(key)
-        if series is None:
-            return []
-
+    @staticmethod
+    def _points_query(
+        series: _SeriesRef,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> tuple[str, list[object]]:
         value_col = _VALUE_COLUMNS[series.data_type]
 
         clauses = ["series_id = $1"]
@@ -179,8 +419,23 @@ class PostgresStorage:
             f"FROM ts_data_points WHERE {' AND '.join(clauses)} "
             "ORDER BY timestamp ASC"
         )
+        return query, params
+
+    async def fetch_points(
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[DataPoint]:
+        series = await self._resolve(key)
+        if series is None:
+            return []
+
+        query, params = self._points_query(series, start, end)
         if limit is not None:
-            query += f" LIMIT ${idx}"
+            query += f" LIMIT ${len(params) + 1}"
             params.append(limit + 1)
 
         rows = await self._pool.fetch(query, *params)
@@ -191,6 +446,137 @@ class PostgresStorage:
             for r in rows
         ]
 
+    async def fetch_points_minmax(
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        buckets: int,
+    ) -> list[DataPoint]:
+        """First, last, min and max point of *buckets* equal-width time buckets.
+
+        The SQL counterpart of ``domain.downsample.minmax_indices``: only the
+        kept points leave the database.
+        """
+        series = await self._resolve(key)
+        if series is None:
+            return []
+
+        points_query, params = self._points_query(series, start, end)
+        params.append(buckets)
+        query = (
+            f"WITH pts AS ({points_query}), "  # noqa: S608
+            "binned AS ("
+            " SELECT timestamp, value, command_id,"
+            " floor(extract(epoch FROM timestamp - min(timestamp) OVER ())"
+            " / (extract(epoch FROM max(timestamp) OVER () - min(timestamp) OVER ())"
+            f" + 1e-6) * ${len(params)})::int AS bin"
+            " FROM pts), "
+            "ranked AS ("
+            " SELECT timestamp, value, command_id,"
+            " row_number() OVER (PARTITION BY bin ORDER BY timestamp) AS by_first,"
+            " row_number() OVER (PARTITION BY bin ORDER BY timestamp DESC) AS by_last,"
+            " row_number() OVER (PARTITION BY bin ORDER BY value, timestamp) AS by_min,"
+            " row_number() OVER (PARTITION BY bin ORDER BY value DESC, timestamp)"
+            " AS by_max"
+            " FROM binned) "
+            "SELECT timestamp, value, command_id FROM ranked "
+            "WHERE 1 IN (by_first, by_last, by_min, by_max) "
+            "ORDER BY timestamp ASC"
+        )
+        rows = await self._pool.fetch(query, *params)
+        return [
+            DataPoint(
+                timestamp=r["timestamp"], value=r["value"], command_id=r["command_id"]
+            )
+            for r in rows
+        ]
+
+    async def iter_points(
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> AsyncGenerator[list[DataPoint]]:
+        """Yield the points of *key* in time order, *batch_size* at a time.
+
+        Reads through a server-side cursor, so one batch is held at a time.
+        The cursor keeps a pooled connection (and its transaction) until the
+        iterator is exhausted or closed.
+        """
+        series = await self._resolve(key)
+        if series is None:
+            return
+
+        query, params = self._points_query(series, start, end)
+        async with self._pool.acquire() as conn, conn.transaction():
+            cursor = await conn.cursor(query, *params)
+            while rows := await cursor.fetch(batch_size):
+                yield [
+                    DataPoint(
+                        timestamp=r["timestamp"],
+                        value=r["value"],
+                        command_id=r["command_id"],
+                    )
+                    for r in rows
+                ]
+
+    async def iter_points_many(
+        self,
+        keys: list[SeriesKey],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> AsyncGenerator[list[tuple[int, DataPoint]]]:
+        """Yield the points of every series in *keys* in time order, each
+        tagged with the index of its key.
+
+        All series are read through one server-side cursor, so a wide export
+        holds a single pooled connection however many series it covers.
+        """
+        targets: dict[str, list[tuple[int, str]]] = {}
+        for i, key in enumerate(keys):
+            series = await self._resolve(key)
+            if series is not None:
+                value_col = _VALUE_COLUMNS[series.data_type]
+                targets.setdefault(series.id, []).append((i, value_col))
+        if not targets:
+            return
+
+        clauses = ["series_id = ANY($1::text[])"]
+        params: list[object] = [list(targets)]
+        if start is not None:
+            params.append(start)
+            clauses.append(f"timestamp >= ${len(params)}")
+        if end is not None:
+            params.append(end)
+            clauses.append(f"timestamp <= ${len(params)}")
+        query = (
+            "SELECT series_id, timestamp, command_id, value_integer, "  # noqa: S608
+            "value_float, value_boolean, value_string "
+            f"FROM ts_data_points WHERE {' AND '.join(clauses)} "
+            "ORDER BY timestamp ASC, series_id"
+        )
+        async with self._pool.acquire() as conn, conn.transaction():
+            cursor = await conn.cursor(query, *params)
+            while rows := await cursor.fetch(batch_size):
+                yield [
+                    (
+                        i,
+                        DataPoint(
+                            timestamp=r["timestamp"],
+                            value=r[value_col],
+                            command_id=r["command_id"],
+                        ),
+                    )
+                    for r in rows
+                    for i, value_col in targets[r["series_id"]]
+                ]
+
     async def _fetch_raw_point_before(
         self,
         series_id: str,
@@ -216,7 +602,7 @@ class PostgresStorage:
         *,
         before: datetime,
     ) -> DataPoint | None:
-        series = await self.get_series_by_key(key)
+        series = await self._resolve(key)
         if series is None:
             return None
         return await self._fetch_raw_point_before(
@@ -228,7 +614,7 @@ class PostgresStorage:
         key: SeriesKey,
         points: list[DataPoint],
     ) -> None:
-        series = await self.get_series_by_key(key)
+        series = await self._resolve(key)
         if series is None:
             msg = f"No series found for key {key}"
             raise NotFoundError(msg)
@@ -249,25 +635,94 @@ class PostgresStorage:
                 " COALESCE(EXCLUDED.command_id, ts_data_points.command_id)",
                 [(series.id, p.timestamp, p.value, p.command_id) for p in points],
             )
+            await conn.execute(
+                _rollups.MARK_DIRTY, series.id, [p.timestamp for p in points]
+            )
             await conn.execute(
                 "UPDATE ts_series SET updated_at = NOW() WHERE id = $1",
                 series.id,
             )
 
+    async def upsert_points_many(
+        self, points_by_key: dict[SeriesKey, list[DataPoint]]
+    ) -> None:
+        """Upsert points of many series in one transaction.
+
+        Rows are bulk-loaded with ``COPY`` into a temporary staging table,
+        merged into ``ts_data_points`` with one ``INSERT ... ON CONFLICT``,
+        and ``ts_series.updated_at`` is bumped with one ``UPDATE``.
+        """
+        refs: dict[SeriesKey, _SeriesRef] = {}
+        for key in points_by_key:
+            ref = await self._resolve(key)
+            if ref is None:
+                msg = f"No series found for key {key}"
+                raise NotFoundError(msg)
+            refs[key] = ref
+
+        records = [
+            record
+            for key, points in points_by_key.items()
+            for record in _copy_records(refs[key].id, refs[key].data_type, points)
+        ]
+        if not records:
+            return
+        series_ids = [ref.id for key, ref in refs.items() if points_by_key[key]]
+
+        async with self._pool.acquire() as conn, conn.transaction():
+            await conn.execute(_CREATE_STAGING)
+            await conn.copy_records_to_table(
+                "ts_points_staging", records=records, columns=_STAGING_COLUMNS
+            )
+            await conn.execute(_MERGE_STAGING)
+            await conn.execute(_rollups.MARK_DIRTY_FROM_STAGING)
+            await conn.execute(
+                "UPDATE ts_series SET updated_at = NOW() WHERE id = ANY($1::text[])",
+                series_ids,
+            )
+
     async def rename_series(self, key: SeriesKey, new_metric: str) -> TimeSeries | None:
+        """Rename the series of *key*; the other processes hear of it on
+        commit (see :meth:`follow_renames`)."""
+        payload = json.dumps(
+            {"owner_id": key.owner_id, "metric": key.metric, "new_metric": new_metric}
+        )
         try:
-            row = await self._pool.fetchrow(
-                """
-                UPDATE ts_series SET metric = $1, updated_at = NOW()
-                WHERE owner_id = $2 AND metric = $3
-                RETURNING *
-                """,
-                new_metric,
-                key.owner_id,
-                key.metric,
-            )
+            async with self._pool.acquire() as conn, conn.transaction():
+                row = await conn.fetchrow(
+                    """
+                    UPDATE ts_series SET metric = $1, updated_at = NOW()
+                    WHERE owner_id = $2 AND metric = $3
+                    RETURNING *
+                    """,
+                    new_metric,
+                    key.owner_id,
+                    key.metric,
+                )
+                if row is not None:
+                    await conn.execute(
+                        "SELECT pg_notify($1, $2)", _RENAMED_CHANNEL, payload
+                    )
         except asyncpg.UniqueViolationError as exc:
             raise _series_key_collision(SeriesKey(key.owner_id, new_metric)) from exc
+        self._series_refs.pop(key, None)
+        return self._row_to_series(row) if row else None
+
+    async def set_series_compression(
+        self, key: SeriesKey, compression: Compression | None
+    ) -> TimeSeries | None:
+        row = await self._pool.fetchrow(
+            """
+            UPDATE ts_series SET compression_method = $1,
+                compression_deviation = $2, compression_max_interval = $3,
+                updated_at = NOW()
+            WHERE owner_id = $4 AND metric = $5
+            RETURNING *
+            """,
+            *_compression_columns(compression),
+            key.owner_id,
+            key.metric,
+        )
         return self._row_to_series(row) if row else None
 
     async def aggregate(
@@ -275,15 +730,128 @@ class PostgresStorage:
         key: SeriesKey,
         query: AggregationQuery,
     ) -> AggregationResult:
-        series = await self.get_series_by_key(key)
+        series = await self._resolve(key)
         if series is None:
             msg = f"No series found for key {key}"
             raise NotFoundError(msg)
+        if _rollups.rollup_width(query, series.data_type) is not None:
+            [result] = await self._aggregate_refs([series], query)
+            return result
+        return await self._aggregate_raw(series, query)
 
+    async def _aggregate_raw(
+        self, series: _SeriesRef, query: AggregationQuery
+    ) -> AggregationResult:
         assert query.start is not None  # noqa: S101
         value_col = _VALUE_COLUMNS[series.data_type]
         anchor = await self._fetch_raw_point_before(series.id, value_col, query.start)
-        return await _agg.compute(self._pool, series, query, anchor, value_col)
+        return await _agg.compute(
+            self._pool, series.id, series.data_type, query, anchor, value_col
+        )
+
+    async def aggregate_many(
+        self,
+        keys: list[SeriesKey],
+        query: AggregationQuery,
+    ) -> list[AggregationResult]:
+        """Aggregate every series in *keys*, results aligned with *keys*.
+
+        Operators in ``MULTI_SERIES_OPERATORS`` (see the aggregate module)
+        run as one statement over all series, LOCF anchors included, and
+        read pre-aggregated rollups when the query's buckets allow it (see
+        the rollups module). The rest — and bucketed series with no point
+        in range, which gapfill cannot see — fall back to single-series
+        queries, at most ``AGGREGATE_FANOUT_LIMIT`` at a time.
+        """
+        refs: list[_SeriesRef] = []
+        for key in keys:
+            ref = await self._resolve(key)
+            if ref is None:
+                msg = f"No series found for key {key}"
+                raise NotFoundError(msg)
+            refs.append(ref)
+        if not refs:
+            return []
+        data_types = {ref.data_type for ref in refs}
+        if len(data_types) > 1:
+            listed = ", ".join(sorted(dt.value for dt in data_types))
+            msg = f"Cannot aggregate series with mixed data types: {listed}"
+            raise InvalidError(msg)
+        return await self._aggregate_refs(refs, query)
+
+    async def _aggregate_refs(
+        self, refs: list[_SeriesRef], query: AggregationQuery
+    ) -> list[AggregationResult]:
+        data_type = refs[0].data_type
+        series_ids = list(dict.fromkeys(ref.id for ref in refs))
+        batched: dict[str, AggregationResult] = {}
+        if query.agg in _agg.MULTI_SERIES_OPERATORS:
+            width = _rollups.rollup_width(query, data_type)
+            if width is not None:
+                await _rollups.refresh(self._pool, series_ids)
+            batched = await _agg.compute_many(
+                self._pool,
+                series_ids,
+                data_type,
+                query,
+                _VALUE_COLUMNS[data_type],
+                width,
+            )
+
+        semaphore = asyncio.Semaphore(AGGREGATE_FANOUT_LIMIT)
+
+        async def _one(ref: _SeriesRef) -> AggregationResult:
+            result = batched.get(ref.id)
+            if result is not None:
+                return result
+            async with semaphore:
+                return await self._aggregate_raw(ref, query)
+
+        return list(await asyncio.gather(*(_one(ref) for ref in refs)))
+
+    async def apply_retention(
+        self, policy: RetentionPolicy, now: datetime
+    ) -> list[SeriesKey]:
+        """Delete raw points, then rollups, past each series' retention.
+
+        Series sharing a rule are trimmed together (see the retention
+        module for the ordering against rollup refreshes).
+        """
+        rows = await self._pool.fetch("SELECT * FROM ts_series")
+        groups: dict[tuple[datetime, datetime | None], list[TimeSeries]] = {}
+        for row in rows:
+            series = self._row_to_series(row)
+            rule = policy.rule_for(series)
+            if rule is not None:
+                cutoffs = (rule.raw_cutoff(now), rule.rollups_cutoff(now))
+                groups.setdefault(cutoffs, []).append(series)
+
+        trimmed: set[str] = set()
+        for (raw_cutoff, rollups_cutoff), members in groups.items():
+            ids = [s.id for s in members]
+            rolled_up = [s.id for s in members if _rollups.is_rolled_up(s.data_type)]
+            trimmed |= await _retention.trim_raw(self._pool, ids, rolled_up, raw_cutoff)
+            if rollups_cutoff is not None and rolled_up:
+                trimmed |= await _retention.trim_rollups(
+                    self._pool, rolled_up, rollups_cutoff
+                )
+        return [
+            SeriesKey(row["owner_id"], row["metric"])
+            for row in rows
+            if row["id"] in trimmed
+        ]
 
     async def close(self) -> None:
+        if self._relisten_task is not None:
+            self._relisten_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._relisten_task
+            self._relisten_task = None
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            listener.remove_termination_listener(self._listener_lost)
+            with contextlib.suppress(Exception):
+                await listener.remove_listener(_RENAMED_CHANNEL, self._renamed)
+            await self._pool.release(listener)
+        self._series_refs.clear()
         await self._pool.close()
@@ -0,0 +1,96 @@
+"""Retention of ``ts_data_points`` and ``ts_rollups``.
+
+Raw points past a series' raw retention are deleted once their granules are
+folded into ``ts_rollups``: the rollups keep answering the aggregations they
+serve (see the rollups module) until the rollup retention removes them too.
+
+Order matters. Pending dirty granules are refreshed first, then the series'
+``ts_retention.raw_from`` watermark is moved to the cutoff, and only then
+are points deleted. From the watermark on, a refresh leaves the granules
+before it alone instead of recomputing them from the deleted points. A write
+landing before the watermark afterwards is past retention: it is deleted by
+the next run and never reaches the rollups.
+
+Points go in slices of ``DELETE_SLICE`` (one transaction each), so a first
+run on years of history does not hold one huge transaction.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from timeseries.storage.postgres import rollups as _rollups
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+    import asyncpg
+
+DELETE_SLICE = timedelta(days=7)
+
+_ADVANCE_WATERMARK = (
+    "INSERT INTO ts_retention (series_id, raw_from)\n"
+    "SELECT unnest($1::text[]), $2::timestamptz\n"
+    "ON CONFLICT (series_id) DO UPDATE SET\n"
+    "    raw_from = GREATEST(ts_retention.raw_from, EXCLUDED.raw_from)"
+)
+
+_OLDEST_POINT = (
+    "SELECT min(timestamp) FROM ts_data_points WHERE series_id = ANY($1::text[])"
+)
+
+_DELETE_POINTS = (
+    "WITH deleted AS (\n"
+    "    DELETE FROM ts_data_points\n"
+    "    WHERE series_id = ANY($1::text[]) AND timestamp >= $2 AND timestamp < $3\n"
+    "    RETURNING series_id\n"
+    ")\n"
+    "SELECT DISTINCT series_id FROM deleted"
+)
+
+_DELETE_ROLLUPS = (
+    "WITH deleted AS (\n"
+    "    DELETE FROM ts_rollups\n"
+    "    WHERE series_id = ANY($1::text[]) AND bucket < $2\n"
+    "    RETURNING series_id\n"
+    ")\n"
+    "SELECT DISTINCT series_id FROM deleted"
+)
+
+
+async def trim_raw(
+    pool: asyncpg.Pool,
+    series_ids: Sequence[str],
+    rolled_up: Sequence[str],
+    cutoff: datetime,
+) -> set[str]:
+    """Delete the points of *series_ids* before *cutoff*; returns the ids
+    that lost any. *rolled_up* are the ids with rollups to bring up to date
+    first."""
+    if rolled_up:
+        await _rollups.refresh(pool, rolled_up)
+    ids = list(series_ids)
+    async with pool.acquire() as conn, conn.transaction():
+        await conn.execute(_ADVANCE_WATERMARK, ids, cutoff)
+    start = await pool.fetchval(_OLDEST_POINT, ids)
+    trimmed: set[str] = set()
+    while start is not None and start < cutoff:
+        end = min(start + DELETE_SLICE, cutoff)
+        rows = await pool.fetch(_DELETE_POINTS, ids, start, end)
+        trimmed.update(row["series_id"] for row in rows)
+        start = end
+    return trimmed
+
+
+async def trim_rollups(
+    pool: asyncpg.Pool, series_ids: Sequence[str], cutoff: datetime
+) -> set[str]:
+    """Delete the rollups of *series_ids* before *cutoff*; returns the ids
+    that lost any."""
+    rows = await pool.fetch(_DELETE_ROLLUPS, list(series_ids), cutoff)
+    return {row["series_id"] for row in rows}
+
+
+__all__ = ["DELETE_SLICE", "trim_raw", "trim_rollups"]
@@ -0,0 +1,325 @@
+"""Pre-aggregated rollups of ``ts_data_points`` and the query router over them.
+
+``ts_rollups`` holds, per series and fixed-width UTC granule (15 minutes and
+1 hour), the components the simple operators recombine exactly: point count,
+sum, min, max, and the first/last value with their timestamps. A query whose
+buckets are made of whole granules reads those rows instead of the raw
+points; the partial granules at either end of its range still come from
+``ts_data_points``.
+
+Rollups are refreshed incrementally and lazily. Every point write marks the
+finest granules it touched in ``ts_rollup_dirty``, in the same transaction;
+before reading, an aggregation claims the marks of the series it is about to
+read and recomputes just those granules (then the coarser ones containing
+them). Answers are therefore exact, late and out-of-order writes included.
+
+Granules before a series' ``ts_retention.raw_from`` watermark are never
+recomputed: their raw points were deleted by retention (see the retention
+module), so the rollups are all that is left of them.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from itertools import pairwise
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from timeseries.domain import (
+    AggregationOperator,
+    DataType,
+    Interval,
+    IntervalUnit,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+    import asyncpg
+
+    from timeseries.domain import AggregationQuery
+
+# Granule widths, finest first. Each width must divide the next so coarser
+# rollups are computed from finer ones.
+ROLLUP_WIDTHS_SECONDS: tuple[int, ...] = (900, 3600)
+
+ROLLUP_OPERATORS = frozenset(
+    {
+        AggregationOperator.COUNT,
+        AggregationOperator.SUM,
+        AggregationOperator.AVG,
+        AggregationOperator.MIN,
+        AggregationOperator.MAX,
+        AggregationOperator.FIRST,
+        AggregationOperator.LAST,
+    }
+)
+
+_SUFFIXES: dict[DataType, str] = {
+    DataType.INT: "integer",
+    DataType.FLOAT: "float",
+    DataType.BOOL: "boolean",
+}
+
+_SECONDS_PER_UNIT: dict[IntervalUnit, int] = {
+    IntervalUnit.MIN: 60,
+    IntervalUnit.H: 3600,
+}
+
+
+def granule_floor(expr: str, width: int) -> str:
+    """SQL for the start of the *width*-second UTC granule containing *expr*."""
+    return f"to_timestamp(floor(extract(epoch FROM {expr}) / {width}) * {width})"
+
+
+def granule_ceil(expr: str, width: int) -> str:
+    """SQL for the first *width*-second granule boundary at or after *expr*."""
+    return f"to_timestamp(ceil(extract(epoch FROM {expr}) / {width}) * {width})"
+
+
+def is_rolled_up(data_type: DataType) -> bool:
+    return data_type in _SUFFIXES
+
+
+# -- Router ------------------------------------------------------------------
+
+
+def _offsets_aligned(tz: str, start: datetime, end: datetime, width: int) -> bool:
+    """Whether every UTC offset *tz* uses over [start, end] is a whole number
+    of granules, i.e. local bucket boundaries fall on granule boundaries.
+
+    Sampled daily: offsets change at most a few times a year, and each
+    stays in effect far longer than a day.
+    """
+    zone = ZoneInfo(tz)
+    at = start
+    while True:
+        offset = at.astimezone(zone).utcoffset()
+        if offset is None or offset.total_seconds() % width:
+            return False
+        if at >= end:
+            return True
+        at = min(at + timedelta(days=1), end)
+
+
+def _divides(interval: Interval, width: int) -> bool:
+    seconds = _SECONDS_PER_UNIT.get(interval.unit)
+    if seconds is None:
+        # Days and months are made of local midnights: whole granules as
+        # long as the timezone offsets are.
+        return True
+    return (interval.qty * seconds) % width == 0
+
+
+def rollup_width(query: AggregationQuery, data_type: DataType) -> int | None:
+    """Return the coarsest granule width that answers *query* exactly.
+
+    ``None`` when the query must scan raw points: operator or data type not
+    rolled up, or bucket boundaries that do not fall on granule boundaries.
+    """
+    if query.agg not in ROLLUP_OPERATORS or data_type not in _SUFFIXES:
+        return None
+    if query.start is None or query.end is None or query.timezone is None:
+        return None
+    if query.interval == "whole":
+        # One bucket over [start, end): the timezone plays no part.
+        return ROLLUP_WIDTHS_SECONDS[-1]
+    if not isinstance(query.interval, Interval):
+        return None
+    for width in reversed(ROLLUP_WIDTHS_SECONDS):
+        if _divides(query.interval, width) and _offsets_aligned(
+            query.timezone, query.start, query.end, width
+        ):
+            return width
+    return None
+
+
+# -- Query source ------------------------------------------------------------
+
+
+def components_source(  # noqa: PLR0913
+    data_type: DataType,
+    value_col: str,
+    width: int,
+    series_filter: str,
+    start: str,
+    end: str,
+) -> str:
+    """SQL rows of aggregate components over [start, end).
+
+    Columns: ``series_id``, ``ts`` (what to bucket on), ``cnt``, ``s_sum``,
+    ``s_min``, ``s_max``, ``first_at``, ``s_first``, ``last_at``, ``s_last``.
+    Whole granules come from ``ts_rollups``; the points before the first
+    and after the last whole granule come from ``ts_data_points``, one row
+    each.
+    """
+    suffix = _SUFFIXES[data_type]
+    sum_col = "sum_float" if data_type == DataType.FLOAT else "sum_integer"
+    raw_sum = f"{value_col}::int::bigint" if data_type == DataType.BOOL else value_col
+    lo = granule_ceil(start, width)
+    hi = granule_floor(end, width)
+    raw = (
+        f"SELECT series_id, timestamp AS ts, 1 AS cnt, {raw_sum} AS s_sum,"
+        f" {value_col} AS s_min, {value_col} AS s_max,"
+        f" timestamp AS first_at, {value_col} AS s_first,"
+        f" timestamp AS last_at, {value_col} AS s_last\n"
+        "    FROM ts_data_points\n"
+        f"    WHERE {series_filter}\n"
+    )
+    return (
+        f"    SELECT series_id, bucket AS ts, point_count AS cnt, {sum_col} AS s_sum,"
+        f" min_{suffix} AS s_min, max_{suffix} AS s_max,"
+        f" first_at, first_{suffix} AS s_first,"
+        f" last_at, last_{suffix} AS s_last\n"
+        "    FROM ts_rollups\n"
+        f"    WHERE {series_filter}\n"
+        f"      AND width_seconds = {width}\n"
+        f"      AND bucket >= {lo}\n"
+        f"      AND bucket < {hi}\n"
+        "    UNION ALL\n"
+        f"    {raw}"
+        f"      AND timestamp >= {start}\n"
+        f"      AND timestamp < LEAST({lo}, {end})\n"
+        "    UNION ALL\n"
+        f"    {raw}"
+        f"      AND timestamp >= GREATEST({hi}, {lo})\n"
+        f"      AND timestamp < {end}"
+    )
+
+
+# -- Maintenance -------------------------------------------------------------
+
+_BASE_WIDTH = ROLLUP_WIDTHS_SECONDS[0]
+
+_ROLLUP_COLUMNS = (
+    "series_id, width_seconds, bucket, point_count, sum_integer, sum_float,"
+    " min_integer, max_integer, min_float, max_float, min_boolean, max_boolean,"
+    " first_at, first_integer, first_float, first_boolean,"
+    " last_at, last_integer, last_float, last_boolean"
+)
+
+_ON_CONFLICT_UPDATE = (
+    "ON CONFLICT (series_id, width_seconds, bucket) DO UPDATE SET "
+    + (
+        ", ".join(
+            f"{col} = EXCLUDED.{col}"
+            for col in _ROLLUP_COLUMNS.replace(" ", "").split(",")[3:]
+        )
+    )
+)
+
+
+def _first_last(source: str, at: str, order: str) -> str:
+    return ", ".join(
+        f"(array_agg({source}_{s} ORDER BY {at} {order}))[1]"
+        for s in ("integer", "float", "boolean")
+    )
+
+
+# Marks written by point upserts. DO UPDATE rather than DO NOTHING: it locks
+# an existing mark, so a concurrent refresh claiming it waits for this
+# transaction and then recomputes with the new points visible.
+MARK_DIRTY = (
+    "INSERT INTO ts_rollup_dirty (series_id, bucket)\n"
+    f"SELECT DISTINCT $1::text, {granule_floor('ts', _BASE_WIDTH)}\n"
+    "FROM unnest($2::timestamptz[]) AS p(ts)\n"
+    "ON CONFLICT (series_id, bucket) DO UPDATE SET marked_at = NOW()"
+)
+
+MARK_DIRTY_FROM_STAGING = (
+    "INSERT INTO ts_rollup_dirty (series_id, bucket)\n"
+    f"SELECT DISTINCT series_id, {granule_floor('timestamp', _BASE_WIDTH)}\n"
+    "FROM ts_points_staging\n"
+    "ON CONFLICT (series_id, bucket) DO UPDATE SET marked_at = NOW()"
+)
+
+_CLAIM_DIRTY = (
+    "DELETE FROM ts_rollup_dirty WHERE series_id = ANY($1::text[])"
+    " RETURNING series_id, bucket"
+)
+
+_REFRESH_BASE = (
+    f"INSERT INTO ts_rollups ({_ROLLUP_COLUMNS})\n"
+    f"SELECT d.series_id, {_BASE_WIDTH}, g.bucket, COUNT(*),\n"
+    "    SUM(COALESCE(d.value_integer, d.value_boolean::int)), SUM(d.value_float),\n"
+    "    MIN(d.value_integer), MAX(d.value_integer),\n"
+    "    MIN(d.value_float), MAX(d.value_float),\n"
+    "    bool_and(d.value_boolean), bool_or(d.value_boolean),\n"
+    f"    MIN(d.timestamp), {_first_last('d.value', 'd.timestamp', 'ASC')},\n"
+    f"    MAX(d.timestamp), {_first_last('d.value', 'd.timestamp', 'DESC')}\n"
+    "FROM unnest($1::text[], $2::timestamptz[]) AS g(series_id, bucket)\n"
+    "LEFT JOIN ts_retention AS w ON w.series_id = g.series_id\n"
+    "JOIN ts_data_points AS d\n"
+    "  ON d.series_id = g.series_id\n"
+    " AND d.timestamp >= g.bucket\n"
+    f" AND d.timestamp < g.bucket + interval '{_BASE_WIDTH} seconds'\n"
+    "WHERE w.raw_from IS NULL OR g.bucket >= w.raw_from\n"
+    "GROUP BY d.series_id, g.bucket\n"
+    f"{_ON_CONFLICT_UPDATE}"
+)
+
+
+def _refresh_coarse(finer: int, width: int) -> str:
+    """Recompute the *width* granules containing the claimed base granules
+    from the *finer* rollups, which are already up to date."""
+    return (
+        f"WITH touched AS (\n"
+        f"    SELECT DISTINCT series_id, {granule_floor('bucket', width)} AS bucket\n"
+        "    FROM unnest($1::text[], $2::timestamptz[]) AS g(series_id, bucket)\n"
+        ")\n"
+        f"INSERT INTO ts_rollups ({_ROLLUP_COLUMNS})\n"
+        f"SELECT r.series_id, {width}, t.bucket, SUM(r.point_count),\n"
+        "    SUM(r.sum_integer), SUM(r.sum_float),\n"
+        "    MIN(r.min_integer), MAX(r.max_integer),\n"
+        "    MIN(r.min_float), MAX(r.max_float),\n"
+        "    bool_and(r.min_boolean), bool_or(r.max_boolean),\n"
+        f"    MIN(r.first_at), {_first_last('r.first', 'r.first_at', 'ASC')},\n"
+        f"    MAX(r.last_at), {_first_last('r.last', 'r.last_at', 'DESC')}\n"
+        "FROM touched AS t\n"
+        "JOIN ts_rollups AS r\n"
+        "  ON r.series_id = t.series_id\n"
+        f" AND r.width_seconds = {finer}\n"
+        " AND r.bucket >= t.bucket\n"
+        f" AND r.bucket < t.bucket + interval '{width} seconds'\n"
+        "GROUP BY r.series_id, t.bucket\n"
+        f"{_ON_CONFLICT_UPDATE}"
+    )
+
+
+_REFRESH_COARSE = [
+    _refresh_coarse(finer, width) for finer, width in pairwise(ROLLUP_WIDTHS_SECONDS)
+]
+
+
+async def refresh(pool: asyncpg.Pool, series_ids: Sequence[str]) -> int:
+    """Recompute the dirty granules of *series_ids*; returns how many.
+
+    Claiming (deleting) the marks and recomputing happen in one transaction,
+    as separate statements: the recompute then runs on a snapshot taken
+    after any writer whose mark the claim had to wait for committed.
+    """
+    async with pool.acquire() as conn, conn.transaction():
+        claimed = await conn.fetch(_CLAIM_DIRTY, list(series_ids))
+        if not claimed:
+            return 0
+        ids = [row["series_id"] for row in claimed]
+        buckets = [row["bucket"] for row in claimed]
+        await conn.execute(_REFRESH_BASE, ids, buckets)
+        for sql in _REFRESH_COARSE:
+            await conn.execute(sql, ids, buckets)
+    return len(claimed)
+
+
+__all__ = [
+    "MARK_DIRTY",
+    "MARK_DIRTY_FROM_STAGING",
+    "ROLLUP_OPERATORS",
+    "ROLLUP_WIDTHS_SECONDS",
+    "components_source",
+    "granule_ceil",
+    "granule_floor",
+    "is_rolled_up",
+    "refresh",
+    "rollup_width",
+]
@@ -3,16 +3,24 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Protocol
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
     from datetime import datetime
 
     from timeseries.domain import (
         AggregationQuery,
         AggregationResult,
+        Compression,
         DataPoint,
+        DataType,
+        RetentionPolicy,
         SeriesKey,
         TimeSeries,
     )
 
+# Default number of points per batch yielded by ``iter_points`` and
+# ``iter_points_many``.
+ITER_BATCH_SIZE = 5_000
+
 
 class TimeSeriesStorage(Protocol):
     async def create_series(self, series: TimeSeries) -> TimeSeries: ...
@@ -21,6 +29,8 @@ class TimeSeriesStorage(Protocol):
 
     async def get_series_by_key(self, key: SeriesKey) -> TimeSeries | None: ...
 
+    async def get_series_data_type(self, key: SeriesKey) -> DataType | None: ...
+
     async def get_series_by_keys(self, keys: list[SeriesKey]) -> list[TimeSeries]: ...
 
     async def list_series(
@@ -39,6 +49,36 @@ class TimeSeriesStorage(Protocol):
         limit: int | None = None,
     ) -> list[DataPoint]: ...
 
+    async def fetch_points_minmax(
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        buckets: int,
+    ) -> list[DataPoint]: ...
+
+    def iter_points(
+        self,
+        key: SeriesKey,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> AsyncGenerator[list[DataPoint]]: ...
+
+    def iter_points_many(
+        self,
+        keys: list[SeriesKey],
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> AsyncGenerator[list[tuple[int, DataPoint]]]:
+        """Points of every series in *keys* in one time-ordered stream, each
+        tagged with the index of its key."""
+        ...
+
     async def fetch_point_before(
         self,
         key: SeriesKey,
@@ -52,14 +92,34 @@ class TimeSeriesStorage(Protocol):
         points: list[DataPoint],
     ) -> None: ...
 
+    async def upsert_points_many(
+        self, points_by_key: dict[SeriesKey, list[DataPoint]]
+    ) -> None: ...
+
     async def rename_series(
         self, key: SeriesKey, new_metric: str
     ) -> TimeSeries | None: ...
 
+    async def set_series_compression(
+        self, key: SeriesKey, compression: Compression | None
+    ) -> TimeSeries | None: ...
+
     async def aggregate(
         self,
         key: SeriesKey,
         query: AggregationQuery,
     ) -> AggregationResult: ...
 
+    async def aggregate_many(
+        self,
+        keys: list[SeriesKey],
+        query: AggregationQuery,
+    ) -> list[AggregationResult]: ...
+
+    async def apply_retention(
+        self, policy: RetentionPolicy, now: datetime
+    ) -> list[SeriesKey]:
+        """Delete history *policy* no longer keeps; returns the trimmed series."""
+        ...
+
     async def close(self) -> None: ...
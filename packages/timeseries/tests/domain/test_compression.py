@@ -0,0 +1,227 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from models.errors import InvalidError
+from timeseries.domain import (
+    Compression,
+    CompressionMethod,
+    DataPoint,
+    DataType,
+    SeriesCompressor,
+    TimeSeries,
+    interpolated_tw_avgs,
+    parse_compression_policy,
+    validate_compression_data_type,
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+DEADBAND = Compression(method=CompressionMethod.DEADBAND, deviation=0.5)
+SWINGING_DOOR = Compression(method=CompressionMethod.SWINGING_DOOR, deviation=0.5)
+
+
+def _points(
+    values: list[float], step: timedelta = timedelta(minutes=1)
+) -> list[DataPoint]:
+    return [DataPoint(timestamp=T0 + i * step, value=v) for i, v in enumerate(values)]
+
+
+def _random_walk(n: int, seed: int) -> list[DataPoint]:
+    rng = random.Random(seed)  # noqa: S311
+    value, values = 20.0, []
+    for _ in range(n):
+        value += rng.gauss(0, 0.2)
+        values.append(value)
+    return _points(values)
+
+
+def _compress(compression: Compression, points: list[DataPoint]) -> list[DataPoint]:
+    compressor = SeriesCompressor(compression)
+    kept = compressor.feed(points)
+    held = compressor.flush()
+    return [*kept, *([held] if held else [])]
+
+
+def _seconds(points: list[DataPoint]) -> np.ndarray:
+    return np.array([(p.timestamp - T0).total_seconds() for p in points])
+
+
+def _values(points: list[DataPoint]) -> np.ndarray:
+    return np.array([float(p.value) for p in points])
+
+
+class TestCompression:
+    def test_max_interval_parsed(self):
+        compression = Compression.model_validate(
+            {"method": "deadband", "deviation": 0.1, "max_interval": "15min"}
+        )
+        assert compression.max_interval == timedelta(minutes=15)
+
+    @pytest.mark.parametrize("deviation", [0, -1, float("nan"), float("inf")])
+    def test_deviation_must_be_positive_and_finite(self, deviation: float):
+        with pytest.raises(ValidationError):
+            Compression(method=CompressionMethod.DEADBAND, deviation=deviation)
+
+    def test_max_interval_must_be_positive(self):
+        with pytest.raises(ValidationError, match="positive"):
+            Compression.model_validate(
+                {"method": "deadband", "deviation": 1, "max_interval": 0}
+            )
+
+    def test_only_swinging_door_interpolates(self):
+        assert SWINGING_DOOR.interpolates
+        assert not DEADBAND.interpolates
+
+    def test_float_series_only(self):
+        validate_compression_data_type(DataType.FLOAT)
+        with pytest.raises(InvalidError, match="float"):
+            validate_compression_data_type(DataType.INT)
+
+
+class TestCompressionPolicy:
+    def test_first_matching_float_rule_wins(self):
+        policy = parse_compression_policy(
+            '[{"metric": "temp*", "method": "swinging_door", "deviation": 0.1},'
+            ' {"method": "deadband", "deviation": 1}]'
+        )
+
+        def compression_for(
+            metric: str, data_type: DataType = DataType.FLOAT
+        ) -> Compression | None:
+            series = TimeSeries(data_type=data_type, owner_id="d1", metric=metric)
+            return policy.compression_for(series)
+
+        assert compression_for("temperature") == Compression(
+            method=CompressionMethod.SWINGING_DOOR, deviation=0.1
+        )
+        assert compression_for("power") == Compression(
+            method=CompressionMethod.DEADBAND, deviation=1
+        )
+        assert compression_for("power", DataType.INT) is None
+
+    def test_invalid_policy_raises(self):
+        with pytest.raises(InvalidError, match="Invalid compression policy"):
+            parse_compression_policy('[{"method": "zip", "deviation": 1}]')
+
+
+class TestDeadband:
+    def test_keeps_moves_beyond_deviation(self):
+        kept = _compress(DEADBAND, _points([10.0, 10.2, 10.4, 10.6, 10.7, 9.0]))
+        assert [p.value for p in kept] == [10.0, 10.6, 9.0]
+
+    def test_every_dropped_point_within_deviation_of_held_value(self):
+        points = _random_walk(2_000, seed=1)
+        kept = _compress(DEADBAND, points)
+
+        held = _values(kept)[
+            np.searchsorted(_seconds(kept), _seconds(points), "right") - 1
+        ]
+        assert np.all(np.abs(held - _values(points)) <= DEADBAND.deviation)
+        assert len(kept) < len(points) / 2
+
+    def test_keeps_a_point_every_max_interval(self):
+        compression = DEADBAND.model_copy(
+            update={"max_interval": timedelta(minutes=10)}
+        )
+        kept = _compress(compression, _points([1.0] * 31))
+        assert [p.timestamp - T0 for p in kept] == [
+            timedelta(minutes=m) for m in (0, 10, 20, 30)
+        ]
+
+
+class TestSwingingDoor:
+    def test_ramp_keeps_its_ends(self):
+        kept = _compress(SWINGING_DOOR, _points([float(i) for i in range(30)]))
+        assert [p.value for p in kept] == [0.0, 29.0]
+
+    def test_turning_point_kept_and_newest_held(self):
+        compressor = SeriesCompressor(SWINGING_DOOR)
+        values = [0.0, 1.0, 2.0, 3.0, 2.0, 1.0, 0.0]
+
+        kept = compressor.feed(_points(values))
+
+        assert [p.value for p in kept] == [0.0, 3.0]
+        held = compressor.flush()
+        assert held is not None
+        assert held.value == 0.0
+        assert compressor.flush() is None
+
+    def test_held_point_flushed_once_stale(self):
+        compressor = SeriesCompressor(SWINGING_DOOR)
+        points = _points([0.0, 1.0])
+        compressor.feed(points)
+        held_at = points[-1].timestamp
+
+        assert compressor.flush_stale(held_at) is None
+        assert (
+            compressor.flush_stale(held_at + SWINGING_DOOR.max_interval) == points[-1]
+        )
+        assert compressor.flush_stale(held_at + SWINGING_DOOR.max_interval) is None
+
+    def test_every_dropped_point_within_deviation_of_the_lines(self):
+        points = _random_walk(2_000, seed=2)
+        kept = _compress(SWINGING_DOOR, points)
+
+        line = np.interp(_seconds(points), _seconds(kept), _values(kept))
+        assert np.all(np.abs(line - _values(points)) <= SWINGING_DOOR.deviation + 1e-9)
+        assert len(kept) < len(points) / 3
+
+    def test_keeps_a_point_every_max_interval(self):
+        compression = SWINGING_DOOR.model_copy(
+            update={"max_interval": timedelta(minutes=10)}
+        )
+        kept = SeriesCompressor(compression).feed(_points([1.0] * 31))
+        assert [p.timestamp - T0 for p in kept] == [
+            timedelta(minutes=m) for m in (0, 9, 18, 27)
+        ]
+
+    def test_fed_in_batches_as_in_one(self):
+        points = _random_walk(500, seed=3)
+        compressor = SeriesCompressor(SWINGING_DOOR)
+        kept = [p for i in range(0, 500, 7) for p in compressor.feed(points[i : i + 7])]
+        assert kept == SeriesCompressor(SWINGING_DOOR).feed(points)
+
+
+class TestSeriesCompressor:
+    @pytest.mark.parametrize("compression", [DEADBAND, SWINGING_DOOR])
+    def test_out_of_order_points_kept_as_is(self, compression: Compression):
+        compressor = SeriesCompressor(compression)
+        compressor.feed(_points([1.0, 1.0, 1.0]))
+        late = DataPoint(timestamp=T0 + timedelta(seconds=30), value=1.0)
+        assert compressor.feed([late]) == [late]
+
+    @pytest.mark.parametrize("compression", [DEADBAND, SWINGING_DOOR])
+    def test_command_points_always_kept(self, compression: Compression):
+        compressor = SeriesCompressor(compression)
+        compressor.feed(_points([1.0, 1.0]))
+        command = DataPoint(
+            timestamp=T0 + timedelta(minutes=5), value=1.0, command_id=7
+        )
+        assert compressor.feed([command])[-1] == command
+
+
+class TestInterpolatedTwAvgs:
+    def test_averages_the_lines(self):
+        points = _points([0.0, 10.0], step=timedelta(hours=1))
+        windows = [
+            (T0, T0 + timedelta(hours=1)),
+            (T0 + timedelta(minutes=30), T0 + timedelta(hours=1)),
+        ]
+        assert interpolated_tw_avgs(points, windows) == [5.0, 7.5]
+
+    def test_held_flat_outside_the_points(self):
+        points = _points([4.0, 8.0], step=timedelta(hours=1))
+        windows = [
+            (T0 - timedelta(hours=1), T0 + timedelta(hours=1)),
+            (T0 + timedelta(hours=2), T0 + timedelta(hours=3)),
+        ]
+        assert interpolated_tw_avgs(points, windows) == [5.0, 8.0]
+
+    def test_nothing_before_the_first_point(self):
+        points = _points([1.0], step=timedelta(hours=1))
+        windows = [(T0 - timedelta(hours=1), T0), (T0, T0)]
+        assert interpolated_tw_avgs(points, windows) == [None, None]
+        assert interpolated_tw_avgs([], windows) == [None, None]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from models.errors import InvalidError
+from timeseries.domain import DataType, validate_downsample_data_type
+from timeseries.domain.downsample import lttb_indices, minmax_indices
+
+
+def _brute_minmax(x: np.ndarray, y: np.ndarray, buckets: int) -> list[int]:
+    span = x[-1] - x[0] + 1
+    kept: set[int] = set()
+    for b in range(buckets):
+        idx = [i for i in range(len(x)) if (x[i] - x[0]) * buckets // span == b]
+        if idx:
+            kept |= {
+                idx[0],
+                idx[-1],
+                min(idx, key=lambda i: (y[i], i)),
+                min(idx, key=lambda i: (-y[i], i)),
+            }
+    return sorted(kept)
+
+
+class TestLttb:
+    def test_small_input_kept_whole(self):
+        x = np.arange(5)
+        assert lttb_indices(x, x, 10).tolist() == [0, 1, 2, 3, 4]
+
+    def test_keeps_threshold_points_with_both_ends(self):
+        rng = np.random.default_rng(0)
+        x = np.arange(1_000)
+        kept = lttb_indices(x, rng.normal(size=1_000), 50)
+        assert len(kept) == 50
+        assert kept[0] == 0
+        assert kept[-1] == 999
+        assert np.all(np.diff(kept) > 0)
+
+    def test_keeps_a_lone_spike(self):
+        y = np.zeros(1_000)
+        y[437] = 100.0
+        assert 437 in lttb_indices(np.arange(1_000), y, 20)
+
+
+class TestMinmax:
+    def test_small_input_kept_whole(self):
+        x = np.arange(8)
+        assert minmax_indices(x, x, 2).tolist() == list(range(8))
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        x = np.cumsum(rng.integers(1, 1_000, size=2_000))
+        y = rng.integers(0, 50, size=2_000).astype(float)
+        assert minmax_indices(x, y, 37).tolist() == _brute_minmax(x, y, 37)
+
+
+class TestValidateDataType:
+    def test_string_rejected(self):
+        with pytest.raises(InvalidError, match="numeric or boolean"):
+            validate_downsample_data_type(DataType.STRING)
+
+    @pytest.mark.parametrize("data_type", [DataType.FLOAT, DataType.INT, DataType.BOOL])
+    def test_numeric_accepted(self, data_type: DataType):
+        validate_downsample_data_type(data_type)
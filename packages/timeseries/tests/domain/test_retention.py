@@ -0,0 +1,70 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from models.errors import InvalidError
+from timeseries.domain import (
+    DataType,
+    RetentionPolicy,
+    RetentionRule,
+    TimeSeries,
+    parse_retention_policy,
+)
+
+
+def _series(metric: str, data_type: DataType = DataType.FLOAT) -> TimeSeries:
+    return TimeSeries(data_type=data_type, owner_id="d1", metric=metric)
+
+
+class TestRetentionRule:
+    def test_durations_parsed(self):
+        rule = RetentionRule.model_validate({"raw": "90d", "rollups": "24mo"})
+        assert rule.raw == timedelta(days=90)
+        assert rule.rollups == timedelta(days=720)
+
+    def test_rollups_shorter_than_raw_rejected(self):
+        with pytest.raises(ValidationError, match="cannot be shorter"):
+            RetentionRule.model_validate({"raw": "90d", "rollups": "30d"})
+
+    def test_raw_below_an_hour_rejected(self):
+        with pytest.raises(ValidationError, match="at least 1h"):
+            RetentionRule.model_validate({"raw": "30min"})
+
+    def test_matches_metric_pattern_and_data_type(self):
+        rule = RetentionRule.model_validate(
+            {"metric": "power_*", "data_type": "float", "raw": "1d"}
+        )
+        assert rule.matches(_series("power_l1"))
+        assert not rule.matches(_series("power_l1", DataType.INT))
+        assert not rule.matches(_series("temperature"))
+
+    def test_cutoffs_floored_to_the_hour(self):
+        rule = RetentionRule.model_validate({"raw": "1d", "rollups": "2d"})
+        now = datetime(2026, 1, 10, 12, 34, 56, tzinfo=UTC)
+        assert rule.raw_cutoff(now) == datetime(2026, 1, 9, 12, tzinfo=UTC)
+        assert rule.rollups_cutoff(now) == datetime(2026, 1, 8, 12, tzinfo=UTC)
+
+    def test_no_rollups_cutoff_when_kept_forever(self):
+        rule = RetentionRule.model_validate({"raw": "1d"})
+        assert rule.rollups_cutoff(datetime(2026, 1, 1, tzinfo=UTC)) is None
+
+
+class TestRetentionPolicy:
+    def test_first_matching_rule_wins(self):
+        policy = parse_retention_policy(
+            '[{"metric": "power_*", "raw": "1d"}, {"raw": "90d"}]'
+        )
+        assert policy.rule_for(_series("power_l1")) == policy.rules[0]
+        assert policy.rule_for(_series("temperature")) == policy.rules[1]
+
+    def test_no_match_keeps_everything(self):
+        policy = RetentionPolicy(
+            rules=(RetentionRule.model_validate({"metric": "power_*", "raw": "1d"}),)
+        )
+        assert policy.rule_for(_series("temperature")) is None
+
+    @pytest.mark.parametrize("spec", ["not json", '[{"raw": "soon"}]', '{"raw": "1d"}'])
+    def test_invalid_spec_raises(self, spec: str):
+        with pytest.raises(InvalidError, match="Invalid retention policy"):
+            parse_retention_policy(spec)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from timeseries.domain import DataPoint
+from timeseries.exporters.rows import merge_rows
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+pytestmark = pytest.mark.asyncio
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+async def _stream(*batches: list[DataPoint]) -> AsyncIterator[list[DataPoint]]:
+    for batch in batches:
+        yield batch
+
+
+def _pt(seconds: float, value: float) -> DataPoint:
+    return DataPoint(timestamp=T0 + timedelta(seconds=seconds), value=value)
+
+
+async def _rows(
+    *streams: AsyncIterator[list[DataPoint]], timezone: str = "UTC"
+) -> list[tuple[str, list]]:
+    return [
+        (ts.isoformat(), values)
+        async for ts, values in merge_rows(streams, timezone=timezone)
+    ]
+
+
+class TestMergeRows:
+    async def test_no_streams(self):
+        assert await _rows() == []
+
+    async def test_interleaves_across_batches_with_locf(self):
+        a = _stream([_pt(0, 1.0)], [_pt(20, 3.0)])
+        b = _stream([], [_pt(10, 2.0)])
+        assert await _rows(a, b) == [
+            ("2024-01-01T00:00:00+00:00", [1.0, None]),
+            ("2024-01-01T00:00:10+00:00", [1.0, 2.0]),
+            ("2024-01-01T00:00:20+00:00", [3.0, 2.0]),
+        ]
+
+    async def test_points_within_one_second_share_a_row(self):
+        a = _stream([_pt(0.1, 1.0), _pt(0.9, 2.0)])
+        b = _stream([_pt(0.5, 5.0)])
+        assert await _rows(a, b) == [("2024-01-01T00:00:00+00:00", [2.0, 5.0])]
+
+    async def test_timestamps_localized(self):
+        rows = await _rows(_stream([_pt(0, 1.0)]), timezone="Europe/Paris")
+        assert rows == [("2024-01-01T01:00:00+01:00", [1.0])]
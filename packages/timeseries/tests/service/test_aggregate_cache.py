@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from timeseries.domain import (
+    AggregatedPoint,
+    AggregationOperator,
+    AggregationQuery,
+    AggregationResult,
+    DataPoint,
+    DataType,
+    Interval,
+    SeriesKey,
+)
+from timeseries.service import TimeSeriesService
+from timeseries.service.aggregate_cache import AggregateCache
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+KEY = SeriesKey(owner_id="d1", metric="temp")
+HOUR = Interval.model_validate("1h")
+
+
+def _query(start: datetime, end: datetime) -> AggregationQuery:
+    return AggregationQuery(
+        agg=AggregationOperator.AVG,
+        interval=HOUR,
+        start=start,
+        end=end,
+        timezone="UTC",
+    )
+
+
+def _result(hours: list[int]) -> AggregationResult:
+    return AggregationResult(
+        interval=HOUR,
+        agg=AggregationOperator.AVG,
+        data_type=DataType.FLOAT,
+        timezone="UTC",
+        points=[
+            AggregatedPoint(
+                interval_start=T0 + timedelta(hours=h), value=float(h), count=1
+            )
+            for h in hours
+        ],
+    )
+
+
+def _starts(hit_points: list[AggregatedPoint]) -> list[int]:
+    return [int((p.interval_start - T0) / timedelta(hours=1)) for p in hit_points]
+
+
+class TestAggregateCache:
+    def test_invalid_size_rejected(self):
+        with pytest.raises(ValueError, match="max_buckets"):
+            AggregateCache(0)
+
+    def test_keeps_closed_buckets_only(self):
+        cache = AggregateCache()
+        query = _query(T0, T0 + timedelta(hours=3, minutes=30))
+        cache.store([KEY], query, [_result([0, 1, 2, 3])], cache.mark())
+
+        hit = cache.lookup([KEY], _query(T0, T0 + timedelta(hours=4)))
+
+        assert hit is not None
+        assert _starts(hit.points[0]) == [0, 1, 2]
+        assert hit.tail_start == T0 + timedelta(hours=3)
+        assert cache.size == 3
+
+    def test_cut_short_first_bucket_not_kept(self):
+        cache = AggregateCache()
+        query = _query(T0 + timedelta(minutes=30), T0 + timedelta(hours=3))
+        cache.store([KEY], query, [_result([0, 1, 2])], cache.mark())
+
+        hit = cache.lookup(
+            [KEY], _query(T0 + timedelta(hours=1), T0 + timedelta(hours=4))
+        )
+
+        assert hit is not None
+        assert _starts(hit.points[0]) == [1]
+
+    def test_lookup_reports_head_to_compute(self):
+        cache = AggregateCache()
+        cache.store([KEY], _query(T0, T0 + timedelta(hours=3)), [_result([0, 1, 2])], 0)
+
+        hit = cache.lookup(
+            [KEY], _query(T0 + timedelta(minutes=20), T0 + timedelta(hours=5))
+        )
+
+        assert hit is not None
+        assert hit.head_end == T0 + timedelta(hours=1)
+        assert _starts(hit.points[0]) == [1]
+
+    def test_miss_when_query_ends_inside_cached_range(self):
+        cache = AggregateCache()
+        cache.store([KEY], _query(T0, T0 + timedelta(hours=3)), [_result([0, 1, 2])], 0)
+        assert cache.lookup([KEY], _query(T0, T0 + timedelta(hours=1))) is None
+
+    def test_write_truncates_from_its_bucket(self):
+        cache = AggregateCache()
+        cache.store(
+            [KEY], _query(T0, T0 + timedelta(hours=5)), [_result([0, 1, 2, 3, 4])], 0
+        )
+
+        cache.invalidate(KEY, T0 + timedelta(hours=2, minutes=10))
+
+        hit = cache.lookup([KEY], _query(T0, T0 + timedelta(hours=5)))
+        assert hit is not None
+        assert _starts(hit.points[0]) == [0, 1]
+        assert hit.tail_start == T0 + timedelta(hours=2)
+
+    def test_write_before_entry_drops_it(self):
+        cache = AggregateCache()
+        cache.store([KEY], _query(T0, T0 + timedelta(hours=3)), [_result([0, 1, 2])], 0)
+        cache.invalidate(KEY, T0 - timedelta(minutes=1))
+        assert cache.size == 0
+
+    def test_result_computed_before_a_write_is_not_stored(self):
+        cache = AggregateCache()
+        since = cache.mark()
+        cache.invalidate(KEY, T0)
+        cache.store(
+            [KEY], _query(T0, T0 + timedelta(hours=3)), [_result([0, 1, 2])], since
+        )
+        assert cache.size == 0
+
+    def test_adjacent_results_merge(self):
+        cache = AggregateCache()
+        cache.store([KEY], _query(T0, T0 + timedelta(hours=3)), [_result([0, 1, 2])], 0)
+        later = _query(T0 + timedelta(hours=2), T0 + timedelta(hours=5))
+        cache.store([KEY], later, [_result([2, 3, 4])], 0)
+
+        hit = cache.lookup([KEY], _query(T0, T0 + timedelta(hours=6)))
+
+        assert hit is not None
+        assert _starts(hit.points[0]) == [0, 1, 2, 3]
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = AggregateCache(max_buckets=3)
+        other = SeriesKey(owner_id="d2", metric="temp")
+        query = _query(T0, T0 + timedelta(hours=3))
+        cache.store([KEY], query, [_result([0, 1, 2])], 0)
+        cache.store([other], query, [_result([0, 1, 2])], 0)
+
+        assert cache.lookup([KEY], query) is None
+        assert cache.size == 2
+
+
+@pytest_asyncio.fixture
+async def services() -> AsyncIterator[tuple[TimeSeriesService, TimeSeriesService]]:
+    cached = TimeSeriesService()
+    uncached = TimeSeriesService(aggregate_cache_size=0)
+    await cached.start()
+    await uncached.start()
+    yield cached, uncached
+    await cached.stop()
+    await uncached.stop()
+
+
+@pytest.mark.asyncio
+class TestServiceCache:
+    @pytest.mark.parametrize(
+        "agg",
+        [
+            AggregationOperator.COUNT,
+            AggregationOperator.AVG,
+            AggregationOperator.LAST,
+            AggregationOperator.DELTA,
+            AggregationOperator.TW_AVG,
+        ],
+    )
+    async def test_matches_uncached_across_refreshes_and_late_writes(
+        self,
+        services: tuple[TimeSeriesService, TimeSeriesService],
+        agg: AggregationOperator,
+    ):
+        rng = random.Random(agg.value)  # noqa: S311
+        for service in services:
+            await service.create_series(
+                data_type=DataType.FLOAT, owner_id="d1", metric="temp"
+            )
+        now = T0 + timedelta(hours=6)
+        for step in range(30):
+            minute = rng.randrange(0, 60 * 6 + step * 5)
+            point = DataPoint(
+                timestamp=T0 + timedelta(minutes=minute), value=rng.uniform(0, 10)
+            )
+            for service in services:
+                await service.upsert_points(KEY, [point])
+            now += timedelta(minutes=5)
+            query = AggregationQuery(
+                agg=agg,
+                interval=HOUR,
+                start=now - timedelta(hours=6, minutes=rng.choice([0, 7])),
+                end=now,
+            )
+            with patch("timeseries.service.service._utcnow", return_value=now):
+                got, want = [await s.get_aggregate(KEY, query) for s in services]
+            assert got.points == want.points
+
+    async def test_refresh_reads_only_the_tail(
+        self, services: tuple[TimeSeriesService, TimeSeriesService]
+    ):
+        service, _ = services
+        await service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temp"
+        )
+        await service.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=T0 + timedelta(minutes=m), value=1.0)
+                for m in range(0, 600, 10)
+            ],
+        )
+        query = AggregationQuery(
+            agg=AggregationOperator.AVG,
+            interval=HOUR,
+            start=T0,
+            end=T0 + timedelta(hours=9, minutes=30),
+        )
+        await service.get_aggregate(KEY, query)
+
+        backend = service._backend  # noqa: SLF001
+        with patch.object(backend, "aggregate", wraps=backend.aggregate) as spy:
+            result = await service.get_aggregate(KEY, query)
+
+        [call] = spy.await_args_list
+        assert call.args[1].start == T0 + timedelta(hours=9)
+        assert len(result.points) == 10
+
+    async def test_space_aggregation_served_from_cache(
+        self, services: tuple[TimeSeriesService, TimeSeriesService]
+    ):
+        service, _ = services
+        other = SeriesKey(owner_id="d2", metric="temp")
+        for key in (KEY, other):
+            await service.upsert_points(
+                key,
+                [
+                    DataPoint(timestamp=T0 + timedelta(hours=h), value=float(h))
+                    for h in range(5)
+                ],
+                create_if_not_found=True,
+            )
+        query = AggregationQuery(
+            agg=AggregationOperator.AVG,
+            interval=HOUR,
+            start=T0,
+            end=T0 + timedelta(hours=4, minutes=30),
+        )
+        first = await service.get_aggregate_many(
+            [KEY, other], query, AggregationOperator.SUM
+        )
+
+        backend = service._backend  # noqa: SLF001
+        with patch.object(
+            backend, "aggregate_many", wraps=backend.aggregate_many
+        ) as spy:
+            second = await service.get_aggregate_many(
+                [KEY, other], query, AggregationOperator.SUM
+            )
+
+        [call] = spy.await_args_list
+        assert call.args[1].start == T0 + timedelta(hours=4)
+        assert second.points == first.points
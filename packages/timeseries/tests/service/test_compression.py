@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from models.errors import InvalidError, NotFoundError
+from timeseries.domain import (
+    AggregationOperator,
+    AggregationQuery,
+    Compression,
+    CompressionMethod,
+    DataPoint,
+    DataType,
+    Interval,
+    SeriesKey,
+    parse_compression_policy,
+)
+from timeseries.service import TimeSeriesService
+from timeseries.service import service as service_module
+
+pytestmark = pytest.mark.asyncio
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+KEY = SeriesKey(owner_id="d1", metric="temp")
+DEADBAND = Compression(method=CompressionMethod.DEADBAND, deviation=0.5)
+SWINGING_DOOR = Compression(
+    method=CompressionMethod.SWINGING_DOOR,
+    deviation=0.5,
+    max_interval=timedelta(hours=3),
+)
+
+
+def _minutes(values: list[float]) -> list[DataPoint]:
+    return [
+        DataPoint(timestamp=T0 + timedelta(minutes=i), value=v)
+        for i, v in enumerate(values)
+    ]
+
+
+# Up one per minute for an hour, then flat for an hour.
+RAMP_THEN_FLAT = _minutes([float(min(i, 60)) for i in range(120)])
+
+
+def _hourly(agg: AggregationOperator) -> AggregationQuery:
+    return AggregationQuery(
+        agg=agg,
+        interval=Interval.model_validate("1h"),
+        start=T0,
+        end=T0 + timedelta(hours=2),
+        timezone="UTC",
+    )
+
+
+class TestCompressedWrites:
+    async def test_deadband_drops_small_moves(self, ts_service: TimeSeriesService):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temp", compression=DEADBAND
+        )
+        await ts_service.upsert_points(KEY, _minutes([10.0, 10.2, 10.4, 10.6, 9.0]))
+
+        stored = (await ts_service.fetch_points(KEY)).points
+        assert [p.value for p in stored] == [10.0, 10.6, 9.0]
+
+    async def test_compression_stored_on_series(self, ts_service: TimeSeriesService):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temp", compression=DEADBAND
+        )
+        series = await ts_service.get_series_by_key(KEY)
+        assert series is not None
+        assert series.compression == DEADBAND
+
+    async def test_swinging_door_keeps_turning_points(
+        self, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await ts_service.upsert_points_many({KEY: RAMP_THEN_FLAT})
+
+        stored = (await ts_service.fetch_points(KEY)).points
+        assert [(p.timestamp - T0, p.value) for p in stored] == [
+            (timedelta(0), 0.0),
+            (timedelta(minutes=60), 60.0),
+        ]
+
+    async def test_only_float_series_compress(self, ts_service: TimeSeriesService):
+        with pytest.raises(InvalidError, match="float"):
+            await ts_service.create_series(
+                data_type=DataType.INT,
+                owner_id="d1",
+                metric="count",
+                compression=DEADBAND,
+            )
+
+    async def test_policy_applies_to_new_series(self):
+        policy = parse_compression_policy(
+            '[{"metric": "te*", "method": "deadband", "deviation": 0.5}]'
+        )
+        service = TimeSeriesService(compression=policy)
+        await service.start()
+        try:
+            other = SeriesKey(owner_id="d1", metric="power")
+            for key in (KEY, other):
+                await service.upsert_points(
+                    key, _minutes([1.0, 1.1, 1.2]), create_if_not_found=True
+                )
+
+            assert len((await service.fetch_points(KEY)).points) == 1
+            assert len((await service.fetch_points(other)).points) == 3
+            series = await service.get_series_by_key(KEY)
+            assert series is not None
+            assert series.compression == DEADBAND
+        finally:
+            await service.stop()
+
+
+class TestSetCompression:
+    async def test_releases_held_point_and_stops(self, ts_service: TimeSeriesService):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await ts_service.upsert_points(KEY, RAMP_THEN_FLAT[:30])
+
+        series = await ts_service.set_compression(KEY, None)
+        await ts_service.upsert_points(KEY, RAMP_THEN_FLAT[30:33])
+
+        assert series.compression is None
+        stored = (await ts_service.fetch_points(KEY)).points
+        assert [p.value for p in stored] == [0.0, 29.0, 30.0, 31.0, 32.0]
+
+    async def test_unknown_series(self, ts_service: TimeSeriesService):
+        with pytest.raises(NotFoundError):
+            await ts_service.set_compression(KEY, DEADBAND)
+
+    async def test_held_points_written_on_stop(self):
+        service = TimeSeriesService()
+        await service.start()
+        await service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await service.upsert_points(KEY, RAMP_THEN_FLAT)
+        backend = service._backend  # noqa: SLF001
+
+        with patch.object(
+            backend, "upsert_points_many", wraps=backend.upsert_points_many
+        ) as spy:
+            await service.stop()
+
+        spy.assert_awaited_once_with({KEY: [RAMP_THEN_FLAT[-1]]})
+
+
+class TestStaleHeldPoints:
+    async def test_last_change_of_a_flat_signal_is_stored(self):
+        service = TimeSeriesService(ingest_flush_interval=0.01)
+        await service.start()
+        try:
+            await service.create_series(
+                data_type=DataType.FLOAT,
+                owner_id="d1",
+                metric="temp",
+                compression=Compression(
+                    method=CompressionMethod.SWINGING_DOOR,
+                    deviation=0.5,
+                    max_interval=timedelta(minutes=5),
+                ),
+            )
+            # Then no change for 10 minutes, so no point to release 25.0.
+            start = datetime.now(UTC) - timedelta(minutes=10)
+            await service.upsert_points(
+                KEY,
+                [
+                    DataPoint(timestamp=start, value=20.0),
+                    DataPoint(timestamp=start + timedelta(seconds=10), value=25.0),
+                ],
+            )
+            await asyncio.sleep(0.1)
+
+            stored = (await service.fetch_points(KEY)).points
+            assert [p.value for p in stored] == [20.0, 25.0]
+        finally:
+            await service.stop()
+
+
+class TestRenamedElsewhere:
+    async def test_held_point_goes_to_the_renamed_series(
+        self, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await ts_service.upsert_points(KEY, RAMP_THEN_FLAT[:30])
+        new_key = SeriesKey(owner_id="d1", metric="temperature")
+        # Renamed by another process sharing the database.
+        await ts_service._backend.rename_series(KEY, new_key.metric)  # noqa: SLF001
+
+        ts_service._series_renamed(KEY, new_key)  # noqa: SLF001
+        await ts_service.flush_ingestion()
+
+        stored = (await ts_service.fetch_points(new_key)).points
+        assert [p.value for p in stored] == [0.0, 29.0]
+
+
+class TestFailedWrites:
+    async def test_points_retried_after_a_failed_write_are_stored(self):
+        service = TimeSeriesService()
+        await service.start()
+        await service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        points = _minutes([0.0, 1.0, 0.0])
+        await service.upsert_points_many({KEY: points[:2]})
+        backend = service._backend  # noqa: SLF001
+
+        with (
+            patch.object(
+                backend, "upsert_points_many", side_effect=RuntimeError("db down")
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            await service.upsert_points_many({KEY: points[2:]})
+        await service.upsert_points_many({KEY: points[2:]})
+        await service.set_compression(KEY, None)
+
+        stored = (await service.fetch_points(KEY)).points
+        assert [(p.timestamp, p.value) for p in stored] == [
+            (p.timestamp, p.value) for p in points
+        ]
+        await service.stop()
+
+    async def test_held_point_kept_when_its_release_fails(self):
+        service = TimeSeriesService()
+        await service.start()
+        await service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await service.upsert_points(KEY, RAMP_THEN_FLAT)
+        backend = service._backend  # noqa: SLF001
+
+        with (
+            patch.object(
+                backend, "upsert_points_many", side_effect=RuntimeError("db down")
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            await service.set_compression(KEY, None)
+        await service.set_compression(KEY, None)
+
+        stored = (await service.fetch_points(KEY)).points
+        assert stored[-1] == RAMP_THEN_FLAT[-1]
+        await service.stop()
+
+
+class TestInterpolatedTwAvg:
+    async def test_swinging_door_series_joined_by_lines(
+        self, ts_service: TimeSeriesService
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await ts_service.upsert_points(KEY, RAMP_THEN_FLAT)
+
+        result = await ts_service.get_aggregate(
+            KEY, _hourly(AggregationOperator.TW_AVG)
+        )
+
+        assert [(p.value, p.count) for p in result.points] == [(30.0, 1), (60.0, 1)]
+
+    async def test_whole_interval(self, ts_service: TimeSeriesService):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await ts_service.upsert_points(KEY, RAMP_THEN_FLAT)
+        query = _hourly(AggregationOperator.TW_AVG).model_copy(
+            update={"interval": "whole"}
+        )
+
+        result = await ts_service.get_aggregate(KEY, query)
+
+        assert [p.value for p in result.points] == [45.0]
+
+    async def test_other_series_still_held(self, ts_service: TimeSeriesService):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await ts_service.upsert_points(KEY, RAMP_THEN_FLAT)
+        plain = SeriesKey(owner_id="d2", metric="temp")
+        await ts_service.upsert_points(
+            plain,
+            [RAMP_THEN_FLAT[0], RAMP_THEN_FLAT[60]],
+            create_if_not_found=True,
+        )
+
+        result = await ts_service.get_aggregate_many(
+            [KEY, plain], _hourly(AggregationOperator.TW_AVG), AggregationOperator.AVG
+        )
+
+        # The plain series holds 0.0 for the first hour under LOCF.
+        assert [p.value for p in result.points] == [15.0, 60.0]
+
+    async def test_points_read_are_capped(
+        self, ts_service: TimeSeriesService, monkeypatch: pytest.MonkeyPatch
+    ):
+        await ts_service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id="d1",
+            metric="temp",
+            compression=SWINGING_DOOR,
+        )
+        await ts_service.upsert_points(KEY, RAMP_THEN_FLAT)
+        monkeypatch.setattr(service_module, "MAX_INTERPOLATED_POINTS", 1)
+
+        with pytest.raises(InvalidError, match="narrow the time range"):
+            await ts_service.get_aggregate(KEY, _hourly(AggregationOperator.TW_AVG))
@@ -300,6 +300,33 @@ class TestExportCsvErrors:
         with pytest.raises(NotFoundError):
             await service.export_csv(["nonexistent"])
 
+    async def test_stream_raises_before_first_chunk(self, service: TimeSeriesService):
+        with pytest.raises(NotFoundError):
+            await service.stream_csv(["nonexistent"])
+
+
+class TestStreamCsv:
+    async def test_chunks_join_to_full_export(self, service: TimeSeriesService):
+        series = await service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temp"
+        )
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await service.upsert_points(
+            series.key,
+            [
+                DataPoint(timestamp=base + timedelta(minutes=i), value=float(i))
+                for i in range(200)
+            ],
+        )
+
+        with patch("timeseries.exporters.csv.CHUNK_SIZE", 1024):
+            chunks = [c async for c in await service.stream_csv([series.id])]
+
+        assert len(chunks) > 1
+        header, rows = parse_csv("".join(chunks))
+        assert header == ["timestamp", "temp"]
+        assert [r[1] for r in rows] == [str(float(i)) for i in range(200)]
+
 
 class TestExportCsvTruncation:
     async def test_truncation_marker_appended_when_series_exceeds_limit(
@@ -315,7 +342,7 @@ class TestExportCsvTruncation:
         ]
         await service.upsert_points(series.key, pts)
 
-        with patch("timeseries.service.service.MAX_RAW_LIMIT", 3):
+        with patch("timeseries.service.service.MAX_EXPORT_POINTS", 3):
             result = await service.export_csv([series.id])
 
         assert "# truncated to 3 points" in result
@@ -330,3 +357,59 @@ class TestExportCsvTruncation:
         await service.upsert_points(series.key, [DataPoint(timestamp=t1, value=1.0)])
         result = await service.export_csv([series.id])
         assert "#" not in result
+
+    async def test_each_series_capped_on_its_own(self, service: TimeSeriesService):
+        long = await service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temp"
+        )
+        short = await service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="hum"
+        )
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await service.upsert_points(
+            long.key,
+            [
+                DataPoint(timestamp=base + timedelta(minutes=i), value=float(i))
+                for i in range(5)
+            ],
+        )
+        await service.upsert_points(
+            short.key, [DataPoint(timestamp=base + timedelta(minutes=4), value=9.0)]
+        )
+
+        with patch("timeseries.service.service.MAX_EXPORT_POINTS", 3):
+            result = await service.export_csv([long.id, short.id])
+
+        _, rows = parse_csv(result.split("\n#")[0])
+        assert [r[1:] for r in rows] == [
+            ["0.0", ""],
+            ["1.0", ""],
+            ["2.0", ""],
+            ["2.0", "9.0"],
+        ]
+        assert "# truncated to 4 points" in result
+
+
+class TestExportCsvReads:
+    async def test_all_series_read_through_one_stream(self, service: TimeSeriesService):
+        backend = service._backend  # noqa: SLF001
+        all_series = [
+            await service.create_series(
+                data_type=DataType.FLOAT, owner_id="d1", metric=metric
+            )
+            for metric in ("temp", "hum", "co2")
+        ]
+        t1 = datetime(2026, 1, 1, tzinfo=UTC)
+        for value, series in enumerate(all_series):
+            await service.upsert_points(
+                series.key, [DataPoint(timestamp=t1, value=float(value))]
+            )
+
+        with patch.object(
+            backend, "iter_points_many", wraps=backend.iter_points_many
+        ) as iter_many:
+            result = await service.export_csv([s.id for s in all_series])
+
+        iter_many.assert_called_once()
+        assert iter_many.call_args.args[0] == [s.key for s in all_series]
+        assert parse_csv(result)[1] == [[t1.isoformat(), "0.0", "1.0", "2.0"]]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import io
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+import pytest_asyncio
+
+from models.errors import NotFoundError
+from timeseries.domain import DataPoint, DataType
+from timeseries.service import TimeSeriesService
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+pytestmark = pytest.mark.asyncio
+
+T1 = datetime(2024, 1, 1, 0, tzinfo=UTC)
+T2 = datetime(2024, 1, 1, 1, tzinfo=UTC)
+
+
+@pytest_asyncio.fixture
+async def service() -> AsyncIterator[TimeSeriesService]:
+    service = TimeSeriesService(storage_url=None)
+    await service.start()
+    yield service
+    await service.stop()
+
+
+def _read(content: bytes) -> pl.DataFrame:
+    return pl.read_parquet(io.BytesIO(content))
+
+
+class TestExportParquet:
+    async def test_typed_columns_with_locf(self, service: TimeSeriesService):
+        temp = await service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temperature"
+        )
+        mode = await service.create_series(
+            data_type=DataType.STRING, owner_id="d1", metric="mode"
+        )
+        await service.upsert_points(temp.key, [DataPoint(timestamp=T1, value=20.5)])
+        await service.upsert_points(mode.key, [DataPoint(timestamp=T2, value="eco")])
+
+        frame = _read(await service.export_parquet([temp.id, mode.id]))
+
+        assert frame.schema == pl.Schema(
+            {
+                "timestamp": pl.Datetime("us", time_zone="UTC"),
+                "d1/temperature": pl.Float64(),
+                "d1/mode": pl.String(),
+            }
+        )
+        assert frame.rows() == [(T1, 20.5, None), (T2, 20.5, "eco")]
+
+    async def test_empty_export_keeps_schema(self, service: TimeSeriesService):
+        series = await service.create_series(
+            data_type=DataType.INT, owner_id="d1", metric="count"
+        )
+        frame = _read(await service.export_parquet([series.id]))
+        assert frame.columns == ["timestamp", "d1/count"]
+        assert frame.height == 0
+
+    async def test_truncation_recorded_in_metadata(self, service: TimeSeriesService):
+        series = await service.create_series(
+            data_type=DataType.FLOAT, owner_id="d1", metric="temp"
+        )
+        await service.upsert_points(
+            series.key,
+            [
+                DataPoint(timestamp=T1 + timedelta(minutes=i), value=float(i))
+                for i in range(5)
+            ],
+        )
+        with patch("timeseries.service.service.MAX_EXPORT_POINTS", 3):
+            content = await service.export_parquet([series.id])
+
+        assert _read(content).height == 3
+        metadata = pl.read_parquet_metadata(io.BytesIO(content))
+        assert metadata["truncated_to"] == "3"
+
+    async def test_unknown_series_id_raises(self, service: TimeSeriesService):
+        with pytest.raises(NotFoundError):
+            await service.export_parquet(["nonexistent"])
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+
+from models.errors import InvalidError
+from timeseries.domain import DataPoint, SeriesKey
+from timeseries.service.ingestion import (
+    INGEST_REPLAY_BATCHES_PER_FLUSH,
+    IngestionBuffer,
+)
+from timeseries.service.spool import IngestionSpool
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+A = SeriesKey(owner_id="d1", metric="temp")
+B = SeriesKey(owner_id="d2", metric="temp")
+
+
+def _point(offset: int, value: float = 1.0) -> DataPoint:
+    return DataPoint(timestamp=T0 + timedelta(seconds=offset), value=value)
+
+
+def _batches(sink: AsyncMock) -> list[dict[SeriesKey, list[DataPoint]]]:
+    return [call.args[0] for call in sink.await_args_list]
+
+
+def test_invalid_settings_rejected():
+    with pytest.raises(ValueError, match="flush_interval"):
+        IngestionBuffer(AsyncMock(), flush_interval=0)
+    with pytest.raises(ValueError, match="max_batch_size"):
+        IngestionBuffer(AsyncMock(), max_batch_size=0)
+    with pytest.raises(ValueError, match="max_pending"):
+        IngestionBuffer(AsyncMock(), max_batch_size=10, max_pending=5)
+
+
+@pytest.mark.asyncio
+class TestIngestionBuffer:
+    async def test_one_sink_call_across_series(self):
+        sink = AsyncMock()
+        buffer = IngestionBuffer(sink)
+        buffer.add(A, [_point(0)])
+        buffer.add(B, [_point(0)])
+        buffer.add(A, [_point(1)])
+
+        await buffer.flush()
+
+        [batch] = _batches(sink)
+        assert batch == {A: [_point(0), _point(1)], B: [_point(0)]}
+        assert buffer.pending_count == 0
+
+    async def test_flushes_when_batch_size_reached(self):
+        sink = AsyncMock()
+        buffer = IngestionBuffer(sink, flush_interval=60, max_batch_size=2)
+        await buffer.start()
+        try:
+            buffer.add(A, [_point(0), _point(1)])
+            await asyncio.sleep(0.01)
+            assert len(_batches(sink)) == 1
+        finally:
+            await buffer.stop()
+
+    async def test_stop_drains_pending(self):
+        sink = AsyncMock()
+        buffer = IngestionBuffer(sink, flush_interval=60)
+        await buffer.start()
+        buffer.add(A, [_point(0)])
+
+        await buffer.stop()
+
+        assert _batches(sink) == [{A: [_point(0)]}]
+
+    async def test_stop_mid_write_keeps_the_batch(self):
+        writing = asyncio.Event()
+
+        async def _hang_once(_batch: dict[SeriesKey, list[DataPoint]]) -> None:
+            if not writing.is_set():
+                writing.set()
+                await asyncio.sleep(60)
+
+        sink = AsyncMock(side_effect=_hang_once)
+        buffer = IngestionBuffer(sink, flush_interval=60, max_batch_size=1)
+        await buffer.start()
+        buffer.add(A, [_point(0)])
+        await writing.wait()
+
+        await buffer.stop()
+
+        assert _batches(sink) == [{A: [_point(0)]}, {A: [_point(0)]}]
+        assert buffer.pending_count == 0
+
+    async def test_storage_failure_requeues_in_order(self):
+        sink = AsyncMock(side_effect=[RuntimeError("db down"), None])
+        buffer = IngestionBuffer(sink)
+        buffer.add(A, [_point(0)])
+        await buffer.flush()
+        buffer.add(A, [_point(1)])
+
+        await buffer.flush()
+
+        assert _batches(sink)[-1] == {A: [_point(0), _point(1)]}
+
+    async def test_requeue_beyond_backlog_drops_batch(self):
+        sink = AsyncMock(side_effect=RuntimeError("db down"))
+        buffer = IngestionBuffer(sink, max_batch_size=1, max_pending=1)
+        buffer.add(A, [_point(0), _point(1)])
+
+        await buffer.flush()
+
+        assert buffer.pending_count == 0
+
+    async def test_invalid_batch_retried_per_series(self):
+        async def _sink(batch: dict[SeriesKey, list[DataPoint]]) -> None:
+            if A in batch:
+                msg = "Expected float, got str"
+                raise InvalidError(msg)
+
+        sink = AsyncMock(side_effect=_sink)
+        buffer = IngestionBuffer(sink)
+        buffer.add(A, [_point(0)])
+        buffer.add(B, [_point(0)])
+
+        await buffer.flush()
+
+        assert _batches(sink)[1:] == [{A: [_point(0)]}, {B: [_point(0)]}]
+        assert buffer.pending_count == 0
+
+
+@pytest.mark.asyncio
+class TestIngestionSpooling:
+    @pytest_asyncio.fixture
+    async def spool(self, tmp_path: Path) -> AsyncIterator[IngestionSpool]:
+        spool = IngestionSpool(tmp_path / "spool.db")
+        await spool.open()
+        yield spool
+        await spool.close()
+
+    async def test_failed_batch_spooled_then_replayed(self, spool: IngestionSpool):
+        sink = AsyncMock(side_effect=[RuntimeError("db down"), None, None])
+        buffer = IngestionBuffer(sink, spool=spool)
+        buffer.add(A, [_point(0)])
+        await buffer.flush()
+
+        assert buffer.pending_count == 0
+        assert spool.points == 1
+
+        buffer.add(B, [_point(1)])
+        await buffer.flush()
+
+        assert _batches(sink)[1:] == [{B: [_point(1)]}, {A: [_point(0)]}]
+        assert spool.points == 0
+
+    async def test_stalled_write_times_out_into_spool(self, spool: IngestionSpool):
+        async def _stall(_batch: dict[SeriesKey, list[DataPoint]]) -> None:
+            await asyncio.sleep(60)
+
+        buffer = IngestionBuffer(
+            AsyncMock(side_effect=_stall), write_timeout=0.01, spool=spool
+        )
+        buffer.add(A, [_point(0)])
+
+        await buffer.flush()
+
+        assert spool.points == 1
+
+    async def test_failed_replay_stays_spooled(self, spool: IngestionSpool):
+        await spool.append({A: [_point(0)]})
+        sink = AsyncMock(side_effect=RuntimeError("db down"))
+        buffer = IngestionBuffer(sink, spool=spool)
+
+        await buffer.flush()
+
+        assert sink.await_count == 1
+        assert spool.points == 1
+
+    async def test_replay_bounded_per_flush(self, spool: IngestionSpool):
+        for i in range(INGEST_REPLAY_BATCHES_PER_FLUSH + 1):
+            await spool.append({A: [_point(i)]})
+        sink = AsyncMock()
+        buffer = IngestionBuffer(sink, max_batch_size=1, max_pending=1, spool=spool)
+
+        await buffer.flush()
+
+        assert sink.await_count == INGEST_REPLAY_BATCHES_PER_FLUSH
+        assert spool.points == 1
+
+    async def test_full_spool_drops_and_counts(self, tmp_path: Path):
+        spool = IngestionSpool(tmp_path / "spool.db", max_points=1)
+        await spool.open()
+        buffer = IngestionBuffer(
+            AsyncMock(side_effect=RuntimeError("db down")), spool=spool
+        )
+        buffer.add(A, [_point(0), _point(1)])
+
+        await buffer.flush()
+
+        stats = buffer.stats()
+        assert stats.dropped_points == 2
+        assert stats.spooled_points == 0
+        await spool.close()
+
+    async def test_stats_report_spool_age(self, spool: IngestionSpool):
+        await spool.append({A: [_point(0)]})
+        buffer = IngestionBuffer(AsyncMock(), spool=spool)
+        buffer.add(B, [_point(0)])
+
+        stats = buffer.stats()
+
+        assert stats.pending_points == 1
+        assert stats.spooled_points == 1
+        assert stats.spool_age_seconds is not None
+        assert stats.spool_age_seconds >= 0
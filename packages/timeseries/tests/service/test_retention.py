@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from timeseries.domain import (
+    AggregationOperator,
+    AggregationQuery,
+    DataPoint,
+    Interval,
+    SeriesKey,
+    parse_retention_policy,
+)
+from timeseries.service import TimeSeriesService
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+pytestmark = pytest.mark.asyncio
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+KEY = SeriesKey(owner_id="d1", metric="temp")
+POLICY = parse_retention_policy('[{"raw": "2d"}]')
+
+
+async def _fill(service: TimeSeriesService) -> None:
+    await service.upsert_points(
+        KEY,
+        [DataPoint(timestamp=T0 + timedelta(days=d), value=float(d)) for d in range(5)],
+        create_if_not_found=True,
+    )
+
+
+@pytest_asyncio.fixture
+async def service() -> AsyncIterator[TimeSeriesService]:
+    service = TimeSeriesService(retention=POLICY, retention_interval=3600)
+    # Keep the background run from racing the tests' own calls.
+    with patch.object(TimeSeriesService, "_retention_loop", return_value=None):
+        await service.start()
+    yield service
+    await service.stop()
+
+
+class TestApplyRetention:
+    async def test_without_policy_keeps_everything(self):
+        service = TimeSeriesService()
+        await service.start()
+        try:
+            await _fill(service)
+            assert await service.apply_retention(T0 + timedelta(days=30)) == []
+            assert len((await service.fetch_points(KEY)).points) == 5
+        finally:
+            await service.stop()
+
+    async def test_trims_past_raw_retention(self, service: TimeSeriesService):
+        await _fill(service)
+
+        trimmed = await service.apply_retention(T0 + timedelta(days=4))
+
+        assert trimmed == [KEY]
+        fetched = await service.fetch_points(KEY)
+        assert [p.value for p in fetched.points] == [2.0, 3.0, 4.0]
+
+    async def test_forgets_cached_aggregates(self, service: TimeSeriesService):
+        await _fill(service)
+        query = AggregationQuery(
+            agg=AggregationOperator.COUNT,
+            interval=Interval.model_validate("1d"),
+            start=T0,
+            end=T0 + timedelta(days=4, hours=12),
+        )
+        now = T0 + timedelta(days=4, hours=12)
+        with patch("timeseries.service.service._utcnow", return_value=now):
+            before = await service.get_aggregate(KEY, query)
+            await service.apply_retention(now)
+            after = await service.get_aggregate(KEY, query)
+
+        assert [p.value for p in before.points[:2]] == [1, 1]
+        assert [p.value for p in after.points[:2]] == [0, 0]
+
+
+class TestRetentionJob:
+    async def test_runs_periodically_once_started(self):
+        service = TimeSeriesService(retention=POLICY, retention_interval=0.01)
+        with patch(
+            "timeseries.service.service._utcnow", return_value=T0 + timedelta(days=4)
+        ):
+            await service.start()
+            try:
+                await _fill(service)
+                await asyncio.sleep(0.05)
+                assert len((await service.fetch_points(KEY)).points) == 3
+            finally:
+                await service.stop()
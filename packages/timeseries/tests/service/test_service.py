@@ -2,14 +2,17 @@ from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
 
 from models.errors import InvalidError, NotFoundError
 from timeseries.domain import (
+    MIN_DOWNSAMPLE_POINTS,
     DataPoint,
     DataType,
+    DownsampleMethod,
     FetchPointsResult,
     SeriesKey,
 )
@@ -309,6 +312,92 @@ class TestUpsertPoints:
             )
 
 
+class TestUpsertPointsMany:
+    async def test_writes_every_series(self, service: TimeSeriesService):
+        now = datetime.now(tz=UTC)
+        other = SeriesKey(owner_id="s2", metric="temperature")
+        await service.upsert_points_many(
+            {
+                KEY: [DataPoint(timestamp=now, value=1.0)],
+                other: [DataPoint(timestamp=now, value=2.0)],
+            },
+            create_if_not_found=True,
+        )
+        assert (await service.fetch_points(KEY)).points[0].value == 1.0
+        assert (await service.fetch_points(other)).points[0].value == 2.0
+
+    async def test_invalid_series_rejects_whole_call(self, service: TimeSeriesService):
+        await service.create_series(
+            data_type=DataType.FLOAT, owner_id=KEY.owner_id, metric=KEY.metric
+        )
+        other = SeriesKey(owner_id="s2", metric="temperature")
+        now = datetime.now(tz=UTC)
+        with pytest.raises(InvalidError, match="Expected float"):
+            await service.upsert_points_many(
+                {
+                    other: [DataPoint(timestamp=now, value=2.0)],
+                    KEY: [DataPoint(timestamp=now, value="bad")],
+                },
+                create_if_not_found=True,
+            )
+        assert (await service.fetch_points(other)).points == []
+
+
+class TestEnqueuePoints:
+    async def test_points_written_on_flush(self, service: TimeSeriesService):
+        now = datetime.now(tz=UTC)
+        service.enqueue_points(KEY, [DataPoint(timestamp=now, value=1.0)])
+        service.enqueue_points(
+            KEY, [DataPoint(timestamp=now + timedelta(seconds=1), value=2.0)]
+        )
+        assert await service.get_series_by_key(KEY) is None
+
+        await service.flush_ingestion()
+
+        result = await service.fetch_points(KEY)
+        assert [p.value for p in result.points] == [1.0, 2.0]
+
+    async def test_stop_drains_queue(self):
+        service = TimeSeriesService(storage_url=None, ingest_flush_interval=60)
+        await service.start()
+        storage = service._backend  # noqa: SLF001
+        service.enqueue_points(
+            KEY, [DataPoint(timestamp=datetime.now(tz=UTC), value=1)]
+        )
+        await service.stop()
+        assert len(await storage.fetch_points(KEY)) == 1
+
+    async def test_invalid_series_does_not_block_others(
+        self, service: TimeSeriesService
+    ):
+        await service.create_series(
+            data_type=DataType.FLOAT, owner_id=KEY.owner_id, metric=KEY.metric
+        )
+        other = SeriesKey(owner_id="s2", metric="temperature")
+        now = datetime.now(tz=UTC)
+        service.enqueue_points(KEY, [DataPoint(timestamp=now, value="bad")])
+        service.enqueue_points(other, [DataPoint(timestamp=now, value=2.0)])
+
+        await service.flush_ingestion()
+
+        assert (await service.fetch_points(KEY)).points == []
+        assert len((await service.fetch_points(other)).points) == 1
+
+    async def test_naive_timestamp_rejected_immediately(
+        self, service: TimeSeriesService
+    ):
+        naive = datetime(2026, 1, 1, 10, 0, 0)  # noqa: DTZ001
+        with pytest.raises(InvalidError, match="timezone-aware"):
+            service.enqueue_points(KEY, [DataPoint(timestamp=naive, value=1.0)])
+
+    async def test_unsupported_value_rejected_immediately(
+        self, service: TimeSeriesService
+    ):
+        now = datetime.now(tz=UTC)
+        with pytest.raises(InvalidError, match="Unsupported value type"):
+            service.enqueue_points(KEY, [DataPoint(timestamp=now, value=None)])  # ty: ignore[invalid-argument-type]
+
+
 class TestFetchPoints:
     async def test_with_time_range(self, service: TimeSeriesService):
         await service.create_series(
@@ -566,3 +655,90 @@ class TestFetchPointsTruncation:
         assert result.truncated is True
         assert result.points[0].value == 99.0
         assert result.next_start == pts[2].timestamp
+
+
+class TestFetchPointsDownsampled:
+    async def _setup(self, service: TimeSeriesService, n: int) -> list[DataPoint]:
+        await service.create_series(
+            data_type=DataType.FLOAT,
+            owner_id=KEY.owner_id,
+            metric=KEY.metric,
+        )
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        points = [
+            DataPoint(timestamp=base + timedelta(minutes=i), value=float(i % 10))
+            for i in range(n)
+        ]
+        points[123] = DataPoint(timestamp=points[123].timestamp, value=1000.0)
+        await service.upsert_points(KEY, points)
+        return points
+
+    @pytest.mark.parametrize("method", list(DownsampleMethod))
+    async def test_caps_points_and_keeps_the_spike(
+        self, service: TimeSeriesService, method: DownsampleMethod
+    ):
+        pts = await self._setup(service, 1_000)
+        result = await service.fetch_points(KEY, max_points=40, downsample=method)
+        assert 0 < len(result.points) <= 40
+        assert result.points[0] == pts[0]
+        assert result.points[-1] == pts[-1]
+        assert 1000.0 in [p.value for p in result.points]
+        assert result.truncated is False
+
+    async def test_carry_forward_takes_a_slot(self, service: TimeSeriesService):
+        pts = await self._setup(service, 1_000)
+        result = await service.fetch_points(
+            KEY, start=pts[500].timestamp, carry_forward=True, max_points=10
+        )
+        assert len(result.points) == 10
+        assert result.points[0] == DataPoint(
+            timestamp=pts[500].timestamp, value=pts[499].value
+        )
+
+    @pytest.mark.parametrize("method", list(DownsampleMethod))
+    @pytest.mark.parametrize("carry_forward", [False, True])
+    async def test_smallest_max_points_honoured(
+        self,
+        service: TimeSeriesService,
+        method: DownsampleMethod,
+        carry_forward: bool,
+    ):
+        pts = await self._setup(service, 1_000)
+        result = await service.fetch_points(
+            KEY,
+            # First, min, max and last all distinct: a full minmax bucket.
+            start=pts[501].timestamp,
+            carry_forward=carry_forward,
+            max_points=MIN_DOWNSAMPLE_POINTS,
+            downsample=method,
+        )
+        assert len(result.points) == MIN_DOWNSAMPLE_POINTS - (not carry_forward)
+        assert result.points[-1] == pts[-1]
+
+    async def test_lttb_range_beyond_raw_limit_truncated(
+        self, service: TimeSeriesService
+    ):
+        pts = await self._setup(service, 200)
+        with patch("timeseries.service.service.MAX_RAW_LIMIT", 100):
+            result = await service.fetch_points(KEY, max_points=10)
+        assert result.truncated is True
+        assert result.next_start == pts[100].timestamp
+
+    async def test_limit_and_max_points_exclusive(self, service: TimeSeriesService):
+        with pytest.raises(InvalidError, match="mutually exclusive"):
+            await service.fetch_points(KEY, limit=10, max_points=10)
+
+    @pytest.mark.parametrize("bad", [MIN_DOWNSAMPLE_POINTS - 1, MAX_RAW_LIMIT + 1])
+    async def test_invalid_max_points_raises(
+        self, service: TimeSeriesService, bad: int
+    ):
+        await self._setup(service, 200)
+        with pytest.raises(InvalidError, match="max_points must be between"):
+            await service.fetch_points(KEY, max_points=bad)
+
+    async def test_string_series_rejected(self, service: TimeSeriesService):
+        await service.create_series(
+            data_type=DataType.STRING, owner_id=KEY.owner_id, metric=KEY.metric
+        )
+        with pytest.raises(InvalidError, match="numeric or boolean"):
+            await service.fetch_points(KEY, max_points=10)
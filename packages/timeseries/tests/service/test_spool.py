@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from timeseries.domain import DataPoint, SeriesKey
+from timeseries.service import TimeSeriesService
+from timeseries.service.spool import IngestionSpool
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.asyncio
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+A = SeriesKey(owner_id="d1", metric="temp")
+B = SeriesKey(owner_id="d2", metric="state")
+
+
+def _point(offset: int, value: float = 1.0) -> DataPoint:
+    return DataPoint(timestamp=T0 + timedelta(seconds=offset), value=value)
+
+
+class TestIngestionSpool:
+    async def test_invalid_size_rejected(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="max_points"):
+            IngestionSpool(tmp_path / "spool.db", max_points=0)
+
+    async def test_use_before_open_raises(self, tmp_path: Path):
+        spool = IngestionSpool(tmp_path / "spool.db")
+        with pytest.raises(RuntimeError, match="open"):
+            await spool.peek(10)
+
+    async def test_round_trip_keeps_value_types(self, tmp_path: Path):
+        spool = IngestionSpool(tmp_path / "spool.db")
+        await spool.open()
+        batch = {
+            A: [_point(0, 1.0), DataPoint(timestamp=T0, value=2, command_id=7)],
+            B: [
+                DataPoint(timestamp=T0, value=True),
+                DataPoint(timestamp=T0, value="on"),
+            ],
+        }
+        assert await spool.append(batch)
+
+        _, peeked = await spool.peek(10)
+
+        assert peeked == batch
+        assert [type(p.value) for p in peeked[A] + peeked[B]] == [float, int, bool, str]
+        await spool.close()
+
+    async def test_peek_oldest_first_and_delete_through(self, tmp_path: Path):
+        spool = IngestionSpool(tmp_path / "spool.db")
+        await spool.open()
+        await spool.append({A: [_point(0), _point(1)]})
+        await spool.append({A: [_point(2)]})
+
+        last_id, peeked = await spool.peek(2)
+        await spool.delete_through(last_id)
+
+        assert peeked == {A: [_point(0), _point(1)]}
+        assert spool.points == 1
+        assert (await spool.peek(10))[1] == {A: [_point(2)]}
+        await spool.close()
+
+    async def test_survives_reopen(self, tmp_path: Path):
+        spool = IngestionSpool(tmp_path / "spool.db")
+        await spool.open()
+        await spool.append({A: [_point(0)]})
+        await spool.close()
+
+        reopened = IngestionSpool(tmp_path / "spool.db")
+        await reopened.open()
+
+        assert reopened.points == 1
+        assert reopened.oldest is not None
+        assert (await reopened.peek(10))[1] == {A: [_point(0)]}
+        await reopened.close()
+
+    async def test_full_spool_refuses_batch(self, tmp_path: Path):
+        spool = IngestionSpool(tmp_path / "spool.db", max_points=2)
+        await spool.open()
+        assert await spool.append({A: [_point(0)]})
+
+        assert not await spool.append({A: [_point(1), _point(2)]})
+        assert spool.points == 1
+        await spool.close()
+
+    async def test_oldest_cleared_when_emptied(self, tmp_path: Path):
+        spool = IngestionSpool(tmp_path / "spool.db")
+        await spool.open()
+        await spool.append({A: [_point(0)]})
+        assert spool.oldest is not None
+
+        last_id, _ = await spool.peek(10)
+        await spool.delete_through(last_id)
+
+        assert spool.points == 0
+        assert spool.oldest is None
+        await spool.close()
+
+
+class TestServiceSpool:
+    async def test_points_left_by_a_previous_run_are_replayed(self, tmp_path: Path):
+        path = tmp_path / "spool.db"
+        spool = IngestionSpool(path)
+        await spool.open()
+        await spool.append({A: [_point(0), _point(1)]})
+        await spool.close()
+
+        service = TimeSeriesService(spool_path=str(path))
+        await service.start()
+        try:
+            assert service.ingestion_stats().spooled_points == 2
+            await service.flush_ingestion()
+
+            fetched = await service.fetch_points(A)
+            assert fetched.points == [_point(0), _point(1)]
+            assert service.ingestion_stats().spooled_points == 0
+        finally:
+            await service.stop()
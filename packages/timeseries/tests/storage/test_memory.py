@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -8,11 +9,14 @@ from models.errors import InvalidError, NotFoundError
 from timeseries.domain import (
     AggregationOperator,
     AggregationQuery,
+    Compression,
+    CompressionMethod,
     DataPoint,
     DataType,
     Interval,
     SeriesKey,
     TimeSeries,
+    parse_retention_policy,
 )
 from timeseries.storage import MemoryStorage
 
@@ -82,6 +86,15 @@ class TestGetSeries:
         assert await storage.get_series_by_key(other) is None
 
 
+class TestGetSeriesDataType:
+    async def test_known_key(self, storage):
+        await storage.create_series(_make_series(data_type=DataType.INT))
+        assert await storage.get_series_data_type(KEY) == DataType.INT
+
+    async def test_unknown_key(self, storage):
+        assert await storage.get_series_data_type(KEY) is None
+
+
 class TestListSeries:
     async def test_empty(self, storage: MemoryStorage):
         assert await storage.list_series() == []
@@ -201,6 +214,36 @@ class TestUpsertPoints:
         assert fetched[0].command_id == 10
 
 
+class TestSetSeriesCompression:
+    COMPRESSION = Compression(
+        method=CompressionMethod.SWINGING_DOOR,
+        deviation=0.25,
+        max_interval=timedelta(minutes=30),
+    )
+
+    async def test_compression_round_trips(self, storage: MemoryStorage):
+        await storage.create_series(
+            replace(_make_series(), compression=self.COMPRESSION)
+        )
+        series = await storage.get_series_by_key(KEY)
+        assert series is not None
+        assert series.compression == self.COMPRESSION
+
+    async def test_set_and_clear(self, storage: MemoryStorage):
+        await storage.create_series(_make_series())
+
+        updated = await storage.set_series_compression(KEY, self.COMPRESSION)
+        assert updated is not None
+        assert updated.compression == self.COMPRESSION
+
+        cleared = await storage.set_series_compression(KEY, None)
+        assert cleared is not None
+        assert cleared.compression is None
+
+    async def test_unknown_key_returns_none(self, storage: MemoryStorage):
+        assert await storage.set_series_compression(KEY, None) is None
+
+
 class TestRenameSeries:
     async def test_rename_updates_metric(self, storage: MemoryStorage):
         await storage.create_series(_make_series())
@@ -353,6 +396,100 @@ class TestFetchPoints:
         assert [p.value for p in fetched] == [1.0, 2.0, 3.0]
 
 
+class TestIterPoints:
+    async def test_unknown_key_yields_nothing(self, storage: MemoryStorage):
+        unknown = SeriesKey(owner_id="y", metric="z")
+        assert [b async for b in storage.iter_points(unknown)] == []
+
+    async def test_batches_in_time_order_within_range(self, storage: MemoryStorage):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        points = [
+            DataPoint(timestamp=base + timedelta(days=i), value=float(i))
+            for i in range(6)
+        ]
+        await storage.upsert_points(KEY, points)
+        batches = [
+            [p.value for p in batch]
+            async for batch in storage.iter_points(
+                KEY,
+                start=base + timedelta(days=1),
+                end=base + timedelta(days=4),
+                batch_size=3,
+            )
+        ]
+        assert batches == [[1.0, 2.0, 3.0], [4.0]]
+
+
+class TestIterPointsMany:
+    async def test_series_interleaved_in_time_order(self, storage: MemoryStorage):
+        other = SeriesKey(owner_id="s1", metric="humidity")
+        await storage.create_series(_make_series())
+        await storage.create_series(_make_series(other, DataType.INT))
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(minutes=m), value=1.5)
+                for m in (0, 2)
+            ],
+        )
+        await storage.upsert_points(
+            other,
+            [DataPoint(timestamp=base + timedelta(minutes=m), value=7) for m in (1, 3)],
+        )
+        unknown = SeriesKey(owner_id="y", metric="z")
+        batches = [
+            [(i, p.value) for i, p in batch]
+            async for batch in storage.iter_points_many(
+                [KEY, unknown, other],
+                start=base + timedelta(minutes=1),
+                batch_size=2,
+            )
+        ]
+        assert batches == [[(2, 7), (0, 1.5)], [(2, 7)]]
+
+    async def test_unknown_keys_yield_nothing(self, storage: MemoryStorage):
+        unknown = SeriesKey(owner_id="y", metric="z")
+        assert [b async for b in storage.iter_points_many([unknown])] == []
+
+
+class TestFetchPointsMinmax:
+    async def test_unknown_key_returns_empty(self, storage: MemoryStorage):
+        unknown = SeriesKey(owner_id="y", metric="z")
+        assert await storage.fetch_points_minmax(unknown, buckets=2) == []
+
+    async def test_keeps_extremes_and_ends_per_bucket(self, storage: MemoryStorage):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        values = [5.0, 1.0, 9.0, 4.0, 6.0, 3.0, 5.0, 8.0, 2.0, 7.0, 5.0, 5.0]
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(minutes=i), value=v)
+                for i, v in enumerate(values)
+            ],
+        )
+        fetched = await storage.fetch_points_minmax(KEY, buckets=2)
+        # Buckets [0, 6) and [6, 12): first, min, max and last of each.
+        assert [p.value for p in fetched] == [5.0, 1.0, 9.0, 3.0, 5.0, 8.0, 2.0, 5.0]
+
+    async def test_small_range_returned_whole(self, storage: MemoryStorage):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(days=i), value=float(i))
+                for i in range(6)
+            ],
+        )
+        fetched = await storage.fetch_points_minmax(
+            KEY, start=base + timedelta(days=1), end=base + timedelta(days=4), buckets=1
+        )
+        assert [p.value for p in fetched] == [1.0, 2.0, 3.0, 4.0]
+
+
 class TestAggregate:
     async def test_raises_when_timezone_not_resolved(self, storage: MemoryStorage):
         series = _make_series()
@@ -367,6 +504,44 @@ class TestAggregate:
             await storage.aggregate(KEY, query)
 
 
+class TestAggregateMany:
+    async def test_results_aligned_with_keys(self, storage: MemoryStorage):
+        other = SeriesKey(owner_id="s2", metric="temperature")
+        await storage.create_series(_make_series())
+        await storage.create_series(_make_series(other))
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        await storage.upsert_points(KEY, [DataPoint(timestamp=start, value=1.0)])
+        await storage.upsert_points(
+            other,
+            [
+                DataPoint(timestamp=start, value=2.0),
+                DataPoint(timestamp=start + timedelta(hours=1), value=4.0),
+            ],
+        )
+        query = AggregationQuery(
+            agg=AggregationOperator.COUNT,
+            interval="whole",
+            start=start,
+            end=start + timedelta(days=1),
+            timezone="UTC",
+        )
+
+        results = await storage.aggregate_many([other, KEY], query)
+
+        assert [r.points[0].value for r in results] == [2, 1]
+
+    async def test_unknown_key_raises(self, storage: MemoryStorage):
+        query = AggregationQuery(
+            agg=AggregationOperator.COUNT,
+            interval="whole",
+            start=datetime(2026, 1, 1, tzinfo=UTC),
+            end=datetime(2026, 1, 2, tzinfo=UTC),
+            timezone="UTC",
+        )
+        with pytest.raises(NotFoundError):
+            await storage.aggregate_many([KEY], query)
+
+
 @pytest.mark.filterwarnings("ignore::pytest.PytestWarning")
 def test_polars_not_imported_by_package() -> None:
     import subprocess
@@ -388,3 +563,32 @@ def test_polars_not_imported_by_package() -> None:
         text=True,
     )
     assert result.returncode == 0, result.stderr
+
+
+class TestApplyRetention:
+    async def test_drops_points_past_matching_rule(self, storage: MemoryStorage):
+        kept_key = SeriesKey(owner_id="s1", metric="state")
+        await storage.create_series(_make_series())
+        await storage.create_series(_make_series(kept_key))
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        points = [
+            DataPoint(timestamp=base + timedelta(days=i), value=float(i))
+            for i in range(5)
+        ]
+        for key in (KEY, kept_key):
+            await storage.upsert_points(key, points)
+        policy = parse_retention_policy('[{"metric": "temp*", "raw": "2d"}]')
+
+        trimmed = await storage.apply_retention(
+            policy, now=base + timedelta(days=4, minutes=30)
+        )
+
+        assert trimmed == [KEY]
+        remaining = await storage.fetch_points(KEY)
+        assert [p.value for p in remaining] == [2.0, 3.0, 4.0]
+        assert len(await storage.fetch_points(kept_key)) == 5
+
+    async def test_nothing_to_drop_reports_nothing(self, storage: MemoryStorage):
+        await storage.create_series(_make_series())
+        policy = parse_retention_policy('[{"raw": "2d"}]')
+        assert await storage.apply_retention(policy, datetime.now(UTC)) == []
@@ -0,0 +1,87 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from models.errors import InvalidError
+from timeseries.domain import DataPoint, DataType
+from timeseries.storage.memory.columns import SeriesColumns, from_us, to_us
+
+BASE = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _pt(minutes: int, value: object, command_id: int | None = None) -> DataPoint:
+    return DataPoint(
+        timestamp=BASE + timedelta(minutes=minutes),
+        value=value,  # ty: ignore[invalid-argument-type]
+        command_id=command_id,
+    )
+
+
+def _values(columns: SeriesColumns) -> list[object]:
+    return [p.value for p in columns.points(0, len(columns))]
+
+
+class TestMicroseconds:
+    def test_round_trip_is_exact(self):
+        ts = datetime(2026, 3, 29, 1, 59, 59, 999_999, tzinfo=UTC)
+        assert from_us(to_us(ts)) == ts
+
+
+class TestUpsert:
+    def test_in_order_batches_append(self):
+        columns = SeriesColumns(DataType.FLOAT)
+        columns.upsert([_pt(0, 1.0), _pt(1, 2.0)])
+        columns.upsert([_pt(2, 3.0)])
+        assert _values(columns) == [1.0, 2.0, 3.0]
+
+    def test_out_of_order_points_are_inserted_sorted(self):
+        columns = SeriesColumns(DataType.INT)
+        columns.upsert([_pt(5, 5), _pt(1, 1)])
+        columns.upsert([_pt(3, 3), _pt(0, 0)])
+        assert _values(columns) == [0, 1, 3, 5]
+
+    def test_same_timestamp_replaces_and_keeps_command_id(self):
+        columns = SeriesColumns(DataType.INT)
+        columns.upsert([_pt(0, 1, command_id=7)])
+        columns.upsert([_pt(0, 2)])
+        [point] = columns.points(0, 1)
+        assert (point.value, point.command_id) == (2, 7)
+
+    def test_bool_values_round_trip(self):
+        columns = SeriesColumns(DataType.BOOL)
+        columns.upsert([_pt(0, value=True), _pt(1, value=False)])
+        assert _values(columns) == [True, False]
+
+    def test_string_values_round_trip(self):
+        columns = SeriesColumns(DataType.STRING)
+        columns.upsert([_pt(0, "eco"), _pt(1, "comfort")])
+        assert _values(columns) == ["eco", "comfort"]
+
+    def test_mismatched_value_rejects_whole_batch(self):
+        columns = SeriesColumns(DataType.INT)
+        with pytest.raises(InvalidError, match="int series"):
+            columns.upsert([_pt(0, 1), _pt(1, "oops")])
+        assert len(columns) == 0
+
+
+class TestLookups:
+    @pytest.fixture
+    def columns(self) -> SeriesColumns:
+        columns = SeriesColumns(DataType.FLOAT)
+        columns.upsert([_pt(m, float(m)) for m in (0, 10, 20)])
+        return columns
+
+    def test_index_bounds(self, columns: SeriesColumns):
+        at_10 = BASE + timedelta(minutes=10)
+        assert columns.index_at_or_after(at_10) == 1
+        assert columns.index_after(at_10) == 2
+
+    def test_columns_from_are_copies(self, columns: SeriesColumns):
+        timestamps, values = columns.columns_from(1)
+        columns.upsert([_pt(30, 30.0)])
+        assert list(values) == [10.0, 20.0]
+        assert len(timestamps) == 2
+
+    def test_drop_before(self, columns: SeriesColumns):
+        assert columns.drop_before(BASE + timedelta(minutes=15)) == 2
+        assert columns.points(0, len(columns)) == [_pt(20, 20.0)]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
 
 import asyncpg
@@ -12,11 +14,15 @@ from models.errors import InvalidError, NotFoundError
 from timeseries.domain import (
     AggregationOperator,
     AggregationQuery,
+    AggregationResult,
+    Compression,
+    CompressionMethod,
     DataPoint,
     DataType,
     Interval,
     SeriesKey,
     TimeSeries,
+    parse_retention_policy,
 )
 from timeseries.storage.postgres import PostgresStorage, run_migrations
 
@@ -259,6 +265,36 @@ class TestUpsertPoints:
         assert fetched[0].command_id == cmd2_id
 
 
+class TestSetSeriesCompression:
+    COMPRESSION = Compression(
+        method=CompressionMethod.SWINGING_DOOR,
+        deviation=0.25,
+        max_interval=timedelta(minutes=30),
+    )
+
+    async def test_compression_round_trips(self, storage):
+        await storage.create_series(
+            replace(_make_series(), compression=self.COMPRESSION)
+        )
+        series = await storage.get_series_by_key(KEY)
+        assert series is not None
+        assert series.compression == self.COMPRESSION
+
+    async def test_set_and_clear(self, storage):
+        await storage.create_series(_make_series())
+
+        updated = await storage.set_series_compression(KEY, self.COMPRESSION)
+        assert updated is not None
+        assert updated.compression == self.COMPRESSION
+
+        cleared = await storage.set_series_compression(KEY, None)
+        assert cleared is not None
+        assert cleared.compression is None
+
+    async def test_unknown_key_returns_none(self, storage):
+        assert await storage.set_series_compression(KEY, None) is None
+
+
 class TestRenameSeries:
     async def test_rename_updates_metric(self, storage):
         await storage.create_series(_make_series())
@@ -308,6 +344,98 @@ class TestRenameSeries:
         assert fetched[0].value == 23.5
 
 
+class TestUpsertPointsMany:
+    async def test_writes_all_series_and_types(self, storage):
+        int_key = SeriesKey("s2", "count")
+        str_key = SeriesKey("s3", "mode")
+        await storage.create_series(_make_series())
+        await storage.create_series(_make_series(int_key, DataType.INT))
+        await storage.create_series(_make_series(str_key, DataType.STRING))
+        now = datetime.now(tz=UTC)
+
+        await storage.upsert_points_many(
+            {
+                KEY: [DataPoint(timestamp=now, value=1)],
+                int_key: [DataPoint(timestamp=now, value=7)],
+                str_key: [DataPoint(timestamp=now, value="eco")],
+            }
+        )
+
+        assert (await storage.fetch_points(KEY))[0].value == 1.0
+        assert (await storage.fetch_points(int_key))[0].value == 7
+        assert (await storage.fetch_points(str_key))[0].value == "eco"
+
+    async def test_merges_with_existing_points(self, storage):
+        await storage.create_series(_make_series())
+        now = datetime.now(tz=UTC)
+        await storage.upsert_points(KEY, [DataPoint(timestamp=now, value=1.0)])
+
+        await storage.upsert_points_many(
+            {
+                KEY: [
+                    DataPoint(timestamp=now, value=2.0),
+                    DataPoint(timestamp=now + timedelta(seconds=1), value=3.0),
+                ]
+            }
+        )
+
+        assert [p.value for p in await storage.fetch_points(KEY)] == [2.0, 3.0]
+
+    async def test_duplicate_timestamps_in_batch(self, storage):
+        await storage.create_series(_make_series())
+        now = datetime.now(tz=UTC)
+        await storage.upsert_points_many(
+            {
+                KEY: [
+                    DataPoint(timestamp=now, value=1.0),
+                    DataPoint(timestamp=now, value=2.0),
+                ]
+            }
+        )
+        fetched = await storage.fetch_points(KEY)
+        assert [p.value for p in fetched] == [2.0]
+
+    async def test_unknown_key_raises_before_writing(self, storage):
+        await storage.create_series(_make_series())
+        now = datetime.now(tz=UTC)
+        with pytest.raises(NotFoundError, match="No series found"):
+            await storage.upsert_points_many(
+                {
+                    KEY: [DataPoint(timestamp=now, value=1.0)],
+                    SeriesKey("y", "z"): [DataPoint(timestamp=now, value=1.0)],
+                }
+            )
+        assert await storage.fetch_points(KEY) == []
+
+
+class TestSeriesCache:
+    async def test_warm_counts_stored_series(self, storage):
+        await storage.create_series(_make_series())
+        await storage.create_series(_make_series(SeriesKey("s2", "temperature")))
+        assert await storage.warm_series_cache() == 2
+
+    async def test_series_created_by_another_instance_resolves(self, storage):
+        other = PostgresStorage(storage._pool)  # noqa: SLF001
+        await other.create_series(_make_series(data_type=DataType.INT))
+        assert await storage.get_series_data_type(KEY) == DataType.INT
+
+    async def test_rename_moves_cached_key(self, storage):
+        await storage.create_series(_make_series())
+        assert await storage.get_series_data_type(KEY) == DataType.FLOAT
+        await storage.rename_series(KEY, "temp")
+
+        assert await storage.get_series_data_type(KEY) is None
+        with pytest.raises(NotFoundError):
+            await storage.upsert_points(
+                KEY, [DataPoint(timestamp=datetime.now(tz=UTC), value=1.0)]
+            )
+        new_key = SeriesKey(owner_id=KEY.owner_id, metric="temp")
+        await storage.upsert_points(
+            new_key, [DataPoint(timestamp=datetime.now(tz=UTC), value=1.0)]
+        )
+        assert len(await storage.fetch_points(new_key)) == 1
+
+
 class TestFetchPointBefore:
     async def test_returns_most_recent_point_before(self, storage):
         await storage.create_series(_make_series())
@@ -411,6 +539,100 @@ class TestFetchPoints:
         assert [p.value for p in fetched] == [1.0, 2.0, 3.0]
 
 
+class TestIterPoints:
+    async def test_unknown_key_yields_nothing(self, storage):
+        unknown = SeriesKey(owner_id="y", metric="z")
+        assert [b async for b in storage.iter_points(unknown)] == []
+
+    async def test_batches_in_time_order_within_range(self, storage):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        points = [
+            DataPoint(timestamp=base + timedelta(days=i), value=float(i))
+            for i in range(6)
+        ]
+        await storage.upsert_points(KEY, points)
+        batches = [
+            [p.value for p in batch]
+            async for batch in storage.iter_points(
+                KEY,
+                start=base + timedelta(days=1),
+                end=base + timedelta(days=4),
+                batch_size=3,
+            )
+        ]
+        assert batches == [[1.0, 2.0, 3.0], [4.0]]
+
+
+class TestIterPointsMany:
+    async def test_series_interleaved_in_time_order(self, storage):
+        other = SeriesKey(owner_id="s1", metric="humidity")
+        await storage.create_series(_make_series())
+        await storage.create_series(_make_series(other, DataType.INT))
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(minutes=m), value=1.5)
+                for m in (0, 2)
+            ],
+        )
+        await storage.upsert_points(
+            other,
+            [DataPoint(timestamp=base + timedelta(minutes=m), value=7) for m in (1, 3)],
+        )
+        unknown = SeriesKey(owner_id="y", metric="z")
+        batches = [
+            [(i, p.value) for i, p in batch]
+            async for batch in storage.iter_points_many(
+                [KEY, unknown, other],
+                start=base + timedelta(minutes=1),
+                batch_size=2,
+            )
+        ]
+        assert batches == [[(2, 7), (0, 1.5)], [(2, 7)]]
+
+    async def test_unknown_keys_yield_nothing(self, storage):
+        unknown = SeriesKey(owner_id="y", metric="z")
+        assert [b async for b in storage.iter_points_many([unknown])] == []
+
+
+class TestFetchPointsMinmax:
+    async def test_unknown_key_returns_empty(self, storage):
+        unknown = SeriesKey(owner_id="y", metric="z")
+        assert await storage.fetch_points_minmax(unknown, buckets=2) == []
+
+    async def test_keeps_extremes_and_ends_per_bucket(self, storage):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        values = [5.0, 1.0, 9.0, 4.0, 6.0, 3.0, 5.0, 8.0, 2.0, 7.0, 5.0, 5.0]
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(minutes=i), value=v)
+                for i, v in enumerate(values)
+            ],
+        )
+        fetched = await storage.fetch_points_minmax(KEY, buckets=2)
+        # Buckets [0, 6) and [6, 12): first, min, max and last of each.
+        assert [p.value for p in fetched] == [5.0, 1.0, 9.0, 3.0, 5.0, 8.0, 2.0, 5.0]
+
+    async def test_small_range_returned_whole(self, storage):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(days=i), value=float(i))
+                for i in range(6)
+            ],
+        )
+        fetched = await storage.fetch_points_minmax(
+            KEY, start=base + timedelta(days=1), end=base + timedelta(days=4), buckets=1
+        )
+        assert [p.value for p in fetched] == [1.0, 2.0, 3.0, 4.0]
+
+
 class TestAggregate:
     async def test_raises_when_timezone_not_resolved(self, storage):
         series = _make_series()
@@ -423,3 +645,252 @@ class TestAggregate:
         )
         with pytest.raises(RuntimeError, match="timezone must be resolved"):
             await storage.aggregate(KEY, query)
+
+
+class TestAggregateMany:
+    """The batched statement must agree with the single-series queries."""
+
+    @pytest_asyncio.fixture
+    async def keys(self, storage):
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        keys = [SeriesKey(f"s{i}", "temperature") for i in range(4)]
+        for key in keys:
+            await storage.create_series(_make_series(key))
+        # s0: points in range; s1: anchor only; s2: anchor and points;
+        # s3: no points at all.
+        await storage.upsert_points(
+            keys[0],
+            [
+                DataPoint(timestamp=base + timedelta(hours=1), value=1.0),
+                DataPoint(timestamp=base + timedelta(hours=30), value=3.0),
+            ],
+        )
+        await storage.upsert_points(
+            keys[1], [DataPoint(timestamp=base - timedelta(hours=2), value=5.0)]
+        )
+        await storage.upsert_points(
+            keys[2],
+            [
+                DataPoint(timestamp=base - timedelta(hours=1), value=7.0),
+                DataPoint(timestamp=base + timedelta(hours=50), value=9.0),
+            ],
+        )
+        return keys
+
+    @pytest.mark.parametrize("interval", ["whole", "1d"])
+    @pytest.mark.parametrize(
+        "agg",
+        [
+            AggregationOperator.COUNT,
+            AggregationOperator.SUM,
+            AggregationOperator.AVG,
+            AggregationOperator.MIN,
+            AggregationOperator.MAX,
+            AggregationOperator.FIRST,
+            AggregationOperator.LAST,
+            AggregationOperator.TW_AVG,
+        ],
+    )
+    async def test_matches_single_series(self, storage, keys, agg, interval):
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        query = AggregationQuery(
+            agg=agg,
+            interval="whole"
+            if interval == "whole"
+            else Interval.model_validate(interval),
+            start=base,
+            end=base + timedelta(days=3),
+            timezone="UTC",
+        )
+
+        batched = await storage.aggregate_many(keys, query)
+
+        assert batched == [await storage.aggregate(key, query) for key in keys]
+
+    async def test_mixed_data_types_raise(self, storage, keys):
+        int_key = SeriesKey("s9", "count")
+        await storage.create_series(_make_series(int_key, DataType.INT))
+        query = AggregationQuery(
+            agg=AggregationOperator.COUNT,
+            interval="whole",
+            start=datetime(2026, 1, 1, tzinfo=UTC),
+            end=datetime(2026, 1, 2, tzinfo=UTC),
+            timezone="UTC",
+        )
+        with pytest.raises(InvalidError, match="mixed data types"):
+            await storage.aggregate_many([*keys, int_key], query)
+
+
+class TestRollups:
+    """Rollup-routed answers must equal raw scans, late writes included."""
+
+    @staticmethod
+    async def _raw(
+        storage: PostgresStorage, key: SeriesKey, query: AggregationQuery
+    ) -> AggregationResult:
+        ref = await storage._resolve(key)  # noqa: SLF001
+        assert ref is not None
+        return await storage._aggregate_raw(ref, query)  # noqa: SLF001
+
+    @pytest.mark.parametrize(
+        ("interval", "timezone"),
+        [("1d", "Europe/Paris"), ("1h", "UTC"), ("15min", "UTC"), ("whole", "UTC")],
+    )
+    @pytest.mark.parametrize(
+        "agg",
+        [
+            AggregationOperator.COUNT,
+            AggregationOperator.SUM,
+            AggregationOperator.AVG,
+            AggregationOperator.MIN,
+            AggregationOperator.MAX,
+            AggregationOperator.FIRST,
+            AggregationOperator.LAST,
+        ],
+    )
+    async def test_matches_raw_scan(self, storage, agg, interval, timezone):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 3, 28, 22, 7, tzinfo=UTC)
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(
+                    timestamp=base + timedelta(minutes=37 * i), value=float(i % 5)
+                )
+                for i in range(200)
+            ],
+        )
+        query = AggregationQuery(
+            agg=agg,
+            interval="whole"
+            if interval == "whole"
+            else Interval.model_validate(interval),
+            # Unaligned start: the head granule comes from raw points.
+            start=base + timedelta(minutes=3),
+            end=base + timedelta(days=4, minutes=11),
+            timezone=timezone,
+        )
+
+        assert await storage.aggregate(KEY, query) == await self._raw(
+            storage, KEY, query
+        )
+
+    async def test_late_write_is_reflected(self, storage):
+        await storage.create_series(_make_series())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=base + timedelta(hours=i), value=1.0)
+                for i in range(48)
+            ],
+        )
+        query = AggregationQuery(
+            agg=AggregationOperator.MAX,
+            interval=Interval.model_validate("1d"),
+            start=base,
+            end=base + timedelta(days=2),
+            timezone="UTC",
+        )
+        await storage.aggregate(KEY, query)
+
+        await storage.upsert_points_many(
+            {KEY: [DataPoint(timestamp=base + timedelta(hours=5), value=9.0)]}
+        )
+
+        result = await storage.aggregate(KEY, query)
+        assert [p.value for p in result.points] == [9.0, 1.0]
+        assert result == await self._raw(storage, KEY, query)
+
+
+class TestApplyRetention:
+    BASE = datetime(2026, 1, 1, tzinfo=UTC)
+
+    def _hourly_count(self, days: int) -> AggregationQuery:
+        return AggregationQuery(
+            agg=AggregationOperator.COUNT,
+            interval=Interval.model_validate("1h"),
+            start=self.BASE,
+            end=self.BASE + timedelta(days=days),
+            timezone="UTC",
+        )
+
+    async def _fill(self, storage: PostgresStorage) -> None:
+        await storage.create_series(_make_series())
+        await storage.upsert_points(
+            KEY,
+            [
+                DataPoint(timestamp=self.BASE + timedelta(minutes=10 * i), value=1.0)
+                for i in range(6 * 24 * 4)
+            ],
+        )
+
+    async def test_rollups_answer_after_raw_is_gone(self, storage):
+        await self._fill(storage)
+        query = self._hourly_count(4)
+        before = await storage.aggregate(KEY, query)
+        policy = parse_retention_policy('[{"raw": "2d"}]')
+
+        trimmed = await storage.apply_retention(
+            policy, now=self.BASE + timedelta(days=4)
+        )
+
+        assert trimmed == [KEY]
+        remaining = await storage.fetch_points(KEY)
+        assert remaining[0].timestamp == self.BASE + timedelta(days=2)
+        assert await storage.aggregate(KEY, query) == before
+
+    async def test_late_write_before_watermark_leaves_rollups(self, storage):
+        await self._fill(storage)
+        query = self._hourly_count(4)
+        policy = parse_retention_policy('[{"raw": "2d"}]')
+        await storage.apply_retention(policy, now=self.BASE + timedelta(days=4))
+        before = await storage.aggregate(KEY, query)
+
+        late = DataPoint(timestamp=self.BASE + timedelta(minutes=5), value=9.0)
+        await storage.upsert_points(KEY, [late])
+
+        assert await storage.aggregate(KEY, query) == before
+
+    async def test_rollups_trimmed_past_their_retention(self, storage):
+        await self._fill(storage)
+        await storage.aggregate(KEY, self._hourly_count(4))
+        policy = parse_retention_policy('[{"raw": "2d", "rollups": "3d"}]')
+
+        await storage.apply_retention(policy, now=self.BASE + timedelta(days=4))
+
+        result = await storage.aggregate(KEY, self._hourly_count(4))
+        counts = [p.value for p in result.points]
+        assert not any(counts[:24])
+        assert counts[24:] == [6] * (len(counts) - 24)
+
+
+class TestRenameAcrossProcesses:
+    async def test_other_process_follows_the_rename(self, storage: PostgresStorage):
+        """*storage* renames, as an API worker would; *engine* is the process
+        ingesting points, with its own pool and series cache."""
+        assert POSTGRES_URL is not None
+        engine = PostgresStorage(await asyncpg.create_pool(POSTGRES_URL))
+        try:
+            renamed: list[tuple[SeriesKey, SeriesKey]] = []
+            await engine.follow_renames(lambda *keys: renamed.append(keys))
+            await engine.create_series(_make_series())
+            ts = datetime(2026, 1, 1, tzinfo=UTC)
+            await engine.upsert_points(KEY, [DataPoint(timestamp=ts, value=1.0)])
+            new_key = SeriesKey(owner_id=KEY.owner_id, metric="temp")
+
+            await storage.rename_series(KEY, "temp")
+            for _ in range(200):
+                if renamed:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert renamed == [(KEY, new_key)]
+            later = DataPoint(timestamp=ts + timedelta(minutes=1), value=2.0)
+            with pytest.raises(NotFoundError):
+                await engine.upsert_points(KEY, [later])
+            await engine.upsert_points(new_key, [later])
+            fetched = await storage.fetch_points(new_key)
+            assert [p.value for p in fetched] == [1.0, 2.0]
+        finally:
+            await engine.close()
@@ -1,8 +1,18 @@
+from collections.abc import AsyncIterator, Mapping, Sequence
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
+from timeseries.domain import AggregationOperator, AggregationQuery, SeriesKey
 from timeseries.domain.aggregation import Interval, IntervalUnit
+from timeseries.storage.postgres import PostgresStorage
 from timeseries.storage.postgres.aggregate import _to_sql_interval
 
+KEYS = [SeriesKey(owner_id=f"s{i}", metric="temperature") for i in range(3)]
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
 
 @pytest.mark.parametrize(
     ("interval_str", "expected"),
@@ -32,3 +42,116 @@ def test_to_sql_interval(interval_str: str, expected: str) -> None:
 def test_to_sql_interval_all_units(qty: int, unit: IntervalUnit, expected: str) -> None:
     iv = Interval(qty=qty, unit=unit)
     assert _to_sql_interval(iv) == expected
+
+
+def _series_row(key: SeriesKey) -> dict[str, object]:
+    return {
+        "id": f"id-{key.owner_id}",
+        "data_type": "float",
+        "owner_id": key.owner_id,
+        "metric": key.metric,
+    }
+
+
+async def _storage(
+    bucket_rows: Sequence[Mapping[str, object]],
+) -> tuple[PostgresStorage, MagicMock]:
+    """Storage over a fake pool: the batched fetch returns *bucket_rows*,
+    any single-series fallback fetch returns no rows."""
+    pool = MagicMock()
+
+    async def fetch(sql: str, *_args: object) -> Sequence[Mapping[str, object]]:
+        if "FROM ts_series" in sql:
+            return [_series_row(key) for key in KEYS]
+        return bucket_rows if "ANY($5::text[])" in sql else []
+
+    pool.fetch = AsyncMock(side_effect=fetch)
+    pool.fetchrow = AsyncMock(return_value=None)
+    # Rollup refresh: no dirty granules to claim.
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+
+    @asynccontextmanager
+    async def _transaction() -> AsyncIterator[None]:
+        yield
+
+    @asynccontextmanager
+    async def _acquire() -> AsyncIterator[MagicMock]:
+        yield conn
+
+    conn.transaction = _transaction
+    pool.acquire = _acquire
+    pool.conn = conn
+    storage = PostgresStorage(pool)
+    await storage.warm_series_cache()
+    pool.fetch.reset_mock()
+    return storage, pool
+
+
+def _query(agg: AggregationOperator) -> AggregationQuery:
+    return AggregationQuery(
+        agg=agg,
+        interval=Interval.model_validate("1d"),
+        start=START,
+        end=datetime(2026, 1, 2, tzinfo=UTC),
+        timezone="UTC",
+    )
+
+
+@pytest.mark.asyncio
+class TestAggregateMany:
+    async def test_batched_operator_runs_one_statement(self):
+        rows = [
+            {"series_id": f"id-{k.owner_id}", "bucket": START, "value": 1.0, "count": 1}
+            for k in KEYS
+        ]
+        storage, pool = await _storage(rows)
+
+        results = await storage.aggregate_many(KEYS, _query(AggregationOperator.AVG))
+
+        [call] = pool.fetch.await_args_list
+        assert call.args[-1] == [f"id-{k.owner_id}" for k in KEYS]
+        assert "FROM ts_rollups" in call.args[0]
+        assert [r.points[0].value for r in results] == [1.0, 1.0, 1.0]
+        pool.fetchrow.assert_not_awaited()
+
+    async def test_series_missing_from_batch_fall_back(self):
+        rows = [{"series_id": "id-s0", "bucket": START, "value": 1.0, "count": 1}]
+        storage, pool = await _storage(rows)
+
+        results = await storage.aggregate_many(KEYS, _query(AggregationOperator.AVG))
+
+        # The batched statement, then one single-series query each for s1, s2.
+        assert pool.fetch.await_count == 3
+        assert pool.fetchrow.await_count == 2
+        assert results[0].points[0].value == 1.0
+        assert results[1].points == results[2].points == []
+
+    async def test_window_operator_is_not_batched(self):
+        storage, pool = await _storage([])
+
+        await storage.aggregate_many(KEYS, _query(AggregationOperator.TW_AVG))
+
+        assert pool.fetch.await_count == len(KEYS)
+        assert all("ANY(" not in call.args[0] for call in pool.fetch.await_args_list)
+
+    async def test_rollup_refresh_claims_queried_series(self):
+        storage, pool = await _storage([])
+
+        await storage.aggregate_many(KEYS, _query(AggregationOperator.MAX))
+
+        [claim] = pool.conn.fetch.await_args_list
+        assert "DELETE FROM ts_rollup_dirty" in claim.args[0]
+        assert claim.args[1] == [f"id-{k.owner_id}" for k in KEYS]
+        pool.conn.execute.assert_not_called()
+
+    async def test_unaligned_interval_reads_raw_points(self):
+        storage, pool = await _storage([])
+        query = _query(AggregationOperator.AVG).model_copy(
+            update={"interval": Interval.model_validate("10min")}
+        )
+
+        await storage.aggregate_many(KEYS, query)
+
+        assert "ts_rollups" not in pool.fetch.await_args_list[0].args[0]
+        pool.conn.fetch.assert_not_awaited()
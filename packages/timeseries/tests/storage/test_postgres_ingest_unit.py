@@ -0,0 +1,24 @@
+from datetime import UTC, datetime
+
+from timeseries.domain import DataPoint, DataType
+from timeseries.storage.postgres.postgres_storage import _copy_records
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def test_value_lands_in_its_data_type_column() -> None:
+    [row] = _copy_records("s", DataType.FLOAT, [DataPoint(T0, 3)])
+    assert row == ("s", T0, None, 3.0, None, None, None)
+    assert isinstance(row[3], float)
+
+    [row] = _copy_records("s", DataType.STRING, [DataPoint(T0, "eco", 5)])
+    assert row == ("s", T0, None, None, None, "eco", 5)
+
+
+def test_duplicate_timestamps_collapse_like_sequential_upserts() -> None:
+    rows = _copy_records(
+        "s",
+        DataType.INT,
+        [DataPoint(T0, 1, command_id=9), DataPoint(T0, 2)],
+    )
+    assert rows == [("s", T0, 2, None, None, None, 9)]
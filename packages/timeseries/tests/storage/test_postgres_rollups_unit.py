@@ -0,0 +1,89 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from timeseries.domain import (
+    AggregationOperator,
+    AggregationQuery,
+    DataType,
+    Interval,
+)
+from timeseries.storage.postgres.rollups import rollup_width
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _query(
+    interval: str,
+    *,
+    agg: AggregationOperator = AggregationOperator.AVG,
+    timezone: str = "UTC",
+    days: int = 30,
+) -> AggregationQuery:
+    return AggregationQuery(
+        agg=agg,
+        interval="whole" if interval == "whole" else Interval.model_validate(interval),
+        start=START,
+        end=START + timedelta(days=days),
+        timezone=timezone,
+    )
+
+
+class TestRollupWidth:
+    @pytest.mark.parametrize(
+        ("interval", "expected"),
+        [
+            ("1mo", 3600),
+            ("1d", 3600),
+            ("2h", 3600),
+            ("1h", 3600),
+            ("30min", 900),
+            ("15min", 900),
+            ("whole", 3600),
+            ("10min", None),
+            ("1min", None),
+        ],
+    )
+    def test_coarsest_dividing_width(self, interval: str, expected: int | None):
+        assert rollup_width(_query(interval), DataType.FLOAT) == expected
+
+    @pytest.mark.parametrize(
+        ("timezone", "expected"),
+        [
+            ("Europe/Paris", 3600),
+            ("America/New_York", 3600),
+            ("Asia/Kolkata", 900),
+            ("Asia/Kathmandu", 900),
+        ],
+    )
+    def test_timezone_offsets_must_be_whole_granules(
+        self, timezone: str, expected: int
+    ):
+        # A year spans both DST transitions.
+        query = _query("1d", timezone=timezone, days=365)
+        assert rollup_width(query, DataType.FLOAT) == expected
+
+    def test_whole_ignores_timezone(self):
+        query = _query("whole", timezone="Asia/Kolkata")
+        assert rollup_width(query, DataType.FLOAT) == 3600
+
+    @pytest.mark.parametrize(
+        "agg",
+        [
+            AggregationOperator.TW_AVG,
+            AggregationOperator.MODE,
+            AggregationOperator.TW_MODE,
+            AggregationOperator.DELTA,
+        ],
+    )
+    def test_window_operators_read_raw_points(self, agg: AggregationOperator):
+        assert rollup_width(_query("1d", agg=agg), DataType.FLOAT) is None
+
+    def test_string_series_read_raw_points(self):
+        query = _query("1d", agg=AggregationOperator.LAST)
+        assert rollup_width(query, DataType.STRING) is None
+
+    @pytest.mark.parametrize("data_type", [DataType.INT, DataType.BOOL])
+    def test_int_and_bool_series_are_rolled_up(self, data_type: DataType):
+        query = _query("1d", agg=AggregationOperator.MAX)
+        assert rollup_width(query, data_type) == 3600
@@ -0,0 +1,170 @@
+"""Query counting for PostgresStorage's series cache, against a fake pool."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from timeseries.domain import DataPoint, DataType, SeriesKey
+from timeseries.storage.postgres import PostgresStorage
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Generator
+
+KEY = SeriesKey(owner_id="s1", metric="temperature")
+ROW = {
+    "id": "series-1",
+    "data_type": "float",
+    "owner_id": KEY.owner_id,
+    "metric": KEY.metric,
+    "created_at": datetime(2024, 1, 1, tzinfo=UTC),
+    "updated_at": datetime(2024, 1, 1, tzinfo=UTC),
+    "compression_method": None,
+    "compression_deviation": None,
+    "compression_max_interval": None,
+}
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Acquire:
+    """Like asyncpg's pool.acquire(): awaited, or used as a context."""
+
+    def __init__(self, conn: MagicMock) -> None:
+        self._conn = conn
+
+    def __await__(self) -> Generator[None, None, MagicMock]:
+        yield from ()
+        return self._conn
+
+    async def __aenter__(self) -> MagicMock:
+        return self._conn
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+
+def _fake_pool() -> MagicMock:
+    pool = MagicMock()
+    pool.fetchrow = AsyncMock(return_value=ROW)
+    pool.fetch = AsyncMock(return_value=[ROW])
+    pool.release = AsyncMock()
+    conn = MagicMock()
+    conn.executemany = AsyncMock()
+    conn.execute = AsyncMock()
+    conn.fetchrow = pool.fetchrow
+    conn.add_listener = AsyncMock()
+
+    @asynccontextmanager
+    async def _transaction() -> AsyncIterator[None]:
+        yield
+
+    conn.transaction = _transaction
+    pool.conn = conn
+    pool.acquire = lambda: _Acquire(conn)
+    return pool
+
+
+def _points() -> list[DataPoint]:
+    return [DataPoint(timestamp=datetime.now(tz=UTC), value=1.0)]
+
+
+class TestSeriesCache:
+    async def test_key_resolved_once(self):
+        pool = _fake_pool()
+        storage = PostgresStorage(pool)
+
+        await storage.upsert_points(KEY, _points())
+        await storage.upsert_points(KEY, _points())
+        assert await storage.get_series_data_type(KEY) == DataType.FLOAT
+
+        pool.fetchrow.assert_awaited_once()
+
+    async def test_warm_cache_avoids_lookups(self):
+        pool = _fake_pool()
+        storage = PostgresStorage(pool)
+
+        assert await storage.warm_series_cache() == 1
+        await storage.upsert_points(KEY, _points())
+
+        pool.fetchrow.assert_not_awaited()
+
+    async def test_miss_is_not_cached(self):
+        pool = _fake_pool()
+        pool.fetchrow.return_value = None
+        storage = PostgresStorage(pool)
+
+        assert await storage.get_series_data_type(KEY) is None
+        pool.fetchrow.return_value = ROW
+        assert await storage.get_series_data_type(KEY) == DataType.FLOAT
+
+    async def test_rename_evicts_old_key(self):
+        pool = _fake_pool()
+        storage = PostgresStorage(pool)
+        await storage.warm_series_cache()
+        pool.fetchrow.return_value = {**ROW, "metric": "temp"}
+
+        await storage.rename_series(KEY, "temp")
+        pool.fetchrow.return_value = None
+
+        assert await storage.get_series_data_type(KEY) is None
+        renamed = SeriesKey(owner_id=KEY.owner_id, metric="temp")
+        assert await storage.get_series_data_type(renamed) == DataType.FLOAT
+
+    async def test_rename_notified(self):
+        pool = _fake_pool()
+        storage = PostgresStorage(pool)
+        pool.fetchrow.return_value = {**ROW, "metric": "temp"}
+
+        await storage.rename_series(KEY, "temp")
+
+        [notify] = pool.conn.execute.await_args_list
+        _, channel, payload = notify.args
+        assert channel == "ts_series_renamed"
+        assert json.loads(payload) == {
+            "owner_id": KEY.owner_id,
+            "metric": KEY.metric,
+            "new_metric": "temp",
+        }
+
+
+class TestFollowRenames:
+    async def test_rename_elsewhere_moves_the_cached_key(self):
+        pool = _fake_pool()
+        storage = PostgresStorage(pool)
+        renamed: list[tuple[SeriesKey, SeriesKey]] = []
+        await storage.follow_renames(lambda *keys: renamed.append(keys))
+        await storage.warm_series_cache()
+        [listen] = pool.conn.add_listener.await_args_list
+        channel, on_notify = listen.args
+        new_key = SeriesKey(owner_id=KEY.owner_id, metric="temp")
+
+        payload = {"owner_id": KEY.owner_id, "metric": KEY.metric, "new_metric": "temp"}
+        on_notify(pool.conn, 1234, channel, json.dumps(payload))
+        pool.fetchrow.return_value = None
+
+        assert renamed == [(KEY, new_key)]
+        assert await storage.get_series_data_type(KEY) is None
+        assert await storage.get_series_data_type(new_key) == DataType.FLOAT
+
+    async def test_lost_listener_clears_the_cache(self):
+        pool = _fake_pool()
+        storage = PostgresStorage(pool)
+        await storage.follow_renames()
+        await storage.warm_series_cache()
+        [(on_lost,)] = [
+            c.args for c in pool.conn.add_termination_listener.call_args_list
+        ]
+
+        on_lost(pool.conn)
+        await asyncio.sleep(0)
+        await storage.get_series_data_type(KEY)
+
+        pool.fetchrow.assert_awaited_once()
+        assert pool.conn.add_listener.await_count == 2
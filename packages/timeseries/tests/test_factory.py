@@ -121,6 +121,13 @@ class TestTimeSeriesServiceLifecycle:
             async def try_enable_hypertable(self) -> None:
                 calls.append("hypertable")
 
+            async def follow_renames(self, on_renamed: object = None) -> None:  # noqa: ARG002
+                calls.append("follow")
+
+            async def warm_series_cache(self) -> int:
+                calls.append("warm")
+                return 0
+
         def fake_run_migrations(database_url: str) -> None:
             calls.append(("migrations", database_url))
 
@@ -144,6 +151,8 @@ class TestTimeSeriesServiceLifecycle:
                 ("migrations", url),
                 ("build", url),
                 "hypertable",
+                "follow",
+                "warm",
             ]
         finally:
             await service.stop()
@@ -3,8 +3,6 @@ from typing import Any
 
 from pydantic import BaseModel, model_validator
 
-from users.password import hash_password
-
 
 class Role(StrEnum):
     ADMIN = "admin"
@@ -46,8 +44,12 @@ class UserInDB(User):
 
     hashed_password: str
 
-    def update(self, update_data: "UserUpdate") -> "UserInDB":
-        update_dict = update_data.to_storage_update_dict()
+    def update(
+        self, update_data: "UserUpdate", *, hashed_password: str | None
+    ) -> "UserInDB":
+        update_dict = update_data.to_storage_update_dict(
+            hashed_password=hashed_password
+        )
         return self.model_copy(update=update_dict)
 
 
@@ -60,7 +62,15 @@ class UserUpdate(BaseModel):
     title: str | None = None
     must_change_password: bool | None = None
 
-    def to_storage_update_dict(self) -> dict[str, str | bool]:
+    def to_storage_update_dict(
+        self, *, hashed_password: str | None
+    ) -> dict[str, str | bool]:
+        """Fields to store. *hashed_password* is the hash of the new password
+        (``None`` when it is not changed), computed by the caller with a
+        :class:`~users.password.PasswordHasher` off the event loop."""
+        if self.password is not None and hashed_password is None:
+            msg = "A new password needs its hashed_password"
+            raise ValueError(msg)
         update_dict: dict[str, str | bool] = {}
         if self.username is not None:
             update_dict["username"] = self.username
@@ -74,8 +84,8 @@ class UserUpdate(BaseModel):
             update_dict["title"] = self.title
         if self.must_change_password is not None:
             update_dict["must_change_password"] = self.must_change_password
-        if self.password is not None:
-            update_dict["hashed_password"] = hash_password(self.password)
+        if hashed_password is not None:
+            update_dict["hashed_password"] = hashed_password
             # A successful password change clears the forced reset flag.
             update_dict["must_change_password"] = False
         return update_dict
@@ -1,5 +1,30 @@
+"""bcrypt password hashing, kept off the event loop.
+
+A bcrypt round costs a few hundred milliseconds of CPU, during which a call
+on the event loop would freeze everything else the process serves. The
+:class:`PasswordHasher` runs them on a small thread pool of its own (bcrypt
+releases the GIL), so they neither block the loop nor take the default
+executor's threads from storage I/O. It also caps the verifications running
+per account and per client, and in total, so a burst of logins is turned
+away early instead of queueing for the pool.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import bcrypt
 
+from models.errors import TooManyRequestsError
+
+HASH_WORKERS = 2
+# Verifications one account or one client may have running at once.
+MAX_VERIFICATIONS_PER_KEY = 2
+# Hashes and verifications waiting for or running on the pool.
+MAX_PENDING = 64
+
 
 def hash_password(plain: str) -> str:
     return bcrypt.hashpw(plain.encode(), bcrypt.gensalt()).decode()
@@ -9,4 +34,77 @@ def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
-__all__ = ["hash_password", "verify_password"]
+class PasswordHasher:
+    """:func:`hash_password` and :func:`verify_password` on a bounded pool."""
+
+    def __init__(
+        self,
+        workers: int = HASH_WORKERS,
+        *,
+        max_per_key: int = MAX_VERIFICATIONS_PER_KEY,
+        max_pending: int = MAX_PENDING,
+    ) -> None:
+        self._workers = workers
+        # Started on first use, and again after close(), like the service.
+        self._executor: ThreadPoolExecutor | None = None
+        self._max_per_key = max_per_key
+        self._max_pending = max_pending
+        self._pending = 0
+        self._running: Counter[str] = Counter()
+
+    async def hash(self, plain: str) -> str:
+        with self._slot():
+            return await self._run(hash_password, plain)
+
+    async def verify(
+        self, plain: str, hashed: str, *, keys: Iterable[str] = ()
+    ) -> bool:
+        """Whether *plain* matches *hashed*; raises
+        :class:`TooManyRequestsError` when any of *keys* (e.g. the account
+        and the client address) already has its share of verifications
+        running."""
+        with self._slot(), self._per_key(keys):
+            return await self._run(verify_password, plain, hashed)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run[T](self, func: Callable[..., T], *args: str) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="bcrypt"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        if self._pending >= self._max_pending:
+            msg = "Too many password checks in progress"
+            raise TooManyRequestsError(msg)
+        self._pending += 1
+        try:
+            yield
+        finally:
+            self._pending -= 1
+
+    @contextmanager
+    def _per_key(self, keys: Iterable[str]) -> Iterator[None]:
+        keys = list(dict.fromkeys(keys))
+        if any(self._running[key] >= self._max_per_key for key in keys):
+            msg = "Too many concurrent login attempts"
+            raise TooManyRequestsError(msg)
+        self._running.update(keys)
+        try:
+            yield
+        finally:
+            self._running.subtract(keys)
+            for key in keys:
+                if self._running[key] <= 0:
+                    del self._running[key]
+
+
+__all__ = ["PasswordHasher", "hash_password", "verify_password"]
@@ -2,15 +2,20 @@ from models.errors import BlockedUserError, NotFoundError
 from models.ids import gen_id
 from models.service import Service
 from users.models import Role, User, UserCreate, UserInDB, UserUpdate
-from users.password import hash_password, verify_password
+from users.password import PasswordHasher
 from users.storage import build_users_storage
 from users.storage.storage_backend import UsersStorageBackend
 
 
 class UsersService(Service):
-    def __init__(self, storage_url: str | None) -> None:
+    def __init__(
+        self, storage_url: str | None, *, hasher: PasswordHasher | None = None
+    ) -> None:
         self._storage_url = storage_url
         self._storage: UsersStorageBackend | None = None
+        # An injected hasher may be shared: its owner closes it.
+        self._owns_hasher = hasher is None
+        self._hasher = hasher or PasswordHasher()
 
     async def start(self) -> None:
         self._storage = await build_users_storage(self._storage_url)
@@ -20,6 +25,8 @@ class UsersService(Service):
         if self._storage is not None:
             await self._storage.close()
             self._storage = None
+        if self._owns_hasher:
+            self._hasher.close()
 
     @property
     def _backend(self) -> UsersStorageBackend:
@@ -47,7 +54,7 @@ class UsersService(Service):
         admin = UserInDB(
             id=gen_id(),
             username="admin",
-            hashed_password=hash_password("admin"),
+            hashed_password=await self._hasher.hash("admin"),
             role=Role.ADMIN,
             must_change_password=True,
         )
@@ -63,11 +70,19 @@ class UsersService(Service):
         user = await self._get_in_db_or_raise(user_id)
         return self._to_public_user(user)
 
-    async def authenticate(self, username: str, password: str) -> User | None:
+    async def authenticate(
+        self, username: str, password: str, *, client: str | None = None
+    ) -> User | None:
+        """The user with these credentials, or None. Raises
+        :class:`TooManyRequestsError` while the account, or the *client*
+        address the attempt comes from, has too many checks running."""
         user = await self._backend.get_by_username(username)
         if user is None:
             return None
-        if not verify_password(password, user.hashed_password):
+        keys = [f"user:{user.id}"]
+        if client is not None:
+            keys.append(f"client:{client}")
+        if not await self._hasher.verify(password, user.hashed_password, keys=keys):
             return None
         if user.is_blocked:
             msg = f"User '{username}' is blocked"
@@ -88,7 +103,7 @@ class UsersService(Service):
         if existing is not None:
             msg = f"Username '{create_data.username}' already exists"
             raise ValueError(msg)
-        hashed = pre_hashed_password or hash_password(create_data.password)
+        hashed = pre_hashed_password or await self._hasher.hash(create_data.password)
         user = UserInDB(
             id=gen_id(),
             username=create_data.username,
@@ -116,7 +131,12 @@ class UsersService(Service):
                 msg = f"Username '{update_data.username}' already exists"
                 raise ValueError(msg)
 
-        updated_user = user.update(update_data)
+        hashed = (
+            await self._hasher.hash(update_data.password)
+            if update_data.password is not None
+            else None
+        )
+        updated_user = user.update(update_data, hashed_password=hashed)
         await self._backend.save(updated_user)
         return self._to_public_user(updated_user)
 
@@ -1,4 +1,6 @@
-from users.models import User, UserCreate, UserInDB, UserType
+import pytest
+
+from users.models import User, UserCreate, UserInDB, UserType, UserUpdate
 
 
 class TestUserType:
@@ -53,3 +55,15 @@ class TestIsBlocked:
     def test_can_set_blocked(self):
         user = User(id="1", username="alice", is_blocked=True)
         assert user.is_blocked is True
+
+
+class TestUserUpdate:
+    def test_new_password_stored_as_given_hash(self):
+        update = UserUpdate(password="secret").to_storage_update_dict(
+            hashed_password="hash"
+        )
+        assert update == {"hashed_password": "hash", "must_change_password": False}
+
+    def test_new_password_without_hash_rejected(self):
+        with pytest.raises(ValueError, match="hashed_password"):
+            UserUpdate(password="secret").to_storage_update_dict(hashed_password=None)
@@ -0,0 +1,91 @@
+"""Unit tests for PasswordHasher."""
+
+import asyncio
+
+import bcrypt
+import pytest
+
+from models.errors import TooManyRequestsError
+from users.password import PasswordHasher
+
+pytestmark = pytest.mark.asyncio
+
+# Cheap rounds: the tests check where and how often bcrypt runs, not its cost.
+HASHED = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4)).decode()
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1)
+    yield hasher
+    hasher.close()
+
+
+class TestHashing:
+    async def test_hash_then_verify(self, hasher: PasswordHasher):
+        hashed = await hasher.hash("secret")
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+
+    async def test_runs_off_the_event_loop(self, hasher: PasswordHasher):
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        # Full-cost rounds, long enough for the loop to run meanwhile.
+        await hasher.hash("secret")
+        ticker.cancel()
+        assert ticks > 1
+
+    async def test_usable_again_after_close(self, hasher: PasswordHasher):
+        assert await hasher.verify("secret", HASHED)
+        hasher.close()
+        assert await hasher.verify("secret", HASHED)
+
+
+class TestConcurrencyCaps:
+    async def test_key_over_its_share_is_rejected(self):
+        hasher = PasswordHasher(workers=1, max_per_key=1)
+        try:
+            running = asyncio.create_task(
+                hasher.verify("secret", HASHED, keys=["user:u1", "client:a"])
+            )
+            await asyncio.sleep(0)
+
+            with pytest.raises(TooManyRequestsError):
+                await hasher.verify("secret", HASHED, keys=["user:u1"])
+            with pytest.raises(TooManyRequestsError):
+                await hasher.verify("secret", HASHED, keys=["client:a"])
+
+            assert await running
+            assert await hasher.verify("secret", HASHED, keys=["user:u1"])
+        finally:
+            hasher.close()
+
+    async def test_other_keys_are_not_held_up(self):
+        hasher = PasswordHasher(workers=1, max_per_key=1)
+        try:
+            results = await asyncio.gather(
+                hasher.verify("secret", HASHED, keys=["user:u1"]),
+                hasher.verify("secret", HASHED, keys=["user:u2"]),
+            )
+            assert results == [True, True]
+        finally:
+            hasher.close()
+
+    async def test_pending_checks_are_capped(self):
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        try:
+            running = asyncio.create_task(hasher.hash("secret"))
+            await asyncio.sleep(0)
+            with pytest.raises(TooManyRequestsError):
+                await hasher.verify("secret", HASHED)
+            await running
+            assert await hasher.verify("secret", HASHED)
+        finally:
+            hasher.close()
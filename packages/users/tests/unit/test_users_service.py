@@ -1,11 +1,14 @@
 """Unit tests for UsersService blocking functionality."""
 
+import asyncio
+from unittest.mock import Mock
+
 import pytest
 
-from models.errors import BlockedUserError, NotFoundError
+from models.errors import BlockedUserError, NotFoundError, TooManyRequestsError
 from users import UsersService
 from users.models import Role, UserInDB
-from users.password import hash_password
+from users.password import PasswordHasher, hash_password
 from users.storage import MemoryUsersStorage
 
 pytestmark = pytest.mark.asyncio
@@ -114,3 +117,34 @@ class TestAuthenticateBlocked:
         result = await service.authenticate("alice", "password12345")
         assert result is not None
         assert result.username == "alice"
+
+
+class TestAuthenticateConcurrency:
+    async def test_authenticate_caps_checks_per_client(
+        self, service: UsersService, storage: MemoryUsersStorage
+    ):
+        await storage.save(_make_user())
+        await storage.save(_make_user("u2", "bob"))
+
+        first = asyncio.create_task(
+            service.authenticate("alice", "password12345", client="10.0.0.1")
+        )
+        second = asyncio.create_task(
+            service.authenticate("alice", "password12345", client="10.0.0.1")
+        )
+        third = asyncio.create_task(
+            service.authenticate("bob", "password12345", client="10.0.0.1")
+        )
+        results = await asyncio.gather(first, second, third, return_exceptions=True)
+        assert sum(isinstance(r, TooManyRequestsError) for r in results) == 1
+
+
+class TestStop:
+    async def test_injected_hasher_left_to_its_owner(self, storage: MemoryUsersStorage):
+        hasher = Mock(spec=PasswordHasher)
+        svc = UsersService(storage_url=None, hasher=hasher)
+        svc._storage = storage  # noqa: SLF001
+
+        await svc.stop()
+
+        hasher.close.assert_not_called()